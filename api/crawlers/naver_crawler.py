@@ -1,7 +1,7 @@
 """
 네이버 스마트플레이스 크롤러
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable
 import asyncio
 from playwright.async_api import async_playwright, Page, Browser, BrowserContext
 import logging
@@ -14,15 +14,29 @@ import platform
 
 from .base_crawler import BaseCrawler
 from api.services.encryption import decrypt_password
+from api.services.review_id_index import get_review_id_index
+from api.services.session_store import get_session_store, save_session_async
 
 logger = logging.getLogger(__name__)
 
+# 리뷰 펼치기/추출을 페이지 스크립트로 일괄 처리 (false면 리뷰 요소별 파싱)
+NAVER_BULK_PARSE = os.getenv("NAVER_BULK_PARSE", "true").lower() == "true"
+# 리뷰 목록 API 응답을 가로채 우선 수집 (응답을 못 받으면 DOM 수집)
+# 기본 비활성화: 리뷰 ID가 본문 해시라 API 본문이 화면 텍스트와 조금만 달라도 이미 저장된 리뷰가
+# 새 ID로 다시 저장되고(중복 답글) 이전 수집 지점 조기 종료도 동작하지 않음 - 실제 응답 필드 확인 후 활성화
+NAVER_API_FIRST = os.getenv("NAVER_API_FIRST", "false").lower() == "true"
+NAVER_API_WAIT_MS = int(os.getenv("NAVER_API_WAIT_MS", "5000"))
+NAVER_API_MAX_PAGES = int(os.getenv("NAVER_API_MAX_PAGES", "50"))
+
 class NaverCrawler(BaseCrawler):
     """네이버 스마트플레이스 크롤러"""
     
-    def __init__(self, headless: bool = False):
+    def __init__(self, headless: bool = False, cdp_endpoint: Optional[str] = None):
         super().__init__(headless=headless)  # headless 매개변수 전달
         self.platform_name = "naver"
+        # 브라우저 풀 Chromium 주소 (있으면 persistent context 대신 풀 브라우저에 연결)
+        self.cdp_endpoint = cdp_endpoint
+        self.context: Optional[BrowserContext] = None
         self.base_url = "https://new.smartplace.naver.com"
         self.login_url = "https://nid.naver.com/nidlogin.login"
         # 브라우저 프로필 저장 경로
@@ -189,39 +203,50 @@ class NaverCrawler(BaseCrawler):
                 '--force-color-profile=srgb',
             ]
             
-            # persistent context로 브라우저 시작
-            self.browser = await self.playwright.chromium.launch_persistent_context(
-                user_data_dir=profile_path,
-                headless=self.headless,
-                args=browser_args,
-                viewport={'width': 1280, 'height': 720},
-                user_agent=self._get_consistent_user_agent(),
-                locale='ko-KR',
-                timezone_id='Asia/Seoul',
-                permissions=[],
-                ignore_https_errors=True,
-                java_script_enabled=True,
-                bypass_csp=True,
-                extra_http_headers={
+            context_options = {
+                'viewport': {'width': 1280, 'height': 720},
+                'user_agent': self._get_consistent_user_agent(),
+                'locale': 'ko-KR',
+                'timezone_id': 'Asia/Seoul',
+                'permissions': [],
+                'ignore_https_errors': True,
+                'java_script_enabled': True,
+                'bypass_csp': True,
+                'extra_http_headers': {
                     'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8',
                     'sec-ch-ua': '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
                     'sec-ch-ua-mobile': '?0',
                     'sec-ch-ua-platform': '"Windows"'
                 }
-            )
+            }
+            
+            if self.cdp_endpoint:
+                # 브라우저 풀의 Chromium에 연결 후 격리된 컨텍스트 생성
+                self.browser = await self.playwright.chromium.connect_over_cdp(self.cdp_endpoint)
+                self.context = await self.browser.new_context(**context_options)
+                logger.info(f"브라우저 풀 연결: {self.cdp_endpoint}")
+            else:
+                # persistent context로 브라우저 시작
+                self.browser = await self.playwright.chromium.launch_persistent_context(
+                    user_data_dir=profile_path,
+                    headless=self.headless,
+                    args=browser_args,
+                    **context_options
+                )
+                self.context = self.browser
             
             # 기존 페이지가 있으면 사용, 없으면 새로 생성
-            pages = self.browser.pages
+            pages = self.context.pages
             if pages:
                 self.page = pages[0]
             else:
-                self.page = await self.browser.new_page()
+                self.page = await self.context.new_page()
             
             # 타임아웃 설정
             self.page.set_default_timeout(30000)  # 30초
             
             # JavaScript로 자동화 감지 방지
-            await self.browser.add_init_script("""
+            await self.context.add_init_script("""
                 // Webdriver 속성 제거
                 Object.defineProperty(navigator, 'webdriver', {
                     get: () => undefined
@@ -272,7 +297,7 @@ class NaverCrawler(BaseCrawler):
                 );
             """)
             
-            logger.info(f"{self.platform_name} 브라우저 시작 완료 (persistent context)")
+            logger.info(f"{self.platform_name} 브라우저 시작 완료 ({'browser pool' if self.cdp_endpoint else 'persistent context'})")
         except Exception as e:
             logger.error(f"브라우저 시작 실패: {str(e)}")
             logger.error(f"Error type: {type(e).__name__}")
@@ -284,6 +309,14 @@ class NaverCrawler(BaseCrawler):
         try:
             logger.info(f"네이버 로그인 시작: {platform_id}")
             
+            # 브라우저 풀 모드는 프로필이 없으므로 저장된 세션 쿠키를 새 컨텍스트에 복원
+            restored_session = False
+            if self.cdp_endpoint:
+                saved_state = get_session_store().load('naver', platform_id)
+                if saved_state and saved_state.get('cookies'):
+                    await page.context.add_cookies(saved_state['cookies'])
+                    restored_session = True
+            
             # 로그인 페이지로 이동
             await page.goto(self.login_url, wait_until="domcontentloaded")
             await asyncio.sleep(1)  # 2초에서 1초로 단축
@@ -291,12 +324,20 @@ class NaverCrawler(BaseCrawler):
             # 이미 로그인되어 있는지 확인
             current_url = page.url
             if "nid.naver.com/nidlogin.login" not in current_url:
-                logger.info("이미 로그인된 상태")
+                logger.info("이미 로그인된 상태" + (" (저장된 세션 재사용)" if restored_session else ""))
                 # 스마트플레이스로 바로 이동
                 await page.goto(self.base_url, wait_until="domcontentloaded")
                 await asyncio.sleep(1)  # 2초에서 1초로 단축
+                if self.cdp_endpoint:
+                    await save_session_async(page.context, 'naver', platform_id)
                 return True
             
+            if restored_session:
+                # 저장된 세션이 만료됨 - 폐기 후 일반 로그인
+                get_session_store().invalidate('naver', platform_id)
+                await page.context.clear_cookies()
+                await page.goto(self.login_url, wait_until="domcontentloaded")
+            
             # 스크린샷 저장 디렉토리 설정
             screenshot_dir = os.path.join("logs", "screenshots", "naver")
             os.makedirs(screenshot_dir, exist_ok=True)
@@ -388,6 +429,8 @@ class NaverCrawler(BaseCrawler):
                         return False
                     
                     logger.info("네이버 로그인 성공")
+                    if self.cdp_endpoint:
+                        await save_session_async(page.context, 'naver', platform_id)
                     return True
                     
                 except:
@@ -571,12 +614,27 @@ class NaverCrawler(BaseCrawler):
         """리뷰 가져오기 (BaseCrawler 호환)"""
         return await self.crawl_reviews(self.page, store_id, store_code=None)
             
-    async def crawl_reviews(self, page: Page, platform_code: str, store_code: str = None) -> List[Dict[str, Any]]:
-        """네이버 스마트플레이스 리뷰 크롤링"""
+    async def crawl_reviews(self, page: Page, platform_code: str, store_code: str = None,
+                            known_review_ids: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        네이버 스마트플레이스 리뷰 크롤링
+
+        Args:
+            known_review_ids: 이전 수집 워터마크의 리뷰 ID
+                (네이버 리뷰 ID는 작성자 + 본문 해시라 스크롤 단계에서는 비교 불가 - 처음 만난 지점에서 파싱 중단)
+        """
         from .review_parsers.naver_review_parser import NaverReviewParser
+        from .review_parsers.naver_api_parser import NaverReviewApiCollector
         
+        known_review_ids = set(known_review_ids or [])
         reviews = []
         parser = NaverReviewParser()
+        review_store_code = store_code or platform_code
+        
+        # 리뷰 API 응답 가로채기 (페이지 이동 전에 등록해야 첫 응답을 받음)
+        collector = NaverReviewApiCollector(parser, review_store_code) if NAVER_API_FIRST else None
+        if collector:
+            page.on("response", collector.on_response)
         
         try:
             # 리뷰 페이지로 이동
@@ -591,13 +649,23 @@ class NaverCrawler(BaseCrawler):
                 await period_button.click()
                 await page.wait_for_timeout(1000)
                 
-                # 7일 옵션 선택
+                # 7일 옵션 선택 (목록을 다시 조회하므로 이전 API 응답은 폐기)
                 seven_days_option = await page.wait_for_selector('a[data-area-code="rv.calendarweek"]', timeout=3000)
+                if collector:
+                    collector.reset()
                 await seven_days_option.click()
                 await page.wait_for_timeout(2000)
             except:
                 logger.info("기간 선택 버튼을 찾을 수 없습니다. 기본 기간으로 진행합니다.")
             
+            if collector:
+                api_reviews = await self._collect_reviews_from_api(
+                    page, collector, parser, platform_code, review_store_code, known_review_ids
+                )
+                if api_reviews is not None:
+                    logger.info(f"총 {len(api_reviews)}개의 리뷰 수집 완료 (리뷰 API)")
+                    return api_reviews
+            
             # 스크롤하면서 모든 리뷰 로드
             last_review_count = 0
             scroll_attempts = 0
@@ -625,30 +693,16 @@ class NaverCrawler(BaseCrawler):
             review_elements = await page.query_selector_all('li.pui__X35jYm.Review_pui_review__zhZdn')
             logger.info(f"총 {len(review_elements)}개의 리뷰 발견")
             
-            for idx, review_element in enumerate(review_elements):
+            reviews = None
+            if NAVER_BULK_PARSE:
                 try:
-                    # 더보기 버튼 처리
-                    more_button = await review_element.query_selector('a.pui__wFzIYl[data-pui-click-code="text"]')
-                    if more_button:
-                        await more_button.click()
-                        await page.wait_for_timeout(500)
-                    
-                    # 태그 더보기 버튼 처리
-                    tag_more_button = await review_element.query_selector('a.pui__jhpEyP.pui__ggzZJ8[data-pui-click-code="rv.keywordmore"]')
-                    if tag_more_button:
-                        await tag_more_button.click()
-                        await page.wait_for_timeout(500)
-                    
-                    # 리뷰 데이터 추출 부분 (665번 라인 근처)
-                    # store_code가 전달되면 사용하고, 없으면 platform_code 사용
-                    review_data = await parser.parse_review_element(page, review_element, store_code or platform_code)
-                    if review_data:
-                        reviews.append(review_data)
-                        logger.info(f"리뷰 {idx + 1} 파싱 완료")
-                        
+                    reviews = await self._parse_reviews_bulk(page, parser, platform_code, review_store_code, known_review_ids)
                 except Exception as e:
-                    logger.error(f"리뷰 {idx + 1} 파싱 중 오류: {str(e)}")
-                    continue
+                    logger.warning(f"리뷰 일괄 추출 실패 - 요소별 파싱으로 대체: {str(e)}")
+            if reviews is None:
+                reviews = await self._parse_reviews_per_element(
+                    page, parser, review_elements, platform_code, review_store_code, known_review_ids
+                )
             
             logger.info(f"총 {len(reviews)}개의 리뷰 파싱 완료")
             
@@ -666,6 +720,129 @@ class NaverCrawler(BaseCrawler):
             os.makedirs(os.path.dirname(error_screenshot_path), exist_ok=True)
             await page.screenshot(path=error_screenshot_path)
             raise
+        finally:
+            if collector:
+                page.remove_listener("response", collector.on_response)
+
+    async def _collect_reviews_from_api(self, page: Page, collector, parser, platform_code: str,
+                                        review_store_code: str, known_review_ids: set) -> Optional[List[Dict[str, Any]]]:
+        """
+        리뷰 API 응답으로 수집 (CSS 클래스 변경과 무관)
+
+        다음 페이지는 스크롤로 요청하고, 응답에 다음 페이지가 없거나 이전 수집 지점에 도달하면 중단
+        API 응답을 하나도 받지 못하면 None (DOM 수집으로 대체)
+        """
+        if not collector.responses and not await collector.wait_for_update(NAVER_API_WAIT_MS):
+            logger.info("리뷰 API 응답을 받지 못했습니다 - DOM 수집으로 대체")
+            return None
+        
+        pages = 1
+        while pages < NAVER_API_MAX_PAGES and collector.has_more is not False and not collector.reached(known_review_ids):
+            before = collector.count
+            collector.mark()
+            await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
+            if not await collector.wait_for_update(NAVER_API_WAIT_MS) or collector.count == before:
+                break
+            pages += 1
+        
+        records = collector.records()
+        logger.info(f"리뷰 API {collector.responses}회 응답, 리뷰 {len(records)}개 수신")
+        return await self._select_new_reviews(records, parser, platform_code, review_store_code, known_review_ids, page.url)
+
+    async def _select_new_reviews(self, records: List[Dict[str, Any]], parser, platform_code: str,
+                                  review_store_code: str, known_review_ids: set, page_url: str) -> List[Dict[str, Any]]:
+        """화면 순서 레코드에서 이전 수집 지점 이후 + 미저장 리뷰만 DB 형식으로 변환"""
+        candidates = []
+        for idx, record in enumerate(records):
+            if record['review_id'] in known_review_ids:
+                logger.info(f"이전 수집 지점 도달 - 나머지 {len(records) - idx}개 리뷰 파싱 생략")
+                break
+            candidates.append(record)
+        
+        # 이미 저장된 리뷰는 제외 (리뷰 ID 인덱스, Bloom 필터 후보만 DB 확인)
+        stored_ids = await get_review_id_index().find_existing_async(
+            'naver', platform_code, [record['review_id'] for record in candidates]
+        )
+        if stored_ids:
+            logger.info(f"이미 저장된 리뷰 {len(stored_ids)}개 파싱 생략")
+        
+        reviews = []
+        for idx, record in enumerate(candidates):
+            if record['review_id'] in stored_ids:
+                continue
+            try:
+                reviews.append(parser.build_review(record, review_store_code, page_url))
+            except Exception as e:
+                logger.error(f"리뷰 {idx + 1} 변환 중 오류: {str(e)}")
+        return reviews
+
+    async def _parse_reviews_bulk(self, page: Page, parser, platform_code: str, review_store_code: str,
+                                  known_review_ids: set) -> List[Dict[str, Any]]:
+        """
+        더보기 펼치기와 필드 추출을 페이지 스크립트 한 번씩으로 처리
+        (리뷰마다 더보기 클릭 + 대기, 요소별 필드 조회를 하지 않음)
+        """
+        await parser.expand_reviews(page)
+        records = await parser.extract_reviews(page, review_store_code)
+        reviews = await self._select_new_reviews(records, parser, platform_code, review_store_code, known_review_ids, page.url)
+        
+        logger.info(f"일괄 추출: 로드된 리뷰 {len(records)}개 중 신규 {len(reviews)}개")
+        return reviews
+
+    async def _parse_reviews_per_element(self, page: Page, parser, review_elements: list, platform_code: str,
+                                         review_store_code: str, known_review_ids: set) -> List[Dict[str, Any]]:
+        """리뷰 요소별 파싱 (일괄 추출이 실패했을 때)"""
+        reviews = []
+        
+        # 1단계: 본문 펼친 뒤 리뷰 ID만 계산 (작성자 + 본문 해시)
+        candidates = []
+        for idx, review_element in enumerate(review_elements):
+            try:
+                # 더보기 버튼 처리
+                more_button = await review_element.query_selector('a.pui__wFzIYl[data-pui-click-code="text"]')
+                if more_button:
+                    await more_button.click()
+                    await page.wait_for_timeout(500)
+                
+                review_id = await parser.peek_review_id(review_element, review_store_code)
+                if review_id in known_review_ids:
+                    logger.info(f"이전 수집 지점 도달 - 나머지 {len(review_elements) - idx}개 리뷰 파싱 생략")
+                    break
+                candidates.append((idx, review_element, review_id))
+                
+            except Exception as e:
+                logger.error(f"리뷰 {idx + 1} ID 확인 중 오류: {str(e)}")
+                candidates.append((idx, review_element, None))
+        
+        # 이미 저장된 리뷰는 전체 파싱 생략 (리뷰 ID 인덱스, Bloom 필터 후보만 DB 확인)
+        stored_ids = await get_review_id_index().find_existing_async(
+            'naver', platform_code, [review_id for _, _, review_id in candidates if review_id]
+        )
+        if stored_ids:
+            logger.info(f"이미 저장된 리뷰 {len(stored_ids)}개 파싱 생략")
+        
+        # 2단계: 신규 리뷰만 전체 파싱
+        for idx, review_element, review_id in candidates:
+            if review_id in stored_ids:
+                continue
+            try:
+                # 태그 더보기 버튼 처리
+                tag_more_button = await review_element.query_selector('a.pui__jhpEyP.pui__ggzZJ8[data-pui-click-code="rv.keywordmore"]')
+                if tag_more_button:
+                    await tag_more_button.click()
+                    await page.wait_for_timeout(500)
+                
+                # store_code가 전달되면 사용하고, 없으면 platform_code 사용
+                review_data = await parser.parse_review_element(page, review_element, review_store_code)
+                if review_data:
+                    reviews.append(review_data)
+                    logger.info(f"리뷰 {idx + 1} 파싱 완료")
+                    
+            except Exception as e:
+                logger.error(f"리뷰 {idx + 1} 파싱 중 오류: {str(e)}")
+                continue
+        
+        return reviews
 
     async def _expand_review_content(self, page: Page):
         """리뷰 내용 더보기 버튼 모두 클릭"""
@@ -13,6 +13,8 @@ from playwright.async_api import async_playwright, TimeoutError as PlaywrightTim
 from pathlib import Path
 import re
 import json
+
+from api.utils.page_waits import StepTimer, wait_for_selector_async, expect_response_async, expect_dom_change_async
 # from ..utils.error_handler import log_login_error, log_reply_error, ErrorType  # 임시 주석 처리
 
 # 임시 더미 클래스 및 함수
@@ -40,6 +42,48 @@ logger = logging.getLogger(__name__)
 # 프로젝트 루트 설정
 PROJECT_ROOT = Path("C:/Review_playwright")
 
+# 리뷰 카드 컨테이너 (find_review_and_click_reply의 후보 셀렉터를 한 번에 대기)
+REVIEW_CARD_SELECTOR = 'div[class*="ReviewContent"], div[class*="review-item"], article[class*="review"], div[data-review-id]'
+
+# 리뷰 카드 후보 셀렉터 (우선순위 순)
+REVIEW_CARD_SELECTORS = [
+    'div[class*="ReviewContent"]',
+    'div[class*="review-content"]',
+    'div[class*="review-item"]',
+    'article[class*="review"]',
+    '.review-card',
+    '[data-testid*="review"]',
+    'div[data-review-id]'  # 크롤러에서 사용하는 데이터 속성
+]
+STAR_SELECTOR = 'svg[class*="star"], img[alt*="별"], .star'
+
+# 리뷰 카드 인덱싱 - 셀렉터 우선순위 순으로 카드마다 ID 후보/텍스트/별 개수를 한 번에 수집
+INDEX_REVIEW_CARDS_SCRIPT = """
+({selectors, starSelector, generation}) => {
+    const seen = new Set();
+    const cards = [];
+    for (const selector of selectors) {
+        let elements = [];
+        try { elements = document.querySelectorAll(selector); } catch (e) { continue; }
+        for (const card of elements) {
+            if (seen.has(card)) continue;
+            seen.add(card);
+            const key = `${generation}-${cards.length}`;
+            card.setAttribute('data-reply-card', key);
+            cards.push({
+                key,
+                dataId: card.getAttribute('data-review-id'),
+                hiddenValues: Array.from(card.querySelectorAll('input[type="hidden"]')).map(input => input.value),
+                text: card.innerText || '',
+                stars: card.querySelectorAll(starSelector).length
+            });
+        }
+    }
+    const atBottom = window.innerHeight + window.scrollY >= document.documentElement.scrollHeight - 2;
+    return {cards, atBottom};
+}
+"""
+
 
 class BaeminReplyManager:
     """
@@ -53,13 +97,18 @@ class BaeminReplyManager:
         self.is_context_provided = isinstance(browser_or_context, BrowserContext)
         self.is_logged_in = False
         self.playwright = None
+        self.timer = StepTimer('baemin_reply')
+        # 리뷰 카드 인덱스 (리뷰 페이지 이동 시 초기화, 일괄 처리 동안 재사용)
+        self._card_index = None
+        self._cards_at_bottom = False
+        self._index_generation = 0
         logger.info(f"배민 매니저 초기화 (Context provided: {self.is_context_provided})")
     
     async def close_popup(self):
         """팝업 닫기 - 다양한 기간의 '보지 않기' 옵션 처리"""
         try:
-            # 팝업이 나타날 때까지 잠시 대기
-            await asyncio.sleep(2)
+            # 팝업이 나타날 때까지 잠시 대기 (없으면 상한 후 진행)
+            await wait_for_selector_async(self.page, 'text=/보지 않기/', ceiling_ms=2000)
             
             # 우선순위: 더 긴 기간의 "보지 않기" 버튼을 먼저 찾아서 클릭
             priority_selectors = [
@@ -119,7 +168,6 @@ class BaeminReplyManager:
             await self.close_popup()
             
             # 추가적인 팝업 처리 (닫기, 확인 등)
-            await asyncio.sleep(1)
             
             # 다양한 팝업 닫기 버튼 선택자
             popup_close_selectors = [
@@ -214,7 +262,6 @@ class BaeminReplyManager:
             
             # CEO 페이지로 먼저 이동
             await self.page.goto('https://biz-member.baemin.com/login', wait_until='networkidle')
-            await asyncio.sleep(2)
             
             current_url = self.page.url
             logger.info(f"초기 이동 후 URL: {current_url}")
@@ -233,7 +280,7 @@ class BaeminReplyManager:
                 login_url = 'https://biz-member.baemin.com/login?returnUrl=https%3A%2F%2Fceo.baemin.com%2F'
                 logger.info(f"로그인 페이지로 직접 이동: {login_url}")
                 await self.page.goto(login_url, wait_until='domcontentloaded', timeout=30000)
-                await asyncio.sleep(3)
+                await wait_for_selector_async(self.page, 'input#username, input[name="username"]', ceiling_ms=5000)
             
             # 로그인 폼 처리
             try:
@@ -375,9 +422,8 @@ class BaeminReplyManager:
                     logger.info("로그인 버튼을 찾을 수 없어 Enter 키로 시도")
                     await pw_input.press('Enter')
                 
-                # 로그인 처리 대기
+                # 로그인 처리 대기 (아래 URL 변경 대기가 최대 10초)
                 logger.info("로그인 처리 대기 중...")
-                await asyncio.sleep(5)
                 
                 # 로그인 성공 확인
                 try:
@@ -457,8 +503,8 @@ class BaeminReplyManager:
             review_url = f"https://self.baemin.com/shops/{platform_code}/reviews"
             logger.info(f"리뷰 페이지 이동 시도: {review_url}")
             
+            self._card_index = None
             await self.page.goto(review_url, wait_until='networkidle', timeout=30000)
-            await asyncio.sleep(3)
             
             current_url = self.page.url
             logger.info(f"리뷰 페이지 로드 완료. 현재 URL: {current_url}")
@@ -473,15 +519,15 @@ class BaeminReplyManager:
                 # 미답변 탭 클릭 시도
                 try:
                     no_comment_tab = await self.page.wait_for_selector('#no-comment', timeout=5000)
-                    await no_comment_tab.click()
+                    async with expect_response_async(self.page, f"/shops/{platform_code}/reviews", ceiling_ms=5000):
+                        await no_comment_tab.click()
                     logger.info("미답변 탭 클릭 완료")
-                    await asyncio.sleep(2)
                 except:
                     try:
                         no_comment_tab = await self.page.wait_for_selector('button:has-text("미답변")', timeout=3000)
-                        await no_comment_tab.click()
+                        async with expect_response_async(self.page, f"/shops/{platform_code}/reviews", ceiling_ms=5000):
+                            await no_comment_tab.click()
                         logger.info("미답변 탭 클릭 완료 (대체 선택자)")
-                        await asyncio.sleep(2)
                     except:
                         logger.warning("미답변 탭을 찾을 수 없습니다 - 계속 진행")
                 
@@ -492,7 +538,6 @@ class BaeminReplyManager:
                 logger.info(f"새 URL 실패, 구 URL로 재시도: {review_url_old}")
                 
                 await self.page.goto(review_url_old, wait_until='networkidle', timeout=30000)
-                await asyncio.sleep(3)
                 
                 return True
                 
@@ -501,7 +546,12 @@ class BaeminReplyManager:
             return False
     
     async def find_review_and_click_reply(self, review_id: str, review_info: dict = None):
-        """리뷰를 찾고 답글 버튼을 클릭 - original_id 기반 매칭 + 필드별 매칭"""
+        """
+        리뷰를 찾고 답글 버튼을 클릭 - original_id 기반 매칭 + 필드별 매칭
+
+        화면의 리뷰 카드를 페이지 스크립트 한 번으로 인덱싱(ID, 텍스트, 별 개수)하고 일괄 처리 동안 재사용
+        대상 리뷰가 인덱스에 없을 때만 스크롤 후 다시 인덱싱
+        """
         try:
             logger.info(f"리뷰 검색 시작 - Review ID: {review_id}")
             
@@ -511,78 +561,41 @@ class BaeminReplyManager:
             
             # 필드별 매칭을 위한 정보 추출
             if review_info:
-                review_name = review_info.get('review_name', '')
-                rating = review_info.get('rating', 0)
-                review_content = review_info.get('review_content', '')
-                ordered_menu = review_info.get('ordered_menu', '')
-                logger.info(f"필드별 매칭 정보: name={review_name}, rating={rating}, content={review_content[:30]}..., menu={ordered_menu}")
+                logger.info(f"필드별 매칭 정보: name={review_info.get('review_name', '')}, rating={review_info.get('rating', 0)}, "
+                            f"content={(review_info.get('review_content') or '')[:30]}..., menu={review_info.get('ordered_menu', '')}")
             
-            # 페이지가 로드될 때까지 대기
-            await asyncio.sleep(3)
+            fresh = False
+            if self._card_index is None:
+                # 리뷰 카드가 렌더링될 때까지 대기
+                await wait_for_selector_async(self.page, REVIEW_CARD_SELECTOR, ceiling_ms=5000)
+                await self._build_card_index()
+                fresh = True
             
-            # 크롤러와 동일한 방식으로 DOM에서 리뷰 찾기
             max_attempts = 10
             for attempt in range(max_attempts):
-                logger.info(f"리뷰 검색 시도 {attempt + 1}/{max_attempts}")
-                
-                # 다양한 리뷰 컨테이너 셀렉터 시도
-                review_selectors = [
-                    'div[class*="ReviewContent"]',
-                    'div[class*="review-content"]',
-                    'div[class*="review-item"]',
-                    'article[class*="review"]',
-                    '.review-card',
-                    '[data-testid*="review"]',
-                    'div[data-review-id]'  # 크롤러에서 사용하는 데이터 속성
-                ]
-                
-                for selector in review_selectors:
-                    try:
-                        review_cards = await self.page.query_selector_all(selector)
-                        if review_cards:
-                            logger.info(f"{len(review_cards)}개의 리뷰 카드 발견 (selector: {selector})")
-                            
-                            # 각 리뷰 카드에서 original_id 매칭
-                            for card in review_cards:
-                                # 데이터 속성에서 ID 확인
-                                data_id = await card.get_attribute('data-review-id')
-                                if data_id == original_id:
-                                    logger.info(f"✅ 데이터 속성으로 매칭 성공: {data_id}")
-                                    return await self._click_reply_button(card)
-                                
-                                # 숨겨진 input 필드에서 ID 확인
-                                hidden_inputs = await card.query_selector_all('input[type="hidden"]')
-                                for input_elem in hidden_inputs:
-                                    input_value = await input_elem.get_attribute('value')
-                                    if input_value == original_id:
-                                        logger.info(f"✅ 숨겨진 입력으로 매칭 성공: {input_value}")
-                                        return await self._click_reply_button(card)
-                                
-                                # 텍스트 내용에서 ID 확인 (마지막 수단)
-                                card_text = await card.inner_text()
-                                if original_id in card_text:
-                                    logger.info(f"✅ 텍스트 내용으로 매칭 성공: {original_id}")
-                                    return await self._click_reply_button(card)
-                                
-                                # 필드별 매칭 (review_info가 있을 때만)
-                                if review_info:
-                                    match_score = await self._calculate_match_score(card, review_info)
-                                    if match_score >= 3:  # 매칭 임계값
-                                        logger.info(f"✅ 필드별 매칭 성공: 점수 {match_score}")
-                                        return await self._click_reply_button(card)
-                                    
-                    except Exception as e:
-                        logger.debug(f"셀렉터 {selector} 처리 중 오류: {str(e)}")
-                        continue
+                card = await self._lookup_card(original_id, review_info)
+                if card is None and not fresh:
+                    # 이전 답글 등록 후 다시 렌더링된 카드가 있을 수 있으므로 한 번 다시 인덱싱
+                    await self._build_card_index()
+                    card = await self._lookup_card(original_id, review_info)
+                if card is not None:
+                    return await self._click_reply_button(card)
+                
+                if self._cards_at_bottom:
+                    logger.info("마지막 리뷰까지 확인 - 추가 스크롤 생략")
+                    break
                 
                 # 스크롤해서 더 많은 리뷰 로드
+                logger.info(f"리뷰 검색 시도 {attempt + 1}/{max_attempts} - 스크롤 후 다시 인덱싱")
                 try:
-                    await self.page.evaluate('window.scrollBy(0, 800)')
-                    await asyncio.sleep(2)
-                    logger.info("페이지 스크롤 완료")
+                    # 추가 리뷰가 렌더링되면 바로 진행 (더 없으면 상한 후 진행)
+                    async with expect_dom_change_async(self.page, ceiling_ms=2000):
+                        await self.page.evaluate('window.scrollBy(0, 800)')
                 except Exception as e:
                     logger.debug(f"페이지 스크롤 중 오류: {str(e)}")
                     await asyncio.sleep(1)
+                await self._build_card_index()
+                fresh = True
             
             logger.warning(f"리뷰를 찾을 수 없음: {review_id}")
             
@@ -609,56 +622,80 @@ class BaeminReplyManager:
             logger.error(f"리뷰 검색 중 오류: {str(e)}")
             return False
     
-    async def _calculate_match_score(self, card, review_info: dict) -> int:
-        """필드별 매칭 점수 계산 (기존 답글 매니저 로직 기반)"""
+    async def _build_card_index(self):
+        """화면의 리뷰 카드 인덱싱 (카드마다 data-reply-card 속성을 붙여 다시 찾을 수 있게 함)"""
+        self._index_generation += 1
         try:
-            score = 0
-            card_text = await card.inner_text()
-            
-            # 1. 리뷰어 이름 매칭 (2점)
-            review_name = review_info.get('review_name', '')
-            if review_name and review_name in card_text:
-                score += 2
-                logger.debug(f"리뷰어 이름 매칭: {review_name}")
-            
-            # 2. 리뷰 내용 매칭 (3점 - 가장 중요)
-            review_content = review_info.get('review_content', '')
-            if review_content and review_content.strip():
-                # 텍스트 정규화해서 비교
-                normalized_content = self._normalize_text(review_content)
-                normalized_card_text = self._normalize_text(card_text)
-                if normalized_content in normalized_card_text:
-                    score += 3
-                    logger.debug(f"리뷰 내용 매칭: {review_content[:30]}...")
-            
-            # 3. 별점 매칭 (1점)
-            rating = review_info.get('rating', 0)
-            if rating > 0:
-                # 별점 이미지나 텍스트 확인
-                try:
-                    star_elements = await card.query_selector_all('svg[class*="star"], img[alt*="별"], .star')
-                    if len(star_elements) == rating:
-                        score += 1
-                        logger.debug(f"별점 매칭: {rating}점")
-                    # 텍스트에서 별점 확인
-                    elif f"{rating}점" in card_text or f"★" * rating in card_text:
-                        score += 1
-                        logger.debug(f"별점 텍스트 매칭: {rating}점")
-                except:
-                    pass
-            
-            # 4. 주문메뉴 매칭 (1점)
-            ordered_menu = review_info.get('ordered_menu', '')
-            if ordered_menu and ordered_menu in card_text:
-                score += 1
-                logger.debug(f"주문메뉴 매칭: {ordered_menu}")
-            
-            logger.debug(f"필드별 매칭 점수: {score}/7")
-            return score
-            
+            snapshot = await self.page.evaluate(INDEX_REVIEW_CARDS_SCRIPT, {
+                'selectors': REVIEW_CARD_SELECTORS,
+                'starSelector': STAR_SELECTOR,
+                'generation': self._index_generation
+            })
         except Exception as e:
-            logger.error(f"매칭 점수 계산 중 오류: {str(e)}")
-            return 0
+            logger.debug(f"리뷰 카드 인덱싱 실패: {str(e)}")
+            snapshot = {'cards': [], 'atBottom': False}
+        
+        self._card_index = snapshot.get('cards') or []
+        self._cards_at_bottom = bool(snapshot.get('atBottom'))
+        logger.info(f"리뷰 카드 {len(self._card_index)}개 인덱싱")
+    
+    async def _lookup_card(self, original_id: str, review_info: Optional[dict]):
+        """인덱스에서 리뷰 카드 찾기 (카드가 다시 렌더링돼 사라졌으면 None)"""
+        entry = self._match_card_entry(original_id, review_info)
+        if entry is None:
+            return None
+        card = await self.page.query_selector(f'[data-reply-card="{entry["key"]}"]')
+        if card is None:
+            logger.debug(f"인덱싱한 카드가 다시 렌더링됨: {entry['key']}")
+        return card
+    
+    def _match_card_entry(self, original_id: str, review_info: Optional[dict]) -> Optional[Dict[str, Any]]:
+        """카드 순서대로 데이터 속성 → 숨겨진 입력 → 텍스트 내 ID → 필드별 점수(3점 이상) 매칭"""
+        for entry in self._card_index or []:
+            if entry.get('dataId') == original_id:
+                logger.info(f"✅ 데이터 속성으로 매칭 성공: {original_id}")
+                return entry
+            if original_id in (entry.get('hiddenValues') or []):
+                logger.info(f"✅ 숨겨진 입력으로 매칭 성공: {original_id}")
+                return entry
+            if original_id in entry.get('text', ''):
+                logger.info(f"✅ 텍스트 내용으로 매칭 성공: {original_id}")
+                return entry
+            if review_info:
+                match_score = self._calculate_match_score(entry, review_info)
+                if match_score >= 3:  # 매칭 임계값
+                    logger.info(f"✅ 필드별 매칭 성공: 점수 {match_score}")
+                    return entry
+        return None
+    
+    def _calculate_match_score(self, entry: Dict[str, Any], review_info: dict) -> int:
+        """필드별 매칭 점수 계산 (기존 답글 매니저 로직 기반, 인덱싱한 카드 텍스트 사용)"""
+        score = 0
+        card_text = entry.get('text', '')
+        
+        # 1. 리뷰어 이름 매칭 (2점)
+        review_name = review_info.get('review_name', '')
+        if review_name and review_name in card_text:
+            score += 2
+        
+        # 2. 리뷰 내용 매칭 (3점 - 가장 중요)
+        review_content = review_info.get('review_content', '')
+        if review_content and review_content.strip():
+            if self._normalize_text(review_content) in self._normalize_text(card_text):
+                score += 3
+        
+        # 3. 별점 매칭 (1점) - 별 아이콘 개수 또는 텍스트
+        rating = review_info.get('rating') or 0
+        if rating > 0 and (entry.get('stars') == rating or f"{rating}점" in card_text or "★" * rating in card_text):
+            score += 1
+        
+        # 4. 주문메뉴 매칭 (1점)
+        ordered_menu = review_info.get('ordered_menu', '')
+        if ordered_menu and ordered_menu in card_text:
+            score += 1
+        
+        logger.debug(f"필드별 매칭 점수: {score}/7")
+        return score
     
     def _normalize_text(self, text: str) -> str:
         """텍스트 정규화 (공백, 줄바꿈 제거)"""
@@ -688,7 +725,7 @@ class BaeminReplyManager:
                         await asyncio.sleep(0.5)
                         await reply_button.click()
                         logger.info(f"답글 버튼 클릭 성공: {btn_selector}")
-                        await asyncio.sleep(2)
+                        await wait_for_selector_async(self.page, 'textarea', ceiling_ms=3000)
                         return True
                 except Exception as e:
                     logger.debug(f"답글 버튼 클릭 시도 실패 ({btn_selector}): {str(e)}")
@@ -706,7 +743,7 @@ class BaeminReplyManager:
         try:
             logger.info("답글 텍스트 입력 시작")
             
-            await asyncio.sleep(2)
+            await wait_for_selector_async(self.page, 'textarea', ceiling_ms=3000)
             
             # textarea 찾기 - 사용자가 제공한 정확한 HTML 구조에 맞게 수정
             textarea_selectors = [
@@ -839,8 +876,8 @@ class BaeminReplyManager:
             await submit_button.click()
             logger.info("등록 버튼 클릭 완료")
             
-            # 등록 완료 대기
-            await asyncio.sleep(3)
+            # 등록 완료 대기 (입력창이 닫히면 완료)
+            await wait_for_selector_async(self.page, 'textarea', ceiling_ms=5000, state='hidden')
             
             logger.info("답글 등록 완료")
             return True
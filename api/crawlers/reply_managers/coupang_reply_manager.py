@@ -7,8 +7,15 @@ import os
 from pathlib import Path
 import re
 
+from api.utils.page_waits import (
+    StepTimer, wait_for_selector_async, wait_for_url_async, expect_dom_change_async
+)
+
 logger = logging.getLogger(__name__)
 
+# 리뷰 목록 테이블 (탭/기간/페이지 전환 후 갱신 감지)
+REVIEW_TABLE_SELECTOR = 'table'
+
 class CoupangReplyManager:
     """쿠팡이츠 답글 관리자"""
     
@@ -20,6 +27,7 @@ class CoupangReplyManager:
         self.platform_store_id = store_info.get('platform_code')  # 쿠팡 매장 ID (예: 708561)
         self.screenshots_dir = Path("logs/screenshots/coupang/replies")
         self.screenshots_dir.mkdir(parents=True, exist_ok=True)
+        self.timer = StepTimer('coupang_reply')
         
     async def login(self, page: Page) -> bool:
         """쿠팡이츠 사장님 사이트 로그인"""
@@ -28,22 +36,19 @@ class CoupangReplyManager:
             
             # 로그인 페이지로 이동
             await page.goto("https://store.coupangeats.com/merchant/login", wait_until="networkidle")
-            await page.wait_for_timeout(2000)
 
             # 아이디 입력
             await page.wait_for_selector('#loginId', state='visible', timeout=10000)
             await page.fill('#loginId', self.platform_id)
-            await page.wait_for_timeout(500)
             
             # 비밀번호 입력
             await page.fill('#password', self.platform_pw)
-            await page.wait_for_timeout(500)
             
             # 로그인 버튼 클릭
             await page.click('button[type="submit"].merchant-submit-btn')
             
-            # 로그인 완료 대기
-            await page.wait_for_timeout(5000)
+            # 로그인 완료 대기 (로그인 페이지를 벗어나면 바로 진행)
+            await wait_for_url_async(page, lambda url: 'login' not in url, ceiling_ms=10000)
             
             # 로그인 성공 확인 (리뷰 페이지로 리다이렉트 되거나 대시보드 표시)
             current_url = page.url
@@ -78,7 +83,7 @@ class CoupangReplyManager:
                     if close_button:
                         await close_button.click()
                         logger.info(f"팝업을 닫았습니다 (셀렉터: {selector})")
-                        await page.wait_for_timeout(1000)
+                        await wait_for_selector_async(page, selector, ceiling_ms=1000, state='hidden')
                         return True
                 except:
                     continue
@@ -108,7 +113,7 @@ class CoupangReplyManager:
             else:
                 await date_dropdown.click()
                 
-            await page.wait_for_timeout(1000)
+            await wait_for_selector_async(page, 'label:has-text("1개월")', ceiling_ms=2000)
             
             # 1개월 옵션 클릭 - JavaScript로 직접 라벨 클릭
             await page.evaluate('''() => {
@@ -131,7 +136,6 @@ class CoupangReplyManager:
             }''')
             
             logger.info("1개월 옵션 선택 완료")
-            await page.wait_for_timeout(1000)
             
             # 조회 버튼 클릭 - 더 정확한 셀렉터 사용
             search_button = await page.query_selector('button.button--primaryOutlined:has-text("조회")')
@@ -140,9 +144,10 @@ class CoupangReplyManager:
                 search_button = await page.query_selector('button:has(span:has-text("조회"))')
             
             if search_button:
-                await search_button.click()
+                # 데이터 로딩 대기 (목록이 갱신되면 바로 진행)
+                async with expect_dom_change_async(page, REVIEW_TABLE_SELECTOR, ceiling_ms=5000):
+                    await search_button.click()
                 logger.info("조회 버튼 클릭 완료")
-                await page.wait_for_timeout(3000)  # 데이터 로딩 대기
             else:
                 logger.warning("조회 버튼을 찾을 수 없습니다")
                 
@@ -159,7 +164,6 @@ class CoupangReplyManager:
             
             # 리뷰 페이지로 이동
             await page.goto("https://store.coupangeats.com/merchant/management/reviews", wait_until="networkidle")
-            await page.wait_for_timeout(3000)
             
             # 팝업 닫기 추가
             await self.close_popup(page)
@@ -167,8 +171,8 @@ class CoupangReplyManager:
             # 매장 선택 (드롭다운에서)
             store_selector = f'li:has-text("{self.platform_store_id}")'
             if await page.locator(store_selector).count() > 0:
-                await page.click(store_selector)
-                await page.wait_for_timeout(2000)
+                async with expect_dom_change_async(page, REVIEW_TABLE_SELECTOR, ceiling_ms=5000):
+                    await page.click(store_selector)
                 logger.info(f"매장 선택 완료: {self.platform_store_id}")
             
             # 날짜 설정 (1개월) - 수정된 로직
@@ -214,8 +218,8 @@ class CoupangReplyManager:
                         tab_classes = await unanswered_tab.get_attribute('class')
                         logger.info(f"클릭 전 미답변 탭 클래스: {tab_classes}")
                         
-                        await unanswered_tab.click()
-                        await page.wait_for_timeout(3000)
+                        async with expect_dom_change_async(page, REVIEW_TABLE_SELECTOR, ceiling_ms=5000):
+                            await unanswered_tab.click()
                         
                         # 클릭 후 상태 확인
                         tab_classes_after = await unanswered_tab.get_attribute('class')
@@ -235,8 +239,8 @@ class CoupangReplyManager:
                     try:
                         span_element = await page.query_selector('span:text("미답변")')
                         if span_element:
-                            await span_element.click()
-                            await page.wait_for_timeout(3000)
+                            async with expect_dom_change_async(page, REVIEW_TABLE_SELECTOR, ceiling_ms=5000):
+                                await span_element.click()
                             logger.info("미답변 span 직접 클릭 시도")
                             tab_clicked = True
                     except Exception as e:
@@ -245,17 +249,17 @@ class CoupangReplyManager:
                 # 방법 3: JavaScript로 강제 클릭
                 if not tab_clicked:
                     try:
-                        await page.evaluate("""
-                            const tabs = document.querySelectorAll('div.css-jzkpn6');
-                            for (let tab of tabs) {
-                                if (tab.textContent.includes('미답변')) {
-                                    tab.click();
-                                    console.log('JavaScript로 미답변 탭 클릭');
-                                    break;
+                        async with expect_dom_change_async(page, REVIEW_TABLE_SELECTOR, ceiling_ms=5000):
+                            await page.evaluate("""
+                                const tabs = document.querySelectorAll('div.css-jzkpn6');
+                                for (let tab of tabs) {
+                                    if (tab.textContent.includes('미답변')) {
+                                        tab.click();
+                                        console.log('JavaScript로 미답변 탭 클릭');
+                                        break;
+                                    }
                                 }
-                            }
-                        """)
-                        await page.wait_for_timeout(3000)
+                            """)
                         logger.info("JavaScript로 미답변 탭 클릭 시도")
                         tab_clicked = True
                     except Exception as e:
@@ -264,8 +268,6 @@ class CoupangReplyManager:
                 if not tab_clicked:
                     logger.warning("⚠️ 미답변 탭을 찾을 수 없음 - 전체 탭에서 검색")
                 
-                await page.wait_for_timeout(5000)  # 탭 전환 대기시간 증가
-                
                 # 현재 활성 탭 다시 확인 및 미답변 개수 확인
                 try:
                     # 미답변 탭의 개수 확인
@@ -285,8 +287,8 @@ class CoupangReplyManager:
                                     all_tab = await page.query_selector('div.css-jzkpn6:has(span:text("전체"))')
                                     if all_tab:
                                         logger.info("전체 탭으로 전환하여 확인합니다...")
-                                        await all_tab.click()
-                                        await page.wait_for_timeout(3000)
+                                        async with expect_dom_change_async(page, REVIEW_TABLE_SELECTOR, ceiling_ms=5000):
+                                            await all_tab.click()
                                         
                                         # 전체 리뷰 개수 확인
                                         all_count_element = await all_tab.query_selector('b.css-1k8kvzj')
@@ -322,7 +324,7 @@ class CoupangReplyManager:
                 
                 # 테이블 로딩 대기
                 try:
-                    await page.wait_for_selector('table', timeout=10000)
+                    await page.wait_for_selector(REVIEW_TABLE_SELECTOR, timeout=10000)
                     logger.info("테이블 로딩 완료")
                 except Exception as e:
                     logger.warning(f"테이블 로딩 실패: {str(e)} - 계속 진행합니다.")
@@ -395,7 +397,6 @@ class CoupangReplyManager:
                     break
                     
                 current_page += 1
-                await page.wait_for_timeout(2000)  # 페이지 로딩 대기
             
             logger.warning(f"모든 페이지를 검색했지만 매칭되는 리뷰를 찾을 수 없음")
             return False
@@ -484,13 +485,12 @@ class CoupangReplyManager:
                                 
                                 # 답글 등록 프로세스
                                 await reply_button.click()
-                                await page.wait_for_timeout(2000)
+                                await wait_for_selector_async(page, 'textarea', ceiling_ms=3000)
                                 
                                 # 답글 입력
                                 reply_textarea = await page.query_selector('textarea')
                                 if reply_textarea:
                                     await reply_textarea.fill(reply_content)
-                                    await page.wait_for_timeout(1000)
                                     
                                     # 등록 버튼 클릭 - 실제 HTML 구조에 맞게 수정
                                     submit_button = await page.query_selector('button.button.button-size--small.button--primaryContained:has(span.button__inner:text("등록"))')
@@ -510,7 +510,8 @@ class CoupangReplyManager:
                                     
                                     if submit_button:
                                         await submit_button.click()
-                                        await page.wait_for_timeout(3000)
+                                        # 입력창이 닫히면 등록 완료
+                                        await wait_for_selector_async(page, 'textarea', ceiling_ms=5000, state='hidden')
                                         logger.info("✅ 답글 등록 완료!")
                                         return True
                                     else:
@@ -546,21 +547,22 @@ class CoupangReplyManager:
     async def _go_to_next_page(self, page: Page) -> bool:
         """다음 페이지로 이동"""
         try:
-            # 페이지네이션 영역에서 다음 버튼 찾기
-            next_button = await page.evaluate('''() => {
-                const containers = document.querySelectorAll('div[class*="css-"]');
-                for (const container of containers) {
-                    const buttons = container.querySelectorAll('button');
-                    if (buttons.length >= 3) {  // 페이지네이션 버튼들
-                        const lastButton = buttons[buttons.length - 1];
-                        if (lastButton && lastButton.querySelector('svg') && !lastButton.disabled) {
-                            lastButton.click();
-                            return true;
+            # 페이지네이션 영역에서 다음 버튼 찾기 (클릭 후 목록이 갱신될 때까지 대기)
+            async with expect_dom_change_async(page, REVIEW_TABLE_SELECTOR, ceiling_ms=5000):
+                next_button = await page.evaluate('''() => {
+                    const containers = document.querySelectorAll('div[class*="css-"]');
+                    for (const container of containers) {
+                        const buttons = container.querySelectorAll('button');
+                        if (buttons.length >= 3) {  // 페이지네이션 버튼들
+                            const lastButton = buttons[buttons.length - 1];
+                            if (lastButton && lastButton.querySelector('svg') && !lastButton.disabled) {
+                                lastButton.click();
+                                return true;
+                            }
                         }
                     }
-                }
-                return false;
-            }''')
+                    return false;
+                }''')
             
             if next_button:
                 logger.info("다음 페이지로 이동")
@@ -11,6 +11,44 @@ import os
 import hashlib
 from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
 
+from api.utils.page_waits import (
+    StepTimer, wait_for_load_async, wait_for_selector_async, wait_for_url_async, expect_dom_change_async
+)
+
+REVIEW_ITEM_SELECTOR = 'li.pui__X35jYm.Review_pui_review__zhZdn'
+# 일괄 처리 인덱싱으로 찾은 리뷰 요소에 붙이는 속성 (값: review_id)
+REPLY_TARGET_ATTR = 'data-reply-target'
+
+# 리뷰 목록 지문 추출 - 작성자, 작성일, 내용 (find_review_element와 같은 요소)
+EXTRACT_REVIEW_FINGERPRINTS_SCRIPT = """
+(selector) => Array.from(document.querySelectorAll(selector)).map((item, position) => {
+    const author = item.querySelector('span.pui__NMi-Dp');
+    let date = '';
+    for (const box of item.querySelectorAll('div.pui__4rEbt5')) {
+        const label = box.querySelector('span.pui__ewpNGR');
+        const time = box.querySelector('time');
+        if (label && time && label.innerText.includes('작성일')) { date = time.innerText; break; }
+    }
+    const content = item.querySelector('a.pui__xtsQN-');
+    return {
+        position,
+        author: author ? author.innerText.trim() : null,
+        date,
+        content: content ? content.innerText.trim() : ''
+    };
+})
+"""
+
+# 매칭된 리뷰 요소에 review_id 표시 ([[position, review_id], ...])
+MARK_REVIEW_TARGETS_SCRIPT = """
+({selector, attr, targets}) => {
+    const items = document.querySelectorAll(selector);
+    for (const [position, key] of targets) {
+        if (items[position]) items[position].setAttribute(attr, key);
+    }
+}
+"""
+
 class NaverReplyManager:
     """네이버 플레이스 답글 관리 클래스"""
     
@@ -18,6 +56,7 @@ class NaverReplyManager:
         self.store_info = store_info
         self.platform = 'naver'
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.timer = StepTimer('naver_reply')
         self.login_url = "https://nid.naver.com/nidlogin.login"
         self.review_url_template = "https://new.smartplace.naver.com/bizes/place/{platform_code}"
         
@@ -53,7 +92,8 @@ class NaverReplyManager:
         try:
             # 네이버 메인 페이지로 이동하여 로그인 상태 확인
             await page.goto("https://www.naver.com", wait_until="domcontentloaded")
-            await asyncio.sleep(2)
+            await wait_for_selector_async(page, 'a[href*="nid.naver.com/nidlogin.login"], .MyView-module__my_view___HhQoA',
+                                          ceiling_ms=3000)
             
             # 로그인 상태 확인 (프로필 이미지나 로그인 버튼 확인)
             login_button = await page.query_selector('a[href*="nid.naver.com/nidlogin.login"]')
@@ -70,7 +110,7 @@ class NaverReplyManager:
             # 대체 방법: 네이버 스마트플레이스 페이지로 직접 이동해서 확인
             test_url = f"https://new.smartplace.naver.com/bizes/place/{self.store_info['platform_code']}"
             await page.goto(test_url, wait_until="domcontentloaded")
-            await asyncio.sleep(3)
+            await wait_for_load_async(page, ceiling_ms=5000)
             
             # 로그인 페이지로 리다이렉트되었는지 확인
             current_url = page.url
@@ -96,7 +136,7 @@ class NaverReplyManager:
             
             # 로그인 페이지로 이동
             await page.goto(self.login_url, wait_until="domcontentloaded")
-            await asyncio.sleep(1)
+            await wait_for_selector_async(page, '#id', ceiling_ms=1000)
             
             # 이미 로그인되어 있는지 확인
             current_url = page.url
@@ -124,10 +164,7 @@ class NaverReplyManager:
             self.logger.info("로그인 버튼 클릭")
             
             # 페이지 전환 대기
-            try:
-                await page.wait_for_navigation(timeout=10000)
-            except:
-                await asyncio.sleep(2)
+            await wait_for_url_async(page, lambda url: 'nidlogin.login' not in url, ceiling_ms=10000)
             
             # 현재 URL 확인
             current_url = page.url
@@ -183,7 +220,6 @@ class NaverReplyManager:
             self.logger.info(f"리뷰 페이지 이동: {review_url}")
             
             await page.goto(review_url, wait_until="networkidle")
-            await page.wait_for_timeout(3000)
             
             # 팝업 처리 (닫기 버튼)
             try:
@@ -191,7 +227,7 @@ class NaverReplyManager:
                 if close_btn:
                     await close_btn.click()
                     self.logger.info("팝업 닫기 완료")
-                    await asyncio.sleep(1)
+                    await wait_for_selector_async(page, '.fn-booking-close1', ceiling_ms=1000, state='hidden')
             except:
                 pass  # 팝업이 없을 수 있음
             
@@ -202,7 +238,7 @@ class NaverReplyManager:
                 if confirm_btn:
                     await confirm_btn.click()
                     self.logger.info("확인 팝업 닫기 완료")
-                    await asyncio.sleep(1)
+                    await wait_for_selector_async(page, 'button:has-text("확인")', ceiling_ms=1000, state='hidden')
             except:
                 pass
             
@@ -210,19 +246,18 @@ class NaverReplyManager:
             try:
                 period_button = await page.wait_for_selector('button[data-area-code="rv.calendarfilter"]', timeout=5000)
                 await period_button.click()
-                await page.wait_for_timeout(1000)
                 
                 # 7일 옵션 선택
                 seven_days_option = await page.wait_for_selector('a[data-area-code="rv.calendarweek"]', timeout=3000)
-                await seven_days_option.click()
-                await page.wait_for_timeout(2000)
+                async with expect_dom_change_async(page, ceiling_ms=5000):
+                    await seven_days_option.click()
                 self.logger.info("7일 필터 설정 완료")
             except Exception as e:
                 self.logger.info(f"기간 선택 버튼을 찾을 수 없습니다. 기본 기간으로 진행합니다: {str(e)}")
             
             # 리뷰 목록 로딩 대기
             try:
-                await page.wait_for_selector('li.pui__X35jYm.Review_pui_review__zhZdn', timeout=5000)
+                await page.wait_for_selector(REVIEW_ITEM_SELECTOR, timeout=5000)
                 self.logger.info("리뷰 목록 로딩 완료")
             except:
                 # 구버전 셀렉터도 시도
@@ -238,8 +273,83 @@ class NaverReplyManager:
             self.logger.error(f"리뷰 페이지 이동 중 오류: {str(e)}")
             return False
     
+    async def _load_all_reviews(self, page: Page):
+        """스크롤하면서 모든 리뷰 로드 (리뷰 수가 더 늘지 않을 때까지, 최대 10회)"""
+        self.logger.info("리뷰 목록 스크롤 시작...")
+        last_review_count = 0
+        scroll_attempts = 0
+        max_scroll_attempts = 10
+        
+        while scroll_attempts < max_scroll_attempts:
+            # 현재 리뷰 개수 확인
+            current_review_count = await page.locator(REVIEW_ITEM_SELECTOR).count()
+            
+            self.logger.info(f"스크롤 {scroll_attempts + 1}회: 현재 리뷰 수 = {current_review_count}")
+            
+            if current_review_count == last_review_count:
+                # 더 이상 새로운 리뷰가 로드되지 않음
+                self.logger.info("더 이상 로드할 리뷰가 없음")
+                break
+                
+            last_review_count = current_review_count
+            
+            # 페이지 스크롤 (추가 리뷰가 렌더링되면 바로 진행)
+            async with expect_dom_change_async(page, ceiling_ms=2000):
+                await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
+            scroll_attempts += 1
+    
+    def _match_fingerprint(self, fingerprint: Dict[str, Any], review_info: Dict[str, Any]) -> bool:
+        """작성자 일치 + (작성일 일치 또는 내용 앞 30자 일치) - find_review_element와 같은 기준"""
+        if not fingerprint.get('author') or fingerprint['author'] != (review_info.get('review_name') or '').strip():
+            return False
+        if fingerprint.get('date') and self._match_date(fingerprint['date'], review_info.get('review_date')):
+            return True
+        content_text = fingerprint.get('content') or ''
+        review_content = (review_info.get('review_content') or '').strip()
+        return bool(review_content) and (
+            content_text[:30] == review_content[:30] or review_content[:30] in content_text
+        )
+    
+    async def index_reviews(self, page: Page, reviews: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        일괄 처리 리뷰 전체를 목록 한 번 로드로 찾기
+        
+        목록을 끝까지 로드한 뒤 리뷰 지문(작성자, 작성일, 내용)을 한 번에 추출해 대상 리뷰와 매칭하고,
+        찾은 요소에 review_id를 표시(find_review_element가 바로 사용)
+        
+        Returns:
+            {review_id: 목록 위치} - 찾지 못한 리뷰는 제외
+        """
+        await self._load_all_reviews(page)
+        fingerprints = await page.evaluate(EXTRACT_REVIEW_FINGERPRINTS_SCRIPT, REVIEW_ITEM_SELECTOR)
+        
+        positions: Dict[str, int] = {}
+        claimed = set()
+        for review in reviews:
+            review_id = review.get('review_id')
+            for fingerprint in fingerprints:
+                if fingerprint['position'] not in claimed and self._match_fingerprint(fingerprint, review):
+                    positions[review_id] = fingerprint['position']
+                    claimed.add(fingerprint['position'])
+                    break
+        
+        await page.evaluate(MARK_REVIEW_TARGETS_SCRIPT, {
+            'selector': REVIEW_ITEM_SELECTOR,
+            'attr': REPLY_TARGET_ATTR,
+            'targets': [[position, review_id] for review_id, position in positions.items()]
+        })
+        self.logger.info(f"리뷰 {len(fingerprints)}개 중 답글 대상 {len(positions)}/{len(reviews)}개 위치 확인")
+        return positions
+    
+    async def _find_marked_review(self, page: Page, key: str) -> Optional[Any]:
+        """index_reviews/find_review_element에서 표시한 리뷰 요소를 화면으로 스크롤해 반환"""
+        container = await page.query_selector(f'{REVIEW_ITEM_SELECTOR}[{REPLY_TARGET_ATTR}="{key}"]')
+        if container:
+            await container.scroll_into_view_if_needed()
+        return container
+    
     async def find_review_element(self, page: Page, review_info: Dict[str, Any]) -> Optional[Any]:
-        """특정 리뷰 요소 찾기"""
+        """특정 리뷰 요소 찾기 (index_reviews로 표시된 요소가 있으면 바로 사용)"""
         try:
             self.logger.info(f"=== 리뷰 찾기 시작 ===")
             self.logger.info(f"찾으려는 리뷰 정보:")
@@ -247,131 +357,39 @@ class NaverReplyManager:
             self.logger.info(f"  - 날짜: {review_info.get('review_date')}")
             self.logger.info(f"  - 내용: {review_info.get('review_content', '')[:50]}...")
             
-            # 스크롤하면서 모든 리뷰 로드
-            self.logger.info("리뷰 목록 스크롤 시작...")
-            last_review_count = 0
-            scroll_attempts = 0
-            max_scroll_attempts = 10
-            
-            while scroll_attempts < max_scroll_attempts:
-                # 현재 리뷰 개수 확인
-                review_containers = await page.query_selector_all('li.pui__X35jYm.Review_pui_review__zhZdn')
-                current_review_count = len(review_containers)
-                
-                self.logger.info(f"스크롤 {scroll_attempts + 1}회: 현재 리뷰 수 = {current_review_count}")
-                
-                if current_review_count == last_review_count:
-                    # 더 이상 새로운 리뷰가 로드되지 않음
-                    self.logger.info("더 이상 로드할 리뷰가 없음")
-                    break
-                    
-                last_review_count = current_review_count
-                
-                # 페이지 스크롤
-                await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                await page.wait_for_timeout(2000)
-                scroll_attempts += 1
-            
-            # 모든 리뷰 컨테이너 다시 가져오기
-            review_containers = await page.query_selector_all('li.pui__X35jYm.Review_pui_review__zhZdn')
+            review_id = review_info.get('review_id')
+            if review_id:
+                container = await self._find_marked_review(page, review_id)
+                if container:
+                    self.logger.info(f"  → 인덱싱된 리뷰 요소 사용: {review_id}")
+                    return container
             
-            self.logger.info(f"총 {len(review_containers)}개의 리뷰 컨테이너 발견")
+            await self._load_all_reviews(page)
             
-            # 현재 페이지의 모든 리뷰 정보 수집 (디버깅용)
-            page_reviews = []
+            # 리뷰 지문(작성자, 작성일, 내용)을 한 번에 추출해 매칭 (index_reviews와 같은 기준)
+            page_reviews = await page.evaluate(EXTRACT_REVIEW_FINGERPRINTS_SCRIPT, REVIEW_ITEM_SELECTOR)
+            self.logger.info(f"총 {len(page_reviews)}개의 리뷰 컨테이너 발견")
             
-            for idx, container in enumerate(review_containers):
-                try:
-                    # 작성자 확인
-                    author_elem = await container.query_selector('span.pui__NMi-Dp')
-                    if not author_elem:
-                        self.logger.debug(f"리뷰 {idx}: 작성자 요소 없음")
-                        continue
-                    
-                    author_text = await author_elem.inner_text()
-                    
-                    # 날짜 확인 - 작성일 기준
-                    date_text = ""
-                    date_containers = await container.query_selector_all('div.pui__4rEbt5')
-                    for date_container in date_containers:
-                        label = await date_container.query_selector('span.pui__ewpNGR')
-                        if label:
-                            label_text = await label.inner_text()
-                            if "작성일" in label_text:
-                                date_elem = await date_container.query_selector('time')
-                                if date_elem:
-                                    date_text = await date_elem.inner_text()
-                                    break
-                    
-                    # 내용 미리보기
-                    content_preview = ""
-                    content_elem = await container.query_selector('a.pui__xtsQN-')
-                    if content_elem:
-                        content_preview = (await content_elem.inner_text())[:50]
-                    
-                    # 이미지 존재 여부
-                    has_image = await container.query_selector('div.Review_img_slide_wrap__RaUKa')
-                    
-                    page_reviews.append({
-                        'idx': idx,
-                        'author': author_text,
-                        'date': date_text,
-                        'content': content_preview,
-                        'has_image': has_image is not None
-                    })
-                    
-                    self.logger.info(f"리뷰 {idx}: 작성자[{author_text}], 날짜[{date_text}], 이미지[{has_image is not None}], 내용[{content_preview}...]")
-                    
-                    # 작성자 매칭
-                    if author_text.strip() != review_info.get('review_name', '').strip():
-                        self.logger.debug(f"  → 작성자 불일치: '{author_text}' != '{review_info.get('review_name')}'")
-                        continue
-                    
-                    self.logger.info(f"  → 작성자 일치! 날짜 확인 중...")
-                    
-                    # 날짜 매칭
-                    if date_text:
-                        review_date = review_info.get('review_date')
-                        if self._match_date(date_text, review_date):
-                            self.logger.info(f"  → 날짜도 일치! 리뷰 찾음: {author_text} - {date_text}")
-                            
-                            # 리뷰를 화면 중앙으로 스크롤
-                            await container.scroll_into_view_if_needed()
-                            await asyncio.sleep(1)
-                            
-                            return container
-                        else:
-                            self.logger.debug(f"  → 날짜 불일치: '{date_text}' != '{review_date}'")
-                    
-                    # 날짜가 없거나 매칭되지 않으면 리뷰 내용으로도 확인
-                    if content_elem:
-                        content_text = await content_elem.inner_text()
-                        review_content = review_info.get('review_content', '')
-                        
-                        # 리뷰 내용의 처음 30자가 일치하면 같은 리뷰로 간주
-                        if review_content and (
-                            content_text.strip()[:30] == review_content.strip()[:30] or
-                            review_content.strip()[:30] in content_text.strip()
-                        ):
-                            self.logger.info(f"  → 내용 매칭으로 리뷰 찾음: {author_text}")
-                            
-                            # 리뷰를 화면 중앙으로 스크롤
-                            await container.scroll_into_view_if_needed()
-                            await asyncio.sleep(1)
-                            
-                            return container
-                        else:
-                            self.logger.debug(f"  → 내용도 불일치")
-                            
-                except Exception as e:
-                    self.logger.error(f"리뷰 {idx} 확인 중 오류: {str(e)}")
+            for fingerprint in page_reviews:
+                if not self._match_fingerprint(fingerprint, review_info):
                     continue
+                
+                self.logger.info(f"  → 리뷰 찾음: {fingerprint['author']} - {fingerprint['date']}")
+                key = review_id or f"position-{fingerprint['position']}"
+                await page.evaluate(MARK_REVIEW_TARGETS_SCRIPT, {
+                    'selector': REVIEW_ITEM_SELECTOR,
+                    'attr': REPLY_TARGET_ATTR,
+                    'targets': [[fingerprint['position'], key]]
+                })
+                container = await self._find_marked_review(page, key)
+                if container:
+                    return container
             
             # 리뷰를 찾지 못한 경우
             self.logger.error(f"=== 리뷰를 찾을 수 없음 ===")
             self.logger.error(f"현재 페이지의 모든 리뷰:")
-            for review in page_reviews:
-                self.logger.error(f"  - {review}")
+            for fingerprint in page_reviews:
+                self.logger.error(f"  - {fingerprint}")
             
             # 디버깅용 스크린샷
             screenshot_dir = os.path.join("logs", "screenshots", "naver", "reply_errors")
@@ -444,7 +462,6 @@ class NaverReplyManager:
             
             self.logger.info("답글쓰기 버튼 클릭")
             await reply_btn.click()
-            await asyncio.sleep(2)
             
             # 텍스트박스에 답글 입력
             self.logger.info("답글 입력창 찾는 중...")
@@ -489,7 +506,8 @@ class NaverReplyManager:
             success = False
             
             for i in range(15):
-                await asyncio.sleep(1)
+                # 입력창이 닫히면 바로 확인, 아니면 1초 후 다시 확인
+                await wait_for_selector_async(page, '#replyWrite', ceiling_ms=1000, state='hidden')
                 self.logger.debug(f"등록 확인 시도 {i+1}/15")
                 
                 # 1. 입력창이 사라졌는지 확인
@@ -497,7 +515,8 @@ class NaverReplyManager:
                     textarea_still_exists = await page.query_selector('#replyWrite')
                     if not textarea_still_exists:
                         self.logger.info("답글 입력창이 사라짐 - 등록 처리됨")
-                        await asyncio.sleep(2)  # 답글이 렌더링될 시간 대기
+                        # 답글이 렌더링될 때까지 대기
+                        await wait_for_selector_async(page, 'a[data-pui-click-code="rv.replyedit"]', ceiling_ms=2000)
                         success = True
                         break
                 except:
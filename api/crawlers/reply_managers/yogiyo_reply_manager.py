@@ -12,6 +12,10 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 
+from api.utils.page_waits import (
+    StepTimer, wait_for_selector_async, wait_for_url_async, expect_dom_change_async
+)
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -19,6 +23,35 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+STORE_ITEM_SELECTOR = 'li.List__Vendor-sc-2ocjy3-7'
+REVIEW_CONTAINER_SELECTOR = 'div.ReviewItem__Container-sc-1oxgj67-0'
+REPLY_TEXTAREA_SELECTOR = 'textarea[class*="ReviewReply__CustomTextarea"], textarea[placeholder="댓글을 입력해주세요."]'
+# 일괄 처리 인덱싱으로 찾은 리뷰 컨테이너에 붙이는 속성 (값: review_id)
+REPLY_TARGET_ATTR = 'data-reply-target'
+
+# 리뷰 목록 지문 추출 - 작성자, 내용, 별점 (find_review_and_click_reply와 같은 요소)
+EXTRACT_REVIEW_FINGERPRINTS_SCRIPT = """
+(selector) => Array.from(document.querySelectorAll(selector)).map((container, position) => {
+    const text = (el) => el ? (el.textContent || '') : null;
+    return {
+        position,
+        has_text: !!(container.textContent || '').trim(),
+        name: text(container.querySelector('h6')),
+        content: text(container.querySelector('p.ReviewItem__CommentTypography-sc-1oxgj67-3')),
+        rating: text(container.querySelector('h6.cknzqP'))
+    };
+})
+"""
+
+# 매칭된 리뷰 컨테이너에 review_id 표시 ([[position, review_id], ...])
+MARK_REVIEW_TARGETS_SCRIPT = """
+({selector, attr, targets}) => {
+    const items = document.querySelectorAll(selector);
+    for (const [position, key] of targets) {
+        if (items[position]) items[position].setAttribute(attr, key);
+    }
+}
+"""
 
 class YogiyoReplyManager:
     """
@@ -32,6 +65,7 @@ class YogiyoReplyManager:
         self.is_logged_in = False
         self.playwright = None
         self.logger = logging.getLogger(__name__)
+        self.timer = StepTimer('yogiyo_reply')
         
     async def __aenter__(self):
         await self.initialize()
@@ -107,7 +141,7 @@ class YogiyoReplyManager:
             
             # 로그인 페이지로 이동
             await self.page.goto(login_url, wait_until='networkidle')
-            await self.page.wait_for_timeout(2000)
+            await wait_for_selector_async(self.page, 'input[name="username"]', ceiling_ms=5000)
             logger.info("로그인 페이지 로드 완료")
             
             # 아이디 입력
@@ -122,8 +156,9 @@ class YogiyoReplyManager:
             await self.page.click('button[type="submit"]')
             logger.info("로그인 버튼 클릭")
             
-            # 인증 메일 팝업 처리를 위한 대기
-            await self.page.wait_for_timeout(3000)
+            # 로그인 페이지를 벗어나거나 인증 메일 팝업이 뜰 때까지 대기
+            if not await wait_for_url_async(self.page, lambda url: 'login' not in url, ceiling_ms=3000):
+                await wait_for_selector_async(self.page, 'div[class*="Alert"]', ceiling_ms=1000)
             
             # 인증 메일 팝업 처리
             try:
@@ -162,7 +197,7 @@ class YogiyoReplyManager:
                         if confirm_button:
                             await confirm_button.click()
                             logger.info("인증 메일 재발송 확인 버튼 클릭")
-                            await self.page.wait_for_timeout(2000)
+                            await wait_for_selector_async(self.page, 'div[class*="Alert"]:has-text("발송")', ceiling_ms=2000)
                             
                             # 두 번째 팝업 처리
                             second_popup = None
@@ -186,14 +221,14 @@ class YogiyoReplyManager:
                                     if second_confirm_button:
                                         await second_confirm_button.click()
                                         logger.info("인증 메일 발송 확인 버튼 클릭")
-                                        await self.page.wait_for_timeout(2000)
+                                        await wait_for_selector_async(self.page, 'div[class*="Alert"]', ceiling_ms=2000, state='hidden')
                                         
             except Exception as e:
                 logger.info(f"인증 메일 팝업 처리 중 예외 (무시): {str(e)}")
             
             # 로그인 완료 대기
             await self.page.wait_for_load_state("networkidle", timeout=10000)
-            await asyncio.sleep(3)
+            await wait_for_url_async(self.page, lambda url: 'login' not in url, ceiling_ms=3000)
             
             # 로그인 성공 확인
             current_url = self.page.url
@@ -226,34 +261,33 @@ class YogiyoReplyManager:
             logger.info(f"리뷰 URL: {review_url}")
             
             await self.page.goto(review_url, wait_until='networkidle', timeout=30000)
-            await asyncio.sleep(3)
             
             # 매장 선택 드롭다운 클릭
             store_selector_button = await self.page.query_selector('button.StoreSelector__DropdownButton-sc-1rowjsb-11')
             if store_selector_button:
                 await store_selector_button.click()
                 logger.info("매장 선택 드롭다운 열기")
-                await asyncio.sleep(2)
+                await wait_for_selector_async(self.page, STORE_ITEM_SELECTOR, ceiling_ms=3000)
                 
                 # 매장 목록에서 해당 매장 찾기
-                store_items = await self.page.query_selector_all('li.List__Vendor-sc-2ocjy3-7')
+                store_items = await self.page.query_selector_all(STORE_ITEM_SELECTOR)
                 for item in store_items:
                     store_id_elem = await item.query_selector('span.List__VendorID-sc-2ocjy3-1')
                     if store_id_elem:
                         store_id_text = await store_id_elem.text_content()
                         if platform_code in store_id_text:
-                            await item.click()
+                            async with expect_dom_change_async(self.page, ceiling_ms=5000):
+                                await item.click()
                             logger.info(f"매장 선택 완료: {platform_code}")
-                            await asyncio.sleep(2)
                             break
             
             # 미답변 탭 클릭
             try:
                 no_reply_tab = await self.page.wait_for_selector('li.InnerTab__TabItem-sc-14s9mjy-0:has-text("미답변")', timeout=5000)
                 if no_reply_tab:
-                    await no_reply_tab.click()
+                    async with expect_dom_change_async(self.page, ceiling_ms=5000):
+                        await no_reply_tab.click()
                     logger.info("미답변 탭 클릭 성공")
-                    await asyncio.sleep(2)
             except:
                 logger.warning("미답변 탭을 찾을 수 없음 - 계속 진행")
             
@@ -281,7 +315,6 @@ class YogiyoReplyManager:
                 review_url = "https://ceo.yogiyo.co.kr/reviews"
                 logger.info(f"리뷰 페이지로 이동: {review_url}")
                 await self.page.goto(review_url, wait_until='networkidle', timeout=30000)
-                await asyncio.sleep(2)
                 logger.info("리뷰 페이지 이동 완료")
             
             # 드롭다운을 통해 매장 선택
@@ -292,14 +325,14 @@ class YogiyoReplyManager:
             try:
                 await self.page.wait_for_selector(dropdown_selector, timeout=10000)
                 await self.page.click(dropdown_selector)
-                await asyncio.sleep(1)
+                await wait_for_selector_async(self.page, STORE_ITEM_SELECTOR, ceiling_ms=3000)
                 logger.info("드롭다운 열기 완료")
             except Exception as e:
                 logger.error(f"드롭다운 열기 실패: {str(e)}")
                 return False
             
             # 매장 목록에서 해당 매장 찾기
-            store_items = await self.page.query_selector_all('li.List__Vendor-sc-2ocjy3-7')
+            store_items = await self.page.query_selector_all(STORE_ITEM_SELECTOR)
             logger.info(f"{len(store_items)}개의 매장 발견")
             
             for item in store_items:
@@ -308,9 +341,9 @@ class YogiyoReplyManager:
                     if id_elem:
                         store_id_text = await id_elem.text_content()
                         if platform_code in store_id_text:
-                            await item.click()
+                            async with expect_dom_change_async(self.page, ceiling_ms=5000):
+                                await item.click()
                             logger.info(f"매장 선택 완료: {platform_code}")
-                            await asyncio.sleep(2)
                             break
                             
                 except Exception as e:
@@ -324,9 +357,9 @@ class YogiyoReplyManager:
             try:
                 no_reply_tab = await self.page.wait_for_selector('li.InnerTab__TabItem-sc-14s9mjy-0:has-text("미답변")', timeout=5000)
                 if no_reply_tab:
-                    await no_reply_tab.click()
+                    async with expect_dom_change_async(self.page, ceiling_ms=5000):
+                        await no_reply_tab.click()
                     logger.info("미답변 탭 클릭 성공")
-                    await asyncio.sleep(2)
             except:
                 logger.warning("미답변 탭을 찾을 수 없음 - 계속 진행")
             
@@ -365,97 +398,42 @@ class YogiyoReplyManager:
                 target_rating = 0
                 target_date = ""
             
-            # 페이지가 로드될 때까지 대기
-            await asyncio.sleep(3)
+            # index_reviews로 표시된 컨테이너가 있으면 바로 사용
+            container = await self.page.query_selector(f'{REVIEW_CONTAINER_SELECTOR}[{REPLY_TARGET_ATTR}="{review_id}"]')
+            if container:
+                logger.info(f"✅ 인덱싱된 리뷰 컨테이너 사용: {review_id}")
+                return await self._click_reply_in_container(container)
+            
+            # 리뷰 목록이 렌더링될 때까지 대기
+            await wait_for_selector_async(self.page, REVIEW_CONTAINER_SELECTOR, ceiling_ms=5000)
             
             # 여러 번 시도
             max_attempts = 3
             for attempt in range(max_attempts):
                 logger.info(f"리뷰 검색 시도 {attempt + 1}/{max_attempts}")
                 
-                # 리뷰 컨테이너 찾기
-                review_containers = await self.page.query_selector_all('div.ReviewItem__Container-sc-1oxgj67-0')
+                fingerprints = await self.page.evaluate(EXTRACT_REVIEW_FINGERPRINTS_SCRIPT, REVIEW_CONTAINER_SELECTOR)
+                logger.info(f"{len(fingerprints)}개의 리뷰 컨테이너 발견")
                 
-                logger.info(f"{len(review_containers)}개의 리뷰 컨테이너 발견")
-                
-                # 각 리뷰 컨테이너 검사
-                for i, container in enumerate(review_containers):
-                    try:
-                        # 컨테이너의 전체 텍스트 가져오기
-                        container_text = await container.text_content()
-                        if not container_text:
-                            continue
-                        
-                        # 매칭 점수 계산
-                        match_score = 0
-                        match_details = []
-                        
-                        # 1. 작성자 이름 매칭
-                        name_elem = await container.query_selector('h6')
-                        if name_elem and target_name:
-                            name_text = await name_elem.text_content()
-                            if target_name in name_text:
-                                match_score += 2
-                                match_details.append(f"이름 매칭: {target_name}")
-                        
-                        # 2. 리뷰 내용 매칭
-                        content_elem = await container.query_selector('p.ReviewItem__CommentTypography-sc-1oxgj67-3')
-                        if content_elem and target_content:
-                            content_text = await content_elem.text_content()
-                            clean_target = ''.join(target_content.split())
-                            clean_content = ''.join(content_text.split())
-                            
-                            if clean_target in clean_content:
-                                match_score += 3
-                                match_details.append("내용 매칭")
-                        
-                        # 3. 별점 매칭
-                        if target_rating:
-                            rating_elem = await container.query_selector('h6.cknzqP')
-                            if rating_elem:
-                                rating_text = await rating_elem.text_content()
-                                if str(target_rating) in rating_text:
-                                    match_score += 1
-                                    match_details.append(f"별점 매칭: {target_rating}")
-                        
-                        # 매칭 점수 확인 (3점 이상이면 해당 리뷰로 판단)
-                        if match_score >= 3:
-                            logger.info(f"✅ 리뷰 매칭 성공! 점수: {match_score}, 상세: {', '.join(match_details)}")
-                            
-                            # 답글 버튼 찾기 (요기요는 '댓글쓰기' 버튼)
-                            reply_button = await container.query_selector('button:has-text("댓글쓰기")')
-                            if not reply_button:
-                                reply_button = await container.query_selector('button.sc-bczRLJ.ifUnxI.sc-eCYdqJ.ReviewReply__AddReplyButton-sc-1536a88-9.hsiXYt.fSnQUl')
-                            if not reply_button:
-                                reply_button = await container.query_selector('button[class*="ReviewReply__AddReplyButton"]')
-                            
-                            if reply_button:
-                                # 버튼이 보이도록 스크롤
-                                await reply_button.scroll_into_view_if_needed()
-                                await asyncio.sleep(1)
-                                
-                                # 버튼 클릭
-                                await reply_button.click()
-                                logger.info("답글 버튼 클릭 성공")
-                                await asyncio.sleep(2)
-                                return True
-                            else:
-                                logger.warning("답글 버튼을 찾을 수 없음 - 오래된 리뷰로 추정")
-                                return "OLD_REVIEW"
-                        
-                        # 매칭 점수가 낮지만 일부 일치하는 경우 로깅
-                        elif match_score > 0:
-                            logger.debug(f"부분 매칭 - 점수: {match_score}, 상세: {', '.join(match_details)}")
-                            
-                    except Exception as e:
-                        logger.error(f"리뷰 컨테이너 {i+1} 처리 중 에러: {str(e)}")
-                        continue
+                for fingerprint in fingerprints:
+                    match_score, match_details = self._score_fingerprint(fingerprint, review_info or {})
+                    
+                    # 매칭 점수 확인 (3점 이상이면 해당 리뷰로 판단)
+                    if match_score >= 3:
+                        logger.info(f"✅ 리뷰 매칭 성공! 점수: {match_score}, 상세: {', '.join(match_details)}")
+                        review_containers = await self.page.query_selector_all(REVIEW_CONTAINER_SELECTOR)
+                        if fingerprint['position'] < len(review_containers):
+                            return await self._click_reply_in_container(review_containers[fingerprint['position']])
+                    
+                    # 매칭 점수가 낮지만 일부 일치하는 경우 로깅
+                    elif match_score > 0:
+                        logger.debug(f"부분 매칭 - 점수: {match_score}, 상세: {', '.join(match_details)}")
                 
                 # 못 찾았으면 스크롤 후 재시도
                 if attempt < max_attempts - 1:
                     logger.info("리뷰를 찾지 못함, 스크롤 후 재시도")
-                    await self.page.evaluate("window.scrollBy(0, 500)")
-                    await asyncio.sleep(2)
+                    async with expect_dom_change_async(self.page, ceiling_ms=2000):
+                        await self.page.evaluate("window.scrollBy(0, 500)")
             
             # 모든 시도 실패
             logger.error("리뷰를 찾을 수 없음")
@@ -464,6 +442,102 @@ class YogiyoReplyManager:
         except Exception as e:
             logger.error(f"리뷰 검색 중 오류: {str(e)}")
             return False
+    
+    def _score_fingerprint(self, fingerprint: Dict[str, Any], review_info: dict) -> Tuple[int, list]:
+        """리뷰 지문 매칭 점수 (이름 2점, 내용 3점, 별점 1점 - 3점 이상이면 같은 리뷰)"""
+        match_score = 0
+        match_details = []
+        if not fingerprint.get('has_text'):
+            return match_score, match_details
+        
+        target_name = review_info.get('review_name') or ''
+        target_content = review_info.get('review_content') or ''
+        target_rating = review_info.get('rating') or 0
+        
+        # 1. 작성자 이름 매칭
+        if fingerprint.get('name') is not None and target_name and target_name in fingerprint['name']:
+            match_score += 2
+            match_details.append(f"이름 매칭: {target_name}")
+        
+        # 2. 리뷰 내용 매칭
+        if fingerprint.get('content') is not None and target_content:
+            if ''.join(target_content.split()) in ''.join(fingerprint['content'].split()):
+                match_score += 3
+                match_details.append("내용 매칭")
+        
+        # 3. 별점 매칭
+        if target_rating and fingerprint.get('rating') is not None and str(target_rating) in fingerprint['rating']:
+            match_score += 1
+            match_details.append(f"별점 매칭: {target_rating}")
+        
+        return match_score, match_details
+    
+    async def _click_reply_in_container(self, container):
+        """리뷰 컨테이너의 답글 버튼 클릭 (버튼이 없으면 오래된 리뷰)"""
+        # 답글 버튼 찾기 (요기요는 '댓글쓰기' 버튼)
+        reply_button = await container.query_selector('button:has-text("댓글쓰기")')
+        if not reply_button:
+            reply_button = await container.query_selector('button.sc-bczRLJ.ifUnxI.sc-eCYdqJ.ReviewReply__AddReplyButton-sc-1536a88-9.hsiXYt.fSnQUl')
+        if not reply_button:
+            reply_button = await container.query_selector('button[class*="ReviewReply__AddReplyButton"]')
+        
+        if not reply_button:
+            logger.warning("답글 버튼을 찾을 수 없음 - 오래된 리뷰로 추정")
+            return "OLD_REVIEW"
+        
+        # 버튼이 보이도록 스크롤
+        await reply_button.scroll_into_view_if_needed()
+        await reply_button.click()
+        logger.info("답글 버튼 클릭 성공")
+        await wait_for_selector_async(self.page, REPLY_TEXTAREA_SELECTOR, ceiling_ms=3000)
+        return True
+    
+    async def index_reviews(self, reviews: list) -> Dict[str, int]:
+        """
+        일괄 처리 리뷰 전체를 목록 한 번 훑기로 찾기
+        
+        현재 렌더링된 리뷰 지문(이름, 내용, 별점)을 한 번에 추출해 아직 못 찾은 대상과 매칭하고,
+        모두 찾거나 목록이 더 늘지 않을 때까지만 스크롤. 찾은 컨테이너에 review_id를 표시
+        (find_review_and_click_reply가 바로 사용)
+        
+        Returns:
+            {review_id: 목록 위치} - 찾지 못한 리뷰는 제외
+        """
+        await wait_for_selector_async(self.page, REVIEW_CONTAINER_SELECTOR, ceiling_ms=5000)
+        
+        positions: Dict[str, int] = {}
+        last_count = -1
+        for _ in range(10):
+            fingerprints = await self.page.evaluate(EXTRACT_REVIEW_FINGERPRINTS_SCRIPT, REVIEW_CONTAINER_SELECTOR)
+            claimed = set(positions.values())
+            new_targets = []
+            for review in reviews:
+                review_id = review.get('review_id')
+                if review_id in positions:
+                    continue
+                for fingerprint in fingerprints:
+                    if fingerprint['position'] not in claimed and self._score_fingerprint(fingerprint, review)[0] >= 3:
+                        positions[review_id] = fingerprint['position']
+                        claimed.add(fingerprint['position'])
+                        new_targets.append([fingerprint['position'], review_id])
+                        break
+            
+            # 스크롤 중 목록이 다시 렌더링될 수 있으므로 찾은 즉시 표시
+            if new_targets:
+                await self.page.evaluate(MARK_REVIEW_TARGETS_SCRIPT, {
+                    'selector': REVIEW_CONTAINER_SELECTOR,
+                    'attr': REPLY_TARGET_ATTR,
+                    'targets': new_targets
+                })
+            
+            if len(positions) == len(reviews) or len(fingerprints) == last_count:
+                break
+            last_count = len(fingerprints)
+            async with expect_dom_change_async(self.page, ceiling_ms=2000):
+                await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        
+        logger.info(f"답글 대상 {len(positions)}/{len(reviews)}개 위치 확인")
+        return positions
             
     async def find_review_and_open_reply(self, review_id: str, review_info: dict = None) -> bool:
         """특정 리뷰를 찾고 답글 모드 열기"""
@@ -487,8 +561,8 @@ class YogiyoReplyManager:
                 target_rating = 0
                 target_date = ""
             
-            # 페이지가 로드될 때까지 대기
-            await asyncio.sleep(3)
+            # 리뷰 목록이 렌더링될 때까지 대기
+            await wait_for_selector_async(self.page, REVIEW_CONTAINER_SELECTOR, ceiling_ms=5000)
             
             # 여러 번 시도
             max_attempts = 3
@@ -496,7 +570,7 @@ class YogiyoReplyManager:
                 logger.info(f"리뷰 검색 시도 {attempt + 1}/{max_attempts}")
                 
                 # 리뷰 컨테이너 찾기
-                review_containers = await self.page.query_selector_all('div.ReviewItem__Container-sc-1oxgj67-0')
+                review_containers = await self.page.query_selector_all(REVIEW_CONTAINER_SELECTOR)
                 
                 logger.info(f"{len(review_containers)}개의 리뷰 컨테이너 발견")
                 
@@ -570,7 +644,7 @@ class YogiyoReplyManager:
                                 # 버튼 클릭
                                 await reply_button.click()
                                 logger.info("답글 버튼 클릭 성공")
-                                await asyncio.sleep(2)
+                                await wait_for_selector_async(self.page, REPLY_TEXTAREA_SELECTOR, ceiling_ms=3000)
                                 return True
                             else:
                                 logger.error("답글 버튼을 찾을 수 없음")
@@ -586,8 +660,8 @@ class YogiyoReplyManager:
                 # 못 찾았으면 스크롤
                 if attempt < max_attempts - 1:
                     logger.info("리뷰를 찾지 못함, 스크롤 후 재시도")
-                    await self.page.evaluate("window.scrollBy(0, 500)")
-                    await asyncio.sleep(2)
+                    async with expect_dom_change_async(self.page, ceiling_ms=2000):
+                        await self.page.evaluate("window.scrollBy(0, 500)")
             
             # 모든 시도 실패
             logger.error("리뷰를 찾을 수 없음")
@@ -603,7 +677,7 @@ class YogiyoReplyManager:
             logger.info(f"답글 작성 시작: {reply_content[:50]}...")
             
             # 텍스트박스가 나타날 때까지 대기
-            await asyncio.sleep(2)
+            await wait_for_selector_async(self.page, REPLY_TEXTAREA_SELECTOR, ceiling_ms=3000)
             
             # 텍스트박스 찾기 (요기요 전용 셀렉터)
             textarea_selectors = [
@@ -665,8 +739,8 @@ class YogiyoReplyManager:
             await register_button.click()
             logger.info("등록 버튼 클릭 완료")
             
-            # 등록 완료 대기
-            await asyncio.sleep(3)
+            # 등록 완료 대기 (입력창이 닫히면 완료)
+            await wait_for_selector_async(self.page, REPLY_TEXTAREA_SELECTOR, ceiling_ms=5000, state='hidden')
             
             # 성공 확인
             logger.info("답글 등록 프로세스 완료")
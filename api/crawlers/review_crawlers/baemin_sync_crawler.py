@@ -10,8 +10,14 @@ from datetime import datetime
 from pathlib import Path
 from playwright.sync_api import sync_playwright, Page, Browser, Playwright, BrowserContext
 
+from api.utils.page_waits import StepTimer, wait_for_selector, wait_for_url, expect_dom_change
+from api.services.session_store import get_session_store, restore_session_sync, save_session_sync
+
 logger = logging.getLogger(__name__)
 
+# '보지 않기' 팝업 버튼 (팝업이 뜨는지 확인용)
+DONT_SHOW_POPUP_SELECTOR = 'text=/보지 않기/'
+
 class BaeminSyncCrawler:
     """배달의민족 동기식 크롤러"""
     
@@ -24,13 +30,14 @@ class BaeminSyncCrawler:
         self.logged_in = False
         self.login_url = "https://biz-member.baemin.com/login"
         self.self_service_url = "https://self.baemin.com"
+        self.timer = StepTimer('baemin')
         
         # 스크린샷 저장 경로
         self.screenshot_dir = Path("C:/Review_playwright/logs/screenshots/baemin")
         self.screenshot_dir.mkdir(parents=True, exist_ok=True)
         
-    def start_browser(self):
-        """브라우저 시작"""
+    def start_browser(self, cdp_endpoint: Optional[str] = None):
+        """브라우저 시작 (cdp_endpoint가 있으면 브라우저 풀의 Chromium에 연결)"""
         try:
             logger.info("배민 브라우저 시작 중...")
             logger.info(f"Headless 모드: {self.headless}")
@@ -57,36 +64,27 @@ class BaeminSyncCrawler:
                 ]
             }
             
-            # 브라우저 시작
+            # 브라우저 시작 (풀 사용 시 이미 떠 있는 Chromium에 연결)
             try:
-                self.browser = self.playwright.chromium.launch(**launch_options)
-                logger.info("브라우저 런치 성공")
+                if cdp_endpoint:
+                    self.browser = self.playwright.chromium.connect_over_cdp(cdp_endpoint)
+                    logger.info(f"브라우저 풀 연결 성공: {cdp_endpoint}")
+                else:
+                    self.browser = self.playwright.chromium.launch(**launch_options)
+                    logger.info("브라우저 런치 성공")
             except Exception as e:
                 logger.error(f"브라우저 런치 실패: {str(e)}")
                 logger.error(f"브라우저 실행 파일 경로 문제일 수 있습니다.")
                 raise
             
-            # 컨텍스트 생성
+            # 컨텍스트 및 페이지 생성
             try:
-                self.context = self.browser.new_context(
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                    viewport={'width': 1920, 'height': 1080},
-                    ignore_https_errors=True  # 추가
-                )
-                logger.info("브라우저 컨텍스트 생성 성공")
+                self._open_context()
+                logger.info("브라우저 컨텍스트/페이지 생성 성공")
             except Exception as e:
                 logger.error(f"컨텍스트 생성 실패: {str(e)}")
                 raise
             
-            # 페이지 생성
-            try:
-                self.page = self.context.new_page()
-                self.page.set_default_timeout(30000)
-                logger.info("페이지 생성 성공")
-            except Exception as e:
-                logger.error(f"페이지 생성 실패: {str(e)}")
-                raise
-            
             logger.info("브라우저 시작 성공")
             
         except Exception as e:
@@ -96,6 +94,23 @@ class BaeminSyncCrawler:
             logger.error(f"스택 트레이스:\n{traceback.format_exc()}")
             self.close_browser()
             raise
+    
+    def _open_context(self, storage_state: Optional[Dict[str, Any]] = None):
+        """컨텍스트/페이지 (재)생성 - storage_state가 있으면 저장된 세션 복원"""
+        if self.page:
+            self.page.close()
+        if self.context:
+            self.context.close()
+        
+        self.context = self.browser.new_context(
+            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            viewport={'width': 1920, 'height': 1080},
+            ignore_https_errors=True,
+            storage_state=storage_state
+        )
+        
+        self.page = self.context.new_page()
+        self.page.set_default_timeout(30000)
             
     def close_browser(self):
         """브라우저 종료"""
@@ -133,6 +148,15 @@ class BaeminSyncCrawler:
         try:
             logger.info(f"배민 로그인 시작: {username}")
             
+            # 저장된 세션이 살아있으면 로그인 생략
+            saved_state = get_session_store().load('baemin', username)
+            if saved_state:
+                self._open_context(saved_state)
+                if restore_session_sync(self.page, 'baemin', username):
+                    self.logged_in = True
+                    logger.info("배민 저장된 세션 재사용 - 로그인 생략")
+                    return True
+            
             # 로그인 페이지로 이동
             self.page.goto(self.login_url)
             self.page.wait_for_load_state('networkidle')
@@ -149,9 +173,9 @@ class BaeminSyncCrawler:
             self.page.click('button[type="submit"]')
             logger.info("로그인 버튼 클릭")
             
-            # 로그인 처리를 위해 충분한 시간 대기
+            # 로그인 처리 대기 (로그인 페이지를 벗어나면 바로 진행)
             logger.info("로그인 처리 대기 중...")
-            self.page.wait_for_timeout(5000)  # 5초 대기
+            wait_for_url(self.page, lambda url: 'login' not in url.lower(), ceiling_ms=10000)
             
             # 현재 URL 확인
             current_url = self.page.url
@@ -161,6 +185,7 @@ class BaeminSyncCrawler:
             if 'login' not in current_url.lower():
                 logger.info("로그인 페이지를 벗어남 - 로그인 성공")
                 self.logged_in = True
+                save_session_sync(self.context, 'baemin', username)
                 return True
             else:
                 logger.error("여전히 로그인 페이지에 있음 - 로그인 실패")
@@ -174,8 +199,8 @@ class BaeminSyncCrawler:
     def close_popup(self):
         """팝업 닫기 - 다양한 기간의 '보지 않기' 옵션 처리"""
         try:
-            # 팝업이 나타날 때까지 잠시 대기
-            self.page.wait_for_timeout(2000)
+            # 팝업이 나타날 때까지 잠시 대기 (없으면 상한 후 진행)
+            wait_for_selector(self.page, DONT_SHOW_POPUP_SELECTOR, ceiling_ms=2000)
             
             # 다양한 기간의 "보지 않기" 버튼 선택자
             popup_close_selectors = [
@@ -226,7 +251,7 @@ class BaeminSyncCrawler:
                     if self.page.is_visible(selector):
                         self.page.click(selector)
                         logger.info(f"팝업을 닫았습니다: {period} 보지 않기")
-                        self.page.wait_for_timeout(1000)
+                        wait_for_selector(self.page, selector, ceiling_ms=1000, state='hidden')
                         return
                 except:
                     continue
@@ -241,7 +266,7 @@ class BaeminSyncCrawler:
                             text_content = element.text_content()
                             self.page.click(selector)
                             logger.info(f"팝업을 닫았습니다: {text_content}")
-                            self.page.wait_for_timeout(1000)
+                            wait_for_selector(self.page, selector, ceiling_ms=1000, state='hidden')
                             return
                 except:
                     continue
@@ -263,7 +288,7 @@ class BaeminSyncCrawler:
                                 text_content = element.text_content()
                                 element.click()
                                 logger.info(f"팝업을 닫았습니다: {text_content}")
-                                self.page.wait_for_timeout(1000)
+                                wait_for_selector(self.page, DONT_SHOW_POPUP_SELECTOR, ceiling_ms=1000, state='hidden')
                                 return
                         except:
                             continue
@@ -282,8 +307,6 @@ class BaeminSyncCrawler:
             self.close_popup()
             
             # 추가적인 팝업 처리 (닫기, 확인 등)
-            self.page.wait_for_timeout(1000)
-            
             # 다양한 팝업 닫기 버튼 선택자
             popup_close_selectors = [
                 'button:has-text("닫기")',
@@ -308,7 +331,7 @@ class BaeminSyncCrawler:
                             element.click()
                             closed_count += 1
                             logger.info(f"추가 팝업 닫기: {selector}")
-                            self.page.wait_for_timeout(500)
+                            wait_for_selector(self.page, selector, ceiling_ms=500, state='hidden')
                 except:
                     continue
             
@@ -332,10 +355,7 @@ class BaeminSyncCrawler:
             self.page.goto(self.self_service_url)
             self.page.wait_for_load_state('networkidle')
             
-            # 페이지 로드 대기
-            self.page.wait_for_timeout(3000)
-            
-            # 팝업 닫기
+            # 팝업 닫기 (팝업이 뜰 때까지 기다림)
             self.close_popup()
 
             stores = []
@@ -502,9 +522,9 @@ class BaeminSyncCrawler:
             # 셀프서비스 페이지에서 매장 선택
             select_element = self.page.query_selector('select')
             if select_element:
-                select_element.select_option(platform_code)
+                with expect_dom_change(self.page, ceiling_ms=3000):
+                    select_element.select_option(platform_code)
                 logger.info(f"매장 {platform_code} 선택 완료")
-                self.page.wait_for_timeout(2000)  # 페이지 로드 대기
                 return True
             else:
                 logger.error("매장 선택 select 요소를 찾을 수 없습니다")
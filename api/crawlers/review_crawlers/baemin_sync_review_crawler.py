@@ -10,9 +10,10 @@ if sys.platform == 'win32':
 
 import re
 import json
+import time
 import logging
 import hashlib
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable
 from datetime import datetime
 from pathlib import Path
 from playwright.sync_api import sync_playwright, Page
@@ -22,7 +23,9 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 # 절대 경로로 import
-from .baemin_sync_crawler import BaeminSyncCrawler
+from .baemin_sync_crawler import BaeminSyncCrawler, DONT_SHOW_POPUP_SELECTOR
+from api.services.review_id_index import find_known_review_ids
+from api.utils.page_waits import wait_for_selector, expect_response
 
 logger = logging.getLogger(__name__)
 
@@ -40,8 +43,8 @@ class BaeminSyncReviewCrawler(BaeminSyncCrawler):
     def close_popup(self):
         """팝업 닫기 - 다양한 기간의 '보지 않기' 옵션 처리"""
         try:
-            # 팝업이 나타날 때까지 잠시 대기
-            self.page.wait_for_timeout(2000)
+            # 팝업이 나타날 때까지 잠시 대기 (없으면 상한 후 진행)
+            wait_for_selector(self.page, DONT_SHOW_POPUP_SELECTOR, ceiling_ms=2000)
             
             # 우선순위: 더 긴 기간의 "보지 않기" 버튼을 먼저 찾아서 클릭
             priority_selectors = [
@@ -64,7 +67,7 @@ class BaeminSyncReviewCrawler(BaeminSyncCrawler):
                     if self.page.is_visible(selector):
                         self.page.click(selector)
                         logger.info(f"팝업을 닫았습니다: {period} 보지 않기")
-                        self.page.wait_for_timeout(1000)
+                        wait_for_selector(self.page, selector, ceiling_ms=1000, state='hidden')
                         return True
                 except:
                     continue
@@ -84,7 +87,7 @@ class BaeminSyncReviewCrawler(BaeminSyncCrawler):
                                 text_content = element.text_content()
                                 element.click()
                                 logger.info(f"팝업을 닫았습니다: {text_content}")
-                                self.page.wait_for_timeout(1000)
+                                wait_for_selector(self.page, DONT_SHOW_POPUP_SELECTOR, ceiling_ms=1000, state='hidden')
                                 return True
                         except:
                             continue
@@ -105,8 +108,6 @@ class BaeminSyncReviewCrawler(BaeminSyncCrawler):
             self.close_popup()
             
             # 추가적인 팝업 처리 (닫기, 확인 등)
-            self.page.wait_for_timeout(1000)
-            
             # 다양한 팝업 닫기 버튼 선택자
             popup_close_selectors = [
                 'button:has-text("닫기")',
@@ -130,7 +131,7 @@ class BaeminSyncReviewCrawler(BaeminSyncCrawler):
                             element.click()
                             closed_count += 1
                             logger.info(f"추가 팝업 닫기: {selector}")
-                            self.page.wait_for_timeout(500)
+                            wait_for_selector(self.page, selector, ceiling_ms=500, state='hidden')
                 except:
                     continue
             
@@ -158,9 +159,6 @@ class BaeminSyncReviewCrawler(BaeminSyncCrawler):
             logger.info("networkidle 대기 중...")
             self.page.wait_for_load_state('networkidle')
             
-            logger.info("3초 추가 대기...")
-            self.page.wait_for_timeout(3000)
-            
             # 팝업 처리 추가
             logger.info("========== 팝업 처리 시작 ==========")
             self.handle_popups()
@@ -187,7 +185,6 @@ class BaeminSyncReviewCrawler(BaeminSyncCrawler):
                 logger.warning("⚠️ 리뷰 페이지가 아닙니다. 다시 이동 시도...")
                 self.page.goto(review_url)
                 self.page.wait_for_load_state('networkidle')
-                self.page.wait_for_timeout(2000)
                 logger.info(f"재이동 후 URL: {self.page.url}")
             
             # 미답변 탭 클릭 시도
@@ -206,7 +203,9 @@ class BaeminSyncReviewCrawler(BaeminSyncCrawler):
                     logger.info(f"선택자 시도: {selector}")
                     try:
                         if self.page.is_visible(selector):
-                            self.page.click(selector)
+                            # 미답변 리뷰 API 응답까지 대기
+                            with expect_response(self.page, f"/shops/{platform_code}/reviews", ceiling_ms=5000):
+                                self.page.click(selector)
                             logger.info(f"미답변 탭 클릭 성공: {selector}")
                             clicked = True
                             break
@@ -215,10 +214,7 @@ class BaeminSyncReviewCrawler(BaeminSyncCrawler):
                     except Exception as e:
                         logger.info(f"❌ {selector} - 에러: {e}")
                 
-                if clicked:
-                    logger.info("2초 대기 중...")
-                    self.page.wait_for_timeout(2000)
-                else:
+                if not clicked:
                     logger.warning("⚠️ 미답변 탭을 찾을 수 없습니다.")
                     
                     # 모든 버튼 찾아보기
@@ -267,8 +263,15 @@ class BaeminSyncReviewCrawler(BaeminSyncCrawler):
         # 예: "baemin_2025060801238589"
         return f"{platform}_{original_id}"
 
-    def get_reviews(self, platform_code: str, store_code: str, limit: int = 50) -> List[Dict[str, Any]]:
-        """리뷰 목록 가져오기 (네트워크 응답 가로채기 방식)"""
+    def get_reviews(self, platform_code: str, store_code: str, limit: int = 50,
+                    known_review_ids: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        리뷰 목록 가져오기 (네트워크 응답 가로채기 방식)
+
+        Args:
+            known_review_ids: 이전 수집 워터마크의 리뷰 ID (최신순 API 목록에서 만나면 이후 리뷰 파싱 생략)
+        """
+        known_review_ids = set(known_review_ids or [])
         try:
             logger.info(f"========== 리뷰 수집 시작 ==========")
             logger.info(f"매장 코드: {platform_code}")
@@ -300,10 +303,25 @@ class BaeminSyncReviewCrawler(BaeminSyncCrawler):
                                 # collected_reviews 초기화 (이전 수집 내용 제거)
                                 collected_reviews.clear()
                                 
+                                # 이미 저장된 리뷰는 파싱 전에 제외 (리뷰 ID 인덱스, Bloom 필터 후보만 DB 확인)
+                                stored_ids = find_known_review_ids('baemin', platform_code, [
+                                    self.generate_review_id('baemin', str(review.get("id", "")))
+                                    for review in data["reviews"][:limit]
+                                ])
+                                
                                 for idx, review in enumerate(data["reviews"][:limit]):
                                     try:
                                         # 원본 ID에서 날짜 추출
                                         original_id = str(review.get("id", ""))
+                                        
+                                        # 워터마크 도달: 이후 리뷰는 이미 수집된 리뷰
+                                        if self.generate_review_id('baemin', original_id) in known_review_ids:
+                                            logger.info(f"이전 수집 지점 도달 ({original_id}) - 이후 {len(data['reviews'][:limit]) - idx}개 리뷰 생략")
+                                            break
+                                        
+                                        if self.generate_review_id('baemin', original_id) in stored_ids:
+                                            continue
+                                        
                                         if len(original_id) >= 8:
                                             date_str = original_id[:8]  # "20250608"
                                             review_date = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
@@ -380,19 +398,22 @@ class BaeminSyncReviewCrawler(BaeminSyncCrawler):
             
             try:
                 # 리뷰 페이지로 이동 (API 호출 트리거)
-                if not self.navigate_to_reviews(platform_code):
+                with self.timer.step('navigate'):
+                    navigated = self.navigate_to_reviews(platform_code)
+                if not navigated:
                     logger.error("리뷰 페이지 이동 실패")
                     return []
                 
-                # API 응답 대기 (최대 10초)
-                wait_time = 0
-                while not api_response_received and wait_time < 10:
-                    self.page.wait_for_timeout(1000)
-                    wait_time += 1
+                # API 응답 대기 (최대 10초, 응답 핸들러가 실행되도록 짧게 나눠 대기)
+                with self.timer.step('api_response'):
+                    deadline = time.monotonic() + 10
+                    while not api_response_received and time.monotonic() < deadline:
+                        self.page.wait_for_timeout(100)
                     
                 if not api_response_received:
                     logger.warning("미답변 API 응답을 받지 못했습니다. DOM 파싱으로 대체합니다.")
-                    return self._get_reviews_by_dom_parsing(platform_code, store_code, limit)
+                    with self.timer.step('dom_parsing'):
+                        return self._get_reviews_by_dom_parsing(platform_code, store_code, limit)
                 
                 logger.info(f"\n========== 총 {len(collected_reviews)}개의 미답변 리뷰 수집 완료 ==========")
                 
@@ -513,7 +534,7 @@ class BaeminSyncReviewCrawler(BaeminSyncCrawler):
             # 버튼 클릭
             reply_button.click()
             logger.info("답글 등록 버튼 클릭")
-            self.page.wait_for_timeout(1000)
+            wait_for_selector(self.page, 'textarea', ceiling_ms=3000)
             
             # 텍스트 입력 영역 찾기
             textarea = self.page.query_selector('textarea[placeholder*="댓글"]')
@@ -541,8 +562,8 @@ class BaeminSyncReviewCrawler(BaeminSyncCrawler):
             submit_button.click()
             logger.info("답글 등록 버튼 클릭")
             
-            # 등록 완료 대기
-            self.page.wait_for_timeout(3000)
+            # 등록 완료 대기 (입력창이 닫히면 완료)
+            wait_for_selector(self.page, 'textarea', ceiling_ms=5000, state='hidden')
             
             return True
             
@@ -12,7 +12,7 @@ import re
 import json
 import logging
 import hashlib
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable
 from datetime import datetime, timedelta
 from pathlib import Path
 from playwright.sync_api import sync_playwright, Page
@@ -34,8 +34,64 @@ except ImportError:
     sys.path.append(root_path)
     from config.supabase_client import get_supabase_client
 
+from api.services.review_ingest import ingest_reviews, watermark_from_reviews
+from api.services.review_id_index import find_known_review_ids
+from api.services.session_store import get_session_store, restore_session_sync, save_session_sync
+from api.utils.page_waits import StepTimer, wait_for_selector, wait_for_url, expect_dom_change
+
 logger = logging.getLogger(__name__)
 
+# 리뷰 목록 테이블 (매장/기간/탭/페이지 변경 시 이 영역의 DOM 변경을 기다림)
+REVIEW_TABLE_SELECTOR = 'table'
+
+# 팝업 닫기 버튼 (팝업이 뜨는지 확인용)
+POPUP_CLOSE_CSS = ('button[data-testid="Dialog__CloseButton"], .dialog-modal-wrapper__body--close-button, '
+                   '[aria-label="Close"], [aria-label="닫기"], .close-button, .popup-close, button.close')
+
+# 리뷰 테이블 전체 행 추출 (행/필드마다 query_selector 왕복하지 않도록 브라우저에서 한 번에)
+# - 행: td.eqn7l9b0 를 가진 tr
+# - 별점: 상세 영역(td.eqn7l9b9, 없으면 행 전체)에서 svg가 정확히 5개인 첫 div의 금색(#FFC400) path 수
+# - 주문메뉴/주문번호: 해당 strong 라벨이 있는 li 의 p
+EXTRACT_REVIEW_ROWS_SCRIPT = """
+() => {
+    const text = (root, selector) => {
+        const el = root.querySelector(selector);
+        return el ? el.textContent : '';
+    };
+    const labeled = (row, label) => {
+        for (const li of row.querySelectorAll('li')) {
+            const strong = li.querySelector('strong');
+            if (strong && strong.textContent.includes(label)) {
+                const p = li.querySelector('p');
+                return p ? p.textContent : '';
+            }
+        }
+        return '';
+    };
+    const goldStars = (row) => {
+        const area = row.querySelector('td.eqn7l9b9') || row;
+        for (const div of area.querySelectorAll('div')) {
+            if (div.querySelectorAll('svg').length === 5) {
+                return div.querySelectorAll('path[fill="#FFC400"]').length;
+            }
+        }
+        return null;
+    };
+    return Array.from(document.querySelectorAll('tr'))
+        .filter(tr => tr.querySelector('td.eqn7l9b0'))
+        .map(row => ({
+            reviewer: text(row, 'div.css-hdvjju.eqn7l9b7 b'),
+            date: text(row, 'span.css-1bqps6x.eqn7l9b8'),
+            content: text(row, 'p.css-16m6tj.eqn7l9b5'),
+            menu: labeled(row, '주문메뉴'),
+            order: labeled(row, '주문번호'),
+            images: Array.from(row.querySelectorAll('div.css-1sh0k4q.eqn7l9b3 img')).map(img => img.getAttribute('src')),
+            has_reply_button: Array.from(row.querySelectorAll('button')).some(b => b.textContent.includes('사장님 댓글 등록하기')),
+            gold_stars: goldStars(row)
+        }));
+}
+"""
+
 class CoupangSyncReviewCrawler:
     """쿠팡이츠 동기식 리뷰 크롤러 - 사용자 제공 정확한 셀렉터 사용"""
     
@@ -49,6 +105,7 @@ class CoupangSyncReviewCrawler:
         self.platform_name = 'coupang'
         self.reviews_data = []
         self.current_store_info = {}
+        self.timer = StepTimer(self.platform_name)
         
         # 쿠팡이츠 URL 설정
         self.login_url = "https://store.coupangeats.com/merchant/login"
@@ -63,8 +120,8 @@ class CoupangSyncReviewCrawler:
         self.review_screenshot_dir = Path("C:/Review_playwright/logs/screenshots/coupang_reviews")
         self.review_screenshot_dir.mkdir(parents=True, exist_ok=True)
         
-    def start_browser(self):
-        """브라우저 시작"""
+    def start_browser(self, cdp_endpoint: Optional[str] = None):
+        """브라우저 시작 (cdp_endpoint가 있으면 브라우저 풀의 Chromium에 연결)"""
         try:
             logger.info(f"Starting {self.platform_name} browser in sync mode (Windows)...")
             
@@ -89,19 +146,15 @@ class CoupangSyncReviewCrawler:
                 ]
             }
             
-            # 브라우저 시작
-            self.browser = self.playwright.chromium.launch(**launch_options)
-            
-            # 컨텍스트 생성
-            self.context = self.browser.new_context(
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                viewport={'width': 1920, 'height': 1080},
-                ignore_https_errors=True
-            )
+            # 브라우저 시작 (풀 사용 시 이미 떠 있는 Chromium에 연결)
+            if cdp_endpoint:
+                self.browser = self.playwright.chromium.connect_over_cdp(cdp_endpoint)
+                logger.info(f"브라우저 풀 연결: {cdp_endpoint}")
+            else:
+                self.browser = self.playwright.chromium.launch(**launch_options)
             
-            # 페이지 생성
-            self.page = self.context.new_page()
-            self.page.set_default_timeout(60000)
+            # 컨텍스트 및 페이지 생성
+            self._open_context()
             
             logger.info(f"{self.platform_name} browser started successfully")
             return True
@@ -110,6 +163,23 @@ class CoupangSyncReviewCrawler:
             logger.error(f"Failed to start browser: {str(e)}")
             self.close_browser()
             return False
+    
+    def _open_context(self, storage_state: Optional[Dict[str, Any]] = None):
+        """컨텍스트/페이지 (재)생성 - storage_state가 있으면 저장된 세션 복원"""
+        if self.page:
+            self.page.close()
+        if self.context:
+            self.context.close()
+        
+        self.context = self.browser.new_context(
+            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            viewport={'width': 1920, 'height': 1080},
+            ignore_https_errors=True,
+            storage_state=storage_state
+        )
+        
+        self.page = self.context.new_page()
+        self.page.set_default_timeout(60000)
             
     def close_browser(self):
         """브라우저 종료"""
@@ -158,12 +228,21 @@ class CoupangSyncReviewCrawler:
             logger.info("쿠팡이츠 로그인 시작")
             logger.info("=" * 50)
             
+            # 저장된 세션이 살아있으면 로그인 생략
+            saved_state = get_session_store().load(self.platform_name, username)
+            if saved_state:
+                self._open_context(saved_state)
+                if restore_session_sync(self.page, self.platform_name, username):
+                    self.logged_in = True
+                    logger.info("✓ 쿠팡이츠 저장된 세션 재사용 - 로그인 생략")
+                    return True
+            
             logger.info(f"로그인 URL: {self.login_url}")
             logger.info(f"Headless 모드: {self.headless}")
             
             # 로그인 페이지로 이동
-            self.page.goto(self.login_url, wait_until='networkidle')
-            self.page.wait_for_timeout(3000)
+            self.page.goto(self.login_url, wait_until='domcontentloaded')
+            wait_for_selector(self.page, '#loginId')
             logger.info("로그인 페이지 로드 완료")
             
             # 페이지 상태 디버깅
@@ -262,9 +341,9 @@ class CoupangSyncReviewCrawler:
                 self.save_screenshot("login_button_click_failed")
                 return False
             
-            # 로그인 처리 대기 (더 긴 시간)
+            # 로그인 처리 대기 (로그인 페이지를 벗어나면 바로 진행)
             logger.info("로그인 처리 대기 중...")
-            self.page.wait_for_timeout(8000)
+            wait_for_url(self.page, lambda url: '/login' not in url, ceiling_ms=10000)
             
             # 로그인 후 상태 확인
             current_url = self.page.url
@@ -299,6 +378,7 @@ class CoupangSyncReviewCrawler:
             # 로그인 페이지에서 벗어났으면 성공
             if '/login' not in current_url and 'merchant' in current_url:
                 self.logged_in = True
+                save_session_sync(self.context, self.platform_name, username)
                 logger.info("=" * 50)
                 logger.info("쿠팡이츠 로그인 성공!")
                 logger.info("=" * 50)
@@ -319,7 +399,8 @@ class CoupangSyncReviewCrawler:
     def close_popup(self):
         """팝업 닫기 - 다양한 방법으로 시도"""
         try:
-            self.page.wait_for_timeout(1000)
+            # 팝업이 뜰 때까지 잠시 대기 (없으면 상한 후 진행)
+            wait_for_selector(self.page, POPUP_CLOSE_CSS, ceiling_ms=1500)
             
             # 다양한 팝업 닫기 버튼 선택자들
             popup_selectors = [
@@ -344,7 +425,7 @@ class CoupangSyncReviewCrawler:
                     if close_button and close_button.is_visible():
                         close_button.click()
                         logger.info(f"팝업을 닫았습니다 (셀렉터: {selector})")
-                        self.page.wait_for_timeout(1000)
+                        wait_for_selector(self.page, selector, ceiling_ms=1000, state='hidden')
                         return True
                 except Exception as e:
                     logger.debug(f"팝업 셀렉터 {selector} 시도 중 오류: {str(e)}")
@@ -370,7 +451,6 @@ class CoupangSyncReviewCrawler:
             if 'reviews' not in current_url:
                 logger.info(f"리뷰 페이지로 이동: {self.reviews_url}")
                 self.page.goto(self.reviews_url, wait_until='networkidle')
-                self.page.wait_for_timeout(3000)
                 logger.info("리뷰 페이지 이동 완료")
             else:
                 logger.info("이미 리뷰 페이지에 있습니다")
@@ -401,7 +481,6 @@ class CoupangSyncReviewCrawler:
                     if dropdown_button and dropdown_button.is_visible():
                         dropdown_button.click()
                         logger.info(f"드롭다운 버튼 클릭 성공: {selector}")
-                        self.page.wait_for_timeout(2000)
                         dropdown_opened = True
                         break
                 except Exception as e:
@@ -426,8 +505,8 @@ class CoupangSyncReviewCrawler:
                         # "큰집닭강정(708561)" 형식에서 매장 코드 확인
                         if platform_code in item_text:
                             logger.info(f"매장 발견: {item_text}")
-                            item.click()
-                            self.page.wait_for_timeout(3000)
+                            with expect_dom_change(self.page, REVIEW_TABLE_SELECTOR, ceiling_ms=5000):
+                                item.click()
                             logger.info(f"매장 선택 성공: {platform_code}")
                             return True
                     except Exception as e:
@@ -454,7 +533,7 @@ class CoupangSyncReviewCrawler:
             date_dropdown = self.page.query_selector('div.css-1rkgd7l:has(svg)')
             if date_dropdown:
                 date_dropdown.click()
-                self.page.wait_for_timeout(1000)
+                wait_for_selector(self.page, 'label:has-text("1개월"), input[name="quick"][value="2"]', ceiling_ms=2000)
                 logger.info("날짜 드롭다운 클릭 성공")
                 
                 # 1개월 라디오 버튼 클릭 - 사용자 제공 셀렉터
@@ -462,16 +541,16 @@ class CoupangSyncReviewCrawler:
                     # 1개월 옵션 선택
                     one_month_label = self.page.query_selector('label:has-text("1개월")')
                     if one_month_label:
-                        one_month_label.click()
+                        with expect_dom_change(self.page, REVIEW_TABLE_SELECTOR, ceiling_ms=3000):
+                            one_month_label.click()
                         logger.info("1개월 옵션 선택 성공")
-                        self.page.wait_for_timeout(1000)
                     else:
                         # 대체 방법: input[value="2"] 선택 (사용자 제공 HTML 기반)
                         one_month_input = self.page.query_selector('input[name="quick"][value="2"]')
                         if one_month_input:
-                            one_month_input.click()
+                            with expect_dom_change(self.page, REVIEW_TABLE_SELECTOR, ceiling_ms=3000):
+                                one_month_input.click()
                             logger.info("1개월 라디오 버튼 선택 성공")
-                            self.page.wait_for_timeout(1000)
                         else:
                             logger.warning("1개월 옵션을 찾을 수 없습니다")
                             
@@ -501,9 +580,9 @@ class CoupangSyncReviewCrawler:
                 try:
                     unanswered_element = self.page.query_selector(selector)
                     if unanswered_element and unanswered_element.is_visible():
-                        unanswered_element.click()
+                        with expect_dom_change(self.page, REVIEW_TABLE_SELECTOR, ceiling_ms=5000):
+                            unanswered_element.click()
                         logger.info(f"미답변 탭 클릭 성공: {selector}")
-                        self.page.wait_for_timeout(2000)
                         return True
                 except Exception as e:
                     logger.debug(f"미답변 탭 셀렉터 {selector} 시도 실패: {str(e)}")
@@ -516,8 +595,15 @@ class CoupangSyncReviewCrawler:
             logger.error(f"미답변 탭 클릭 실패: {str(e)}")
             return False
 
-    def get_reviews_with_pagination(self, platform_code: str, store_code: str, store_name: str, limit: int = 50) -> List[Dict[str, Any]]:
-        """페이지네이션을 통한 리뷰 수집 - 사용자 제공 정확한 셀렉터"""
+    def get_reviews_with_pagination(self, platform_code: str, store_code: str, store_name: str, limit: int = 50,
+                                    known_review_ids: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        페이지네이션을 통한 리뷰 수집 - 사용자 제공 정확한 셀렉터
+
+        Args:
+            known_review_ids: 이전 수집 워터마크의 리뷰 ID (최신순 목록에서 만나면 이후 페이지 탐색 중단)
+        """
+        known_review_ids = set(known_review_ids or [])
         try:
             logger.info(f"========== 쿠팡이츠 리뷰 수집 시작 ==========")
             logger.info(f"매장 코드: {platform_code}")
@@ -528,37 +614,42 @@ class CoupangSyncReviewCrawler:
             collected_reviews = []
             
             # 1. 리뷰 페이지로 이동
-            if not self.navigate_to_reviews():
+            with self.timer.step('navigate'):
+                navigated = self.navigate_to_reviews()
+            if not navigated:
                 logger.error("리뷰 페이지 이동 실패")
                 return []
             
-            # 2. 팝업 닫기 (여러 번 시도)
-            for attempt in range(3):
-                try:
-                    if self.close_popup():
+            # 2. 팝업 닫기 (팝업이 여러 개 뜨는 경우 최대 3개, 더 없으면 바로 진행)
+            with self.timer.step('popup'):
+                for attempt in range(3):
+                    try:
+                        if not self.close_popup():
+                            logger.debug(f"팝업 없음 또는 이미 닫힘 (시도 {attempt + 1})")
+                            break
                         logger.info(f"팝업 닫기 성공 (시도 {attempt + 1})")
+                    except Exception as e:
+                        logger.debug(f"팝업 닫기 시도 {attempt + 1} 실패: {str(e)}")
                         break
-                    else:
-                        logger.debug(f"팝업 없음 또는 이미 닫힘 (시도 {attempt + 1})")
-                except Exception as e:
-                    logger.debug(f"팝업 닫기 시도 {attempt + 1} 실패: {str(e)}")
-                
-                self.page.wait_for_timeout(1000)
             
             # 3. 매장 선택
-            if not self.select_store(platform_code):
+            with self.timer.step('select_store'):
+                selected = self.select_store(platform_code)
+            if not selected:
                 logger.error("매장 선택 실패")
                 return []
             
             # 4. 날짜 범위 설정 (1개월)
             try:
-                self.set_date_range()
+                with self.timer.step('date_range'):
+                    self.set_date_range()
             except Exception as e:
                 logger.error(f"날짜 설정 실패: {str(e)}")
             
             # 5. 미답변 탭 클릭
             try:
-                self.click_unanswered_tab()
+                with self.timer.step('unanswered_tab'):
+                    self.click_unanswered_tab()
                 logger.info("미답변 탭 처리 완료")
             except Exception as e:
                 logger.error(f"미답변 탭 클릭 중 예외: {str(e)}")
@@ -567,12 +658,14 @@ class CoupangSyncReviewCrawler:
             page_num = 1
             max_pages = 10  # 최대 10페이지까지 확장
             empty_page_count = 0  # 빈 페이지 카운트
+            reached_watermark = False  # 이전 수집 지점 도달 여부
             
             while len(collected_reviews) < limit and page_num <= max_pages:
                 logger.info(f"\n========== 페이지 {page_num} 처리 시작 ==========")
                 
                 # 현재 페이지의 리뷰들 수집
-                reviews_on_page = self._extract_reviews_from_page(platform_code, store_code)
+                with self.timer.step('extract_page'):
+                    reviews_on_page = self._extract_reviews_from_page(platform_code, store_code)
                 
                 if not reviews_on_page:
                     empty_page_count += 1
@@ -585,11 +678,20 @@ class CoupangSyncReviewCrawler:
                 else:
                     empty_page_count = 0  # 리뷰가 있으면 카운트 리셋
                     
+                    # 이미 저장된 리뷰는 제외 (리뷰 ID 인덱스, Bloom 필터 후보만 DB 확인)
+                    stored_ids = find_known_review_ids('coupang', platform_code, [r['review_id'] for r in reviews_on_page])
+                    
                     # 중복 제거하면서 추가
                     new_review_count = 0
                     for review in reviews_on_page:
                         if len(collected_reviews) >= limit:
                             break
+                        # 워터마크 도달: 이후 리뷰는 이미 수집된 리뷰
+                        if review['review_id'] in known_review_ids:
+                            reached_watermark = True
+                            break
+                        if review['review_id'] in stored_ids:
+                            continue
                         # 중복 체크 (날짜와 리뷰 내용으로)
                         is_duplicate = any(
                             r['review_date'] == review['review_date'] and 
@@ -601,17 +703,22 @@ class CoupangSyncReviewCrawler:
                             collected_reviews.append(review)
                             new_review_count += 1
                     
-                    logger.info(f"페이지 {page_num}: 총 {len(reviews_on_page)}개 중 {new_review_count}개 신규 리뷰 추가")
+                    logger.info(f"페이지 {page_num}: 총 {len(reviews_on_page)}개 중 {new_review_count}개 신규 리뷰 추가 (기존 {len(stored_ids)}개 제외)")
                     logger.info(f"현재까지 총 {len(collected_reviews)}개 리뷰 수집")
                 
+                if reached_watermark:
+                    logger.info("이전 수집 지점 도달 - 수집 종료")
+                    break
+                
                 # 다음 페이지로 이동
                 if len(collected_reviews) < limit and page_num < max_pages:
                     # 페이지네이션 상태 확인
                     has_next = self._check_pagination_status()
                     if has_next:
-                        if self._go_to_next_page():
+                        with self.timer.step('next_page'):
+                            moved = self._go_to_next_page()
+                        if moved:
                             page_num += 1
-                            self.page.wait_for_timeout(2000)
                         else:
                             logger.info("다음 페이지 이동 실패 - 수집 종료")
                             break
@@ -631,56 +738,41 @@ class CoupangSyncReviewCrawler:
             return []
 
     def _extract_reviews_from_page(self, platform_code: str, store_code: str) -> List[Dict[str, Any]]:
-        """현재 페이지에서 리뷰 추출 - 사용자 제공 정확한 셀렉터"""
+        """현재 페이지에서 리뷰 추출 - 한 번의 evaluate로 모든 행을 읽고 Python에서는 정규화만"""
         reviews = []
         
         try:
-            # 리뷰 테이블 행들 - 사용자 제공 HTML 기반
-            review_rows = self.page.query_selector_all('tr:has(td.eqn7l9b0)')
+            rows = self.page.evaluate(EXTRACT_REVIEW_ROWS_SCRIPT)
             
-            logger.info(f"페이지에서 {len(review_rows)}개 리뷰 행 발견")
+            logger.info(f"페이지에서 {len(rows)}개 리뷰 행 발견")
             
-            for idx, row in enumerate(review_rows):
+            for idx, row in enumerate(rows):
                 try:
-                    # 작성자 이름 - 사용자 제공 셀렉터
-                    reviewer_elem = row.query_selector('div.css-hdvjju.eqn7l9b7 b')
-                    reviewer_name = reviewer_elem.text_content().strip() if reviewer_elem else "익명"
+                    reviewer_name = (row.get('reviewer') or '').strip() or "익명"
                     
-                    # 별점 계산 - 새로운 함수 사용
-                    rating = self._parse_star_rating(row, idx)
+                    # 별점: 5개 별 컨테이너의 금색 별 개수 (못 찾으면 기본 5점, 1~5 범위로 제한)
+                    gold_stars = row.get('gold_stars')
+                    if gold_stars is None:
+                        logger.warning(f"⚠ 리뷰 {idx + 1}: 5개 별점 컨테이너를 찾을 수 없음 - 기본값 5점 사용")
+                        gold_stars = 5
+                    rating = max(1, min(int(gold_stars), 5))
                     
-                    # 날짜 - 사용자 제공 셀렉터
-                    date_elem = row.query_selector('span.css-1bqps6x.eqn7l9b8')
-                    date_text = date_elem.text_content().strip() if date_elem else ""
+                    date_text = (row.get('date') or '').strip()
                     review_date = self._parse_relative_date(date_text)
                     logger.debug(f"날짜 변환: '{date_text}' → '{review_date}'")
                     
-                    # 리뷰 내용 - 정확한 셀렉터로만 가져오기 (주문메뉴와 혼동 방지)
-                    content_elem = row.query_selector('p.css-16m6tj.eqn7l9b5')
-                    review_content = content_elem.text_content().strip() if content_elem else ""
-                    
-                    # 리뷰 내용 없으면 로깅
+                    review_content = (row.get('content') or '').strip()
                     if not review_content:
                         logger.debug(f"리뷰 {idx + 1}: 리뷰 코멘트 없음 (별점만 등록)")
                     
-                    # 주문 메뉴 - 사용자 제공 셀렉터
-                    menu_elem = row.query_selector('li:has(strong:has-text("주문메뉴")) p')
-                    ordered_menu = menu_elem.text_content().strip() if menu_elem else ""
-                    
-                    # 주문번호 - 사용자 제공 셀렉터
-                    order_elem = row.query_selector('li:has(strong:has-text("주문번호")) p')
-                    order_info = order_elem.text_content().strip() if order_elem else ""
+                    ordered_menu = (row.get('menu') or '').strip()
+                    order_info = (row.get('order') or '').strip()
+                    review_images = [src for src in row.get('images') or [] if src]
                     
-                    # 리뷰 이미지들 - 사용자 제공 셀렉터
-                    image_elems = row.query_selector_all('div.css-1sh0k4q.eqn7l9b3 img')
-                    review_images = [img.get_attribute('src') for img in image_elems if img.get_attribute('src')]
-                    
-                    # 답글 여부 확인 - 사용자 제공 HTML의 "사장님 댓글 등록하기" 버튼
-                    reply_button = row.query_selector('button:has-text("사장님 댓글 등록하기")')
-                    has_reply = reply_button is None  # 버튼이 없으면 이미 답글 있음
+                    # "사장님 댓글 등록하기" 버튼이 없으면 이미 답글 있음
+                    has_reply = not row.get('has_reply_button')
                     
                     # 리뷰 ID 생성 (주문번호 + 주문일 기반으로 고유성 확보)
-                    import hashlib
                     review_id = self.generate_order_based_review_id(platform_code, order_info)
                     
                     review_data = {
@@ -704,10 +796,6 @@ class CoupangSyncReviewCrawler:
                     reviews.append(review_data)
                     logger.info(f"[쿠팡이츠] 리뷰 {idx + 1} 수집: {reviewer_name} - {rating}점 - {review_content[:30]}...")
                     
-                    # 별점이 5점을 초과하면 로그로 확인
-                    if rating > 5:
-                        logger.warning(f"별점이 5점을 초과함: {rating}점 - 리뷰어: {reviewer_name}")
-                    
                 except Exception as e:
                     logger.error(f"리뷰 파싱 중 오류 (idx {idx}): {str(e)}")
                     continue
@@ -718,56 +806,6 @@ class CoupangSyncReviewCrawler:
         logger.info(f"페이지에서 총 {len(reviews)}개 리뷰 추출 완료")
         return reviews
 
-    def _parse_star_rating(self, row_element, idx: int) -> int:
-        """별점 파싱 - 금색(#FFC400) 별 개수로 정확하게 계산"""
-        rating = 5  # 기본값
-        
-        try:
-            logger.debug(f"리뷰 {idx + 1} 별점 파싱 시작")
-            
-            # 방법 1: 오른쪽 td (리뷰 상세 영역)에서 첫 번째 별점 컨테이너만 찾기
-            # 사용자 HTML 구조: <td class="eqn7l9b9 css-n1gvoq e1dqye0l0">에 실제 별점이 있음
-            review_detail_td = row_element.query_selector('td.eqn7l9b9')
-            if review_detail_td:
-                # 이 td 내에서 첫 번째 별점 컨테이너만 검색 (div > svg 5개 구조)
-                star_containers = review_detail_td.query_selector_all('div:has(svg)')
-                
-                for container in star_containers:
-                    svgs = container.query_selector_all('svg')
-                    if len(svgs) == 5:  # 별점은 정확히 5개 SVG로 구성
-                        gold_stars = container.query_selector_all('path[fill="#FFC400"]')
-                        rating = len(gold_stars)
-                        logger.info(f"★ 별점 파싱 성공 (상세영역 5별): 금색 별 {len(gold_stars)}개 = {rating}점")
-                        break
-                else:
-                    # 5개 SVG 컨테이너를 찾지 못한 경우
-                    logger.warning("⚠ 상세영역에서 5개 별점 컨테이너를 찾을 수 없음")
-            else:
-                # 대체 방법: 전체 행에서 첫 번째 5개 별점 컨테이너 찾기
-                star_containers = row_element.query_selector_all('div:has(svg)')
-                
-                for container in star_containers:
-                    svgs = container.query_selector_all('svg')
-                    if len(svgs) == 5:  # 별점은 정확히 5개 SVG로 구성
-                        gold_stars = container.query_selector_all('path[fill="#FFC400"]')
-                        rating = len(gold_stars)
-                        logger.info(f"★ 별점 파싱 성공 (전체 5별): 금색 별 {len(gold_stars)}개 = {rating}점")
-                        break
-                else:
-                    logger.warning("⚠ 5개 별점 컨테이너를 찾을 수 없음 - 기본값 5점 사용")
-            
-            # 0점이나 5점 초과 방지
-            rating = max(1, min(rating, 5))
-            logger.info(f"최종 별점: {rating}점")
-            
-        except Exception as e:
-            logger.error(f"별점 계산 오류: {str(e)} - 기본값 5점 사용")
-            import traceback
-            logger.error(traceback.format_exc())
-            rating = 5
-        
-        return rating
-
     def _parse_relative_date(self, date_text: str) -> str:
         """상대적 날짜 파싱 ('8시간 전', '1일 전' 등)"""
         try:
@@ -897,9 +935,9 @@ class CoupangSyncReviewCrawler:
                 next_page_btn = self.page.query_selector(f'ul li button:has-text("{next_page}"):not(.active)')
                 
                 if next_page_btn and next_page_btn.is_visible():
-                    next_page_btn.click()
+                    with expect_dom_change(self.page, REVIEW_TABLE_SELECTOR, ceiling_ms=5000):
+                        next_page_btn.click()
                     logger.info(f"페이지 {next_page} 버튼 클릭")
-                    self.page.wait_for_timeout(3000)  # 페이지 로드 대기
                     return True
                 
                 # 다음 버튼(data-at="next-btn") 사용
@@ -907,9 +945,9 @@ class CoupangSyncReviewCrawler:
                 if next_btn and next_btn.is_visible():
                     btn_classes = next_btn.get_attribute('class') or ''
                     if 'hide-btn' not in btn_classes:
-                        next_btn.click()
+                        with expect_dom_change(self.page, REVIEW_TABLE_SELECTOR, ceiling_ms=5000):
+                            next_btn.click()
                         logger.info("다음 버튼 (data-at=next-btn) 클릭")
-                        self.page.wait_for_timeout(3000)
                         return True
                     else:
                         logger.info("다음 버튼이 비활성화됨 (hide-btn)")
@@ -926,9 +964,9 @@ class CoupangSyncReviewCrawler:
                 try:
                     next_elem = self.page.query_selector(selector)
                     if next_elem and next_elem.is_visible():
-                        next_elem.click()
+                        with expect_dom_change(self.page, REVIEW_TABLE_SELECTOR, ceiling_ms=5000):
+                            next_elem.click()
                         logger.info(f"다음 페이지로 이동 (대체 선택자: {selector})")
-                        self.page.wait_for_timeout(3000)
                         return True
                 except Exception as e:
                     logger.debug(f"대체 선택자 {selector} 시도 실패: {str(e)}")
@@ -942,7 +980,7 @@ class CoupangSyncReviewCrawler:
             return False
 
     def save_reviews_to_supabase(self, store_info: Dict, reviews: List[Dict]) -> Dict[str, int]:
-        """수집한 리뷰를 Supabase에 저장"""
+        """수집한 리뷰를 Supabase에 일괄 저장 (in_() 1회로 중복 확인 후 청크 insert)"""
         try:
             if not reviews:
                 logger.info("저장할 리뷰가 없습니다")
@@ -950,81 +988,11 @@ class CoupangSyncReviewCrawler:
             
             logger.info(f"[DB] {len(reviews)}개 쿠팡이츠 리뷰 저장 시작...")
             
-            # Supabase 클라이언트 가져오기
-            supabase = get_supabase_client()
+            save_stats = ingest_reviews(store_info, reviews)
             
-            # 저장 통계
-            saved_count = 0
-            failed_count = 0
-            duplicate_count = 0
+            logger.info(f"[DB] 쿠팡이츠 리뷰 저장 완료: 성공 {save_stats['saved']}개, 중복 {save_stats['duplicate']}개, 실패 {save_stats['failed']}개")
             
-            for review in reviews:
-                try:
-                    # 중복 체크
-                    existing = supabase.table('reviews').select('review_id').eq('review_id', review['review_id']).execute()
-                    
-                    if existing.data:
-                        logger.info(f"[DB] 중복 리뷰 스킵: {review['review_id']} - {review['review_name']}")
-                        duplicate_count += 1
-                        continue
-                    
-                    # DB에 맞게 데이터 정제
-                    review_data = {
-                        'review_id': review['review_id'],
-                        'platform': review['platform'],
-                        'platform_code': review['platform_code'],
-                        'store_code': review['store_code'],
-                        'review_name': review['review_name'],
-                        'rating': review['rating'],
-                        'review_content': review['review_content'],
-                        'review_date': review['review_date'],
-                        'ordered_menu': review['ordered_menu'],
-                        'delivery_review': review.get('delivery_review', ''),
-                        'response_status': 'pending',  # 기본값: 미답변 상태
-                        'crawled_at': datetime.now().isoformat()
-                    }
-                    
-                    # review_images를 PostgreSQL 배열 형식으로 변환
-                    if isinstance(review.get('review_images'), list):
-                        review_data['review_images'] = review['review_images']
-                    else:
-                        review_data['review_images'] = []
-                    
-                    # 리뷰 저장
-                    result = supabase.table('reviews').insert(review_data).execute()
-                    
-                    if result.data:
-                        logger.info(f"[DB] 저장 성공: {review['review_id']} - {review['review_name']}")
-                        saved_count += 1
-                    else:
-                        logger.error(f"[DB] 저장 실패: {review['review_id']} - {review['review_name']}")
-                        failed_count += 1
-                        
-                except Exception as e:
-                    logger.error(f"[DB] 저장 중 오류: {review['review_id']} - {str(e)}")
-                    failed_count += 1
-            
-            # 사용량 업데이트
-            if saved_count > 0:
-                try:
-                    supabase.rpc('update_usage', {
-                        'p_user_code': store_info.get('owner_user_code', 'SYSTEM'),
-                        'p_reviews_increment': saved_count,
-                        'p_ai_api_calls_increment': 0,
-                        'p_web_api_calls_increment': 0,
-                        'p_manual_replies_increment': 0,
-                        'p_error_increment': 0
-                    }).execute()
-                except Exception as e:
-                    logger.error(f"[DB] 사용량 업데이트 실패: {str(e)}")
-            
-            logger.info(f"[DB] 쿠팡이츠 리뷰 저장 완료: 성공 {saved_count}개, 중복 {duplicate_count}개, 실패 {failed_count}개")
-            
-            return {
-                'saved': saved_count,
-                'duplicate': duplicate_count,
-                'failed': failed_count
-            }
+            return save_stats
             
         except Exception as e:
             logger.error(f"[DB] Supabase 저장 중 오류: {str(e)}")
@@ -1034,24 +1002,13 @@ class CoupangSyncReviewCrawler:
         """리뷰 목록 가져오기 - 외부 인터페이스"""
         return self.get_reviews_with_pagination(platform_code, store_code, "테스트매장", limit)
 
-    def get_reviews_and_save(self, platform_code: str, store_code: str, store_info: Dict = None, limit: int = 50) -> Dict[str, Any]:
-        """리뷰 수집 후 Supabase에 저장 (중복 필터링)"""
+    def get_reviews_and_save(self, platform_code: str, store_code: str, store_info: Dict = None, limit: int = 50,
+                             known_review_ids: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """리뷰 수집 후 Supabase에 저장 (중복 필터링, known_review_ids 도달 시 수집 중단)"""
         try:
-            # 기존 리뷰 ID 목록 가져오기 (중복 방지)
-            existing_review_ids = set()
-            if store_info:
-                try:
-                    supabase = get_supabase_client()
-                    # 해당 매장의 기존 리뷰 ID 조회
-                    existing_reviews = supabase.table('reviews').select('review_id').eq('platform_code', platform_code).eq('platform', 'coupang').execute()
-                    existing_review_ids = {r['review_id'] for r in existing_reviews.data}
-                    logger.info(f"기존 리뷰 {len(existing_review_ids)}개 확인")
-                except Exception as e:
-                    logger.error(f"기존 리뷰 조회 실패: {str(e)}")
-            
             # 리뷰 수집
             store_name = store_info.get('store_name', '테스트매장') if store_info else '테스트매장'
-            reviews = self.get_reviews_with_pagination(platform_code, store_code, store_name, limit)
+            reviews = self.get_reviews_with_pagination(platform_code, store_code, store_name, limit, known_review_ids)
             
             if not reviews:
                 return {
@@ -1061,27 +1018,24 @@ class CoupangSyncReviewCrawler:
                     'message': '수집된 리뷰가 없습니다'
                 }
             
-            # 중복 필터링
-            new_reviews = [r for r in reviews if r['review_id'] not in existing_review_ids]
-            logger.info(f"전체 {len(reviews)}개 중 신규 {len(new_reviews)}개 리뷰")
-            
-            # Supabase에 저장
-            if store_info and new_reviews:
-                save_stats = self.save_reviews_to_supabase(store_info, new_reviews)
-                return {
+            # Supabase에 저장 (중복 필터링은 일괄 저장에서 수집한 review_id만 조회)
+            if store_info:
+                save_stats = self.save_reviews_to_supabase(store_info, reviews)
+                logger.info(f"전체 {len(reviews)}개 중 신규 {save_stats['saved']}개 리뷰 저장")
+                return dict({
                     'success': True,
                     'collected': len(reviews),
                     'saved': save_stats['saved'],
-                    'duplicate': len(reviews) - len(new_reviews) + save_stats['duplicate'],
+                    'duplicate': save_stats['duplicate'],
                     'failed': save_stats['failed']
-                }
+                }, **watermark_from_reviews(reviews))
             else:
                 return {
                     'success': True,
                     'collected': len(reviews),
                     'saved': 0,
-                    'duplicate': len(reviews) - len(new_reviews),
-                    'message': 'store_info가 없거나 신규 리뷰가 없음'
+                    'duplicate': 0,
+                    'message': 'store_info가 없어 저장하지 않음'
                 }
                 
         except Exception as e:
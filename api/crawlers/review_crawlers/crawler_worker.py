@@ -0,0 +1,191 @@
+"""
+상주형 크롤러 워커 프로세스
+stdin/stdout 파이프로 길이 프리픽스 JSON 프레임(api.utils.worker_protocol)을 주고받으며
+매장 단위 리뷰 수집 작업을 반복 처리 (매장마다 인터프리터를 새로 띄우지 않음)
+
+요청:  {"id", "platform", "store_info", "start_date", "end_date", "cdp_endpoint", "known_review_ids"}
+응답:  {"id", "event": "progress", "stage"}            - 진행 단계
+       {"id", "event": "review", "review_id", ...}     - 리뷰 단위 결과
+       {"id", "event": "result", "result": {...}}      - 최종 결과 (작업당 1회, 워터마크용 review_ids 포함)
+"""
+import asyncio
+import sys
+import os
+import logging
+from pathlib import Path
+from typing import Dict, Any, Callable
+
+if sys.platform == 'win32':
+    asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+
+# 프로젝트 루트 경로를 Python 경로에 추가
+project_root = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from api.utils.worker_protocol import read_message, write_message
+
+logger = logging.getLogger(__name__)
+
+Emit = Callable[[Dict[str, Any]], None]
+
+
+def collect_baemin(job: Dict[str, Any], emit: Emit) -> Dict[str, Any]:
+    """배민 리뷰 수집 및 저장"""
+    from api.crawlers.review_crawlers.baemin_sync_review_crawler import BaeminSyncReviewCrawler
+    from api.crawlers.review_crawlers.run_sync_crawler import save_reviews_to_supabase
+    from api.services.review_ingest import watermark_from_reviews
+
+    store_info = job['store_info']
+    crawler = BaeminSyncReviewCrawler(headless=True)
+    try:
+        emit({'event': 'progress', 'stage': 'browser'})
+        with crawler.timer.step('browser'):
+            crawler.start_browser(cdp_endpoint=job.get('cdp_endpoint'))
+
+        emit({'event': 'progress', 'stage': 'login'})
+        with crawler.timer.step('login'):
+            logged_in = crawler.login(store_info.get('platform_id', ''), store_info.get('platform_pw', ''))
+        if not logged_in:
+            return {"success": False, "error": "로그인 실패"}
+
+        emit({'event': 'progress', 'stage': 'crawl'})
+        reviews = crawler.get_reviews(
+            store_info['platform_code'],
+            store_info['store_code'],
+            limit=10,
+            known_review_ids=job.get('known_review_ids')
+        )
+        for review in reviews:
+            emit({'event': 'review', 'review_id': review.get('review_id')})
+
+        saved = 0
+        if reviews:
+            emit({'event': 'progress', 'stage': 'save'})
+            # 기존 subprocess 실행 시와 동일하게 사용량은 SYSTEM으로 집계
+            with crawler.timer.step('save'):
+                save_stats = save_reviews_to_supabase(dict(store_info, owner_user_code='SYSTEM'), reviews)
+            saved = save_stats['saved']
+
+        return dict({"success": True, "collected": len(reviews), "saved": saved,
+                     "step_timings": crawler.timer.summary()}, **watermark_from_reviews(reviews))
+    finally:
+        crawler.close_browser()
+        crawler.timer.log()
+
+
+def collect_naver(job: Dict[str, Any], emit: Emit) -> Dict[str, Any]:
+    """네이버 리뷰 수집 및 저장 (async 크롤러를 워커 내부 이벤트 루프에서 실행)"""
+    from api.crawlers.review_crawlers.run_naver_async_crawler import collect_single_store_reviews
+
+    emit({'event': 'progress', 'stage': 'crawl'})
+    return asyncio.run(collect_single_store_reviews(
+        job['store_info'],
+        job.get('start_date'),
+        job.get('end_date'),
+        job.get('cdp_endpoint'),
+        on_event=emit,
+        known_review_ids=job.get('known_review_ids')
+    ))
+
+
+def _collect_with_sync_crawler(crawler, job: Dict[str, Any], emit: Emit) -> Dict[str, Any]:
+    """요기요/쿠팡이츠 동기 크롤러 공통 흐름 (수집과 Supabase 저장은 크롤러가 처리)"""
+    store_info = job['store_info']
+    try:
+        emit({'event': 'progress', 'stage': 'browser'})
+        with crawler.timer.step('browser'):
+            started = crawler.start_browser(cdp_endpoint=job.get('cdp_endpoint'))
+        if not started:
+            return {"success": False, "error": "브라우저 시작 실패"}
+
+        emit({'event': 'progress', 'stage': 'login'})
+        with crawler.timer.step('login'):
+            logged_in = crawler.login(store_info.get('platform_id', ''), store_info.get('platform_pw', ''))
+        if not logged_in:
+            return {"success": False, "error": "로그인 실패"}
+
+        emit({'event': 'progress', 'stage': 'crawl'})
+        result = crawler.get_reviews_and_save(
+            store_info['platform_code'],
+            store_info['store_code'],
+            store_info,
+            limit=50,
+            known_review_ids=job.get('known_review_ids')
+        )
+
+        if not result['success']:
+            return {"success": False, "error": result.get('error', '알 수 없는 오류')}
+
+        return {
+            "success": True,
+            "collected": result['collected'],
+            "saved": result['saved'],
+            "review_ids": result.get('review_ids', []),
+            "latest_review_date": result.get('latest_review_date'),
+            "step_timings": crawler.timer.summary()
+        }
+    finally:
+        crawler.close_browser()
+        crawler.timer.log()
+
+
+def collect_yogiyo(job: Dict[str, Any], emit: Emit) -> Dict[str, Any]:
+    """요기요 리뷰 수집 및 저장"""
+    from api.crawlers.review_crawlers.yogiyo_sync_review_crawler import YogiyoSyncReviewCrawler
+    return _collect_with_sync_crawler(YogiyoSyncReviewCrawler(headless=True), job, emit)
+
+
+def collect_coupang(job: Dict[str, Any], emit: Emit) -> Dict[str, Any]:
+    """쿠팡이츠 리뷰 수집 및 저장"""
+    from api.crawlers.review_crawlers.coupang_sync_review_crawler import CoupangSyncReviewCrawler
+    return _collect_with_sync_crawler(CoupangSyncReviewCrawler(headless=True), job, emit)
+
+
+HANDLERS: Dict[str, Callable[[Dict[str, Any], Emit], Dict[str, Any]]] = {
+    'baemin': collect_baemin,
+    'naver': collect_naver,
+    'yogiyo': collect_yogiyo,
+    'coupang': collect_coupang,
+}
+
+
+def main():
+    # 프로토콜 전용 출력 스트림 확보 후, 크롤러의 print/로그는 모두 stderr로 보냄
+    protocol_in = sys.stdin.buffer
+    protocol_out = os.fdopen(os.dup(sys.stdout.fileno()), 'wb')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(levelname)s] %(name)s - %(message)s',
+        stream=sys.stderr
+    )
+
+    write_message(protocol_out, {'event': 'ready', 'pid': os.getpid()})
+
+    while True:
+        job = read_message(protocol_in)
+        if job is None or job.get('type') == 'shutdown':
+            break
+
+        job_id = job.get('id')
+
+        def emit(message: Dict[str, Any]):
+            write_message(protocol_out, dict(message, id=job_id))
+
+        handler = HANDLERS.get(job.get('platform'))
+        try:
+            if handler is None:
+                result = {"success": False, "error": f"지원하지 않는 플랫폼: {job.get('platform')}"}
+            else:
+                result = handler(job, emit)
+        except Exception as e:
+            logger.exception(f"작업 처리 중 오류 (id={job_id})")
+            result = {"success": False, "error": str(e)}
+
+        emit({'event': 'result', 'result': result})
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ import logging
 import subprocess
 import threading
 import json
+from typing import Callable, Optional, List
 
 # 프로젝트 루트 경로를 Python 경로에 추가
 project_root = Path(__file__).parent.parent.parent.parent
@@ -15,6 +16,7 @@ sys.path.insert(0, str(project_root))
 from api.crawlers.naver_crawler import NaverCrawler
 from config.supabase_client import get_supabase_client
 from api.services.encryption import encrypt_password, decrypt_password
+from api.services.review_ingest import ingest_reviews, watermark_from_reviews
 
 # 로깅 설정
 logging.basicConfig(
@@ -87,27 +89,9 @@ async def crawl_naver_reviews():
                     reviews = await crawler.crawl_reviews(crawler.page, platform_code, store_code)
                     logger.info(f"{len(reviews)}개의 리뷰를 크롤링했습니다.")
                     
-                    # DB 저장
-                    saved_count = 0
-                    for review in reviews:
-                        try:
-                            # 중복 확인
-                            existing = supabase.table('reviews').select('id').eq('review_id', review['review_id']).execute()
-
-                            if existing.data:
-                                logger.info(f"이미 존재하는 리뷰: {review['review_id']}")
-                                continue
-
-                            # store_code 추가 부분 삭제 (이미 파서에서 처리됨)
-                            # review['store_code'] = store_code  # 이 줄 삭제
-
-                            # 리뷰 저장
-                            supabase.table('reviews').insert(review).execute()
-                            saved_count += 1
-                            
-                        except Exception as e:
-                            logger.error(f"리뷰 저장 중 오류: {str(e)}")
-                            continue
+                    # DB 일괄 저장
+                    save_stats = ingest_reviews(store, reviews, normalize=False, update_usage=False)
+                    saved_count = save_stats['saved']
                     
                     logger.info(f"{saved_count}개의 새로운 리뷰를 저장했습니다.")
                     
@@ -135,58 +119,59 @@ def run_crawler_in_thread():
     finally:
         loop.close()
 
-async def collect_single_store_reviews(store_info: dict, start_date: str, end_date: str) -> dict:
-    """단일 매장 리뷰 수집 (자동화용)"""
-    supabase = get_supabase_client()
+async def collect_single_store_reviews(store_info: dict, start_date: str, end_date: str, cdp_endpoint: str = None,
+                                       on_event: Optional[Callable[[dict], None]] = None,
+                                       known_review_ids: Optional[List[str]] = None) -> dict:
+    """
+    단일 매장 리뷰 수집 (자동화용)
+    
+    Args:
+        cdp_endpoint: 브라우저 풀 Chromium 주소
+        on_event: 진행 단계/리뷰별 결과 콜백 (크롤러 워커 프로세스에서 사용)
+        known_review_ids: 이전 수집 워터마크의 리뷰 ID (도달 시 수집 중단)
+    """
+    def emit(event: dict):
+        if on_event:
+            on_event(event)
     
     try:
         logger.info(f"네이버 단일 매장 리뷰 수집 시작: {store_info['store_name']}")
         
         # NaverCrawler를 컨텍스트 매니저로 사용
-        async with NaverCrawler(headless=True) as crawler:
+        async with NaverCrawler(headless=True, cdp_endpoint=cdp_endpoint) as crawler:
             # 로그인
             platform_id = store_info['platform_id']
             platform_pw = store_info['platform_pw']
             
+            emit({'event': 'progress', 'stage': 'login'})
             login_success = await crawler.login(crawler.page, platform_id, platform_pw)
             if not login_success:
                 logger.error(f"네이버 로그인 실패: {platform_id}")
                 return {"success": False, "error": "로그인 실패"}
             
             # 리뷰 크롤링
+            emit({'event': 'progress', 'stage': 'crawl'})
             store_code = store_info['store_code']
             platform_code = store_info['platform_code']
             
-            reviews = await crawler.crawl_reviews(crawler.page, platform_code, store_code)
+            reviews = await crawler.crawl_reviews(crawler.page, platform_code, store_code, known_review_ids)
             logger.info(f"{len(reviews)}개의 네이버 리뷰를 크롤링했습니다.")
             
-            # DB 저장
-            saved_count = 0
-            for review in reviews:
-                try:
-                    # 중복 확인
-                    existing = supabase.table('reviews').select('id').eq('review_id', review['review_id']).execute()
-
-                    if existing.data:
-                        logger.debug(f"이미 존재하는 리뷰: {review['review_id']}")
-                        continue
-
-                    # 리뷰 저장
-                    review['crawled_at'] = datetime.now().isoformat()
-                    supabase.table('reviews').insert(review).execute()
-                    saved_count += 1
-                    
-                except Exception as e:
-                    logger.error(f"리뷰 저장 중 오류: {str(e)}")
-                    continue
+            # DB 일괄 저장 (사용량은 호출 측에서 집계)
+            save_stats = ingest_reviews(store_info, reviews, normalize=False, update_usage=False)
+            saved_count = save_stats['saved']
+            for review_id in save_stats['saved_ids']:
+                emit({'event': 'review', 'review_id': review_id, 'status': 'saved'})
+            for review_id in save_stats['duplicate_ids']:
+                emit({'event': 'review', 'review_id': review_id, 'status': 'duplicate'})
             
             logger.info(f"{saved_count}개의 새로운 네이버 리뷰를 저장했습니다.")
             
-            return {
+            return dict({
                 "success": True,
                 "collected": len(reviews),
                 "saved": saved_count
-            }
+            }, **watermark_from_reviews(reviews))
         
     except Exception as e:
         logger.error(f"네이버 단일 매장 리뷰 수집 중 오류: {str(e)}")
@@ -200,6 +185,7 @@ if __name__ == "__main__":
             store_info = crawler_data["store_info"]
             start_date = crawler_data["start_date"]
             end_date = crawler_data["end_date"]
+            cdp_endpoint = crawler_data.get("cdp_endpoint")
             
             # Windows 환경 설정
             if sys.platform == 'win32':
@@ -211,12 +197,12 @@ if __name__ == "__main__":
                 asyncio.set_event_loop(loop)
                 
                 try:
-                    result = loop.run_until_complete(collect_single_store_reviews(store_info, start_date, end_date))
+                    result = loop.run_until_complete(collect_single_store_reviews(store_info, start_date, end_date, cdp_endpoint))
                     print(json.dumps(result, ensure_ascii=False))
                 finally:
                     loop.close()
             else:
-                result = asyncio.run(collect_single_store_reviews(store_info, start_date, end_date))
+                result = asyncio.run(collect_single_store_reviews(store_info, start_date, end_date, cdp_endpoint))
                 print(json.dumps(result, ensure_ascii=False))
                 
         except Exception as e:
@@ -17,6 +17,7 @@ load_dotenv()
 sys.path.append(r"C:\Review_playwright")
 from config.supabase_client import get_supabase_client
 from api.services.encryption import decrypt_password  # 복호화 함수 import
+from api.services.review_ingest import ingest_reviews
 
 def get_baemin_stores():
     """Supabase에서 모든 배민 매장 정보 가져오기"""
@@ -46,98 +47,20 @@ def get_baemin_stores():
     return stores
 
 def save_reviews_to_supabase(store_info: Dict, reviews: List[Dict]) -> Dict[str, int]:
-    """수집한 리뷰를 Supabase에 저장 (동기 버전)"""
-    from config.supabase_client import get_supabase_client
-    
+    """수집한 리뷰를 Supabase에 일괄 저장 (동기 버전)"""
     print(f"\n[DB] {len(reviews)}개 리뷰 저장 시작...")
     
-    # Supabase 클라이언트 직접 사용
-    supabase = get_supabase_client()
-    
-    # 저장 통계
-    saved_count = 0
-    failed_count = 0
-    duplicate_count = 0
-    
-    for review in reviews:
-        try:
-            # 중복 체크
-            existing = supabase.table('reviews').select('review_id').eq('review_id', review['review_id']).execute()
-            
-            if existing.data:
-                print(f"[DB] 중복 리뷰 스킵: {review['review_id']} - {review['review_name']}")
-                duplicate_count += 1
-                continue
-            
-            # DB에 맞게 데이터 정제
-            review_data = {
-                'review_id': review['review_id'],
-                'platform': review['platform'],
-                'platform_code': review['platform_code'],
-                'store_code': review['store_code'],
-                'review_name': review['review_name'],
-                'rating': review['rating'],
-                'review_content': review['review_content'],
-                'review_date': review['review_date'],
-                'ordered_menu': review['ordered_menu'],
-                'delivery_review': review['delivery_review'],
-                'response_status': 'pending',  # 기본값: 미답변 상태
-                'crawled_at': datetime.now().isoformat()
-            }
-            
-            # review_images를 PostgreSQL 배열 형식으로 변환
-            if isinstance(review.get('review_images'), list):
-                # PostgreSQL TEXT[] 형식: {url1,url2,url3}
-                if review['review_images']:
-                    # 리스트가 비어있지 않은 경우
-                    review_data['review_images'] = review['review_images']  # Supabase가 자동 변환
-                else:
-                    # 빈 리스트인 경우
-                    review_data['review_images'] = []
-            else:
-                review_data['review_images'] = []
-            
-            # 리뷰 저장
-            result = supabase.table('reviews').insert(review_data).execute()
-            
-            if result.data:
-                print(f"[DB] 저장 성공: {review['review_id']} - {review['review_name']}")
-                saved_count += 1
-            else:
-                print(f"[DB] 저장 실패: {review['review_id']} - {review['review_name']}")
-                failed_count += 1
-                
-        except Exception as e:
-            print(f"[DB] 저장 중 오류: {review['review_id']} - {str(e)}")
-            failed_count += 1
-    
-    # 사용량 업데이트
-    if saved_count > 0:
-        try:
-            supabase.rpc('update_usage', {
-                'p_user_code': store_info['owner_user_code'],
-                'p_reviews_increment': saved_count,
-                'p_ai_api_calls_increment': 0,
-                'p_web_api_calls_increment': 0,
-                'p_manual_replies_increment': 0,
-                'p_error_increment': 0
-            }).execute()
-        except Exception as e:
-            print(f"[DB] 사용량 업데이트 실패: {str(e)}")
+    save_stats = ingest_reviews(store_info, reviews)
     
     print(f"\n[DB] 저장 완료:")
-    print(f"  - 성공: {saved_count}개")
-    print(f"  - 중복: {duplicate_count}개")
-    print(f"  - 실패: {failed_count}개")
+    print(f"  - 성공: {save_stats['saved']}개")
+    print(f"  - 중복: {save_stats['duplicate']}개")
+    print(f"  - 실패: {save_stats['failed']}개")
     
-    return {
-        'saved': saved_count,
-        'duplicate': duplicate_count,
-        'failed': failed_count
-    }
+    return save_stats
 
-def run_crawler_for_store(store_info, headless=True, debug=False):
-    """특정 매장에 대해 크롤러 실행"""
+def run_crawler_for_store(store_info, headless=True, debug=False, cdp_endpoint=None):
+    """특정 매장에 대해 크롤러 실행 (cdp_endpoint: 브라우저 풀 Chromium 주소)"""
     
     # 복호화된 비밀번호 확인
     if not store_info.get('platform_pw_decrypted'):
@@ -191,7 +114,7 @@ print(f"플랫폼 코드: {store_info['platform_code']}")
 crawler = BaeminSyncReviewCrawler(headless={headless})
 try:
     print("\\n[1단계] 브라우저 시작 중...")
-    crawler.start_browser()
+    crawler.start_browser(cdp_endpoint={cdp_endpoint!r})
     print("[1단계] 브라우저 시작 완료")
     
     # 로그인
@@ -313,8 +236,13 @@ def main():
                 'owner_user_code': 'SYSTEM'  # subprocess 실행시 기본값
             }
             
-            # 크롤러 실행
-            result = run_crawler_for_store(store_info, headless=True, debug=False)
+            # 크롤러 실행 (브라우저 풀 엔드포인트가 전달되면 재사용)
+            result = run_crawler_for_store(
+                store_info,
+                headless=True,
+                debug=False,
+                cdp_endpoint=crawler_data.get('cdp_endpoint')
+            )
             
             # 결과 JSON으로 출력
             if result and 'save_stats' in result:
@@ -12,7 +12,7 @@ import re
 import json
 import logging
 import hashlib
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable
 from datetime import datetime, timedelta
 from pathlib import Path
 from playwright.sync_api import sync_playwright, Page
@@ -34,8 +34,16 @@ except ImportError:
     sys.path.append(root_path)
     from config.supabase_client import get_supabase_client
 
+from api.services.review_ingest import ingest_reviews, watermark_from_reviews
+from api.services.review_id_index import find_known_review_ids
+from api.services.session_store import get_session_store, restore_session_sync, save_session_sync
+from api.utils.page_waits import StepTimer, wait_for_selector, wait_for_url, expect_dom_change
+
 logger = logging.getLogger(__name__)
 
+# 리뷰 목록 영역 (매장/탭/페이지 변경 시 이 영역의 DOM 변경을 기다림, 없으면 body)
+REVIEW_LIST_SELECTOR = 'main'
+
 class YogiyoSyncReviewCrawler:
     """요기요 동기식 리뷰 크롤러 - 사용자 제공 정확한 셀렉터 사용"""
     
@@ -49,6 +57,7 @@ class YogiyoSyncReviewCrawler:
         self.platform_name = 'yogiyo'
         self.reviews_data = []
         self.current_store_info = {}
+        self.timer = StepTimer(self.platform_name)
         
         # 스크린샷 저장 경로
         self.screenshot_dir = Path(f"C:/Review_playwright/logs/screenshots/{self.platform_name}")
@@ -58,8 +67,8 @@ class YogiyoSyncReviewCrawler:
         self.review_screenshot_dir = Path("C:/Review_playwright/logs/screenshots/yogiyo_reviews")
         self.review_screenshot_dir.mkdir(parents=True, exist_ok=True)
         
-    def start_browser(self):
-        """브라우저 시작"""
+    def start_browser(self, cdp_endpoint: Optional[str] = None):
+        """브라우저 시작 (cdp_endpoint가 있으면 브라우저 풀의 Chromium에 연결)"""
         try:
             logger.info(f"Starting {self.platform_name} browser in sync mode (Windows)...")
             
@@ -84,19 +93,15 @@ class YogiyoSyncReviewCrawler:
                 ]
             }
             
-            # 브라우저 시작
-            self.browser = self.playwright.chromium.launch(**launch_options)
-            
-            # 컨텍스트 생성
-            self.context = self.browser.new_context(
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                viewport={'width': 1920, 'height': 1080},
-                ignore_https_errors=True
-            )
+            # 브라우저 시작 (풀 사용 시 이미 떠 있는 Chromium에 연결)
+            if cdp_endpoint:
+                self.browser = self.playwright.chromium.connect_over_cdp(cdp_endpoint)
+                logger.info(f"브라우저 풀 연결: {cdp_endpoint}")
+            else:
+                self.browser = self.playwright.chromium.launch(**launch_options)
             
-            # 페이지 생성
-            self.page = self.context.new_page()
-            self.page.set_default_timeout(60000)
+            # 컨텍스트 및 페이지 생성
+            self._open_context()
             
             logger.info(f"{self.platform_name} browser started successfully")
             return True
@@ -105,6 +110,23 @@ class YogiyoSyncReviewCrawler:
             logger.error(f"Failed to start browser: {str(e)}")
             self.close_browser()
             return False
+    
+    def _open_context(self, storage_state: Optional[Dict[str, Any]] = None):
+        """컨텍스트/페이지 (재)생성 - storage_state가 있으면 저장된 세션 복원"""
+        if self.page:
+            self.page.close()
+        if self.context:
+            self.context.close()
+        
+        self.context = self.browser.new_context(
+            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            viewport={'width': 1920, 'height': 1080},
+            ignore_https_errors=True,
+            storage_state=storage_state
+        )
+        
+        self.page = self.context.new_page()
+        self.page.set_default_timeout(60000)
             
     def close_browser(self):
         """브라우저 종료"""
@@ -153,12 +175,21 @@ class YogiyoSyncReviewCrawler:
             logger.info("요기요 로그인 시작")
             logger.info("=" * 50)
             
+            # 저장된 세션이 살아있으면 로그인 생략
+            saved_state = get_session_store().load(self.platform_name, username)
+            if saved_state:
+                self._open_context(saved_state)
+                if restore_session_sync(self.page, self.platform_name, username):
+                    self.logged_in = True
+                    logger.info("✓ 요기요 저장된 세션 재사용 - 로그인 생략")
+                    return True
+            
             login_url = "https://ceo.yogiyo.co.kr/login/"
             logger.info(f"로그인 URL: {login_url}")
             
             # 로그인 페이지로 이동
-            self.page.goto(login_url, wait_until='networkidle')
-            self.page.wait_for_timeout(3000)
+            self.page.goto(login_url, wait_until='domcontentloaded')
+            wait_for_selector(self.page, 'input[name="username"]')
             logger.info("로그인 페이지 로드 완료")
             
             # 아이디 입력 - 사용자 제공 정확한 셀렉터
@@ -193,8 +224,8 @@ class YogiyoSyncReviewCrawler:
                     logger.error(f"로그인 버튼 클릭 실패: {str(e)} / {str(e2)}")
                     return False
             
-            # 로그인 처리 대기
-            self.page.wait_for_timeout(5000)
+            # 로그인 처리 대기 (로그인 페이지를 벗어나면 바로 진행)
+            wait_for_url(self.page, lambda url: 'login' not in url, ceiling_ms=10000)
             
             # 로그인 성공 확인
             current_url = self.page.url
@@ -203,6 +234,7 @@ class YogiyoSyncReviewCrawler:
             # URL 확인으로 로그인 성공 판단
             if 'ceo.yogiyo.co.kr' in current_url and 'login' not in current_url:
                 self.logged_in = True
+                save_session_sync(self.context, self.platform_name, username)
                 logger.info("=" * 50)
                 logger.info("✓ 요기요 로그인 성공!")
                 logger.info("=" * 50)
@@ -227,7 +259,7 @@ class YogiyoSyncReviewCrawler:
             logger.info(f"리뷰 페이지로 이동: {review_url}")
             
             self.page.goto(review_url, wait_until='networkidle')
-            self.page.wait_for_timeout(3000)
+            wait_for_selector(self.page, 'button.StoreSelector__DropdownButton-sc-1rowjsb-11')
             logger.info("리뷰 페이지 로드 완료")
             
             return True
@@ -249,7 +281,6 @@ class YogiyoSyncReviewCrawler:
                 if dropdown_button and dropdown_button.is_visible():
                     dropdown_button.click()
                     logger.info("드롭다운 버튼 클릭 성공")
-                    self.page.wait_for_timeout(2000)
                 else:
                     logger.error("드롭다운 버튼을 찾을 수 없습니다")
                     return False
@@ -279,9 +310,9 @@ class YogiyoSyncReviewCrawler:
                                 
                                 logger.info(f"매장 발견: {vendor_name} ({vendor_id_text})")
                                 
-                                # 매장 클릭
-                                item.click()
-                                self.page.wait_for_timeout(3000)
+                                # 매장 클릭 (리뷰 목록이 갱신될 때까지 대기)
+                                with expect_dom_change(self.page, REVIEW_LIST_SELECTOR, ceiling_ms=5000):
+                                    item.click()
                                 logger.info(f"매장 선택 성공: {platform_code}")
                                 return True
                     except Exception as e:
@@ -310,9 +341,9 @@ class YogiyoSyncReviewCrawler:
             try:
                 unanswered_tab = self.page.query_selector(unanswered_tab_selector)
                 if unanswered_tab and unanswered_tab.is_visible():
-                    unanswered_tab.click()
+                    with expect_dom_change(self.page, REVIEW_LIST_SELECTOR, ceiling_ms=5000):
+                        unanswered_tab.click()
                     logger.info("미답변 탭 클릭 성공")
-                    self.page.wait_for_timeout(3000)
                     return True
                 else:
                     logger.warning("미답변 탭을 찾을 수 없습니다")
@@ -325,8 +356,15 @@ class YogiyoSyncReviewCrawler:
             logger.error(f"미답변 탭 처리 실패: {str(e)}")
             return False
 
-    def get_reviews_with_pagination(self, platform_code: str, store_code: str, limit: int = 50) -> List[Dict[str, Any]]:
-        """페이지네이션을 통한 리뷰 수집 - 사용자 제공 정확한 셀렉터"""
+    def get_reviews_with_pagination(self, platform_code: str, store_code: str, limit: int = 50,
+                                    known_review_ids: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        페이지네이션을 통한 리뷰 수집 - 사용자 제공 정확한 셀렉터
+
+        Args:
+            known_review_ids: 이전 수집 워터마크의 리뷰 ID (최신순 목록에서 만나면 이후 페이지 탐색 중단)
+        """
+        known_review_ids = set(known_review_ids or [])
         try:
             logger.info(f"========== 요기요 리뷰 수집 시작 ==========")
             logger.info(f"매장 코드: {platform_code}")
@@ -336,29 +374,37 @@ class YogiyoSyncReviewCrawler:
             collected_reviews = []
             
             # 1. 리뷰 페이지로 이동
-            if not self.navigate_to_reviews(platform_code):
+            with self.timer.step('navigate'):
+                navigated = self.navigate_to_reviews(platform_code)
+            if not navigated:
                 logger.error("리뷰 페이지 이동 실패")
                 return []
             
             # 2. 매장 선택
-            if not self.select_store_by_platform_code(platform_code):
+            with self.timer.step('select_store'):
+                selected = self.select_store_by_platform_code(platform_code)
+            if not selected:
                 logger.error("매장 선택 실패")
                 return []
             
             # 3. 미답변 탭 클릭
-            if not self.click_unanswered_tab():
+            with self.timer.step('unanswered_tab'):
+                tab_clicked = self.click_unanswered_tab()
+            if not tab_clicked:
                 logger.warning("미답변 탭 클릭 실패 - 전체 리뷰로 진행")
             
             # 4. 리뷰 수집
             page_num = 1
             max_pages = 10  # 최대 10페이지까지 확장
             empty_page_count = 0  # 빈 페이지 카운트
+            reached_watermark = False  # 이전 수집 지점 도달 여부
             
             while len(collected_reviews) < limit and page_num <= max_pages:
                 logger.info(f"\n========== 요기요 페이지 {page_num} 처리 시작 ==========")
                 
                 # 현재 페이지의 리뷰들 수집
-                reviews_on_page = self._extract_reviews_from_page(platform_code, store_code)
+                with self.timer.step('extract_page'):
+                    reviews_on_page = self._extract_reviews_from_page(platform_code, store_code)
                 
                 if not reviews_on_page:
                     empty_page_count += 1
@@ -371,11 +417,20 @@ class YogiyoSyncReviewCrawler:
                 else:
                     empty_page_count = 0  # 리뷰가 있으면 카운트 리셋
                     
+                    # 이미 저장된 리뷰는 제외 (리뷰 ID 인덱스, Bloom 필터 후보만 DB 확인)
+                    stored_ids = find_known_review_ids('yogiyo', platform_code, [r['review_id'] for r in reviews_on_page])
+                    
                     # 중복 제거하면서 추가
                     new_review_count = 0
                     for review in reviews_on_page:
                         if len(collected_reviews) >= limit:
                             break
+                        # 워터마크 도달: 이후 리뷰는 이미 수집된 리뷰
+                        if review['review_id'] in known_review_ids:
+                            reached_watermark = True
+                            break
+                        if review['review_id'] in stored_ids:
+                            continue
                         # 중복 체크 (날짜와 리뷰 내용으로)
                         is_duplicate = any(
                             r['review_date'] == review['review_date'] and 
@@ -387,14 +442,19 @@ class YogiyoSyncReviewCrawler:
                             collected_reviews.append(review)
                             new_review_count += 1
                     
-                    logger.info(f"페이지 {page_num}: 총 {len(reviews_on_page)}개 중 {new_review_count}개 신규 리뷰 추가")
+                    logger.info(f"페이지 {page_num}: 총 {len(reviews_on_page)}개 중 {new_review_count}개 신규 리뷰 추가 (기존 {len(stored_ids)}개 제외)")
                     logger.info(f"현재까지 총 {len(collected_reviews)}개 리뷰 수집")
                 
+                if reached_watermark:
+                    logger.info("이전 수집 지점 도달 - 수집 종료")
+                    break
+                
                 # 다음 페이지로 이동
                 if len(collected_reviews) < limit and page_num < max_pages:
-                    if self._go_to_next_page():
+                    with self.timer.step('next_page'):
+                        moved = self._go_to_next_page()
+                    if moved:
                         page_num += 1
-                        self.page.wait_for_timeout(3000)
                     else:
                         logger.info("더 이상 페이지가 없습니다 - 수집 종료")
                         break
@@ -589,8 +649,8 @@ class YogiyoSyncReviewCrawler:
             for selector in next_selectors:
                 try:
                     if self.page.is_visible(selector):
-                        self.page.click(selector)
-                        self.page.wait_for_load_state('networkidle')
+                        with expect_dom_change(self.page, REVIEW_LIST_SELECTOR, ceiling_ms=5000):
+                            self.page.click(selector)
                         return True
                 except:
                     continue
@@ -602,7 +662,7 @@ class YogiyoSyncReviewCrawler:
             return False
 
     def save_reviews_to_supabase(self, store_info: Dict, reviews: List[Dict]) -> Dict[str, int]:
-        """수집한 리뷰를 Supabase에 저장"""
+        """수집한 리뷰를 Supabase에 일괄 저장 (in_() 1회로 중복 확인 후 청크 insert)"""
         try:
             if not reviews:
                 logger.info("저장할 리뷰가 없습니다")
@@ -610,81 +670,11 @@ class YogiyoSyncReviewCrawler:
             
             logger.info(f"[DB] {len(reviews)}개 요기요 리뷰 저장 시작...")
             
-            # Supabase 클라이언트 가져오기
-            supabase = get_supabase_client()
-            
-            # 저장 통계
-            saved_count = 0
-            failed_count = 0
-            duplicate_count = 0
-            
-            for review in reviews:
-                try:
-                    # 중복 체크
-                    existing = supabase.table('reviews').select('review_id').eq('review_id', review['review_id']).execute()
-                    
-                    if existing.data:
-                        logger.info(f"[DB] 중복 리뷰 스킵: {review['review_id']} - {review['review_name']}")
-                        duplicate_count += 1
-                        continue
-                    
-                    # DB에 맞게 데이터 정제
-                    review_data = {
-                        'review_id': review['review_id'],
-                        'platform': review['platform'],
-                        'platform_code': review['platform_code'],
-                        'store_code': review['store_code'],
-                        'review_name': review['review_name'],
-                        'rating': review['rating'],
-                        'review_content': review['review_content'],
-                        'review_date': review['review_date'],
-                        'ordered_menu': review['ordered_menu'],
-                        'delivery_review': review.get('delivery_review', ''),
-                        'response_status': 'pending',  # 기본값: 미답변 상태
-                        'crawled_at': datetime.now().isoformat()
-                    }
-                    
-                    # review_images를 PostgreSQL 배열 형식으로 변환
-                    if isinstance(review.get('review_images'), list):
-                        review_data['review_images'] = review['review_images']
-                    else:
-                        review_data['review_images'] = []
-                    
-                    # 리뷰 저장
-                    result = supabase.table('reviews').insert(review_data).execute()
-                    
-                    if result.data:
-                        logger.info(f"[DB] 저장 성공: {review['review_id']} - {review['review_name']}")
-                        saved_count += 1
-                    else:
-                        logger.error(f"[DB] 저장 실패: {review['review_id']} - {review['review_name']}")
-                        failed_count += 1
-                        
-                except Exception as e:
-                    logger.error(f"[DB] 저장 중 오류: {review['review_id']} - {str(e)}")
-                    failed_count += 1
-            
-            # 사용량 업데이트
-            if saved_count > 0:
-                try:
-                    supabase.rpc('update_usage', {
-                        'p_user_code': store_info.get('owner_user_code', 'SYSTEM'),
-                        'p_reviews_increment': saved_count,
-                        'p_ai_api_calls_increment': 0,
-                        'p_web_api_calls_increment': 0,
-                        'p_manual_replies_increment': 0,
-                        'p_error_increment': 0
-                    }).execute()
-                except Exception as e:
-                    logger.error(f"[DB] 사용량 업데이트 실패: {str(e)}")
+            save_stats = ingest_reviews(store_info, reviews)
             
-            logger.info(f"[DB] 요기요 리뷰 저장 완료: 성공 {saved_count}개, 중복 {duplicate_count}개, 실패 {failed_count}개")
+            logger.info(f"[DB] 요기요 리뷰 저장 완료: 성공 {save_stats['saved']}개, 중복 {save_stats['duplicate']}개, 실패 {save_stats['failed']}개")
             
-            return {
-                'saved': saved_count,
-                'duplicate': duplicate_count,
-                'failed': failed_count
-            }
+            return save_stats
             
         except Exception as e:
             logger.error(f"[DB] Supabase 저장 중 오류: {str(e)}")
@@ -694,23 +684,12 @@ class YogiyoSyncReviewCrawler:
         """리뷰 목록 가져오기 - 외부 인터페이스"""
         return self.get_reviews_with_pagination(platform_code, store_code, limit)
 
-    def get_reviews_and_save(self, platform_code: str, store_code: str, store_info: Dict = None, limit: int = 50) -> Dict[str, Any]:
-        """리뷰 수집 후 Supabase에 저장 (중복 필터링)"""
+    def get_reviews_and_save(self, platform_code: str, store_code: str, store_info: Dict = None, limit: int = 50,
+                             known_review_ids: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """리뷰 수집 후 Supabase에 저장 (중복 필터링, known_review_ids 도달 시 수집 중단)"""
         try:
-            # 기존 리뷰 ID 목록 가져오기 (중복 방지)
-            existing_review_ids = set()
-            if store_info:
-                try:
-                    supabase = get_supabase_client()
-                    # 해당 매장의 기존 리뷰 ID 조회
-                    existing_reviews = supabase.table('reviews').select('review_id').eq('platform_code', platform_code).eq('platform', 'yogiyo').execute()
-                    existing_review_ids = {r['review_id'] for r in existing_reviews.data}
-                    logger.info(f"기존 리뷰 {len(existing_review_ids)}개 확인")
-                except Exception as e:
-                    logger.error(f"기존 리뷰 조회 실패: {str(e)}")
-            
             # 리뷰 수집
-            reviews = self.get_reviews_with_pagination(platform_code, store_code, limit)
+            reviews = self.get_reviews_with_pagination(platform_code, store_code, limit, known_review_ids)
             
             if not reviews:
                 return {
@@ -720,27 +699,24 @@ class YogiyoSyncReviewCrawler:
                     'message': '수집된 리뷰가 없습니다'
                 }
             
-            # 중복 필터링
-            new_reviews = [r for r in reviews if r['review_id'] not in existing_review_ids]
-            logger.info(f"전체 {len(reviews)}개 중 신규 {len(new_reviews)}개 리뷰")
-            
-            # Supabase에 저장
-            if store_info and new_reviews:
-                save_stats = self.save_reviews_to_supabase(store_info, new_reviews)
-                return {
+            # Supabase에 저장 (중복 필터링은 일괄 저장에서 수집한 review_id만 조회)
+            if store_info:
+                save_stats = self.save_reviews_to_supabase(store_info, reviews)
+                logger.info(f"전체 {len(reviews)}개 중 신규 {save_stats['saved']}개 리뷰 저장")
+                return dict({
                     'success': True,
                     'collected': len(reviews),
                     'saved': save_stats['saved'],
-                    'duplicate': len(reviews) - len(new_reviews) + save_stats['duplicate'],
+                    'duplicate': save_stats['duplicate'],
                     'failed': save_stats['failed']
-                }
+                }, **watermark_from_reviews(reviews))
             else:
                 return {
                     'success': True,
                     'collected': len(reviews),
                     'saved': 0,
-                    'duplicate': len(reviews) - len(new_reviews),
-                    'message': 'store_info가 없거나 신규 리뷰가 없음'
+                    'duplicate': 0,
+                    'message': 'store_info가 없어 저장하지 않음'
                 }
                 
         except Exception as e:
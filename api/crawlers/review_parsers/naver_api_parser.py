@@ -0,0 +1,245 @@
+"""
+네이버 스마트플레이스 리뷰 API 응답 파서
+리뷰 페이지가 호출하는 리뷰 목록 API(GraphQL/JSON) 응답을 가로채 DOM 대신 응답 데이터로 리뷰를 수집
+
+- 응답 구조/필드명이 바뀌어도 동작하도록 '작성자 + 본문'을 가진 객체 목록을 응답에서 찾아 사용
+- 다음 페이지는 페이지 스크롤로 불러오고, 응답의 다음 페이지 여부(hasMore 등)로 중단 시점 판단
+- 변환 결과는 NaverReviewParser.build_review 입력 형식 (DOM 파싱과 같은 리뷰 ID/DB 형식)
+"""
+import os
+import re
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Any, Optional, List
+
+logger = logging.getLogger(__name__)
+
+# 가로챌 응답 URL (정규식)
+NAVER_REVIEW_API_PATTERN = re.compile(os.getenv(
+    "NAVER_REVIEW_API_PATTERN", r"smartplace\.naver\.com/.*(graphql|review)"
+))
+
+_AUTHOR_KEYS = ('author', 'writer', 'nickname', 'authorName', 'userName')
+_BODY_KEYS = ('body', 'content', 'contents', 'reviewBody', 'text')
+_HAS_MORE_KEYS = ('hasMore', 'hasNext', 'hasNextPage', 'has_more', 'has_next')
+_IS_LAST_KEYS = ('isLast', 'last', 'isLastPage')
+_CURSOR_KEYS = ('nextCursor', 'endCursor', 'cursor', 'after', 'next')
+
+
+def _get(data: Any, *paths: str) -> Any:
+    """'author.nickname' 형태 경로 중 처음으로 값이 있는 것 반환"""
+    for path in paths:
+        value = data
+        for key in path.split('.'):
+            if not isinstance(value, dict):
+                value = None
+                break
+            value = value.get(key)
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def _is_review_item(item: Any) -> bool:
+    return (isinstance(item, dict)
+            and any(key in item for key in _AUTHOR_KEYS)
+            and any(key in item for key in _BODY_KEYS))
+
+
+def find_review_items(payload: Any) -> List[Dict[str, Any]]:
+    """응답에서 리뷰 객체 목록 찾기 (여러 개면 가장 긴 목록)"""
+    best: List[Dict[str, Any]] = []
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            if node and all(_is_review_item(item) for item in node) and len(node) > len(best):
+                best = node
+            else:
+                stack.extend(node)
+        elif isinstance(node, dict):
+            stack.extend(node.values())
+    return best
+
+
+def find_page_info(payload: Any) -> Dict[str, Any]:
+    """응답에서 다음 페이지 여부/커서 찾기 (못 찾으면 has_more=None)"""
+    has_more = None
+    cursor = None
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(item for item in node if isinstance(item, (dict, list)))
+        elif isinstance(node, dict):
+            for key in _HAS_MORE_KEYS:
+                if isinstance(node.get(key), bool) and has_more is None:
+                    has_more = node[key]
+            for key in _IS_LAST_KEYS:
+                if isinstance(node.get(key), bool) and has_more is None:
+                    has_more = not node[key]
+            for key in _CURSOR_KEYS:
+                if isinstance(node.get(key), (str, int)) and cursor is None:
+                    cursor = node[key]
+            stack.extend(value for value in node.values() if isinstance(value, (dict, list)))
+    return {'has_more': has_more, 'cursor': cursor}
+
+
+def _normalize_date(value: Any, parser) -> Optional[str]:
+    """API 날짜 → YYYY-MM-DD (ISO, '2025. 6. 30(월)', '6.30.월' 형식)"""
+    if not value:
+        return None
+    text = str(value).strip()
+    if re.match(r'\d{4}-\d{2}-\d{2}', text):
+        return text[:10]
+    if re.match(r'\d{4}\.\s*\d{1,2}\.\s*\d{1,2}', text):
+        return parser.parse_review_date(text)
+
+    # 연도 없는 '6.30.월' - 올해 기준, 미래 날짜면 작년
+    match = re.match(r'(\d{1,2})\.(\d{1,2})', text)
+    if match:
+        now = datetime.now()
+        month, day = int(match.group(1)), int(match.group(2))
+        year = now.year if (month, day) <= (now.month, now.day) else now.year - 1
+        return f"{year}-{month:02d}-{day:02d}"
+    return None
+
+
+def _normalize_datetime(value: Any, parser) -> Optional[str]:
+    """API 답글 시각 → YYYY-MM-DD HH:MM"""
+    if not value:
+        return None
+    text = str(value).strip()
+    if re.match(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}', text):
+        return f"{text[:10]} {text[11:16]}"
+    return parser.parse_naver_reply_date(text)
+
+
+def _urls(values: Any) -> List[str]:
+    urls = []
+    for value in values or []:
+        if isinstance(value, str):
+            urls.append(value)
+        elif isinstance(value, dict):
+            url = _get(value, 'thumbnail', 'url', 'src', 'imageUrl', 'origin')
+            if url:
+                urls.append(url)
+    return urls
+
+
+def _names(values: Any) -> List[str]:
+    names = []
+    for value in values or []:
+        name = value if isinstance(value, str) else _get(value, 'name', 'displayName', 'keyword', 'text')
+        if name:
+            names.append(str(name))
+    return names
+
+
+def api_item_to_raw(item: Dict[str, Any], parser) -> Dict[str, Any]:
+    """API 리뷰 객체 → build_review 입력 (DOM 추출 레코드와 같은 키)"""
+    rating = _get(item, 'rating', 'score', 'starRating')
+    reply = item.get('reply') if isinstance(item.get('reply'), dict) else None
+    reply_body = _get(reply, 'body', 'content', 'contents') if reply else _get(item, 'replyBody', 'replyContent')
+    reply_time = _get(reply, 'created', 'createdAt', 'createdDate', 'editedAt') if reply else _get(item, 'replyCreated', 'replyDate')
+
+    author = item.get('author') or item.get('writer')
+    reviewer = _get(author, 'nickname', 'name') if isinstance(author, dict) else author
+    reviewer = reviewer or _get(item, 'nickname', 'authorName', 'userName')
+
+    return {
+        'original_id': _get(item, 'id', 'reviewId'),
+        'reviewer': reviewer,
+        'review_date': _normalize_date(_get(item, 'visited', 'visitDate', 'created', 'createdAt', 'createdDate'), parser),
+        'has_rating_elem': rating is not None,
+        'rating_score': str(rating) if rating is not None else None,
+        'content': _get(item, *_BODY_KEYS),
+        'images': _urls(item.get('media') or item.get('images') or item.get('thumbnails')),
+        'keywords': _names(item.get('votedKeywords') or item.get('keywords') or item.get('tags')),
+        'has_reply_write_button': not reply_body,
+        'has_reply': bool(reply_body),
+        'reply_content': reply_body,
+        'response_at': _normalize_datetime(reply_time, parser)
+    }
+
+
+class NaverReviewApiCollector:
+    """
+    리뷰 API 응답 수집기 (page.on('response')에 on_response 등록)
+
+    응답마다 리뷰 객체를 리뷰 ID 기준으로 순서대로 모으고, 새 응답이 오면 wait_for_update가 깨어남
+    """
+
+    def __init__(self, parser, store_code: str):
+        self.parser = parser
+        self.store_code = store_code
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._updated = asyncio.Event()
+        self.responses = 0
+        self.has_more: Optional[bool] = None
+        self.cursor = None
+
+    def reset(self):
+        """필터 변경 등으로 목록이 새로 조회될 때 이전 응답 폐기"""
+        self._records.clear()
+        self._updated.clear()
+        self.responses = 0
+        self.has_more = None
+        self.cursor = None
+
+    @property
+    def count(self) -> int:
+        return len(self._records)
+
+    def records(self) -> List[Dict[str, Any]]:
+        """수집한 레코드 (응답 순서 = 화면 순서, review_id 포함)"""
+        return list(self._records.values())
+
+    def reached(self, known_review_ids: set) -> bool:
+        """이전 수집 지점 리뷰를 이미 받았는지"""
+        return bool(known_review_ids) and any(review_id in known_review_ids for review_id in self._records)
+
+    async def on_response(self, response):
+        if not NAVER_REVIEW_API_PATTERN.search(response.url) or response.status != 200:
+            return
+        if 'json' not in (response.headers.get('content-type') or ''):
+            return
+        try:
+            payload = await response.json()
+        except Exception:
+            return
+
+        items = find_review_items(payload)
+        if not items:
+            return
+
+        for item in items:
+            try:
+                record = api_item_to_raw(item, self.parser)
+            except Exception as e:
+                logger.debug(f"리뷰 API 항목 변환 실패: {str(e)}")
+                continue
+            record['review_id'] = self.parser.generate_review_id(
+                self.store_code, record.get('content') or '', record.get('reviewer') or '익명'
+            )
+            self._records.setdefault(record['review_id'], record)
+
+        page_info = find_page_info(payload)
+        self.has_more = page_info['has_more']
+        self.cursor = page_info['cursor']
+        self.responses += 1
+        logger.info(f"[네이버 API] 리뷰 {len(items)}개 수신 (누적 {self.count}개, 다음 페이지: {self.has_more})")
+        self._updated.set()
+
+    def mark(self):
+        """다음 wait_for_update가 이 시점 이후 응답만 기다리도록"""
+        self._updated.clear()
+
+    async def wait_for_update(self, ceiling_ms: int) -> bool:
+        """mark 이후 리뷰 응답이 올 때까지 대기 (상한 초과 시 False)"""
+        try:
+            await asyncio.wait_for(self._updated.wait(), timeout=ceiling_ms / 1000)
+            return True
+        except asyncio.TimeoutError:
+            return False
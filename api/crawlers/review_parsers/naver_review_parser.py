@@ -4,14 +4,66 @@ DOM에서 리뷰 데이터를 추출하고 DB 형식으로 변환
 """
 import re
 import json
+import asyncio
 import logging
 import hashlib
 from datetime import datetime
 from typing import Dict, Optional, List
 from playwright.async_api import Page, ElementHandle
 
+from api.services.review_ingest import ingest_reviews
+from api.utils.page_waits import expect_dom_change_async
+
 logger = logging.getLogger(__name__)
 
+REVIEW_ITEM_SELECTOR = 'li.pui__X35jYm.Review_pui_review__zhZdn'
+# 본문 더보기 / 키워드 더보기 버튼
+EXPAND_BUTTON_SELECTOR = 'a.pui__wFzIYl[data-pui-click-code="text"], a[data-pui-click-code="rv.keywordmore"]'
+
+# 로드된 리뷰의 본문/키워드 더보기 버튼을 한 번에 클릭 (클릭한 버튼 수 반환)
+EXPAND_REVIEWS_SCRIPT = """
+([itemSelector, buttonSelector]) => {
+    let clicked = 0;
+    for (const item of document.querySelectorAll(itemSelector)) {
+        for (const button of item.querySelectorAll(buttonSelector)) {
+            button.click();
+            clicked++;
+        }
+    }
+    return clicked;
+}
+"""
+
+# 로드된 모든 리뷰의 필드를 한 번에 추출 (parse_review_element와 같은 셀렉터, 텍스트는 inner_text와 같은 innerText)
+EXTRACT_REVIEWS_SCRIPT = """
+(itemSelector) => {
+    const text = (root, selector) => {
+        const el = root && root.querySelector(selector);
+        return el ? el.innerText : null;
+    };
+    return Array.from(document.querySelectorAll(itemSelector)).map(item => {
+        const ratingElem = item.querySelector('[data-pui-rating-score]');
+        const replyContainer = item.querySelector('div.pui__GbW8H7.pui__BDGQvd');
+        return {
+            reviewer: text(item, 'span.pui__NMi-Dp'),
+            date: text(item, 'div.pui__4rEbt5 time'),
+            has_rating_elem: !!ratingElem,
+            rating_score: ratingElem ? ratingElem.getAttribute('data-pui-rating-score') : null,
+            filled_stars: item.querySelectorAll('path[fill="#FFD400"]').length,
+            content: text(item, 'a.pui__xtsQN-'),
+            images: Array.from(item.querySelectorAll('div.Review_img_box__iZRS7 img'))
+                .map(img => img.getAttribute('src')),
+            keywords: Array.from(item.querySelectorAll('div.pui__HLNvmI span.pui__jhpEyP'))
+                .map(span => span.innerText),
+            has_reply_write_button: !!item.querySelector('button[data-area-code="rv.replywrite"]'),
+            has_reply: !!replyContainer,
+            reply_content: text(replyContainer, 'a[data-pui-click-code="rv.replyfold"]'),
+            reply_time: text(replyContainer, 'time')
+        };
+    });
+}
+"""
+
 
 class NaverReviewParser:
     def __init__(self, supabase=None):
@@ -34,6 +86,20 @@ class NaverReviewParser:
         unique_string = f"{store_code}_{reviewer_name}_{review_text[:50]}"
         return hashlib.md5(unique_string.encode()).hexdigest()
     
+    async def peek_review_id(self, review_element: ElementHandle, store_code: str) -> str:
+        """
+        전체 파싱 없이 리뷰 ID만 계산 (parse_review_element와 같은 셀렉터/기본값 사용)
+        
+        이미 저장된 리뷰인지 먼저 확인해 이미지/키워드/답글 추출을 생략하기 위함
+        """
+        reviewer_elem = await review_element.query_selector('span.pui__NMi-Dp')
+        reviewer_name = await reviewer_elem.inner_text() if reviewer_elem else '익명'
+        
+        content_elem = await review_element.query_selector('a.pui__xtsQN-')
+        review_content = await content_elem.inner_text() if content_elem else ''
+        
+        return self.generate_review_id(store_code, review_content, reviewer_name)
+    
     def parse_review_date(self, date_text: str) -> str:
         """
         네이버 날짜 형식을 YYYY-MM-DD로 변환
@@ -127,147 +193,156 @@ class NaverReviewParser:
         try:
             # 리뷰어 이름 추출 - 수정된 셀렉터
             reviewer_elem = await review_element.query_selector('span.pui__NMi-Dp')
-            reviewer_name = await reviewer_elem.inner_text() if reviewer_elem else '익명'
-            
-            # 날짜 추출 - 수정된 셀렉터
             date_elem = await review_element.query_selector('div.pui__4rEbt5 time')
-            if date_elem:
-                review_date_text = await date_elem.inner_text()
-                # "2025. 6. 30(월)" 형식 처리
-                review_date = self.parse_review_date(review_date_text)
-            else:
-                review_date = datetime.now().strftime('%Y-%m-%d')
-            
-            # 별점 추출 - 네이버는 별점이 없을 수 있으므로 NULL 허용
-            rating = None  # 기본값을 NULL로 변경
             rating_elem = await review_element.query_selector('[data-pui-rating-score]')
-            if rating_elem:
-                rating_score = await rating_elem.get_attribute('data-pui-rating-score')
-                if rating_score:
-                    rating = int(rating_score)
-            else:
-                # 대체 방법: 채워진 별 개수 세기
-                filled_stars = await review_element.query_selector_all('path[fill="#FFD400"]')
-                if filled_stars:
-                    rating = len(filled_stars)
-            
-            # 리뷰 내용 추출 - 수정된 셀렉터
             content_elem = await review_element.query_selector('a.pui__xtsQN-')
-            review_content = ''
-            if content_elem:
-                review_content = await content_elem.inner_text()
-            
-            # 이미지 URL 추출 - 수정된 셀렉터
-            image_elems = await review_element.query_selector_all('div.Review_img_box__iZRS7 img')
-            image_urls = []
-            for img_elem in image_elems:
-                img_url = await img_elem.get_attribute('src')
-                if img_url:
-                    image_urls.append(img_url)
-            
-            # 키워드/태그 추출 - 수정된 셀렉터
-            keyword_elems = await review_element.query_selector_all('div.pui__HLNvmI span.pui__jhpEyP')
-            keywords = []
-            for keyword_elem in keyword_elems:
-                keyword_text = await keyword_elem.inner_text()
-                if keyword_text:
-                    keywords.append(keyword_text.strip())
-            
-            # ===== 중요한 수정 부분 시작 =====
-            # 답글 확인 로직 개선
-            response_status = 'pending'  # 기본값
-            ai_response = None
-            response_at = None
-            
-            # 1. 답글 쓰기 버튼 확인
-            reply_write_button = await review_element.query_selector('button[data-area-code="rv.replywrite"]')
-            
-            if reply_write_button:
-                # 답글 쓰기 버튼이 있으면 답글이 없는 상태
-                response_status = 'pending'
-                logger.debug(f"답글 쓰기 버튼 발견 - 답글 없음")
-            else:
-                # 2. 답글 쓰기 버튼이 없으면 답글 영역 확인
-                reply_container = await review_element.query_selector('div.pui__GbW8H7.pui__BDGQvd')
-                
-                if reply_container:
-                    # 답글이 달려있는 경우
-                    response_status = 'posted'
-                    
-                    # 답글 내용 추출
-                    reply_content_elem = await reply_container.query_selector('a[data-pui-click-code="rv.replyfold"]')
-                    if reply_content_elem:
-                        ai_response = await reply_content_elem.inner_text()
-                        logger.debug(f"답글 내용 추출: {ai_response[:50]}...")
-                    
-                    # 답글 작성 시간 추출
-                    reply_time_elem = await reply_container.query_selector('time')
-                    if reply_time_elem:
-                        reply_time_text = await reply_time_elem.inner_text()
-                        response_at = self.parse_naver_reply_date(reply_time_text)
-                        logger.debug(f"답글 작성 시간: {reply_time_text} -> {response_at}")
-                else:
-                    # 답글 쓰기 버튼도 없고 답글도 없는 경우 (예외 상황)
-                    response_status = 'no_button'
-                    logger.warning(f"답글 쓰기 버튼과 답글 모두 없음 - 리뷰어: {reviewer_name}")
-            # ===== 중요한 수정 부분 끝 =====
-            
-            # 리뷰 ID 생성
-            review_id = self.generate_review_id(store_code, review_content, reviewer_name)
-            
-            # platform_code 추출 (URL에서)
-            current_url = page.url
-            # URL 형식: https://new.smartplace.naver.com/bizes/place/{platform_code}/reviews
-            match = re.search(r'/bizes/place/(\d+)', current_url)
-            platform_code = match.group(1) if match else store_code
-            
-            # DB 형식으로 변환
-            db_format = {
-                'review_id': review_id,
-                'store_code': store_code,
-                'platform': 'naver',
-                'platform_code': platform_code,
-                'review_name': reviewer_name,
-                'rating': rating,  # NULL 허용
-                'review_content': review_content,
-                'ordered_menu': None,  # 네이버는 주문 메뉴 정보가 없으므로 NULL
-                'delivery_review': None,  # 네이버는 배달 리뷰 없음
-                'review_date': review_date,
-                'review_images': image_urls,
-                'sentiment_score': None,
-                'review_category': None,
-                'keywords': keywords,  # 키워드는 별도 필드에 저장
-                'urgency_level': 'low',
-                'ai_response': ai_response,  # 수정됨
-                'manual_response': None,
-                'final_response': None,
-                'response_status': response_status,  # 수정됨
-                'response_method': None,
-                'response_at': response_at,  # 수정됨
-                'response_by': None,
-                'response_quality_score': None,
-                'customer_reaction': None,
-                'follow_up_required': False,
-                'boss_reply_needed': rating <= 3 if rating else False,  # rating이 NULL일 수도 있으므로 체크
-                'review_reason': None,
-                'retry_count': 0,
-                'last_retry_at': None,
-                'error_message': None,
-                'processing_duration': None,
-                'crawled_at': datetime.now().isoformat(),  # datetime 객체를 ISO 형식 문자열로 변환
-                'processed_at': None,
-                'is_deleted': False,
-                'deleted_at': None,
-                'notes': None
+            reply_container = await review_element.query_selector('div.pui__GbW8H7.pui__BDGQvd')
+            reply_content_elem = await reply_container.query_selector('a[data-pui-click-code="rv.replyfold"]') if reply_container else None
+            reply_time_elem = await reply_container.query_selector('time') if reply_container else None
+            
+            raw = {
+                'reviewer': await reviewer_elem.inner_text() if reviewer_elem else None,
+                'date': await date_elem.inner_text() if date_elem else None,
+                'has_rating_elem': rating_elem is not None,
+                'rating_score': await rating_elem.get_attribute('data-pui-rating-score') if rating_elem else None,
+                'filled_stars': len(await review_element.query_selector_all('path[fill="#FFD400"]')),
+                'content': await content_elem.inner_text() if content_elem else None,
+                'images': [await img.get_attribute('src') for img in await review_element.query_selector_all('div.Review_img_box__iZRS7 img')],
+                'keywords': [await span.inner_text() for span in await review_element.query_selector_all('div.pui__HLNvmI span.pui__jhpEyP')],
+                'has_reply_write_button': await review_element.query_selector('button[data-area-code="rv.replywrite"]') is not None,
+                'has_reply': reply_container is not None,
+                'reply_content': await reply_content_elem.inner_text() if reply_content_elem else None,
+                'reply_time': await reply_time_elem.inner_text() if reply_time_elem else None
             }
-            
-            logger.debug(f"파싱된 네이버 리뷰: {reviewer_name} - {rating}점 - {review_date} - 답글상태: {response_status}")
-            return db_format
+            return self.build_review(raw, store_code, page.url)
             
         except Exception as e:
             logger.error(f"리뷰 요소 파싱 오류: {e}")
             logger.exception("상세 오류:")
             return None
+    
+    async def expand_reviews(self, page: Page) -> int:
+        """로드된 모든 리뷰의 본문/키워드 더보기를 스크립트 한 번으로 펼침 (펼친 버튼 수 반환)"""
+        if not await page.locator(EXPAND_BUTTON_SELECTOR).count():
+            return 0
+        async with expect_dom_change_async(page, ceiling_ms=3000):
+            clicked = await page.evaluate(EXPAND_REVIEWS_SCRIPT, [REVIEW_ITEM_SELECTOR, EXPAND_BUTTON_SELECTOR])
+        logger.info(f"더보기 {clicked}개 일괄 펼침")
+        return clicked
+    
+    async def extract_reviews(self, page: Page, store_code: str) -> List[Dict]:
+        """
+        로드된 모든 리뷰를 스크립트 한 번으로 추출 (요소/필드마다 브라우저 왕복하지 않음)
+        
+        Returns:
+            List[Dict]: build_review에 넘길 원본 레코드 (review_id 포함, 화면 순서)
+        """
+        records = await page.evaluate(EXTRACT_REVIEWS_SCRIPT, REVIEW_ITEM_SELECTOR)
+        for record in records:
+            record['review_id'] = self.generate_review_id(
+                store_code, record.get('content') or '', record.get('reviewer') or '익명'
+            )
+        return records
+    
+    def build_review(self, raw: Dict, store_code: str, page_url: str) -> Dict:
+        """
+        추출한 원본 필드를 DB 저장 형식으로 변환 (parse_review_element / extract_reviews / 리뷰 API 공통)
+        
+        리뷰 API 레코드는 날짜가 이미 변환되어 review_date / response_at 으로 전달됨
+        """
+        reviewer_name = raw.get('reviewer') or '익명'
+        
+        # "2025. 6. 30(월)" 형식 처리
+        if raw.get('review_date'):
+            review_date = raw['review_date']
+        elif raw.get('date'):
+            review_date = self.parse_review_date(raw['date'])
+        else:
+            review_date = datetime.now().strftime('%Y-%m-%d')
+        
+        # 별점 - 네이버는 별점이 없을 수 있으므로 NULL 허용
+        rating = None
+        if raw.get('has_rating_elem'):
+            if raw.get('rating_score'):
+                rating = int(raw['rating_score'])
+        elif raw.get('filled_stars'):
+            # 대체 방법: 채워진 별 개수
+            rating = raw['filled_stars']
+        
+        review_content = raw.get('content') or ''
+        image_urls = [url for url in raw.get('images') or [] if url]
+        keywords = [keyword.strip() for keyword in raw.get('keywords') or [] if keyword]
+        
+        # 답글 상태: 답글 쓰기 버튼이 있으면 답글 없음, 없으면 답글 영역 확인
+        response_status = 'pending'
+        ai_response = None
+        response_at = None
+        if raw.get('has_reply_write_button'):
+            logger.debug(f"답글 쓰기 버튼 발견 - 답글 없음")
+        elif raw.get('has_reply'):
+            response_status = 'posted'
+            if raw.get('reply_content'):
+                ai_response = raw['reply_content']
+                logger.debug(f"답글 내용 추출: {ai_response[:50]}...")
+            if raw.get('response_at'):
+                response_at = raw['response_at']
+            elif raw.get('reply_time'):
+                response_at = self.parse_naver_reply_date(raw['reply_time'])
+                logger.debug(f"답글 작성 시간: {raw['reply_time']} -> {response_at}")
+        else:
+            # 답글 쓰기 버튼도 없고 답글도 없는 경우 (예외 상황)
+            response_status = 'no_button'
+            logger.warning(f"답글 쓰기 버튼과 답글 모두 없음 - 리뷰어: {reviewer_name}")
+        
+        # 리뷰 ID 생성
+        review_id = self.generate_review_id(store_code, review_content, reviewer_name)
+        
+        # platform_code 추출 (URL 형식: https://new.smartplace.naver.com/bizes/place/{platform_code}/reviews)
+        match = re.search(r'/bizes/place/(\d+)', page_url or '')
+        platform_code = match.group(1) if match else store_code
+        
+        # DB 형식으로 변환
+        db_format = {
+            'review_id': review_id,
+            'store_code': store_code,
+            'platform': 'naver',
+            'platform_code': platform_code,
+            'review_name': reviewer_name,
+            'rating': rating,  # NULL 허용
+            'review_content': review_content,
+            'ordered_menu': None,  # 네이버는 주문 메뉴 정보가 없으므로 NULL
+            'delivery_review': None,  # 네이버는 배달 리뷰 없음
+            'review_date': review_date,
+            'review_images': image_urls,
+            'sentiment_score': None,
+            'review_category': None,
+            'keywords': keywords,  # 키워드는 별도 필드에 저장
+            'urgency_level': 'low',
+            'ai_response': ai_response,
+            'manual_response': None,
+            'final_response': None,
+            'response_status': response_status,
+            'response_method': None,
+            'response_at': response_at,
+            'response_by': None,
+            'response_quality_score': None,
+            'customer_reaction': None,
+            'follow_up_required': False,
+            'boss_reply_needed': rating <= 3 if rating else False,  # rating이 NULL일 수도 있으므로 체크
+            'review_reason': None,
+            'retry_count': 0,
+            'last_retry_at': None,
+            'error_message': None,
+            'processing_duration': None,
+            'crawled_at': datetime.now().isoformat(),  # datetime 객체를 ISO 형식 문자열로 변환
+            'processed_at': None,
+            'is_deleted': False,
+            'deleted_at': None,
+            'notes': None
+        }
+        
+        logger.debug(f"파싱된 네이버 리뷰: {reviewer_name} - {rating}점 - {review_date} - 답글상태: {response_status}")
+        return db_format
         
   
     async def save_reviews(self, reviews: List[Dict], store_code: str) -> Dict:
@@ -281,52 +356,37 @@ class NaverReviewParser:
                     'errors': ['Supabase 서비스 없음']
                 }
             
-            saved_count = 0
             errors = []
             
             logger.info(f"네이버 리뷰 {len(reviews)}개 저장 시작 - store_code: {store_code}")
             
+            valid_reviews = []
             for review in reviews:
-                try:
-                    # 저장 전 데이터 검증
-                    logger.debug(f"저장할 네이버 리뷰 데이터: {review['review_id']} - {review.get('review_name')} - {review.get('rating')}점")
-                    
-                    # 필수 필드 확인 - rating을 제외
-                    required_fields = ['review_id', 'store_code', 'platform', 'review_date']
-                    missing_fields = [f for f in required_fields if f not in review or review[f] is None]
-
-                    if missing_fields:
-                        logger.error(f"필수 필드 누락: {missing_fields}")
-                        errors.append(f"리뷰 {review.get('review_id', 'unknown')}: 필수 필드 누락 - {missing_fields}")
-                        continue
-                    
-                    # is_deleted 필드 명시적 설정
-                    if 'is_deleted' not in review:
-                        review['is_deleted'] = False
-                    
-                    # 저장 시도
-                    result = await self.supabase.save_review(review)
-                    
-                    if result:
-                        saved_count += 1
-                        logger.info(f"네이버 리뷰 저장 성공: {review['review_id']} - {review.get('review_name')} - {review.get('rating')}점")
-                        
-                        # 저장 직후 확인 조회
-                        verify_query = self.supabase.client.table('reviews').select('*').eq('review_id', review['review_id'])
-                        verify_response = await self.supabase._execute_query(verify_query)
-                        
-                        if verify_response.data:
-                            logger.debug(f"저장 확인 - DB에 저장됨: {review['review_id']}")
-                        else:
-                            logger.warning(f"저장 확인 실패 - DB에서 찾을 수 없음: {review['review_id']}")
-                    else:
-                        logger.error(f"리뷰 저장 실패: {review['review_id']}")
-                        errors.append(f"리뷰 {review['review_id']} 저장 실패")
-                        
-                except Exception as e:
-                    logger.error(f"리뷰 저장 오류: {e}")
-                    logger.exception("상세 오류:")
-                    errors.append(f"리뷰 저장 오류: {str(e)}")
+                # 필수 필드 확인 - rating을 제외
+                required_fields = ['review_id', 'store_code', 'platform', 'review_date']
+                missing_fields = [f for f in required_fields if f not in review or review[f] is None]
+                
+                if missing_fields:
+                    logger.error(f"필수 필드 누락: {missing_fields}")
+                    errors.append(f"리뷰 {review.get('review_id', 'unknown')}: 필수 필드 누락 - {missing_fields}")
+                    continue
+                
+                # is_deleted 필드 명시적 설정
+                if 'is_deleted' not in review:
+                    review['is_deleted'] = False
+                valid_reviews.append(review)
+            
+            # 일괄 저장 (중복 확인은 리뷰 ID 인덱스 후보만 DB 조회, 리뷰마다 select/검증 조회하지 않음)
+            loop = asyncio.get_event_loop()
+            save_stats = await loop.run_in_executor(
+                None,
+                lambda: ingest_reviews({}, valid_reviews, normalize=False, update_usage=False)
+            )
+            saved_count = save_stats['saved']
+            if save_stats['duplicate']:
+                logger.info(f"이미 저장된 네이버 리뷰 {save_stats['duplicate']}개 건너뜀")
+            if save_stats['failed']:
+                errors.append(f"리뷰 {save_stats['failed']}개 저장 실패")
             
             # 저장 결과 요약
             logger.info(f"네이버 리뷰 저장 완료 - 성공: {saved_count}/{len(reviews)}")
@@ -6,7 +6,7 @@ import sys
 import asyncio
 import time
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from fastapi import FastAPI, Request, Depends
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
@@ -21,6 +21,7 @@ import traceback
 # 24시간 자동화를 위한 스케줄러 추가
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
 # 서비스 임포트
 from api.services.review_collector_service import ReviewCollectorService
@@ -28,7 +29,18 @@ from api.services.reply_posting_service import ReplyPostingService
 from api.services.ai_service import AIService
 from api.services.supabase_service import SupabaseService, get_supabase_service
 from api.services.encryption import decrypt_password
-from config.openai_client import get_openai_client
+from api.services.browser_pool import get_browser_pool, shutdown_browser_pool
+from api.services.session_store import get_session_store
+from api.services.crawler_worker_pool import get_crawler_worker_pool, shutdown_crawler_worker_pool
+from api.services.reply_cache import get_reply_cache
+from api.services.ai_batch_service import get_ai_batch_service, AI_BATCH_MODE
+from api.services.automation_lease import get_lease_manager
+from api.services.collection_concurrency import get_collection_concurrency, get_reply_posting_concurrency
+from api.services.crawl_scheduler import get_crawl_scheduler, COLLECT_TICK_MINUTES
+from api.services.pipeline_queue import (
+    get_pipeline_queue, enqueue_pipeline_jobs_async, PIPELINE_QUEUE_ENABLED, AI_REPLY_JOBS_ENABLED, JOB_AI_REPLY, JOB_POST_REPLY
+)
+from config.openai_client import get_openai_client, close_async_openai_client, get_openai_limiter_stats, OPENAI_CONCURRENCY
 
 # Windows에서 Playwright 호환성을 위해 SelectorEventLoopPolicy 사용
 # nest_asyncio 적용 전에 설정해야 함
@@ -60,11 +72,12 @@ logger = logging.getLogger(__name__)
 # 스케줄러 생성
 scheduler = AsyncIOScheduler()
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    logger.info("리뷰 자동화 서비스 시작...")
-    
-    # ⭐ 조건부 실행 로직 추가
+# 스케줄러 실행 위치: 'api' - 웹서버 프로세스에서 실행 (기존 방식)
+#                    'worker' - 별도 워커 프로세스(python -m api.worker)에서만 실행, 웹서버는 API만 제공
+SCHEDULER_MODE = os.getenv("SCHEDULER_MODE", "api").lower()
+
+async def start_automation():
+    """자동화 스케줄러 시작 (웹서버 lifespan / 워커 공용)"""
     enable_auto_start = os.getenv("AUTO_START_JOBS", "false").lower() == "true"
     
     if enable_auto_start:
@@ -75,13 +88,36 @@ async def lifespan(app: FastAPI):
         logger.info("🌐 웹서버 모드: 스케줄러만 등록 (즉시 실행 없음)")
         # 스케줄러만 등록, 즉시 실행 안함
         await setup_scheduler_only()
-    
-    yield
-    
+
+async def shutdown_automation():
+    """스케줄러 및 자동화 리소스 정리 (웹서버 lifespan / 워커 공용)"""
     # 스케줄러 종료
     if scheduler.running:
         scheduler.shutdown()
     
+    # 크롤러 워커 및 브라우저 풀 종료 (남아있는 프로세스 정리)
+    await asyncio.get_event_loop().run_in_executor(None, shutdown_crawler_worker_pool)
+    await asyncio.get_event_loop().run_in_executor(None, shutdown_browser_pool)
+    
+    # OpenAI 연결 풀 종료
+    await close_async_openai_client()
+    
+    # 보유 중인 작업 리더 임대 반납
+    await get_lease_manager().release_held_async()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info("리뷰 자동화 서비스 시작...")
+    
+    if SCHEDULER_MODE == 'worker':
+        logger.info("🧩 워커 분리 모드: 스케줄 작업은 워커 프로세스에서 실행 (python -m api.worker)")
+    else:
+        await start_automation()
+    
+    yield
+    
+    await shutdown_automation()
+    
     logger.info("리뷰 자동화 서비스 종료...")
 
 app = FastAPI(
@@ -177,13 +213,14 @@ async def startup_scheduler():
             logger.error(f"초기 답글 등록 실패: {str(e)}")
         
         # 2. 정기 스케줄 설정 (AI 답글 생성이 답글 등록보다 우선)
-        # 3분마다 리뷰 수집
+        # 리뷰 수집 - 주기마다 수집 시점이 된 매장만 (매장별 간격은 리뷰 유입 속도로 결정)
         scheduler.add_job(
             collect_all_reviews_job,
-            trigger=CronTrigger(minute="*/3"),
+            trigger=IntervalTrigger(minutes=COLLECT_TICK_MINUTES),
             id="review_collection",
             args=[review_service],
-            name="리뷰 수집 작업"
+            name="리뷰 수집 작업",
+            max_instances=1
         )
         
         # 30초마다 AI 답글 생성 (우선순위 높임)
@@ -204,9 +241,12 @@ async def startup_scheduler():
             name="답글 등록 작업"
         )
         
+        # 작업 큐 처리 (PIPELINE_QUEUE_ENABLED 사용 시)
+        add_pipeline_queue_job(ai_service, supabase_service, reply_service)
+        
         scheduler.start()
         logger.info("=== 스케줄러가 시작되었습니다 ===")
-        logger.info("자동화 모드: 리뷰 수집(3분), AI 생성(30초), 답글 등록(2분) 간격")
+        logger.info(f"자동화 모드: 리뷰 수집(매장별 유입 속도 기준, {COLLECT_TICK_MINUTES}분 주기 확인), AI 생성(30초), 답글 등록(2분) 간격")
         
     except Exception as e:
         logger.error(f"스케줄러 시작 실패: {str(e)}")
@@ -223,13 +263,14 @@ async def setup_scheduler_only():
         
         logger.info("=== 스케줄러만 등록 시작 (즉시 실행 없음) ===")
         
-        # 1. 리뷰 수집 작업 - 4시간마다 (운영 환경)
+        # 1. 리뷰 수집 작업 - 주기마다 수집 시점이 된 매장만 (매장별 간격은 리뷰 유입 속도로 결정)
         scheduler.add_job(
             collect_all_reviews_job,
-            CronTrigger(hour="*/4"),  # 4시간마다
+            IntervalTrigger(minutes=COLLECT_TICK_MINUTES),
             args=[review_service],
             id="review_collection",
             name="리뷰 수집 작업",
+            max_instances=1,
             replace_existing=True
         )
         
@@ -253,9 +294,12 @@ async def setup_scheduler_only():
             replace_existing=True
         )
         
+        # 4. 작업 큐 처리 (PIPELINE_QUEUE_ENABLED 사용 시)
+        add_pipeline_queue_job(ai_service, supabase_service, reply_service)
+        
         scheduler.start()
         logger.info("=== 스케줄러 등록 완료 (웹서버 모드) ===")
-        logger.info("운영 모드: 리뷰 수집(4시간), AI 생성(30분), 답글 등록(4시간) 간격")
+        logger.info(f"운영 모드: 리뷰 수집(매장별 유입 속도 기준, {COLLECT_TICK_MINUTES}분 주기 확인), AI 생성(30분), 답글 등록(4시간) 간격")
         logger.info("답글 지연: 일반 1일, 사장님확인 2일")
         
     except Exception as e:
@@ -269,7 +313,7 @@ async def collect_all_reviews_job(review_service: ReviewCollectorService):
         logger.info("=== 리뷰 자동 수집 시작 ===")
         start_time = time.time()
         
-        result = await review_service.collect_all_stores_reviews()
+        result = await review_service.collect_all_stores_reviews(due_only=True)
         
         elapsed_time = time.time() - start_time
         logger.info(f"리뷰 수집 완료: {result} (소요시간: {elapsed_time:.2f}초)")
@@ -278,112 +322,332 @@ async def collect_all_reviews_job(review_service: ReviewCollectorService):
         logger.error(f"리뷰 수집 중 오류: {str(e)}")
         logger.error(traceback.format_exc())
 
-# AI 답글 생성 작업
+# 답글 등록 가능 시간 (post_replies_batch_job의 1일/2일 지연 조건과 동일)
+def reply_posting_time(review: dict, boss_review_needed: bool) -> datetime:
+    """리뷰 날짜 기준 일반 1일, 사장님 확인 필요 2일 후 (UTC 시각 - 리뷰 날짜는 서버 로컬 날짜로 해석)"""
+    delay = timedelta(days=2 if boss_review_needed else 1)
+    now = datetime.now(timezone.utc)
+    try:
+        review_date = datetime.fromisoformat(str(review.get('review_date'))[:10])
+    except ValueError:
+        return now + delay
+    return max(now, (review_date + delay).astimezone(timezone.utc))
+
+# AI 답글 생성 결과 저장 (실시간 생성/배치 모드 공용)
+async def save_generated_reply(supabase_service: SupabaseService, review: dict, reply_result: dict) -> dict:
+    """생성된 답글을 저장하고 자동 등록 여부에 따라 리뷰 상태 갱신"""
+    try:
+        if not reply_result['success']:
+            # 답글 생성 실패시 로그 기록
+            logger.error(f"답글 생성 실패: {reply_result.get('error', 'Unknown error')}")
+            return {"success": False, "review_id": review['review_id'], "error": reply_result.get('error')}
+        
+        # 답글 저장 및 상태 업데이트 (수동 시스템과 동일)
+        await supabase_service.save_ai_reply(
+            review['review_id'],
+            reply_result['reply'],
+            reply_result.get('quality_score', 0.8)
+        )
+        
+        # 생성 이력 저장 (수동 시스템과 동일)
+        await supabase_service.save_reply_generation_history(
+            review_id=review['review_id'],
+            user_code='SYSTEM',  # 자동화 시스템
+            generation_type='ai_auto',  # 자동 생성
+            prompt_used=reply_result.get('prompt_used', ''),
+            model_version=reply_result.get('model_used', 'gpt-4o-mini'),
+            generated_content=reply_result['reply'],
+            quality_score=reply_result['quality_score'],
+            processing_time_ms=reply_result.get('processing_time_ms', 0),
+            token_usage=reply_result.get('token_usage', 0),
+            is_selected=True  # 자동화에서는 바로 선택됨
+        )
+        
+        # boss_review_needed, review_reason, urgency_score 처리
+        boss_review_needed = reply_result.get('boss_review_needed', False)
+        review_reason = reply_result.get('review_reason', '')
+        urgency_score = reply_result.get('urgency_score', 0.3)
+        quality_score = reply_result.get('quality_score', 0.8)
+        rating = review.get('rating', 5)
+        
+        # 자동 등록 여부 결정 (스마트 자동화)
+        auto_post_status = 'generated'  # 기본값: 수동 검토 필요
+        
+        # 높은 별점 + 높은 품질 + 사장님 검토 불필요 → 자동 등록 대기
+        if (rating >= 4 and 
+            quality_score >= 0.7 and 
+            not boss_review_needed and
+            urgency_score < 0.5):
+            auto_post_status = 'ready_to_post'  # 자동 등록 대기
+            logger.info(f"리뷰 {review['review_id']} 자동 등록 대기 상태로 설정 (별점: {rating}, 품질: {quality_score:.2f})")
+        else:
+            logger.info(f"리뷰 {review['review_id']} 수동 검토 필요 (별점: {rating}, 품질: {quality_score:.2f}, 사장님검토: {boss_review_needed})")
+        
+        # 상태 업데이트 (수동 시스템과 동일한 방식)
+        await supabase_service.update_review_status(
+            review_id=review['review_id'],
+            status=auto_post_status,
+            reply_content=reply_result['reply'],
+            reply_type='ai_auto',
+            reply_by='AI_AUTO',
+            boss_review_needed=boss_review_needed,  # 파라미터명은 그대로 유지 (메서드에서 boss_reply_needed로 변환)
+            review_reason=review_reason,
+            urgency_score=urgency_score
+        )
+        
+        # 작업 큐 사용 시 답글 등록 지연(일반 1일, 사장님확인 2일) 후 처리되도록 등록 작업 추가
+        await enqueue_pipeline_jobs_async(
+            JOB_POST_REPLY, [review['review_id']], run_after=reply_posting_time(review, boss_review_needed)
+        )
+        
+        return {"success": True, "review_id": review['review_id']}
+        
+    except Exception as e:
+        logger.error(f"AI 답글 저장 실패 - review_id: {review['review_id']}, error: {str(e)}")
+        return {"success": False, "review_id": review['review_id'], "error": str(e)}
+
+# AI 답글 생성 작업 (대상 리뷰를 페이지 단위로 처리, 한 번 실행에 최대 AI_REPLY_MAX_PER_RUN개)
+AI_REPLY_PAGE_SIZE = int(os.getenv("AI_REPLY_PAGE_SIZE", "50"))
+AI_REPLY_MAX_PER_RUN = int(os.getenv("AI_REPLY_MAX_PER_RUN", "500"))
+
+# 작업 큐 처리 간격 / 한 번에 등록할 답글 수 (PIPELINE_QUEUE_ENABLED 사용 시)
+PIPELINE_QUEUE_POLL_SECONDS = int(os.getenv("PIPELINE_QUEUE_POLL_SECONDS", "30"))
+POST_REPLY_BATCH_LIMIT = int(os.getenv("POST_REPLY_BATCH_LIMIT", "20"))
+# 계정별 등록 직전 임대 연장 시 리뷰 1개당 추가 시간 (브라우저 등록이 느린 계정도 처리 중 임대가 만료되지 않도록)
+POST_REPLY_LEASE_SECONDS_PER_REVIEW = int(os.getenv("POST_REPLY_LEASE_SECONDS_PER_REVIEW", "60"))
+
 async def generate_ai_replies_job(ai_service: AIService, supabase_service: SupabaseService):
     """새 리뷰에 대한 AI 답글 자동 생성"""
     try:
+        # 여러 인스턴스 실행 시 리더 인스턴스에서만 실행 (작업 큐 처리는 큐 임대로 분산)
+        if not await get_lease_manager().is_job_leader("ai_reply_generation"):
+            return
+        
         logger.info("=== AI 답글 자동 생성 시작 ===")
         
-        # 답글이 없는 리뷰 조회
-        new_reviews = await supabase_service.get_reviews_without_reply()
+        # 배치 모드: 완료된 배치 결과 반영 + 대기 리뷰를 Batch API로 제출
+        if AI_BATCH_MODE:
+            await get_ai_batch_service(ai_service, supabase_service).run(
+                lambda review, reply_result: save_generated_reply(supabase_service, review, reply_result)
+            )
+            return
         
-        if not new_reviews:
-            logger.info("AI 답글 생성할 새 리뷰가 없습니다")
+        # 작업 큐 모드: 큐에 없는 대상 리뷰를 등록(스윕)한 뒤 큐에서 처리
+        if PIPELINE_QUEUE_ENABLED:
+            await sweep_ai_reply_jobs(supabase_service)
+            await process_ai_reply_jobs(ai_service, supabase_service)
             return
-            
-        logger.info(f"{len(new_reviews)}개 리뷰에 대한 AI 답글 생성 시작")
         
-        # 병렬 처리를 위한 세마포어 (동시 5개)
-        semaphore = asyncio.Semaphore(5)
+        # 병렬 처리를 위한 세마포어 (OpenAI 호출 자체는 공유 클라이언트의 제한기가 RPM/TPM까지 제한)
+        semaphore = asyncio.Semaphore(OPENAI_CONCURRENCY)
         
-        async def generate_with_limit(review):
+        async def generate_with_limit(review, store_rules):
             async with semaphore:
                 try:
-                    # 매장 정책 조회
-                    policy = await supabase_service.get_store_reply_rules(review['store_code'])
-                    
                     # AI 답글 생성
                     reply_result = await ai_service.generate_reply(
                         review_data=review,
-                        store_rules=policy
+                        store_rules=store_rules
                     )
                     
                     # DB에 저장
-                    if reply_result['success']:
-                        # 답글 저장 및 상태 업데이트 (수동 시스템과 동일)
-                        await supabase_service.save_ai_reply(
-                            review['review_id'],
-                            reply_result['reply'],
-                            reply_result.get('quality_score', 0.8)
-                        )
-                        
-                        # 생성 이력 저장 (수동 시스템과 동일)
-                        await supabase_service.save_reply_generation_history(
-                            review_id=review['review_id'],
-                            user_code='SYSTEM',  # 자동화 시스템
-                            generation_type='ai_auto',  # 자동 생성
-                            prompt_used=reply_result.get('prompt_used', ''),
-                            model_version=reply_result.get('model_used', 'gpt-4o-mini'),
-                            generated_content=reply_result['reply'],
-                            quality_score=reply_result['quality_score'],
-                            processing_time_ms=reply_result.get('processing_time_ms', 0),
-                            token_usage=reply_result.get('token_usage', 0),
-                            is_selected=True  # 자동화에서는 바로 선택됨
-                        )
-                        
-                        # boss_review_needed, review_reason, urgency_score 처리
-                        boss_review_needed = reply_result.get('boss_review_needed', False)
-                        review_reason = reply_result.get('review_reason', '')
-                        urgency_score = reply_result.get('urgency_score', 0.3)
-                        quality_score = reply_result.get('quality_score', 0.8)
-                        rating = review.get('rating', 5)
-                        
-                        # 자동 등록 여부 결정 (스마트 자동화)
-                        auto_post_status = 'generated'  # 기본값: 수동 검토 필요
-                        
-                        # 높은 별점 + 높은 품질 + 사장님 검토 불필요 → 자동 등록 대기
-                        if (rating >= 4 and 
-                            quality_score >= 0.7 and 
-                            not boss_review_needed and
-                            urgency_score < 0.5):
-                            auto_post_status = 'ready_to_post'  # 자동 등록 대기
-                            logger.info(f"리뷰 {review['review_id']} 자동 등록 대기 상태로 설정 (별점: {rating}, 품질: {quality_score:.2f})")
-                        else:
-                            logger.info(f"리뷰 {review['review_id']} 수동 검토 필요 (별점: {rating}, 품질: {quality_score:.2f}, 사장님검토: {boss_review_needed})")
-                        
-                        # 상태 업데이트 (수동 시스템과 동일한 방식)
-                        await supabase_service.update_review_status(
-                            review_id=review['review_id'],
-                            status=auto_post_status,
-                            reply_content=reply_result['reply'],
-                            reply_type='ai_auto',
-                            reply_by='AI_AUTO',
-                            boss_review_needed=boss_review_needed,  # 파라미터명은 그대로 유지 (메서드에서 boss_reply_needed로 변환)
-                            review_reason=review_reason,
-                            urgency_score=urgency_score
-                        )
-                    else:
-                        # 답글 생성 실패시 로그 기록
-                        logger.error(f"답글 생성 실패: {reply_result.get('error', 'Unknown error')}")
-                        return {"success": False, "review_id": review['review_id'], "error": reply_result.get('error')}
-                    
-                    return {"success": True, "review_id": review['review_id']}
+                    return await save_generated_reply(supabase_service, review, reply_result)
                     
                 except Exception as e:
                     logger.error(f"AI 답글 생성 실패 - review_id: {review['review_id']}, error: {str(e)}")
                     return {"success": False, "review_id": review['review_id'], "error": str(e)}
         
-        # 모든 리뷰 병렬 처리
-        tasks = [generate_with_limit(review) for review in new_reviews]
-        results = await asyncio.gather(*tasks)
+        # 답글이 없는 리뷰를 페이지 단위로 조회 (실패한 리뷰는 커서가 지나가므로 같은 실행에서 다시 처리하지 않음)
+        total_count = 0
+        success_count = 0
+        after = None
+        while total_count < AI_REPLY_MAX_PER_RUN:
+            new_reviews = await supabase_service.get_reviews_without_reply(
+                limit=min(AI_REPLY_PAGE_SIZE, AI_REPLY_MAX_PER_RUN - total_count),
+                after=after
+            )
+            if not new_reviews:
+                break
+            after = new_reviews[-1]
+            
+            logger.info(f"{len(new_reviews)}개 리뷰에 대한 AI 답글 생성 시작 (누적 {total_count}개 처리)")
+            
+            # 매장 정책 일괄 조회
+            rules_by_store = await supabase_service.get_store_reply_rules_bulk(
+                [review['store_code'] for review in new_reviews]
+            )
+            
+            # 페이지 내 리뷰 병렬 처리
+            tasks = [generate_with_limit(review, rules_by_store[review['store_code']]) for review in new_reviews]
+            results = await asyncio.gather(*tasks)
+            
+            total_count += len(new_reviews)
+            success_count += sum(1 for r in results if r and r.get('success', False))
+        
+        if total_count == 0:
+            logger.info("AI 답글 생성할 새 리뷰가 없습니다")
+            return
         
         # 결과 집계
-        success_count = sum(1 for r in results if r and r.get('success', False))
-        logger.info(f"AI 답글 생성 완료: {success_count}/{len(new_reviews)} 성공")
+        logger.info(f"AI 답글 생성 완료: {success_count}/{total_count} 성공")
         
     except Exception as e:
         logger.error(f"AI 답글 생성 작업 실패: {str(e)}")
 
+# 작업 큐: 수집 시 등록되지 않은 대상 리뷰(큐 도입 전 리뷰, 등록 실패 등)를 AI 답글 작업으로 등록
+async def sweep_ai_reply_jobs(supabase_service: SupabaseService) -> int:
+    """AI 답글 생성 대상 리뷰를 큐에 등록 (이미 진행 중인 작업은 건너뜀)"""
+    queue = get_pipeline_queue()
+    enqueued = 0
+    after = None
+    scanned = 0
+    while scanned < AI_REPLY_MAX_PER_RUN:
+        page = await supabase_service.get_reviews_without_reply(limit=AI_REPLY_PAGE_SIZE, after=after)
+        if not page:
+            break
+        after = page[-1]
+        scanned += len(page)
+        enqueued += await queue.enqueue_async(JOB_AI_REPLY, [review['review_id'] for review in page])
+    
+    if enqueued:
+        logger.info(f"[PipelineQueue] AI 답글 작업 스윕: {enqueued}개 등록")
+    return enqueued
+
+# 작업 큐: AI 답글 생성 작업 처리
+async def process_ai_reply_jobs(ai_service: AIService, supabase_service: SupabaseService) -> dict:
+    """ai_reply 작업을 임대해 답글 생성 (성공 시 save_generated_reply가 등록 작업을 추가)"""
+    queue = get_pipeline_queue()
+    semaphore = asyncio.Semaphore(OPENAI_CONCURRENCY)
+    stats = {"completed": 0, "skipped": 0, "failed": 0}
+    
+    async def process(job, review, store_rules):
+        async with semaphore:
+            try:
+                # 답글이 이미 있거나 자동 답글 대상이 아니게 된 리뷰는 완료 처리
+                if (review is None or review.get('ai_response') or review.get('boss_reply_needed')
+                        or not ai_service._should_generate_reply(review, store_rules)):
+                    await queue.complete_async([job])
+                    stats["skipped"] += 1
+                    return
+                
+                reply_result = await ai_service.generate_reply(review_data=review, store_rules=store_rules)
+                outcome = await save_generated_reply(supabase_service, review, reply_result)
+                
+                if outcome.get('success'):
+                    await queue.complete_async([job])
+                    stats["completed"] += 1
+                else:
+                    await queue.fail_async(job, outcome.get('error') or '답글 생성 실패')
+                    stats["failed"] += 1
+            except Exception as e:
+                logger.error(f"AI 답글 작업 처리 실패 - review_id: {job['review_id']}, error: {str(e)}")
+                await queue.fail_async(job, str(e))
+                stats["failed"] += 1
+    
+    processed = 0
+    while processed < AI_REPLY_MAX_PER_RUN:
+        jobs = await queue.claim_async(JOB_AI_REPLY, min(AI_REPLY_PAGE_SIZE, AI_REPLY_MAX_PER_RUN - processed))
+        if not jobs:
+            break
+        processed += len(jobs)
+        
+        reviews = {review['review_id']: review for review in await supabase_service.get_reviews_by_ids([job['review_id'] for job in jobs])}
+        rules_by_store = await supabase_service.get_store_reply_rules_bulk(
+            [review['store_code'] for review in reviews.values()]
+        )
+        await asyncio.gather(*[
+            process(job, reviews.get(job['review_id']), rules_by_store.get(reviews.get(job['review_id'], {}).get('store_code')))
+            for job in jobs
+        ])
+    
+    if processed:
+        logger.info(f"[PipelineQueue] AI 답글 작업 처리: 완료 {stats['completed']}개, 건너뜀 {stats['skipped']}개, 실패 {stats['failed']}개")
+    return stats
+
+# 작업 큐: 답글 등록 작업 처리
+async def process_post_reply_jobs(reply_service: ReplyPostingService) -> dict:
+    """등록 시간이 된 post_reply 작업을 임대해 계정별로 묶어 등록"""
+    queue = get_pipeline_queue()
+    jobs = await queue.claim_async(JOB_POST_REPLY, POST_REPLY_BATCH_LIMIT)
+    if not jobs:
+        return {"success_count": 0, "fail_count": 0}
+    
+    jobs_by_review = {job['review_id']: job for job in jobs}
+    reviews = await reply_service.supabase.get_reviews_by_ids(list(jobs_by_review.keys()), columns='*')
+    thirty_days_ago = (datetime.now() - timedelta(days=30)).date().isoformat()
+    
+    # 이미 등록/수동 처리됐거나 30일이 지난 리뷰는 등록하지 않고 완료 처리
+    postable = []
+    for review in reviews:
+        if (review.get('response_status') in ('ready_to_post', 'generated')
+                and str(review.get('review_date') or '')[:10] >= thirty_days_ago):
+            postable.append(review)
+    postable_ids = {review['review_id'] for review in postable}
+    await queue.complete_async([job for review_id, job in jobs_by_review.items() if review_id not in postable_ids])
+    
+    if not postable:
+        return {"success_count": 0, "fail_count": 0}
+    
+    # 계정 그룹은 로그인 잠금/브라우저 슬롯을 기다리므로 등록 직전에 그룹 크기만큼 임대를 연장하고,
+    # 리뷰마다 답글을 제출하기 전에 다시 연장해 아직 보유 중인지 확인
+    # (그 사이 임대가 만료돼 다른 워커가 가져간 작업은 등록하지 않음 - 중복 등록 방지)
+    lost_ids = set()
+    
+    async def hold_group(group_reviews: list) -> list:
+        group_jobs = [jobs_by_review[review['review_id']] for review in group_reviews]
+        held = await queue.renew_async(
+            group_jobs, queue.lease_seconds + POST_REPLY_LEASE_SECONDS_PER_REVIEW * len(group_jobs)
+        )
+        lost_ids.update(job['review_id'] for job in group_jobs if job['id'] not in held)
+        return [review for review in group_reviews if jobs_by_review[review['review_id']]['id'] in held]
+    
+    async def still_held(review: dict) -> bool:
+        job = jobs_by_review[review['review_id']]
+        if job['id'] in await queue.renew_async([job]):
+            return True
+        lost_ids.add(review['review_id'])
+        return False
+    
+    result = await post_reviews_by_account(reply_service, postable, before_post=hold_group, should_post=still_held)
+    
+    results_by_review = {item.get('review_id'): item for item in result['results']}
+    for review_id in postable_ids - lost_ids:
+        item = results_by_review.get(review_id)
+        if item and item.get('success'):
+            await queue.complete_async([jobs_by_review[review_id]])
+        else:
+            await queue.fail_async(jobs_by_review[review_id], (item or {}).get('message') or '답글 등록 결과 없음')
+    
+    logger.info(f"[PipelineQueue] 답글 등록 작업 처리: {result['success_count']}개 성공, {result['fail_count']}개 실패")
+    return result
+
+# 작업 큐 처리 주기 작업 (AI 답글 생성 → 답글 등록 순)
+async def drain_pipeline_queue_job(ai_service: AIService, supabase_service: SupabaseService, reply_service: ReplyPostingService):
+    """작업 큐에 쌓인 AI 답글/답글 등록 작업 처리"""
+    try:
+        # 배치 모드에서는 AI 답글을 ai_batch_service가 생성 (ai_reply 작업 미사용)
+        if AI_REPLY_JOBS_ENABLED:
+            await process_ai_reply_jobs(ai_service, supabase_service)
+        await process_post_reply_jobs(reply_service)
+    except Exception as e:
+        logger.error(f"작업 큐 처리 실패: {str(e)}")
+        logger.error(traceback.format_exc())
+
+def add_pipeline_queue_job(ai_service: AIService, supabase_service: SupabaseService, reply_service: ReplyPostingService):
+    """작업 큐 사용 시 큐 처리 작업 등록"""
+    if not PIPELINE_QUEUE_ENABLED:
+        return
+    scheduler.add_job(
+        drain_pipeline_queue_job,
+        IntervalTrigger(seconds=PIPELINE_QUEUE_POLL_SECONDS),
+        args=[ai_service, supabase_service, reply_service],
+        id="pipeline_queue",
+        name="작업 큐 처리",
+        max_instances=1,
+        replace_existing=True
+    )
+    logger.info(f"작업 큐 처리: {PIPELINE_QUEUE_POLL_SECONDS}초 간격")
+
 # 단일 리뷰 AI 답글 생성 헬퍼 함수
 async def generate_single_reply(ai_service: AIService, supabase_service: SupabaseService, review: dict):
     """단일 리뷰에 대한 AI 답글 생성"""
@@ -439,9 +703,143 @@ async def generate_single_reply(ai_service: AIService, supabase_service: Supabas
         logger.error(f"리뷰 {review['review_id']} 답글 생성 실패: {str(e)}")
         raise
 
+# 계정(플랫폼+매장)별로 묶어 답글 일괄 등록
+async def post_reviews_by_account(reply_service: ReplyPostingService, all_reviews: list, before_post=None, should_post=None) -> dict:
+    """리뷰를 플랫폼 계정별로 그룹핑해 한 번 로그인으로 등록 - {success_count, fail_count, results}
+
+    before_post: 그룹 등록 직전(로그인 잠금/슬롯 획득 후) 호출되는 async 함수, 실제로 등록할 리뷰 목록 반환
+    should_post: 리뷰마다 등록 직전 호출되는 async 함수, False면 그 리뷰는 건너뜀
+    """
+    supabase = reply_service.supabase
+    
+    # 플랫폼별 그룹핑으로 효율적 처리
+    success_count = 0
+    fail_count = 0
+    results = []
+    
+    # 매장 정보 한 번만 조회 (platform_reply_rules에서)
+    try:
+        # platform_reply_rules 테이블에서 직접 조회
+        stores_query = supabase.client.table('platform_reply_rules').select('*').eq('is_active', True)
+        stores_response = await supabase._execute_query(stores_query)
+        
+        if not stores_response.data:
+            logger.warning("활성화된 매장이 없습니다")
+            return {"success_count": 0, "fail_count": len(all_reviews), "results": []}
+        
+        store_map = {store['store_code']: store for store in stores_response.data}
+        logger.info(f"매장 정보 조회 성공: {len(store_map)}개 매장")
+        
+    except Exception as e:
+        logger.error(f"매장 정보 조회 실패: {str(e)}")
+        return {"success_count": 0, "fail_count": len(all_reviews), "results": []}
+    
+    # 플랫폼별로 그룹핑
+    platform_groups = {}
+    for review in all_reviews:
+        platform = review.get('platform')
+        platform_code = review.get('platform_code')
+        store_code = review.get('store_code')
+        
+        if not all([platform, platform_code, store_code]):
+            logger.error(f"필수 정보 누락: {review['review_id']}")
+            fail_count += 1
+            results.append({'review_id': review['review_id'], 'success': False, 'message': '필수 정보 누락'})
+            continue
+            
+        # 매장 정보 확인
+        store_info = store_map.get(store_code)
+        if not store_info:
+            logger.error(f"매장 정보 없음: {store_code}")
+            fail_count += 1
+            results.append({'review_id': review['review_id'], 'success': False, 'message': '매장 정보 없음'})
+            continue
+        
+        # 플랫폼+계정별로 그룹핑 (매장 정보 포함)
+        group_key = f"{platform}_{platform_code}"
+        if group_key not in platform_groups:
+            # 비밀번호 복호화
+            encrypted_pw = store_info.get('platform_pw', '')
+            decrypted_pw = decrypt_password(encrypted_pw) if encrypted_pw else ''
+            
+            # 복호화된 매장 정보 생성
+            decrypted_store_info = store_info.copy()
+            decrypted_store_info['platform_pw'] = decrypted_pw
+            
+            platform_groups[group_key] = {
+                'platform': platform,
+                'platform_code': platform_code,
+                'store_info': decrypted_store_info,  # 복호화된 매장 정보 포함
+                'platform_id': store_info.get('platform_id'),
+                'platform_pw': decrypted_pw,  # 복호화된 비밀번호
+                'store_name': store_info.get('store_name'),
+                'user_code': store_info.get('owner_user_code'),  # 올바른 필드명
+                'reviews': []
+            }
+            
+            logger.info(f"비밀번호 복호화 완료: {platform_code} (암호화: {len(encrypted_pw)}자 -> 복호화: {len(decrypted_pw)}자)")
+        platform_groups[group_key]['reviews'].append(review)
+    
+    logger.info(f"플랫폼별 그룹핑 완료: {len(platform_groups)}개 그룹")
+    
+    # 그룹(계정)별 일괄 처리를 동시에 실행 (플랫폼별/전체 브라우저 한도 내에서)
+    concurrency = get_reply_posting_concurrency()
+    # 같은 로그인 계정을 쓰는 매장들은 동시 로그인 충돌을 피하도록 순차 처리
+    login_locks = {}
+    
+    async def post_group(group_key, group_data):
+        platform = group_data['platform']
+        platform_code = group_data['platform_code']
+        reviews = group_data['reviews']
+        login_lock = login_locks.setdefault(f"{platform}_{group_data['platform_id']}", asyncio.Lock())
+        
+        async with login_lock:
+            async with concurrency.slot(platform):
+                if before_post:
+                    reviews = await before_post(reviews)
+                    if not reviews:
+                        return {"success_count": 0, "fail_count": 0, "results": []}
+                logger.info(f"=== {platform} ({platform_code}) 일괄 처리 시작: {len(reviews)}개 리뷰 ===")
+                started = time.time()
+                
+                # 플랫폼별 일괄 처리 (매장 정보 포함)
+                result = await reply_service.post_batch_replies_by_platform(
+                    platform=platform,
+                    platform_code=platform_code,
+                    user_code=group_data['user_code'],
+                    reviews=reviews,
+                    store_info=group_data['store_info'],  # 매장 정보 직접 전달
+                    should_post=should_post
+                )
+                concurrency.record(platform, time.time() - started, result)
+        
+        logger.info(f"{platform} ({platform_code}) 완료: {result.get('success_count', 0)}개 성공, {result.get('fail_count', 0)}개 실패")
+        return result
+    
+    group_items = list(platform_groups.items())
+    group_results = await asyncio.gather(
+        *(post_group(group_key, group_data) for group_key, group_data in group_items),
+        return_exceptions=True
+    )
+    
+    for (group_key, group_data), result in zip(group_items, group_results):
+        if isinstance(result, Exception):
+            logger.error(f"플랫폼 일괄 처리 실패 - {group_key}: {str(result)}")
+            fail_count += len(group_data['reviews'])
+            continue
+        success_count += result.get('success_count', 0)
+        fail_count += result.get('fail_count', 0)
+        results.extend(result.get('results', []))
+    
+    return {"success_count": success_count, "fail_count": fail_count, "results": results}
+
 async def post_replies_batch_job(reply_service: ReplyPostingService):
     """생성된 AI 답글을 일괄 등록 - 1일/2일 지연 로직 적용"""
     try:
+        # 여러 인스턴스 실행 시 리더 인스턴스에서만 실행
+        if not await get_lease_manager().is_job_leader("reply_posting"):
+            return
+        
         logger.info("=== 답글 일괄 등록 시작 ===")
         
         supabase = reply_service.supabase
@@ -492,103 +890,15 @@ async def post_replies_batch_job(reply_service: ReplyPostingService):
         logger.info(f"답글 등록 대상: 일반 {len(normal_replies.data if normal_replies.data else [])}개, "
                    f"사장님확인 {len(boss_review_replies.data if boss_review_replies.data else [])}개")
         
-        # 플랫폼별 그룹핑으로 효율적 처리
-        success_count = 0
-        fail_count = 0
-        
-        # 매장 정보 한 번만 조회 (platform_reply_rules에서)
-        try:
-            # platform_reply_rules 테이블에서 직접 조회
-            stores_query = supabase.client.table('platform_reply_rules').select('*').eq('is_active', True)
-            stores_response = await supabase._execute_query(stores_query)
-            
-            if not stores_response.data:
-                logger.warning("활성화된 매장이 없습니다")
-                return
-            
-            store_map = {store['store_code']: store for store in stores_response.data}
-            logger.info(f"매장 정보 조회 성공: {len(store_map)}개 매장")
-            
-        except Exception as e:
-            logger.error(f"매장 정보 조회 실패: {str(e)}")
+        # 작업 큐 모드: 등록 작업으로 넘기고 큐 처리 작업에서 등록 (큐 도입 전 답글, 등록 작업 누락분 보완)
+        if PIPELINE_QUEUE_ENABLED:
+            enqueued = await get_pipeline_queue().enqueue_async(JOB_POST_REPLY, [review['review_id'] for review in all_reviews])
+            logger.info(f"[PipelineQueue] 답글 등록 작업 스윕: {enqueued}개 등록")
             return
         
-        # 플랫폼별로 그룹핑
-        platform_groups = {}
-        for review in all_reviews:
-            platform = review.get('platform')
-            platform_code = review.get('platform_code')
-            store_code = review.get('store_code')
-            
-            if not all([platform, platform_code, store_code]):
-                logger.error(f"필수 정보 누락: {review['review_id']}")
-                fail_count += 1
-                continue
-                
-            # 매장 정보 확인
-            store_info = store_map.get(store_code)
-            if not store_info:
-                logger.error(f"매장 정보 없음: {store_code}")
-                fail_count += 1
-                continue
-            
-            # 플랫폼+계정별로 그룹핑 (매장 정보 포함)
-            group_key = f"{platform}_{platform_code}"
-            if group_key not in platform_groups:
-                # 비밀번호 복호화
-                encrypted_pw = store_info.get('platform_pw', '')
-                decrypted_pw = decrypt_password(encrypted_pw) if encrypted_pw else ''
-                
-                # 복호화된 매장 정보 생성
-                decrypted_store_info = store_info.copy()
-                decrypted_store_info['platform_pw'] = decrypted_pw
-                
-                platform_groups[group_key] = {
-                    'platform': platform,
-                    'platform_code': platform_code,
-                    'store_info': decrypted_store_info,  # 복호화된 매장 정보 포함
-                    'platform_id': store_info.get('platform_id'),
-                    'platform_pw': decrypted_pw,  # 복호화된 비밀번호
-                    'store_name': store_info.get('store_name'),
-                    'user_code': store_info.get('owner_user_code'),  # 올바른 필드명
-                    'reviews': []
-                }
-                
-                logger.info(f"비밀번호 복호화 완료: {platform_code} (암호화: {len(encrypted_pw)}자 -> 복호화: {len(decrypted_pw)}자)")
-            platform_groups[group_key]['reviews'].append(review)
-        
-        logger.info(f"플랫폼별 그룹핑 완료: {len(platform_groups)}개 그룹")
-        
-        # 각 플랫폼별로 일괄 처리
-        for group_key, group_data in platform_groups.items():
-            try:
-                platform = group_data['platform']
-                platform_code = group_data['platform_code']
-                user_code = group_data['user_code']
-                reviews = group_data['reviews']
-                
-                logger.info(f"=== {platform} ({platform_code}) 일괄 처리 시작: {len(reviews)}개 리뷰 ===")
-                
-                # 플랫폼별 일괄 처리 (매장 정보 포함)
-                result = await reply_service.post_batch_replies_by_platform(
-                    platform=platform,
-                    platform_code=platform_code,
-                    user_code=user_code,
-                    reviews=reviews,
-                    store_info=group_data['store_info']  # 매장 정보 직접 전달
-                )
-                
-                batch_success = result.get('success_count', 0)
-                batch_fail = result.get('fail_count', 0)
-                
-                success_count += batch_success
-                fail_count += batch_fail
-                
-                logger.info(f"{platform} ({platform_code}) 완료: {batch_success}개 성공, {batch_fail}개 실패")
-                
-            except Exception as e:
-                logger.error(f"플랫폼 일괄 처리 실패 - {group_key}: {str(e)}")
-                fail_count += len(group_data['reviews'])
+        result = await post_reviews_by_account(reply_service, all_reviews)
+        success_count = result['success_count']
+        fail_count = result['fail_count']
         
         logger.info(f"전체 답글 일괄 등록 완료: {success_count}개 성공, {fail_count}개 실패")
             
@@ -642,11 +952,47 @@ async def scheduler_status():
         })
     
     return {
+        "scheduler_mode": SCHEDULER_MODE,
         "scheduler_running": scheduler.running,
         "jobs": jobs,
+        "browser_pool": get_browser_pool().get_stats(),
+        "crawler_workers": get_crawler_worker_pool().get_stats(),
+        "collection_concurrency": get_collection_concurrency().get_stats(),
+        "reply_posting_concurrency": get_reply_posting_concurrency().get_stats(),
+        "session_store": get_session_store().get_stats(),
+        "openai": get_openai_limiter_stats(),
+        "reply_cache": get_reply_cache().get_stats(),
+        "pipeline_queue": get_pipeline_queue().get_stats(),
+        "leases": get_lease_manager().get_stats(),
+        "crawl_scheduler": get_crawl_scheduler().get_stats(),
+        "current_time": datetime.now().isoformat()
+    }
+
+# 매장별 수집 신선도 API
+@app.get("/api/scheduler/freshness")
+async def crawl_freshness():
+    """매장별 리뷰 유입 속도, 수집 간격, 예상 수집 지연"""
+    review_service = ReviewCollectorService(get_supabase_service())
+    stores, watermarks = await review_service.get_crawl_schedule_inputs()
+    return {
+        "scheduler": get_crawl_scheduler().get_stats(),
+        "stores": get_crawl_scheduler().freshness_report(stores, watermarks),
         "current_time": datetime.now().isoformat()
     }
 
+# 격리된 작업 큐 작업 재등록 API
+@app.post("/api/pipeline/requeue-dead/{job_type}")
+async def requeue_dead_pipeline_jobs(job_type: str):
+    """재시도 횟수를 넘겨 격리된 작업(ai_reply/post_reply)을 다시 대기 상태로"""
+    if job_type not in (JOB_AI_REPLY, JOB_POST_REPLY):
+        return {"success": False, "error": f"Unknown job type: {job_type}"}
+    try:
+        requeued = await get_pipeline_queue().requeue_dead_async(job_type)
+        return {"success": True, "job_type": job_type, "requeued": requeued}
+    except Exception as e:
+        logger.error(f"격리 작업 재등록 실패 ({job_type}): {str(e)}")
+        return {"success": False, "error": str(e)}
+
 # 스케줄러 작업 수동 실행 API
 @app.post("/api/scheduler/run/{job_id}")
 async def run_scheduler_job(job_id: str):
@@ -732,6 +1078,7 @@ async def list_endpoints():
         },
         "24시간_자동화_엔드포인트": {
             "스케줄러_상태": "GET /api/scheduler/status",
+            "수집_신선도": "GET /api/scheduler/freshness",
             "작업_수동_실행": "POST /api/scheduler/run/{job_id}"
         },
         "테스트용_엔드포인트": {
@@ -21,6 +21,7 @@ from api.schemas.store import (
 )
 from api.schemas.auth import User
 from api.services.encryption import encrypt_password, decrypt_password
+from api.services.supabase_service import invalidate_store_rules_cache
 from api.crawlers import get_crawler
 
 router = APIRouter(prefix="/api/stores", tags=["stores"])
@@ -595,6 +596,8 @@ async def update_store(
             return response
         
         await update()
+        # AI 답글 생성 시 변경된 정책이 바로 반영되도록 캐시 무효화
+        invalidate_store_rules_cache(store_code)
     
     # 업데이트된 정보 반환
     return await get_store_info(store_code, db)
@@ -627,6 +630,7 @@ async def delete_store(
         return response
     
     await deactivate()
+    invalidate_store_rules_cache(store_code)
     
     return {"message": "매장이 성공적으로 삭제되었습니다."}
 
@@ -0,0 +1,310 @@
+"""
+AI 답글 배치 생성 서비스 (OpenAI Batch API)
+AI_BATCH_MODE=true면 generate_ai_replies_job이 리뷰마다 실시간 호출하는 대신
+대기 리뷰를 JSONL 배치로 제출하고, 다음 작업 실행 때 완료된 배치 결과를 반영
+(답글 등록은 1일 지연 후이므로 최대 24시간 완료 창 안에서 처리해도 충분)
+
+AI_BATCH_BACKEND=fake면 OpenAI 없이 즉시 완료되는 로컬 가짜 배치 엔드포인트 사용 (테스트용)
+AI_BATCH_BASE_URL로 Batch API 호환 로컬 서버를 지정할 수도 있음
+"""
+import os
+import json
+import uuid
+import logging
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Callable, Awaitable
+
+from dotenv import load_dotenv
+
+from config.openai_client import get_async_openai_client
+from .ai_service import AIService
+from .supabase_service import SupabaseService, AI_REPLY_REVIEW_COLUMNS
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+AI_BATCH_MODE = os.getenv("AI_BATCH_MODE", "false").lower() == "true"
+AI_BATCH_BACKEND = os.getenv("AI_BATCH_BACKEND", "openai")
+AI_BATCH_BASE_URL = os.getenv("AI_BATCH_BASE_URL")
+AI_BATCH_MIN_SIZE = int(os.getenv("AI_BATCH_MIN_SIZE", "1"))
+AI_BATCH_MAX_SIZE = int(os.getenv("AI_BATCH_MAX_SIZE", "2000"))
+AI_BATCH_PAGE_SIZE = int(os.getenv("AI_BATCH_PAGE_SIZE", "500"))
+
+# 결과 파일이 생기는 배치 종료 상태 (expired도 완료된 요청은 결과 파일에 포함됨)
+TERMINAL_STATUSES = ('completed', 'failed', 'expired', 'cancelled')
+
+ApplyResult = Callable[[Dict[str, Any], Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+class OpenAIBatchBackend:
+    """OpenAI Batch API 호출 (파일 업로드 → 배치 생성 → 상태 조회 → 결과 다운로드)"""
+
+    def __init__(self, base_url: Optional[str] = None):
+        self.base_url = base_url
+        self._base_url_client = None
+
+    def _client(self):
+        if not self.base_url:
+            return get_async_openai_client()
+        if self._base_url_client is None:
+            from openai import AsyncOpenAI
+            self._base_url_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY", "fake-key"), base_url=self.base_url)
+        return self._base_url_client
+
+    async def submit(self, requests: List[Dict[str, Any]], metadata: Dict[str, str]) -> Dict[str, Any]:
+        client = self._client()
+        payload = '\n'.join(json.dumps(request, ensure_ascii=False) for request in requests).encode('utf-8')
+        input_file = await client.files.create(file=('ai_replies.jsonl', payload), purpose='batch')
+        batch = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint='/v1/chat/completions',
+            completion_window='24h',
+            metadata=metadata
+        )
+        return {'batch_id': batch.id, 'status': batch.status, 'input_file_id': input_file.id}
+
+    async def cancel(self, batch_id: str):
+        await self._client().batches.cancel(batch_id)
+
+    async def retrieve(self, batch_id: str) -> Dict[str, Any]:
+        batch = await self._client().batches.retrieve(batch_id)
+        return {'status': batch.status, 'output_file_id': batch.output_file_id}
+
+    async def download(self, file_id: str) -> List[Dict[str, Any]]:
+        content = await self._client().files.content(file_id)
+        return [json.loads(line) for line in content.text.splitlines() if line.strip()]
+
+
+class FakeBatchBackend:
+    """
+    로컬 가짜 배치 엔드포인트 (테스트용)
+
+    제출 즉시 completed 상태가 되며, 모든 요청에 고정 답글 JSON을 돌려줍니다.
+    """
+
+    def __init__(self, reply: Optional[str] = None):
+        self.reply = reply or os.getenv(
+            "AI_BATCH_FAKE_REPLY",
+            "고객님, 소중한 리뷰 남겨주셔서 진심으로 감사드립니다. 앞으로도 정성을 다해 맛있는 음식으로 보답하겠습니다."
+        )
+        self._batches: Dict[str, List[Dict[str, Any]]] = {}
+
+    async def submit(self, requests: List[Dict[str, Any]], metadata: Dict[str, str]) -> Dict[str, Any]:
+        batch_id = f"batch_fake_{uuid.uuid4().hex[:12]}"
+        self._batches[batch_id] = requests
+        return {'batch_id': batch_id, 'status': 'validating', 'input_file_id': f"file_fake_{uuid.uuid4().hex[:12]}"}
+
+    async def cancel(self, batch_id: str):
+        self._batches.pop(batch_id, None)
+
+    async def retrieve(self, batch_id: str) -> Dict[str, Any]:
+        if batch_id not in self._batches:
+            return {'status': 'expired', 'output_file_id': None}
+        return {'status': 'completed', 'output_file_id': batch_id}
+
+    async def download(self, file_id: str) -> List[Dict[str, Any]]:
+        content = json.dumps({
+            'reply': self.reply,
+            'boss_review_needed': False,
+            'reason': '',
+            'urgency_score': 0.2
+        }, ensure_ascii=False)
+        return [{
+            'custom_id': request['custom_id'],
+            'response': {
+                'status_code': 200,
+                'body': {
+                    'choices': [{'message': {'role': 'assistant', 'content': content}}],
+                    'usage': {'total_tokens': 0}
+                }
+            },
+            'error': None
+        } for request in self._batches.pop(file_id, [])]
+
+
+class AIReplyBatchService:
+    """
+    배치 모드 답글 생성
+
+    run() 한 번에:
+    1. 진행 중인 배치 상태 조회 → 종료된 배치 결과를 apply_result로 반영
+       (파싱 실패/품질 미달 결과는 실시간 generate_reply로 재생성)
+    2. 진행 중인 배치에 없는 대기 리뷰를 새 배치로 제출 (캐시 적중 리뷰는 즉시 반영)
+    """
+
+    def __init__(self, ai_service: AIService, supabase_service: SupabaseService, backend=None):
+        self.ai_service = ai_service
+        self.supabase = supabase_service
+        self.backend = backend or self._create_backend()
+
+    @staticmethod
+    def _create_backend():
+        if AI_BATCH_BACKEND == 'fake':
+            logger.info("[AIBatch] 가짜 배치 엔드포인트 사용")
+            return FakeBatchBackend()
+        return OpenAIBatchBackend(AI_BATCH_BASE_URL)
+
+    async def run(self, apply_result: ApplyResult) -> Dict[str, Any]:
+        """배치 결과 반영 후 새 배치 제출"""
+        stats = {'applied': 0, 'failed': 0, 'cached': 0, 'submitted': 0, 'open_batches': 0}
+
+        open_batches = await self.supabase.get_open_ai_reply_batches()
+        in_flight_ids = set()
+        for batch in open_batches:
+            finished = await self._poll_batch(batch, apply_result, stats)
+            if not finished:
+                stats['open_batches'] += 1
+                in_flight_ids.update(batch.get('review_ids') or [])
+
+        await self._submit_pending(in_flight_ids, apply_result, stats)
+
+        logger.info(f"[AIBatch] 반영 {stats['applied']}개, 실패 {stats['failed']}개, 캐시 {stats['cached']}개, "
+                    f"제출 {stats['submitted']}개, 진행 중 배치 {stats['open_batches']}개")
+        return stats
+
+    async def _poll_batch(self, batch: Dict[str, Any], apply_result: ApplyResult, stats: Dict[str, Any]) -> bool:
+        """배치 상태 확인 후 종료됐으면 결과 반영 (종료 여부 반환)"""
+        batch_id = batch['batch_id']
+        try:
+            remote = await self.backend.retrieve(batch_id)
+        except Exception as e:
+            logger.error(f"[AIBatch] 배치 {batch_id} 상태 조회 실패: {str(e)}")
+            return False
+
+        status = remote.get('status')
+        if status not in TERMINAL_STATUSES:
+            if status != batch.get('status'):
+                await self.supabase.update_ai_reply_batch(batch_id, status=status)
+            return False
+
+        applied = 0
+        error_message = None
+        output_file_id = remote.get('output_file_id')
+        if output_file_id:
+            try:
+                lines = await self.backend.download(output_file_id)
+                applied = await self._apply_output(lines, apply_result, stats)
+            except Exception as e:
+                error_message = f"결과 반영 실패: {str(e)}"
+                logger.error(f"[AIBatch] 배치 {batch_id} {error_message}")
+        else:
+            error_message = f"결과 파일 없음 (상태: {status})"
+
+        # 반영되지 않은 리뷰는 ai_response가 비어 있으므로 다음 실행에서 다시 제출됨
+        await self.supabase.update_ai_reply_batch(
+            batch_id,
+            status=status,
+            output_file_id=output_file_id,
+            applied_count=applied,
+            error_message=error_message,
+            completed_at=datetime.now().isoformat()
+        )
+        logger.info(f"[AIBatch] 배치 {batch_id} 종료 ({status}) - {applied}/{batch.get('request_count', 0)}개 반영")
+        return True
+
+    async def _apply_output(self, lines: List[Dict[str, Any]], apply_result: ApplyResult, stats: Dict[str, Any]) -> int:
+        """결과 JSONL → 리뷰별 답글 저장"""
+        outputs = {line.get('custom_id'): line for line in lines if line.get('custom_id')}
+        # 제출 때와 같은 프롬프트로 검증/재생성하도록 배달리뷰 등 프롬프트 컬럼을 모두 조회
+        reviews = await self.supabase.get_reviews_by_ids(list(outputs.keys()), columns=AI_REPLY_REVIEW_COLUMNS)
+        rules_by_store = await self.supabase.get_store_reply_rules_bulk([review['store_code'] for review in reviews])
+        applied = 0
+
+        for review in reviews:
+            # 배치 대기 중 수동으로 답글이 작성된 리뷰는 건너뜀
+            if review.get('ai_response'):
+                continue
+
+            store_rules = rules_by_store[review['store_code']]
+
+            line = outputs[review['review_id']]
+            response = line.get('response') or {}
+            body = response.get('body') or {}
+            if line.get('error') or response.get('status_code') != 200 or not body.get('choices'):
+                result = {'success': False, 'error': str(line.get('error') or body.get('error') or '배치 요청 실패')}
+            else:
+                result = self.ai_service.build_batch_result(
+                    review,
+                    store_rules,
+                    body['choices'][0]['message'].get('content'),
+                    (body.get('usage') or {}).get('total_tokens', 0)
+                )
+
+            if not result.get('success'):
+                logger.warning(f"[AIBatch] 리뷰 {review['review_id']} 배치 결과 사용 불가, 실시간 생성: {result.get('error')}")
+                result = await self.ai_service.generate_reply(review_data=review, store_rules=store_rules)
+
+            outcome = await apply_result(review, result)
+            if outcome.get('success'):
+                applied += 1
+                stats['applied'] += 1
+            else:
+                stats['failed'] += 1
+
+        return applied
+
+    async def _submit_pending(self, in_flight_ids: set, apply_result: ApplyResult, stats: Dict[str, Any]):
+        """진행 중인 배치에 없는 대기 리뷰를 새 배치로 제출"""
+        pending = []
+        after = None
+        while len(pending) < AI_BATCH_MAX_SIZE:
+            page = await self.supabase.get_reviews_without_reply(limit=AI_BATCH_PAGE_SIZE, after=after)
+            if not page:
+                break
+            after = page[-1]
+            pending.extend(review for review in page if review['review_id'] not in in_flight_ids)
+        pending = pending[:AI_BATCH_MAX_SIZE]
+        if not pending:
+            return
+
+        rules_by_store = await self.supabase.get_store_reply_rules_bulk([review['store_code'] for review in pending])
+        requests = []
+        review_ids = []
+        for review in pending:
+            store_rules = rules_by_store[review['store_code']]
+
+            cached = self.ai_service.get_cached_reply(review, store_rules)
+            if cached:
+                outcome = await apply_result(review, cached)
+                stats['cached' if outcome.get('success') else 'failed'] += 1
+                continue
+
+            requests.append(self.ai_service.build_batch_request(review, store_rules))
+            review_ids.append(review['review_id'])
+
+        if len(requests) < AI_BATCH_MIN_SIZE:
+            logger.info(f"[AIBatch] 대기 리뷰 {len(requests)}개 - 최소 배치 크기({AI_BATCH_MIN_SIZE}) 미만이라 다음 실행으로 연기")
+            return
+
+        try:
+            submitted = await self.backend.submit(requests, {'source': 'generate_ai_replies_job'})
+        except Exception as e:
+            logger.error(f"[AIBatch] 배치 제출 실패: {str(e)}")
+            return
+
+        # 배치를 기록하지 못하면 다음 실행에서 같은 리뷰를 다시 제출하므로 (이중 과금) 제출한 배치를 취소
+        recorded = await self.supabase.create_ai_reply_batch(
+            submitted['batch_id'], review_ids, submitted['input_file_id'], submitted['status']
+        )
+        if not recorded:
+            try:
+                await self.backend.cancel(submitted['batch_id'])
+                logger.error(f"[AIBatch] 배치 {submitted['batch_id']} 기록 실패 - 배치 취소")
+            except Exception as e:
+                logger.error(f"[AIBatch] 배치 {submitted['batch_id']} 기록 실패 후 취소도 실패 (수동 확인 필요): {str(e)}")
+            return
+
+        stats['submitted'] += len(review_ids)
+        logger.info(f"[AIBatch] 배치 {submitted['batch_id']} 제출 - 리뷰 {len(review_ids)}개")
+
+
+# 싱글톤 인스턴스
+_ai_batch_service: Optional[AIReplyBatchService] = None
+
+
+def get_ai_batch_service(ai_service: AIService, supabase_service: SupabaseService) -> AIReplyBatchService:
+    """배치 서비스 싱글톤 인스턴스 반환 (가짜 엔드포인트의 제출 내역 유지)"""
+    global _ai_batch_service
+    if _ai_batch_service is None:
+        _ai_batch_service = AIReplyBatchService(ai_service, supabase_service)
+    return _ai_batch_service
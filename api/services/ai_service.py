@@ -8,20 +8,51 @@ import asyncio
 import json
 from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
-from config.openai_client import get_openai_client
+from config.openai_client import create_chat_completion
 from ..utils.error_handler import log_api_error, ErrorType
+from .reply_cache import get_reply_cache
 
 logger = logging.getLogger(__name__)
 
+# 사장님 확인 필요 여부 판단 기준 (분석 단독 호출 / 답글 통합 호출 공용)
+BOSS_ATTENTION_CRITERIA = """판단 기준:
+1. 고객의 직접적인 질문이 있는가?
+2. 심각한 불만이나 항의가 포함되어 있는가?
+3. 위생, 안전, 건강 관련 이슈가 있는가?
+4. 법적 문제나 배상 요구가 있는가?
+5. 직원의 심각한 잘못이나 서비스 문제가 있는가?
+6. 단골 고객의 실망이나 이탈 위험이 있는가?
+7. 즉각적인 대응이 필요한 긴급 사안인가?
+8. 매장 운영에 대한 중요한 제안이나 피드백이 있는가?"""
+
+# 답글 생성 호출에 덧붙여 분석까지 한 번의 JSON 응답으로 받기 위한 지시문
+COMBINED_OUTPUT_INSTRUCTIONS = f"""
+
+추가로 이 리뷰를 사장님이 직접 확인해야 하는지도 함께 판단하세요.
+
+{BOSS_ATTENTION_CRITERIA}
+
+응답 형식 (JSON):
+{{
+    "reply": "고객에게 등록할 답글 본문",
+    "boss_review_needed": true/false,
+    "reason": "사장님 확인이 필요한 구체적인 이유 (한국어로 간단명료하게, 필요 없으면 빈 문자열)",
+    "urgency_score": 0.0-1.0 (긴급도 점수)
+}}
+
+중요: 단순한 칭찬이나 일반적인 피드백은 boss_review_needed를 false로 판단하세요."""
+
 
 class AIService:
     """AI 답글 생성 서비스"""
     
     def __init__(self):
-        self.client = get_openai_client()
+        # 공유 AsyncOpenAI 클라이언트 사용 (동시 호출 수/RPM/TPM 제한은 create_chat_completion에서 적용)
         self.model = os.getenv("AI_MODEL", "gpt-4o-mini")
         self.max_tokens = int(os.getenv("AI_MAX_TOKENS", "600"))
         self.temperature = float(os.getenv("AI_TEMPERATURE", "0.7"))
+        # 답글과 사장님 확인 분석을 한 번의 호출로 생성 (false면 기존 2회 호출)
+        self.combined_analysis = os.getenv("AI_COMBINED_ANALYSIS", "true").lower() == "true"
         
     async def generate_reply(
         self, 
@@ -100,6 +131,14 @@ class AIService:
                     'retry_count': retry_count,
                     'total_attempts': retry_count + 1
                 }
+
+            # 같은 정책의 거의 같은 리뷰(별점만 있는 리뷰, "맛있어요" 등)는 캐시된 답글 변형 재사용
+            # (재생성 요청은 use_cache=False로 캐시를 건너뜀)
+            reply_cache = get_reply_cache()
+            if retry_count == 0 and kwargs.get('use_cache', True):
+                cached = self.get_cached_reply(review_data, store_rules)
+                if cached:
+                    return cached
             
             # 프롬프트 생성
             prompt = self._create_prompt(review_data, store_rules)
@@ -116,52 +155,20 @@ class AIService:
                 adjusted_temperature = min(1.0, self.temperature + (retry_count * 0.1))
                 logger.info(f"재시도 {retry_count}회차: temperature를 {adjusted_temperature}로 조정")
             
-            # OpenAI API 호출
-            try:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=adjusted_temperature,
-                    max_tokens=self.max_tokens
-                )
-            except Exception as api_error:
-                # API 에러 로깅
-                error_type = ErrorType.API_TIMEOUT
-                error_message = str(api_error)
-                
-                if "rate_limit" in error_message.lower() or "quota" in error_message.lower():
-                    error_type = ErrorType.API_RATE_LIMIT
-                elif "timeout" in error_message.lower():
-                    error_type = ErrorType.API_TIMEOUT
-                elif "invalid" in error_message.lower():
-                    error_type = ErrorType.INVALID_RESPONSE
-                
-                await log_api_error(
-                    api_type='openai',
-                    error_type=error_type,
-                    error_message=error_message,
-                    request_data={
-                        'model': self.model,
-                        'temperature': adjusted_temperature,
-                        'max_tokens': self.max_tokens,
-                        'prompt_length': len(prompt)
-                    },
-                    store_code=review_data.get('store_code'),
-                    review_id=review_data.get('review_id')
+            # 답글과 사장님 확인 분석을 한 번에 요청 (실패 시 기존 방식: 답글 호출 + 분석 호출)
+            combined = None
+            if self.combined_analysis:
+                combined = await self._generate_reply_with_analysis(
+                    system_prompt, prompt, review_data, adjusted_temperature
                 )
-                
-                raise  # 에러 재발생
-                
-            generated_reply = response.choices[0].message.content
-            if generated_reply:
-                generated_reply = generated_reply.strip()
-            else:
-                generated_reply = ""
             
-            token_usage = response.usage.total_tokens if response.usage else 0
+            if combined:
+                generated_reply, analysis, token_usage = combined
+            else:
+                analysis = None
+                generated_reply, token_usage = await self._generate_reply_text(
+                    system_prompt, prompt, review_data, adjusted_temperature
+                )
             processing_time_ms = int((time.time() - start_time) * 1000)
             
             # 답글 품질 검증
@@ -193,10 +200,10 @@ class AIService:
             # 매장 정책에 맞게 답글 조정
             final_reply = self._apply_store_formatting(generated_reply, store_rules)
             
-            # AI 기반 사장님 확인 필요 여부 분석
-            boss_review_needed, review_reason, urgency_score = await self._analyze_review_for_boss_attention(
-                review_data
-            )
+            # AI 기반 사장님 확인 필요 여부 분석 (통합 호출에서 받았으면 재사용)
+            if analysis is None:
+                analysis = await self._analyze_review_for_boss_attention(review_data)
+            boss_review_needed, review_reason, urgency_score = analysis
             
             # 최대 재시도 후에도 품질이 낮은 경우에만 사장님 확인 필요
             if not is_valid and retry_count >= max_retries:
@@ -204,7 +211,7 @@ class AIService:
                 review_reason = f"AI 답글 품질 미달 ({max_retries}회 재시도 후에도 품질 기준 미달, 점수: {quality_score:.2f})"
                 urgency_score = max(urgency_score, 0.6)
             
-            return {
+            result = {
                 'success': True,
                 'reply': final_reply,
                 'quality_score': quality_score,
@@ -219,6 +226,8 @@ class AIService:
                 'retry_count': retry_count,
                 'total_attempts': retry_count + 1
             }
+            reply_cache.put(review_data, store_rules, result)
+            return result
             
         except Exception as e:
             processing_time_ms = int((time.time() - start_time) * 1000)
@@ -241,6 +250,222 @@ class AIService:
                 'total_attempts': retry_count + 1
             }
     
+    async def _generate_reply_with_analysis(
+        self,
+        system_prompt: str,
+        prompt: str,
+        review_data: Dict[str, Any],
+        temperature: float
+    ) -> Optional[Tuple[str, Tuple[bool, str, float], int]]:
+        """
+        답글과 사장님 확인 분석을 하나의 JSON 응답으로 생성
+        
+        Returns:
+            (답글, (boss_review_needed, reason, urgency_score), 토큰 사용량) - 응답 형식 오류 시 None
+            (API 호출 오류는 로깅 후 예외 그대로 전달)
+        """
+        request_body = self._combined_request_body(system_prompt, prompt, temperature)
+        try:
+            response = await create_chat_completion(**request_body)
+        except Exception as api_error:
+            # API/네트워크 오류는 개별 호출로 대체하지 않고 기존 재시도 경로로 전달 (호출 수 증가 방지)
+            await self._log_openai_error(api_error, temperature, request_body['max_tokens'], prompt, review_data)
+            raise
+        
+        try:
+            generated_reply, analysis = self._parse_combined_content(
+                response.choices[0].message.content, review_data
+            )
+        except (ValueError, TypeError, AttributeError, IndexError) as e:
+            # JSON 형식/필드 문제만 개별 호출로 대체
+            logger.warning(f"답글/분석 통합 응답 형식 오류, 개별 호출로 대체: {str(e)}")
+            return None
+        
+        token_usage = response.usage.total_tokens if response.usage else 0
+        return generated_reply, analysis, token_usage
+    
+    def _combined_request_body(self, system_prompt: str, prompt: str, temperature: float) -> Dict[str, Any]:
+        """답글/분석 통합 호출 요청 본문 (실시간 호출과 Batch API 요청 공용)"""
+        return {
+            'model': self.model,
+            'messages': [
+                {"role": "system", "content": system_prompt + COMBINED_OUTPUT_INSTRUCTIONS},
+                {"role": "user", "content": prompt}
+            ],
+            'temperature': temperature,
+            'max_tokens': self.max_tokens + 150,  # 분석 필드 여유분
+            'response_format': {"type": "json_object"}
+        }
+    
+    def _parse_combined_content(
+        self,
+        content: Optional[str],
+        review_data: Dict[str, Any]
+    ) -> Tuple[str, Tuple[bool, str, float]]:
+        """통합 호출 JSON 응답 → (답글, 분석 결과)"""
+        result = json.loads(content or '')
+        generated_reply = (result.get('reply') or '').strip()
+        if not generated_reply:
+            raise ValueError("응답에 reply 필드가 없습니다")
+        
+        return generated_reply, self._finalize_boss_analysis(result, review_data.get('rating'))
+    
+    def get_cached_reply(self, review_data: Dict[str, Any], store_rules: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """답글 캐시 조회 - 적중 시 generate_reply와 같은 형식의 결과 반환"""
+        cached = get_reply_cache().get(review_data, store_rules)
+        if not cached:
+            return None
+        
+        logger.info("캐시된 답글 사용 (OpenAI 호출 생략)")
+        return dict(
+            cached,
+            success=True,
+            processing_time_ms=0,
+            token_usage=0,
+            prompt_used='',
+            cache_hit=True,
+            retry_count=0,
+            total_attempts=1
+        )
+    
+    def build_batch_request(
+        self,
+        review_data: Dict[str, Any],
+        store_rules: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Batch API 입력(JSONL) 한 줄 생성 - custom_id는 review_id"""
+        prompt = self._create_prompt(review_data, store_rules)
+        system_prompt = self._create_system_prompt(store_rules)
+        return {
+            'custom_id': review_data['review_id'],
+            'method': 'POST',
+            'url': '/v1/chat/completions',
+            'body': self._combined_request_body(system_prompt, prompt, self.temperature)
+        }
+    
+    def build_batch_result(
+        self,
+        review_data: Dict[str, Any],
+        store_rules: Dict[str, Any],
+        content: Optional[str],
+        token_usage: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Batch API 응답 본문 → generate_reply와 같은 형식의 결과
+        
+        품질 검증을 통과하지 못하면 success=False (호출 측에서 실시간 생성으로 재시도)
+        """
+        try:
+            generated_reply, analysis = self._parse_combined_content(content, review_data)
+        except Exception as e:
+            return {'success': False, 'error': f'배치 응답 파싱 실패: {str(e)}'}
+        
+        is_valid, quality_score = self._validate_reply(generated_reply, review_data, store_rules)
+        if not is_valid:
+            return {'success': False, 'error': f'배치 답글 품질 미달 (점수: {quality_score:.2f})'}
+        
+        boss_review_needed, review_reason, urgency_score = analysis
+        result = {
+            'success': True,
+            'reply': self._apply_store_formatting(generated_reply, store_rules),
+            'quality_score': quality_score,
+            'is_valid': is_valid,
+            'processing_time_ms': 0,
+            'token_usage': token_usage,
+            'model_used': self.model,
+            'prompt_used': self._create_prompt(review_data, store_rules),
+            'boss_review_needed': boss_review_needed,
+            'review_reason': review_reason,
+            'urgency_score': urgency_score,
+            'retry_count': 0,
+            'total_attempts': 1
+        }
+        get_reply_cache().put(review_data, store_rules, result)
+        return result
+    
+    async def _generate_reply_text(
+        self,
+        system_prompt: str,
+        prompt: str,
+        review_data: Dict[str, Any],
+        adjusted_temperature: float
+    ) -> Tuple[str, int]:
+        """답글만 생성 (통합 호출 실패 시 사용하는 기존 방식)"""
+        # OpenAI API 호출
+        try:
+            response = await create_chat_completion(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=adjusted_temperature,
+                max_tokens=self.max_tokens
+            )
+        except Exception as api_error:
+            await self._log_openai_error(api_error, adjusted_temperature, self.max_tokens, prompt, review_data)
+            raise  # 에러 재발생
+            
+        generated_reply = response.choices[0].message.content
+        if generated_reply:
+            generated_reply = generated_reply.strip()
+        else:
+            generated_reply = ""
+        
+        token_usage = response.usage.total_tokens if response.usage else 0
+        return generated_reply, token_usage
+    
+    async def _log_openai_error(
+        self,
+        api_error: Exception,
+        temperature: float,
+        max_tokens: int,
+        prompt: str,
+        review_data: Dict[str, Any]
+    ):
+        """OpenAI API 에러 로깅 (에러 메시지로 유형 분류)"""
+        error_type = ErrorType.API_TIMEOUT
+        error_message = str(api_error)
+        
+        if "rate_limit" in error_message.lower() or "quota" in error_message.lower():
+            error_type = ErrorType.API_RATE_LIMIT
+        elif "timeout" in error_message.lower():
+            error_type = ErrorType.API_TIMEOUT
+        elif "invalid" in error_message.lower():
+            error_type = ErrorType.INVALID_RESPONSE
+        
+        await log_api_error(
+            api_type='openai',
+            error_type=error_type,
+            error_message=error_message,
+            request_data={
+                'model': self.model,
+                'temperature': temperature,
+                'max_tokens': max_tokens,
+                'prompt_length': len(prompt)
+            },
+            store_code=review_data.get('store_code'),
+            review_id=review_data.get('review_id')
+        )
+    
+    def _finalize_boss_analysis(
+        self,
+        analysis_result: Dict[str, Any],
+        rating: Optional[int]
+    ) -> Tuple[bool, str, float]:
+        """AI 분석 결과 정리 (낮은 별점은 AI 판단과 무관하게 확인 필요)"""
+        boss_review_needed = bool(analysis_result.get('boss_review_needed', False))
+        reason = analysis_result.get('reason', '') or ''
+        urgency_score = float(analysis_result.get('urgency_score', 0.5))
+        
+        # 낮은 별점은 항상 확인 필요 (AI 판단과 무관하게)
+        if rating is not None and rating <= 2 and not boss_review_needed:
+            boss_review_needed = True
+            reason = f"낮은 별점({rating}점) - {reason}" if reason else f"낮은 별점({rating}점)"
+            urgency_score = max(urgency_score, 0.7)
+        
+        return boss_review_needed, reason, urgency_score
+    
     def _should_generate_reply(
         self, 
         review_data: Dict[str, Any], 
@@ -512,15 +737,7 @@ class AIService:
 - 리뷰 내용: {review_content}
 - 배달 평가: {delivery_review}
 
-판단 기준:
-1. 고객의 직접적인 질문이 있는가?
-2. 심각한 불만이나 항의가 포함되어 있는가?
-3. 위생, 안전, 건강 관련 이슈가 있는가?
-4. 법적 문제나 배상 요구가 있는가?
-5. 직원의 심각한 잘못이나 서비스 문제가 있는가?
-6. 단골 고객의 실망이나 이탈 위험이 있는가?
-7. 즉각적인 대응이 필요한 긴급 사안인가?
-8. 매장 운영에 대한 중요한 제안이나 피드백이 있는가?
+{BOSS_ATTENTION_CRITERIA}
 
 응답 형식 (JSON):
 {{
@@ -532,7 +749,7 @@ class AIService:
 중요: 단순한 칭찬이나 일반적인 피드백은 false로 판단하세요."""
 
             # OpenAI API 호출
-            response = self.client.chat.completions.create(
+            response = await create_chat_completion(
                 model=self.model,
                 messages=[
                     {
@@ -549,18 +766,7 @@ class AIService:
             # 응답 파싱
             result_text = response.choices[0].message.content
             try:
-                analysis_result = json.loads(result_text)
-                boss_review_needed = analysis_result.get('boss_review_needed', False)
-                reason = analysis_result.get('reason', '')
-                urgency_score = float(analysis_result.get('urgency_score', 0.5))
-                
-                # 낮은 별점은 항상 확인 필요 (AI 판단과 무관하게)
-                if rating is not None and rating <= 2 and not boss_review_needed:
-                    boss_review_needed = True
-                    reason = f"낮은 별점({rating}점) - {reason}" if reason else f"낮은 별점({rating}점)"
-                    urgency_score = max(urgency_score, 0.7)
-                
-                return boss_review_needed, reason, urgency_score
+                return self._finalize_boss_analysis(json.loads(result_text), rating)
                 
             except json.JSONDecodeError:
                 # JSON 파싱 실패시 기본 규칙 적용
@@ -608,7 +814,7 @@ class AIService:
         self.temperature = min(1.0, self.temperature + 0.1 + (previous_attempts * 0.05))
         
         try:
-            result = await self.generate_reply(review_data, store_rules)
+            result = await self.generate_reply(review_data, store_rules, use_cache=False)
             result['generation_type'] = 'ai_retry'
             result['attempt_number'] = previous_attempts + 1
             return result
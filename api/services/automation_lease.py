@@ -0,0 +1,139 @@
+"""
+자동화 임대(lease) 관리
+API 서버/워커 인스턴스가 여러 대일 때 스케줄 작업 중복 실행 방지
+- 작업 리더 선출: 'job:<작업ID>' 임대를 가진 인스턴스만 폴링 작업 실행 (보유 중 계속 갱신)
+- 매장 수집 분배: 'collect:<매장코드>' 임대를 먼저 잡은 워커만 해당 매장 수집 (수집이 끝나면 반납)
+
+automation_leases 테이블이 아직 없는 DB에서는 LEASE_FAIL_OPEN(기본 true)에 따라
+임대 없이 실행합니다 (단일 인스턴스 운영 호환).
+"""
+import os
+import socket
+import asyncio
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+from dotenv import load_dotenv
+
+from config.supabase_client import get_supabase_client
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+LEASE_FAIL_OPEN = os.getenv("LEASE_FAIL_OPEN", "true").lower() == "true"
+JOB_LEADER_LEASE_SECONDS = int(os.getenv("JOB_LEADER_LEASE_SECONDS", "900"))
+# 매장 수집 임대 만료 시간 (수집이 끝나면 반납하므로, 워커가 수집 중 죽었을 때 다른 워커가 이어받기까지의 시간)
+COLLECT_STORE_LEASE_SECONDS = int(os.getenv("COLLECT_STORE_LEASE_SECONDS", "1800"))
+
+# 이 프로세스의 워커 ID (임대 보유자, 작업 큐 임대자로 사용)
+WORKER_ID = f"{socket.gethostname()}-{os.getpid()}"
+
+
+class LeaseManager:
+    """automation_leases 테이블 기반 임대 관리"""
+
+    def __init__(self, holder: Optional[str] = None):
+        self.holder = holder or WORKER_ID
+        self._lock = threading.Lock()
+        # 보유 중인 작업 리더 임대 (종료 시 반납)
+        self._held_jobs = set()
+
+        # 통계
+        self._acquired = 0
+        self._denied = 0
+        self._errors = 0
+
+    def _count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def try_acquire(self, lease_name: str, ttl_seconds: int, allow_renew: bool = True) -> bool:
+        """임대 획득 시도 (allow_renew면 이미 보유 중인 임대는 만료 시간 연장)"""
+        try:
+            response = get_supabase_client().rpc('try_acquire_lease', {
+                'p_lease_name': lease_name,
+                'p_holder': self.holder,
+                'p_ttl_seconds': ttl_seconds,
+                'p_allow_renew': allow_renew
+            }).execute()
+        except Exception as e:
+            self._count('_errors')
+            logger.warning(f"[Lease] {lease_name} 임대 확인 실패 ({'임대 없이 실행' if LEASE_FAIL_OPEN else '실행 건너뜀'}): {str(e)}")
+            return LEASE_FAIL_OPEN
+
+        acquired = bool(response.data)
+        self._count('_acquired' if acquired else '_denied')
+        return acquired
+
+    def release(self, lease_name: str) -> bool:
+        """보유 중인 임대 반납"""
+        try:
+            response = get_supabase_client().rpc('release_lease', {
+                'p_lease_name': lease_name,
+                'p_holder': self.holder
+            }).execute()
+            return bool(response.data)
+        except Exception as e:
+            logger.warning(f"[Lease] {lease_name} 임대 반납 실패: {str(e)}")
+            return False
+
+    async def try_acquire_async(self, lease_name: str, ttl_seconds: int, allow_renew: bool = True) -> bool:
+        return await asyncio.get_running_loop().run_in_executor(None, self.try_acquire, lease_name, ttl_seconds, allow_renew)
+
+    async def release_async(self, lease_name: str) -> bool:
+        return await asyncio.get_running_loop().run_in_executor(None, self.release, lease_name)
+
+    async def is_job_leader(self, job_id: str) -> bool:
+        """스케줄 작업 리더 여부 (리더 임대 획득/갱신)"""
+        lease_name = f"job:{job_id}"
+        acquired = await self.try_acquire_async(lease_name, JOB_LEADER_LEASE_SECONDS)
+        with self._lock:
+            if acquired:
+                self._held_jobs.add(lease_name)
+            else:
+                self._held_jobs.discard(lease_name)
+        if not acquired:
+            logger.info(f"[Lease] {job_id} - 다른 인스턴스가 리더이므로 건너뜀")
+        return acquired
+
+    async def release_held_async(self):
+        """보유 중인 작업 리더 임대 모두 반납 (종료 시 다른 인스턴스가 만료를 기다리지 않고 이어받도록)"""
+        with self._lock:
+            lease_names = list(self._held_jobs)
+            self._held_jobs.clear()
+        for lease_name in lease_names:
+            if await self.release_async(lease_name):
+                logger.info(f"[Lease] {lease_name} 리더 임대 반납")
+
+    async def claim_store(self, store_code: str) -> bool:
+        """매장 수집 담당 획득 (다른 워커가 수집 중이면 False - 수집이 끝나면 release_store로 반납)"""
+        return await self.try_acquire_async(f"collect:{store_code}", COLLECT_STORE_LEASE_SECONDS, allow_renew=False)
+
+    async def release_store(self, store_code: str) -> bool:
+        """매장 수집 담당 반납"""
+        return await self.release_async(f"collect:{store_code}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'holder': self.holder,
+                'held_jobs': sorted(self._held_jobs),
+                'acquired': self._acquired,
+                'denied': self._denied,
+                'errors': self._errors
+            }
+
+
+# 싱글톤 인스턴스
+_lease_manager: Optional[LeaseManager] = None
+_lease_manager_lock = threading.Lock()
+
+
+def get_lease_manager() -> LeaseManager:
+    """임대 관리자 싱글톤 인스턴스 반환"""
+    global _lease_manager
+    with _lease_manager_lock:
+        if _lease_manager is None:
+            _lease_manager = LeaseManager()
+        return _lease_manager
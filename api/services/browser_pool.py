@@ -0,0 +1,316 @@
+"""
+브라우저 풀 서비스
+Chromium 프로세스를 미리 띄워두고 매장별로 격리된 컨텍스트를 제공
+"""
+import os
+import time
+import queue
+import socket
+import shutil
+import logging
+import tempfile
+import threading
+import subprocess
+import urllib.request
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, List
+
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# 크롤러들이 공통으로 사용하던 Chromium 실행 옵션
+POOL_BROWSER_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-gpu',
+    '--disable-web-security',
+    '--disable-features=IsolateOrigins,site-per-process',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--lang=ko-KR',
+]
+
+
+class PooledBrowser:
+    """풀에서 관리하는 Chromium 프로세스 하나"""
+
+    def __init__(self, slot_id: int):
+        self.slot_id = slot_id
+        self.process: Optional[subprocess.Popen] = None
+        self.port: Optional[int] = None
+        self.user_data_dir: Optional[str] = None
+        self.uses = 0
+        self.launched_at: Optional[float] = None
+
+    @property
+    def cdp_endpoint(self) -> str:
+        """connect_over_cdp 에 넘길 엔드포인트"""
+        return f"http://127.0.0.1:{self.port}"
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+
+class BrowserPool:
+    """
+    Chromium 웜 풀
+
+    Playwright sync API 객체는 생성한 스레드에서만 사용할 수 있으므로
+    브라우저 객체 대신 CDP 엔드포인트를 대여합니다. 각 크롤러는 자신의
+    Playwright 인스턴스로 connect_over_cdp 후 new_context()로 격리된 세션을 만듭니다.
+    (동기/비동기 크롤러, subprocess 크롤러 모두 같은 풀 사용 가능)
+    """
+
+    def __init__(self,
+                 pool_size: Optional[int] = None,
+                 checkout_timeout: Optional[float] = None,
+                 recycle_after: Optional[int] = None,
+                 headless: Optional[bool] = None):
+        self.pool_size = pool_size or int(os.getenv("BROWSER_POOL_SIZE", "3"))
+        self.checkout_timeout = checkout_timeout or float(os.getenv("BROWSER_POOL_CHECKOUT_TIMEOUT", "120"))
+        self.recycle_after = recycle_after or int(os.getenv("BROWSER_POOL_RECYCLE_AFTER", "20"))
+        if headless is None:
+            headless = os.getenv("BROWSER_POOL_HEADLESS", "true").lower() == "true"
+        self.headless = headless
+
+        self._idle: "queue.Queue[PooledBrowser]" = queue.Queue()
+        for slot_id in range(self.pool_size):
+            self._idle.put(PooledBrowser(slot_id))
+
+        self._lock = threading.Lock()
+        self._executable_path: Optional[str] = None
+        self._closed = False
+
+        # 통계
+        self._checkouts = 0
+        self._checkout_wait_total = 0.0
+        self._checkout_wait_max = 0.0
+        self._launches = 0
+        self._recycles = 0
+        self._timeouts = 0
+
+    # ------------------------------------------------------------------
+    # 대여/반납
+    # ------------------------------------------------------------------
+    @contextmanager
+    def checkout(self):
+        """
+        브라우저 대여 (context manager)
+
+        Yields:
+            str: CDP 엔드포인트 (예: http://127.0.0.1:9333)
+        """
+        browser = self._acquire()
+        try:
+            yield browser.cdp_endpoint
+        finally:
+            self._release(browser)
+
+    def _acquire(self) -> PooledBrowser:
+        if self._closed:
+            raise RuntimeError("브라우저 풀이 종료되었습니다")
+
+        started = time.time()
+        try:
+            browser = self._idle.get(timeout=self.checkout_timeout)
+        except queue.Empty:
+            with self._lock:
+                self._timeouts += 1
+            raise TimeoutError(f"브라우저 풀 대여 시간 초과 ({self.checkout_timeout}초)")
+
+        try:
+            if not browser.is_alive():
+                self._launch(browser)
+        except Exception:
+            # 실행 실패한 슬롯도 풀에 돌려놓아야 다음 요청이 재시도할 수 있음
+            self._idle.put(browser)
+            raise
+
+        waited = time.time() - started
+        with self._lock:
+            self._checkouts += 1
+            self._checkout_wait_total += waited
+            self._checkout_wait_max = max(self._checkout_wait_max, waited)
+
+        logger.info(f"[BrowserPool] 슬롯 {browser.slot_id} 대여 (대기 {waited:.2f}초, 사용 {browser.uses}회)")
+        return browser
+
+    def _release(self, browser: PooledBrowser):
+        browser.uses += 1
+
+        if self._closed:
+            self._terminate(browser)
+        elif browser.uses >= self.recycle_after or not browser.is_alive():
+            logger.info(f"[BrowserPool] 슬롯 {browser.slot_id} 재시작 예정 (사용 {browser.uses}회)")
+            self._terminate(browser)
+            with self._lock:
+                self._recycles += 1
+
+        self._idle.put(browser)
+
+    # ------------------------------------------------------------------
+    # 프로세스 관리
+    # ------------------------------------------------------------------
+    def _launch(self, browser: PooledBrowser):
+        """Chromium 프로세스 시작 후 CDP 응답 대기"""
+        self._terminate(browser)
+
+        executable = self._get_executable_path()
+        port = self._find_free_port()
+        user_data_dir = tempfile.mkdtemp(prefix=f"review_pool_{browser.slot_id}_")
+
+        args = [executable, f'--remote-debugging-port={port}', f'--user-data-dir={user_data_dir}']
+        args.extend(POOL_BROWSER_ARGS)
+        if self.headless:
+            args.append('--headless=new')
+        args.append('about:blank')
+
+        logger.info(f"[BrowserPool] 슬롯 {browser.slot_id} Chromium 시작 (port={port})")
+        process = subprocess.Popen(
+            args,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+
+        browser.process = process
+        browser.port = port
+        browser.user_data_dir = user_data_dir
+        browser.uses = 0
+        browser.launched_at = time.time()
+
+        if not self._wait_for_cdp(port, timeout=30):
+            self._terminate(browser)
+            raise RuntimeError(f"Chromium CDP 엔드포인트 응답 없음 (port={port})")
+
+        with self._lock:
+            self._launches += 1
+
+    def _terminate(self, browser: PooledBrowser):
+        if browser.process is not None:
+            try:
+                browser.process.terminate()
+                browser.process.wait(timeout=10)
+            except Exception:
+                try:
+                    browser.process.kill()
+                except Exception:
+                    pass
+            browser.process = None
+
+        if browser.user_data_dir:
+            shutil.rmtree(browser.user_data_dir, ignore_errors=True)
+            browser.user_data_dir = None
+
+        browser.port = None
+
+    def _wait_for_cdp(self, port: int, timeout: float) -> bool:
+        deadline = time.time() + timeout
+        url = f"http://127.0.0.1:{port}/json/version"
+        while time.time() < deadline:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return True
+            except Exception:
+                time.sleep(0.1)
+        return False
+
+    def _find_free_port(self) -> int:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(('127.0.0.1', 0))
+            return sock.getsockname()[1]
+
+    def _get_executable_path(self) -> str:
+        """Playwright가 설치한 Chromium 실행 파일 경로"""
+        if self._executable_path:
+            return self._executable_path
+
+        custom_path = os.environ.get('PLAYWRIGHT_BROWSER_PATH')
+        if custom_path and os.path.exists(custom_path):
+            self._executable_path = custom_path
+            return custom_path
+
+        # sync_playwright는 실행 중인 이벤트 루프가 있는 스레드에서 사용할 수 없으므로
+        # 별도 스레드에서 경로만 조회
+        result: Dict[str, Any] = {}
+
+        def resolve():
+            try:
+                from playwright.sync_api import sync_playwright
+                with sync_playwright() as p:
+                    result['path'] = p.chromium.executable_path
+            except Exception as e:
+                result['error'] = e
+
+        thread = threading.Thread(target=resolve, daemon=True)
+        thread.start()
+        thread.join(timeout=60)
+
+        if 'path' not in result:
+            raise RuntimeError(f"Chromium 실행 파일을 찾을 수 없습니다: {result.get('error')}")
+
+        self._executable_path = result['path']
+        return self._executable_path
+
+    def shutdown(self):
+        """풀의 모든 브라우저 종료"""
+        self._closed = True
+        browsers: List[PooledBrowser] = []
+        while True:
+            try:
+                browsers.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+        for browser in browsers:
+            self._terminate(browser)
+            self._idle.put(browser)
+
+        logger.info(f"[BrowserPool] 종료 완료 ({len(browsers)}/{self.pool_size}개 슬롯 정리)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """풀 상태/대여 지연 통계"""
+        with self._lock:
+            avg_wait = self._checkout_wait_total / self._checkouts if self._checkouts else 0.0
+            return {
+                'pool_size': self.pool_size,
+                'idle': self._idle.qsize(),
+                'checkout_timeout': self.checkout_timeout,
+                'recycle_after': self.recycle_after,
+                'checkouts': self._checkouts,
+                'avg_checkout_wait': round(avg_wait, 3),
+                'max_checkout_wait': round(self._checkout_wait_max, 3),
+                'launches': self._launches,
+                'recycles': self._recycles,
+                'timeouts': self._timeouts
+            }
+
+
+# 싱글톤 인스턴스
+_browser_pool: Optional[BrowserPool] = None
+_browser_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """브라우저 풀 싱글톤 인스턴스 반환"""
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is None:
+            _browser_pool = BrowserPool()
+        return _browser_pool
+
+
+def shutdown_browser_pool():
+    """브라우저 풀 종료 (생성된 경우에만)"""
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is not None:
+            _browser_pool.shutdown()
+            _browser_pool = None
@@ -0,0 +1,280 @@
+"""
+리뷰 수집 동시 실행 제어
+플랫폼별 동시 수집 수를 관측된 소요 시간/오류/로그인 실패에 따라 AIMD로 조정
+
+- 성공 + 목표 시간 이내: 동시 수집 수를 한 주기(현재 한도만큼 성공)마다 1씩 증가
+- 실패(로그인 실패, 시간 초과 등) 또는 목표 시간 초과: 한도를 배율만큼 감소
+  (같은 혼잡으로 인한 연속 실패에 여러 번 줄이지 않도록 감소 후 일정 시간은 유지)
+- 전체 한도: CPU/가용 메모리로 띄울 수 있는 Chromium 수와 브라우저 풀/크롤러 워커 풀 크기 중 최솟값
+
+답글 등록(계정별 일괄 등록)도 같은 제어기를 별도 인스턴스로 사용 (get_reply_posting_concurrency)
+- 답글 등록은 풀 밖에서 브라우저를 직접 띄우므로 전체 한도는 CPU/메모리 기준만 적용
+- 일괄 등록 소요 시간은 리뷰 수에 비례하므로 지연 기준 없이 실패/로그인 실패에만 감소
+"""
+import os
+import time
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional
+
+from dotenv import load_dotenv
+
+from api.services.browser_pool import get_browser_pool
+from api.services.crawler_worker_pool import get_crawler_worker_pool
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# Chromium 한 개(매장 컨텍스트 포함)가 사용하는 메모리 추정치
+COLLECT_CHROMIUM_MEMORY_MB = int(os.getenv("COLLECT_CHROMIUM_MEMORY_MB", "500"))
+# 감소 후 다시 감소하기까지 최소 간격 (초)
+COLLECT_AIMD_DECREASE_COOLDOWN = float(os.getenv("COLLECT_AIMD_DECREASE_COOLDOWN", "30"))
+COLLECT_AIMD_DECREASE_FACTOR = float(os.getenv("COLLECT_AIMD_DECREASE_FACTOR", "0.5"))
+
+# 플랫폼별 기본값 (초기 한도, 최대 한도, 목표 소요 시간 초)
+# 네이버는 동시 로그인에 민감해 보수적으로, 배민/요기요는 비교적 여유 있게 시작
+PLATFORM_DEFAULTS = {
+    'baemin': (2, 4, 60.0),
+    'yogiyo': (2, 4, 60.0),
+    'coupang': (1, 3, 60.0),
+    'naver': (1, 2, 90.0),
+}
+DEFAULT_PLATFORM_SETTINGS = (1, 2, 60.0)
+
+# 답글 등록 플랫폼별 기본값 (초기 한도, 최대 한도, 목표 소요 시간 초)
+REPLY_PLATFORM_DEFAULTS = {
+    'baemin': (2, 3, float('inf')),
+    'yogiyo': (2, 3, float('inf')),
+    'coupang': (1, 2, float('inf')),
+    'naver': (1, 2, float('inf')),
+}
+
+LOGIN_FAILURE_KEYWORDS = ('로그인', 'login')
+
+
+def _available_memory_mb() -> Optional[int]:
+    """가용 메모리 (MB) - psutil이 없으면 /proc/meminfo 사용"""
+    try:
+        import psutil
+        return int(psutil.virtual_memory().available / (1024 * 1024))
+    except ImportError:
+        pass
+
+    try:
+        with open('/proc/meminfo', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def resource_concurrency_cap() -> int:
+    """CPU 코어 수와 가용 메모리로 동시에 띄울 수 있는 Chromium 수 추정"""
+    cap = os.cpu_count() or 1
+    memory_mb = _available_memory_mb()
+    if memory_mb is not None:
+        cap = min(cap, memory_mb // COLLECT_CHROMIUM_MEMORY_MB)
+    return max(1, cap)
+
+
+def is_login_failure(error: str) -> bool:
+    """수집 오류 메시지가 로그인 실패인지 확인"""
+    error = (error or '').lower()
+    return any(keyword in error for keyword in LOGIN_FAILURE_KEYWORDS)
+
+
+class AdaptiveLimiter:
+    """AIMD 방식으로 한도가 바뀌는 동시 실행 제한기 (플랫폼 하나)"""
+
+    def __init__(self, name: str, initial_limit: int, max_limit: int, latency_target: float, min_limit: int = 1):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, min_limit)
+        self.latency_target = latency_target
+        self.limit = float(min(max(initial_limit, min_limit), self.max_limit))
+
+        self.in_flight = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._last_decrease = 0.0
+
+        # 통계
+        self._successes = 0
+        self._failures = 0
+        self._login_failures = 0
+        self._slow = 0
+        self._latency_total = 0.0
+
+    def _get_condition(self) -> asyncio.Condition:
+        # 실행 스크립트마다 이벤트 루프가 달라질 수 있으므로 루프별로 새로 생성
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+            self.in_flight = 0
+        return self._condition
+
+    async def acquire(self):
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self):
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight = max(0, self.in_flight - 1)
+            condition.notify_all()
+
+    def record(self, latency: float, success: bool, login_failed: bool = False):
+        """수집 결과 반영 후 한도 조정"""
+        previous = int(self.limit)
+        self._latency_total += latency
+
+        if success:
+            self._successes += 1
+        else:
+            self._failures += 1
+        if login_failed:
+            self._login_failures += 1
+
+        slow = success and latency > self.latency_target
+        if slow:
+            self._slow += 1
+
+        if success and not slow:
+            # 가산 증가: 현재 한도만큼 성공하면 1 증가
+            self.limit = min(self.max_limit, self.limit + 1.0 / max(self.limit, 1.0))
+        else:
+            now = time.time()
+            if now - self._last_decrease >= COLLECT_AIMD_DECREASE_COOLDOWN:
+                self.limit = max(self.min_limit, self.limit * COLLECT_AIMD_DECREASE_FACTOR)
+                self._last_decrease = now
+
+        if int(self.limit) != previous:
+            reason = '로그인 실패' if login_failed else ('실패' if not success else ('지연' if slow else '정상'))
+            logger.info(f"[Concurrency] {self.name} 동시 실행 한도 {previous} → {int(self.limit)} ({reason}, {latency:.1f}초)")
+
+        # 한도가 늘었으면 대기 중인 작업 깨우기
+        if self._condition is not None and self._loop is not None and int(self.limit) > previous:
+            self._loop.create_task(self._notify())
+
+    async def _notify(self):
+        async with self._condition:
+            self._condition.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        completed = self._successes + self._failures
+        return {
+            'limit': int(self.limit),
+            'max_limit': self.max_limit,
+            'in_flight': self.in_flight,
+            'latency_target': self.latency_target,
+            'successes': self._successes,
+            'failures': self._failures,
+            'login_failures': self._login_failures,
+            'slow': self._slow,
+            'avg_latency': round(self._latency_total / completed, 2) if completed else 0.0
+        }
+
+
+class CollectionConcurrencyController:
+    """플랫폼별 AdaptiveLimiter + 전체 한도"""
+
+    def __init__(self, global_limit: Optional[int] = None, env_prefix: str = 'COLLECT',
+                 platform_defaults: Optional[Dict[str, tuple]] = None, label: str = '수집'):
+        if global_limit is None:
+            global_limit = int(os.getenv("COLLECT_GLOBAL_MAX_CONCURRENCY", "0")) or resource_concurrency_cap()
+            # 풀 크기를 넘으면 대여 대기 시간이 소요 시간에 섞여 한도 조정이 왜곡되므로 풀 크기로 제한
+            global_limit = min(global_limit, get_browser_pool().pool_size, get_crawler_worker_pool().pool_size)
+        self.global_limit = max(1, global_limit)
+        self.env_prefix = env_prefix
+        self.platform_defaults = PLATFORM_DEFAULTS if platform_defaults is None else platform_defaults
+        self._global = AdaptiveLimiter(f'{label}/global', self.global_limit, self.global_limit, float('inf'))
+
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+        self._lock = threading.Lock()
+
+        logger.info(f"[Concurrency] 전체 동시 {label} 한도: {self.global_limit}")
+
+    def get_limiter(self, platform: str) -> AdaptiveLimiter:
+        platform = (platform or '').lower()
+        with self._lock:
+            if platform not in self._limiters:
+                initial, max_limit, latency_target = self.platform_defaults.get(platform, DEFAULT_PLATFORM_SETTINGS)
+                prefix = f"{self.env_prefix}_CONCURRENCY_{platform.upper()}"
+                self._limiters[platform] = AdaptiveLimiter(
+                    platform,
+                    initial_limit=int(os.getenv(f"{prefix}_INITIAL", str(initial))),
+                    max_limit=int(os.getenv(f"{prefix}_MAX", str(max_limit))),
+                    latency_target=float(os.getenv(f"{prefix}_LATENCY_TARGET", str(latency_target)))
+                )
+            return self._limiters[platform]
+
+    @asynccontextmanager
+    async def slot(self, platform: str):
+        """
+        플랫폼 한도 → 전체 한도 순으로 획득
+        (전체 한도를 먼저 잡고 플랫폼 한도를 기다리면 다른 플랫폼 작업까지 막힘)
+        """
+        limiter = self.get_limiter(platform)
+        await limiter.acquire()
+        try:
+            await self._global.acquire()
+            try:
+                yield limiter
+            finally:
+                await self._global.release()
+        finally:
+            await limiter.release()
+
+    def record(self, platform: str, latency: float, result: Dict[str, Any]):
+        """매장 수집/일괄 등록 결과({success, errors 또는 error}) 반영"""
+        success = bool(result.get('success'))
+        errors = result.get('errors') or ([result['error']] if result.get('error') else [])
+        login_failed = not success and any(is_login_failure(str(error)) for error in errors)
+        self.get_limiter(platform).record(latency, success, login_failed)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'global_limit': self.global_limit,
+                'global_in_flight': self._global.in_flight,
+                'platforms': {name: limiter.get_stats() for name, limiter in self._limiters.items()}
+            }
+
+
+# 싱글톤 인스턴스
+_controller: Optional[CollectionConcurrencyController] = None
+_controller_lock = threading.Lock()
+
+
+def get_collection_concurrency() -> CollectionConcurrencyController:
+    """수집 동시 실행 제어기 싱글톤 인스턴스 반환"""
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = CollectionConcurrencyController()
+        return _controller
+
+
+# 답글 등록용 인스턴스
+_reply_controller: Optional[CollectionConcurrencyController] = None
+
+
+def get_reply_posting_concurrency() -> CollectionConcurrencyController:
+    """답글 등록 동시 실행 제어기 싱글톤 인스턴스 반환"""
+    global _reply_controller
+    with _controller_lock:
+        if _reply_controller is None:
+            _reply_controller = CollectionConcurrencyController(
+                global_limit=int(os.getenv("REPLY_GLOBAL_MAX_CONCURRENCY", "0")) or resource_concurrency_cap(),
+                env_prefix='REPLY',
+                platform_defaults=REPLY_PLATFORM_DEFAULTS,
+                label='답글 등록'
+            )
+        return _reply_controller
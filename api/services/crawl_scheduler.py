@@ -0,0 +1,204 @@
+"""
+매장별 수집 우선순위 스케줄링
+매장마다 새 리뷰 유입 속도(시간당 리뷰 수, 수집 이력의 EWMA)를 기록하고
+리뷰가 자주 달리는 매장은 자주, 조용한 매장은 드물게 수집
+
+- 수집 간격: 한 번 수집할 때 새 리뷰가 COLLECT_TARGET_REVIEWS_PER_CRAWL개 정도 쌓이도록
+  (최소/최대 간격 사이로 제한, 이력이 없는 매장은 기존 4시간 간격)
+- 전체 수집 예산(시간당 수집 횟수)을 넘으면 모든 매장 간격을 같은 비율로 늘림
+- 주기 작업(COLLECT_TICK_MINUTES)마다 수집 시점이 지난 매장을 밀린 리뷰가 많은 순으로 예산만큼 선택
+"""
+import os
+import math
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+COLLECT_TICK_MINUTES = int(os.getenv("COLLECT_TICK_MINUTES", "10"))
+COLLECT_BUDGET_PER_HOUR = int(os.getenv("COLLECT_BUDGET_PER_HOUR", "120"))
+COLLECT_MIN_INTERVAL_MINUTES = int(os.getenv("COLLECT_MIN_INTERVAL_MINUTES", "30"))
+COLLECT_MAX_INTERVAL_MINUTES = int(os.getenv("COLLECT_MAX_INTERVAL_MINUTES", "720"))
+COLLECT_DEFAULT_INTERVAL_MINUTES = int(os.getenv("COLLECT_DEFAULT_INTERVAL_MINUTES", "240"))
+COLLECT_TARGET_REVIEWS_PER_CRAWL = float(os.getenv("COLLECT_TARGET_REVIEWS_PER_CRAWL", "3"))
+COLLECT_RATE_ALPHA = float(os.getenv("COLLECT_RATE_ALPHA", "0.3"))
+
+
+def _parse_time(value) -> Optional[datetime]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def store_key(platform: str, platform_code: str) -> Tuple[str, str]:
+    """워터마크와 매장을 잇는 키 (store_crawl_watermarks의 UNIQUE 키)"""
+    return ((platform or '').lower(), str(platform_code or ''))
+
+
+def compute_review_rate(previous_rate: Optional[float], new_reviews: int, elapsed_hours: Optional[float]) -> float:
+    """시간당 새 리뷰 수 EWMA 갱신 (이전 수집 시각이 없으면 이전 값 유지)"""
+    if not elapsed_hours or elapsed_hours <= 0:
+        return float(previous_rate or 0.0)
+    observed = new_reviews / elapsed_hours
+    if previous_rate is None:
+        return observed
+    return COLLECT_RATE_ALPHA * observed + (1 - COLLECT_RATE_ALPHA) * float(previous_rate)
+
+
+def compute_crawl_interval(rate: Optional[float]) -> int:
+    """유입 속도로 수집 간격(분) 계산"""
+    if rate is None:
+        return COLLECT_DEFAULT_INTERVAL_MINUTES
+    if rate <= 0:
+        return COLLECT_MAX_INTERVAL_MINUTES
+    interval = COLLECT_TARGET_REVIEWS_PER_CRAWL / rate * 60
+    return int(min(COLLECT_MAX_INTERVAL_MINUTES, max(COLLECT_MIN_INTERVAL_MINUTES, interval)))
+
+
+class CrawlScheduler:
+    """유입 속도 기반 수집 대상 선택/다음 수집 시각 계산"""
+
+    def __init__(self, budget_per_hour: Optional[int] = None, tick_minutes: Optional[int] = None):
+        self.budget_per_hour = budget_per_hour or COLLECT_BUDGET_PER_HOUR
+        self.tick_minutes = tick_minutes or COLLECT_TICK_MINUTES
+        # 예산 초과 시 간격 배율 (select_due_stores에서 전체 수요로 갱신)
+        self.budget_scale = 1.0
+
+    def _update_budget_scale(self, stores: List[Dict], watermarks: Dict[Tuple[str, str], Dict]):
+        """매장별 간격대로 수집할 때의 시간당 수집 횟수가 예산을 넘으면 간격 배율 적용"""
+        demand = 0.0
+        for store in stores:
+            watermark = watermarks.get(store_key(store.get('platform'), store.get('platform_code'))) or {}
+            demand += 60 / (watermark.get('crawl_interval_minutes') or COLLECT_DEFAULT_INTERVAL_MINUTES)
+        self.budget_scale = max(1.0, demand / self.budget_per_hour) if self.budget_per_hour else 1.0
+
+    def select_due_stores(self, stores: List[Dict], watermarks: Dict[Tuple[str, str], Dict],
+                          now: Optional[datetime] = None) -> List[Dict]:
+        """
+        이번 주기에 수집할 매장 선택
+
+        수집 시점이 지난 매장 중 '마지막 수집 이후 쌓였을 것으로 예상되는 리뷰 수'가 많은 순
+        (수집 이력이 없는 매장이 가장 먼저), 주기당 예산만큼
+        """
+        now = now or datetime.now()
+        self._update_budget_scale(stores, watermarks)
+
+        due = []
+        for store in stores:
+            watermark = watermarks.get(store_key(store.get('platform'), store.get('platform_code')))
+            next_crawl_at = _parse_time((watermark or {}).get('next_crawl_at'))
+            last_crawled_at = _parse_time((watermark or {}).get('last_crawled_at'))
+
+            if next_crawl_at and next_crawl_at > now:
+                continue
+            if not last_crawled_at:
+                due.append((float('inf'), store))
+                continue
+
+            hours_since = (now - last_crawled_at).total_seconds() / 3600
+            rate = float(watermark.get('review_rate_per_hour') or 0.0)
+            # 유입이 없는 매장끼리는 오래 안 본 매장부터
+            due.append((rate * hours_since + hours_since * 1e-6, store))
+
+        due.sort(key=lambda item: item[0], reverse=True)
+        tick_budget = max(1, math.ceil(self.budget_per_hour * self.tick_minutes / 60)) if self.budget_per_hour else len(due)
+        selected = [store for _, store in due[:tick_budget]]
+
+        if len(due) > tick_budget:
+            logger.info(f"[CrawlScheduler] 수집 대상 {len(due)}개 중 예산 {tick_budget}개만 이번 주기에 수집")
+        return selected
+
+    def next_schedule(self, watermark: Optional[Dict], new_reviews: int,
+                      now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        수집 성공 후 유입 속도/간격/다음 수집 시각 (워터마크에 함께 저장)
+
+        crawl_interval_minutes는 유입 속도 기준 간격이고, 예산 배율은 next_crawl_at에만 반영
+        (배율을 반영한 간격으로 수요를 다시 계산하면 배율이 오르내리며 흔들림)
+        """
+        now = now or datetime.now()
+        last_crawled_at = _parse_time((watermark or {}).get('last_crawled_at'))
+        elapsed_hours = (now - last_crawled_at).total_seconds() / 3600 if last_crawled_at else None
+        previous_rate = (watermark or {}).get('review_rate_per_hour')
+
+        if elapsed_hours:
+            rate = compute_review_rate(float(previous_rate) if previous_rate is not None else None,
+                                       new_reviews, elapsed_hours)
+        else:
+            rate = float(previous_rate) if previous_rate is not None else None
+
+        interval = compute_crawl_interval(rate)
+        scaled_interval = int(max(interval, min(COLLECT_MAX_INTERVAL_MINUTES, interval * self.budget_scale)))
+        return {
+            'review_rate_per_hour': round(rate, 3) if rate is not None else None,
+            'crawl_interval_minutes': interval,
+            'next_crawl_at': (now + timedelta(minutes=scaled_interval)).isoformat()
+        }
+
+    def retry_schedule(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """수집 실패 시 다음 시도 시각 (매 주기 재시도하지 않도록 최소 간격 후)"""
+        now = now or datetime.now()
+        return {'next_crawl_at': (now + timedelta(minutes=COLLECT_MIN_INTERVAL_MINUTES)).isoformat()}
+
+    def freshness_report(self, stores: List[Dict], watermarks: Dict[Tuple[str, str], Dict],
+                         now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        매장별 예상 신선도
+
+        expected_delay_minutes: 새 리뷰가 수집되기까지 평균 대기 시간 (간격/2 + 주기/2)
+        expected_backlog: 지금 수집하면 새로 나올 것으로 예상되는 리뷰 수
+        """
+        now = now or datetime.now()
+        report = []
+        for store in stores:
+            watermark = watermarks.get(store_key(store.get('platform'), store.get('platform_code'))) or {}
+            rate = watermark.get('review_rate_per_hour')
+            interval = watermark.get('crawl_interval_minutes') or COLLECT_DEFAULT_INTERVAL_MINUTES
+            interval = max(interval, min(COLLECT_MAX_INTERVAL_MINUTES, interval * self.budget_scale))
+            last_crawled_at = _parse_time(watermark.get('last_crawled_at'))
+            hours_since = (now - last_crawled_at).total_seconds() / 3600 if last_crawled_at else None
+
+            report.append({
+                'store_code': store.get('store_code'),
+                'store_name': store.get('store_name'),
+                'platform': store.get('platform'),
+                'review_rate_per_hour': float(rate) if rate is not None else None,
+                'crawl_interval_minutes': int(interval),
+                'last_crawled_at': watermark.get('last_crawled_at'),
+                'next_crawl_at': watermark.get('next_crawl_at'),
+                'expected_delay_minutes': round(interval / 2 + self.tick_minutes / 2, 1),
+                'expected_backlog': round(float(rate) * hours_since, 1) if rate is not None and hours_since is not None else None
+            })
+
+        report.sort(key=lambda item: item['review_rate_per_hour'] or 0.0, reverse=True)
+        return report
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'tick_minutes': self.tick_minutes,
+            'budget_per_hour': self.budget_per_hour,
+            'budget_scale': round(self.budget_scale, 2),
+            'min_interval_minutes': COLLECT_MIN_INTERVAL_MINUTES,
+            'max_interval_minutes': COLLECT_MAX_INTERVAL_MINUTES
+        }
+
+
+# 싱글톤 인스턴스
+_crawl_scheduler: Optional[CrawlScheduler] = None
+
+
+def get_crawl_scheduler() -> CrawlScheduler:
+    """수집 스케줄러 싱글톤 인스턴스 반환"""
+    global _crawl_scheduler
+    if _crawl_scheduler is None:
+        _crawl_scheduler = CrawlScheduler()
+    return _crawl_scheduler
@@ -0,0 +1,263 @@
+"""
+크롤러 워커 프로세스 풀
+crawler_worker.py 프로세스를 상주시켜 두고 길이 프리픽스 JSON 프레임으로 작업을 전달
+(매장마다 인터프리터를 띄우고 stdout을 정규식으로 파싱하던 방식 대체)
+"""
+import os
+import sys
+import time
+import uuid
+import queue
+import logging
+import threading
+import subprocess
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable, List
+
+from dotenv import load_dotenv
+
+from api.utils.worker_protocol import read_message, write_message, ProtocolError
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+project_root = Path(__file__).resolve().parent.parent.parent
+WORKER_MODULE = 'api.crawlers.review_crawlers.crawler_worker'
+
+
+class CrawlerWorker:
+    """상주 워커 프로세스 하나"""
+
+    def __init__(self, slot_id: int):
+        self.slot_id = slot_id
+        self.process: Optional[subprocess.Popen] = None
+        self.messages: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self.jobs_done = 0
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def start(self, ready_timeout: float = 30):
+        """워커 프로세스 시작 후 ready 프레임 대기"""
+        env = os.environ.copy()
+        env['PYTHONIOENCODING'] = 'utf-8'
+
+        self.messages = queue.Queue()
+        self.jobs_done = 0
+        self.process = subprocess.Popen(
+            [sys.executable, '-u', '-m', WORKER_MODULE],
+            cwd=str(project_root),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env
+        )
+
+        threading.Thread(target=self._read_frames, args=(self.process, self.messages), daemon=True).start()
+        threading.Thread(target=self._drain_stderr, args=(self.process,), daemon=True).start()
+
+        try:
+            ready = self.messages.get(timeout=ready_timeout)
+        except queue.Empty:
+            ready = None
+
+        if not ready or ready.get('event') != 'ready':
+            self.stop(kill=True)
+            raise RuntimeError(f"크롤러 워커 {self.slot_id} 시작 실패")
+
+        logger.info(f"[CrawlerWorker] 워커 {self.slot_id} 시작 (pid={ready.get('pid')})")
+
+    def _read_frames(self, process: subprocess.Popen, messages: "queue.Queue"):
+        """워커 stdout의 프레임을 큐로 전달 (종료 시 None)"""
+        try:
+            while True:
+                message = read_message(process.stdout)
+                if message is None:
+                    break
+                messages.put(message)
+        except (ProtocolError, ValueError, OSError) as e:
+            logger.error(f"[CrawlerWorker] 워커 {self.slot_id} 프레임 수신 오류: {str(e)}")
+        finally:
+            messages.put(None)
+
+    def _drain_stderr(self, process: subprocess.Popen):
+        """워커 로그(stderr)를 서버 로그로 전달"""
+        for raw_line in iter(process.stderr.readline, b''):
+            line = raw_line.decode('utf-8', errors='replace').rstrip()
+            if line:
+                logger.debug(f"[worker-{self.slot_id}] {line}")
+
+    def send(self, job: Dict[str, Any]):
+        write_message(self.process.stdin, job)
+
+    def stop(self, kill: bool = False):
+        if self.process is None:
+            return
+
+        try:
+            if not kill and self.is_alive():
+                write_message(self.process.stdin, {'type': 'shutdown'})
+                self.process.wait(timeout=10)
+        except Exception:
+            pass
+
+        if self.is_alive():
+            try:
+                self.process.kill()
+                self.process.wait(timeout=10)
+            except Exception:
+                pass
+
+        self.process = None
+
+
+class CrawlerWorkerPool:
+    """
+    크롤러 워커 풀
+
+    작업은 run()으로 동기 실행되며, 제한 시간을 넘기면 해당 워커 프로세스를 종료하고
+    다음 대여 시 새로 띄웁니다. (스레드를 남겨두지 않고 작업을 확실히 취소)
+    """
+
+    def __init__(self,
+                 pool_size: Optional[int] = None,
+                 job_timeout: Optional[float] = None,
+                 recycle_after: Optional[int] = None):
+        self.pool_size = pool_size or int(os.getenv("CRAWLER_WORKER_POOL_SIZE", "3"))
+        self.job_timeout = job_timeout or float(os.getenv("CRAWLER_JOB_TIMEOUT", "120"))
+        self.recycle_after = recycle_after or int(os.getenv("CRAWLER_WORKER_RECYCLE_AFTER", "50"))
+
+        self._idle: "queue.Queue[CrawlerWorker]" = queue.Queue()
+        for slot_id in range(self.pool_size):
+            self._idle.put(CrawlerWorker(slot_id))
+
+        self._lock = threading.Lock()
+        self._closed = False
+        self._workers: List[CrawlerWorker] = list(self._idle.queue)
+
+        # 통계
+        self._jobs = 0
+        self._failures = 0
+        self._timeouts = 0
+        self._starts = 0
+
+    def run(self,
+            job: Dict[str, Any],
+            timeout: Optional[float] = None,
+            on_event: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        작업 실행 후 최종 결과 반환
+
+        Args:
+            job: {"platform", "store_info", "start_date", "end_date", "cdp_endpoint", "known_review_ids"}
+            timeout: 작업 제한 시간 (기본 CRAWLER_JOB_TIMEOUT)
+            on_event: progress/review 이벤트 콜백
+
+        Returns:
+            dict: {"success": bool, "collected": int, "saved": int} 또는 {"success": False, "error": str}
+        """
+        if self._closed:
+            return {"success": False, "error": "크롤러 워커 풀이 종료되었습니다"}
+
+        worker = self._idle.get()
+        job_id = uuid.uuid4().hex
+        deadline = time.time() + (timeout or self.job_timeout)
+
+        try:
+            if not worker.is_alive():
+                worker.start()
+                with self._lock:
+                    self._starts += 1
+
+            worker.send(dict(job, id=job_id))
+
+            while True:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise queue.Empty
+
+                message = worker.messages.get(timeout=remaining)
+                if message is None:
+                    self._count('_failures')
+                    logger.error(f"[CrawlerWorker] 워커 {worker.slot_id} 비정상 종료")
+                    return {"success": False, "error": "크롤러 워커 비정상 종료"}
+
+                if message.get('id') != job_id:
+                    continue
+
+                event = message.get('event')
+                if event == 'result':
+                    worker.jobs_done += 1
+                    self._count('_jobs')
+                    return message.get('result') or {"success": False, "error": "결과 없음"}
+
+                if on_event:
+                    try:
+                        on_event(message)
+                    except Exception as e:
+                        logger.debug(f"[CrawlerWorker] 이벤트 콜백 오류: {str(e)}")
+
+        except queue.Empty:
+            self._count('_timeouts')
+            logger.error(f"[CrawlerWorker] 작업 시간 초과 - 워커 {worker.slot_id} 종료 (platform={job.get('platform')})")
+            worker.stop(kill=True)
+            return {"success": False, "error": "크롤러 실행 시간 초과"}
+
+        except Exception as e:
+            self._count('_failures')
+            logger.error(f"[CrawlerWorker] 작업 실행 실패: {str(e)}")
+            worker.stop(kill=True)
+            return {"success": False, "error": str(e)}
+
+        finally:
+            if self._closed or worker.jobs_done >= self.recycle_after:
+                worker.stop()
+            self._idle.put(worker)
+
+    def _count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def shutdown(self):
+        """모든 워커 종료 (실행 중인 작업은 워커 종료로 즉시 실패 처리됨)"""
+        self._closed = True
+        idle_workers = list(self._idle.queue)
+        for worker in self._workers:
+            worker.stop(kill=worker not in idle_workers)
+        logger.info(f"[CrawlerWorker] 워커 풀 종료 ({self.pool_size}개)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'pool_size': self.pool_size,
+                'idle': self._idle.qsize(),
+                'alive': sum(1 for worker in self._workers if worker.is_alive()),
+                'job_timeout': self.job_timeout,
+                'jobs': self._jobs,
+                'failures': self._failures,
+                'timeouts': self._timeouts,
+                'starts': self._starts
+            }
+
+
+# 싱글톤 인스턴스
+_crawler_worker_pool: Optional[CrawlerWorkerPool] = None
+_crawler_worker_pool_lock = threading.Lock()
+
+
+def get_crawler_worker_pool() -> CrawlerWorkerPool:
+    """크롤러 워커 풀 싱글톤 인스턴스 반환"""
+    global _crawler_worker_pool
+    with _crawler_worker_pool_lock:
+        if _crawler_worker_pool is None:
+            _crawler_worker_pool = CrawlerWorkerPool()
+        return _crawler_worker_pool
+
+
+def shutdown_crawler_worker_pool():
+    """크롤러 워커 풀 종료 (생성된 경우에만)"""
+    global _crawler_worker_pool
+    with _crawler_worker_pool_lock:
+        if _crawler_worker_pool is not None:
+            _crawler_worker_pool.shutdown()
+            _crawler_worker_pool = None
@@ -0,0 +1,222 @@
+"""
+파이프라인 작업 큐
+리뷰 수집 → AI 답글 생성 → 답글 등록 단계를 pipeline_jobs 테이블로 연결
+(각 스케줄 작업이 reviews 테이블을 상태 조건으로 폴링하던 방식 대체)
+
+- 임대/완료/실패는 SQL 함수(claim/complete/fail_pipeline_jobs)에서 처리하며,
+  claim은 FOR UPDATE SKIP LOCKED라 여러 워커가 동시에 비워도 중복 처리되지 않음
+- 실패한 작업은 지수 백오프로 재시도하고, max_attempts를 넘기면 'dead'로 격리
+  (격리 시 트리거가 리뷰를 'failed'로 표시, requeue_dead로 되살림)
+- 오래 걸리는 작업은 처리 직전에 renew로 임대를 연장하고 아직 보유 중인 작업만 처리
+"""
+import os
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Iterable, Set
+
+from dotenv import load_dotenv
+
+from config.supabase_client import get_supabase_client
+from api.services.automation_lease import WORKER_ID
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+PIPELINE_QUEUE_ENABLED = os.getenv("PIPELINE_QUEUE_ENABLED", "false").lower() == "true"
+
+# AI_BATCH_MODE에서는 Batch API(ai_batch_service)가 답글을 생성하므로 ai_reply 작업을 쓰지 않음
+AI_REPLY_JOBS_ENABLED = os.getenv("AI_BATCH_MODE", "false").lower() != "true"
+
+# 작업 유형
+JOB_AI_REPLY = 'ai_reply'
+JOB_POST_REPLY = 'post_reply'
+
+
+class PipelineQueue:
+    """pipeline_jobs 테이블 기반 작업 큐"""
+
+    def __init__(self,
+                 lease_seconds: Optional[int] = None,
+                 max_attempts: Optional[int] = None,
+                 retry_base_seconds: Optional[int] = None,
+                 retry_max_seconds: Optional[int] = None):
+        self.lease_seconds = lease_seconds or int(os.getenv("PIPELINE_LEASE_SECONDS", "600"))
+        self.max_attempts = max_attempts or int(os.getenv("PIPELINE_MAX_ATTEMPTS", "5"))
+        self.retry_base_seconds = retry_base_seconds or int(os.getenv("PIPELINE_RETRY_BASE_SECONDS", "60"))
+        self.retry_max_seconds = retry_max_seconds or int(os.getenv("PIPELINE_RETRY_MAX_SECONDS", "3600"))
+        self.worker_id = WORKER_ID
+
+        self._lock = threading.Lock()
+
+        # 통계
+        self._enqueued = 0
+        self._claimed = 0
+        self._completed = 0
+        self._retried = 0
+        self._dead = 0
+        self._lost = 0
+        self._requeued = 0
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def enqueue(self, job_type: str, review_ids: Iterable[str], run_after: Optional[datetime] = None) -> int:
+        """작업 등록 (진행 중인 작업이 이미 있는 리뷰는 건너뜀) - 등록된 개수 반환
+
+        run_after는 시간대가 있는 값(UTC)으로 전달 (서버 로컬 시간과 DB 시간대가 달라도 같은 시각)
+        """
+        review_ids = [review_id for review_id in review_ids if review_id]
+        if not review_ids:
+            return 0
+
+        params = {
+            'p_job_type': job_type,
+            'p_review_ids': review_ids,
+            'p_max_attempts': self.max_attempts
+        }
+        if run_after:
+            params['p_run_after'] = run_after.isoformat()
+
+        response = get_supabase_client().rpc('enqueue_pipeline_jobs', params).execute()
+        inserted = response.data or 0
+        self._count('_enqueued', inserted)
+        logger.debug(f"[PipelineQueue] {job_type} 작업 {inserted}/{len(review_ids)}개 등록")
+        return inserted
+
+    def claim(self, job_type: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """처리할 작업 임대"""
+        response = get_supabase_client().rpc('claim_pipeline_jobs', {
+            'p_job_type': job_type,
+            'p_worker_id': self.worker_id,
+            'p_limit': limit,
+            'p_lease_seconds': self.lease_seconds
+        }).execute()
+        jobs = response.data or []
+        self._count('_claimed', len(jobs))
+        return jobs
+
+    def renew(self, jobs: List[Dict[str, Any]], lease_seconds: Optional[int] = None) -> Set[int]:
+        """임대 연장 - 아직 이 워커가 보유 중인 작업 ID 반환 (임대가 만료돼 다른 워커가 가져간 작업은 제외)"""
+        if not jobs:
+            return set()
+        response = get_supabase_client().rpc('renew_pipeline_jobs', {
+            'p_job_ids': [job['id'] for job in jobs],
+            'p_worker_id': self.worker_id,
+            'p_lease_seconds': lease_seconds or self.lease_seconds
+        }).execute()
+        held = {int(job_id) for job_id in (response.data or [])}
+        lost = len(jobs) - len(held)
+        if lost:
+            self._count('_lost', lost)
+            logger.warning(f"[PipelineQueue] 임대를 잃은 작업 {lost}개 제외 (다른 워커가 처리)")
+        return held
+
+    def complete(self, jobs: List[Dict[str, Any]]) -> int:
+        """작업 완료 처리"""
+        if not jobs:
+            return 0
+        response = get_supabase_client().rpc('complete_pipeline_jobs', {
+            'p_job_ids': [job['id'] for job in jobs],
+            'p_worker_id': self.worker_id
+        }).execute()
+        completed = response.data or 0
+        self._count('_completed', completed)
+        return completed
+
+    def fail(self, job: Dict[str, Any], error: str) -> Optional[str]:
+        """작업 실패 처리 - 재시도 대기('queued') 또는 격리('dead') 상태 반환"""
+        attempts = max(job.get('attempts') or 1, 1)
+        retry_delay = min(self.retry_base_seconds * (2 ** (attempts - 1)), self.retry_max_seconds)
+
+        response = get_supabase_client().rpc('fail_pipeline_job', {
+            'p_job_id': job['id'],
+            'p_worker_id': self.worker_id,
+            'p_error': (error or '')[:1000],
+            'p_retry_delay_seconds': retry_delay
+        }).execute()
+        status = response.data
+
+        if status == 'dead':
+            self._count('_dead')
+            logger.error(f"[PipelineQueue] {job['job_type']} 작업 격리 (review_id={job['review_id']}, {attempts}회 실패): {error}")
+        elif status == 'queued':
+            self._count('_retried')
+            logger.warning(f"[PipelineQueue] {job['job_type']} 작업 {retry_delay}초 후 재시도 (review_id={job['review_id']}): {error}")
+        return status
+
+    def requeue_dead(self, job_type: str) -> int:
+        """격리된 작업을 다시 대기 상태로 (시도 횟수 초기화, 'failed'로 표시된 리뷰 상태 복원)"""
+        response = get_supabase_client().rpc('requeue_dead_pipeline_jobs', {'p_job_type': job_type}).execute()
+        requeued = response.data or 0
+        self._count('_requeued', requeued)
+        logger.info(f"[PipelineQueue] 격리된 {job_type} 작업 {requeued}개 재등록")
+        return requeued
+
+    async def enqueue_async(self, job_type: str, review_ids: Iterable[str], run_after: Optional[datetime] = None) -> int:
+        return await asyncio.get_running_loop().run_in_executor(None, self.enqueue, job_type, list(review_ids), run_after)
+
+    async def claim_async(self, job_type: str, limit: int = 20) -> List[Dict[str, Any]]:
+        return await asyncio.get_running_loop().run_in_executor(None, self.claim, job_type, limit)
+
+    async def renew_async(self, jobs: List[Dict[str, Any]], lease_seconds: Optional[int] = None) -> Set[int]:
+        return await asyncio.get_running_loop().run_in_executor(None, self.renew, jobs, lease_seconds)
+
+    async def complete_async(self, jobs: List[Dict[str, Any]]) -> int:
+        return await asyncio.get_running_loop().run_in_executor(None, self.complete, jobs)
+
+    async def fail_async(self, job: Dict[str, Any], error: str) -> Optional[str]:
+        return await asyncio.get_running_loop().run_in_executor(None, self.fail, job, error)
+
+    async def requeue_dead_async(self, job_type: str) -> int:
+        return await asyncio.get_running_loop().run_in_executor(None, self.requeue_dead, job_type)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'enabled': PIPELINE_QUEUE_ENABLED,
+                'worker_id': self.worker_id,
+                'enqueued': self._enqueued,
+                'claimed': self._claimed,
+                'completed': self._completed,
+                'retried': self._retried,
+                'dead': self._dead,
+                'lost': self._lost,
+                'requeued': self._requeued
+            }
+
+
+# 싱글톤 인스턴스
+_pipeline_queue: Optional[PipelineQueue] = None
+_pipeline_queue_lock = threading.Lock()
+
+
+def get_pipeline_queue() -> PipelineQueue:
+    """파이프라인 작업 큐 싱글톤 인스턴스 반환"""
+    global _pipeline_queue
+    with _pipeline_queue_lock:
+        if _pipeline_queue is None:
+            _pipeline_queue = PipelineQueue()
+        return _pipeline_queue
+
+
+def enqueue_pipeline_jobs(job_type: str, review_ids: Iterable[str], run_after: Optional[datetime] = None) -> int:
+    """큐가 활성화된 경우에만 작업 등록 (실패해도 예외를 올리지 않음 - 주기 작업의 스윕이 보완)"""
+    if not PIPELINE_QUEUE_ENABLED:
+        return 0
+    if job_type == JOB_AI_REPLY and not AI_REPLY_JOBS_ENABLED:
+        return 0
+    try:
+        return get_pipeline_queue().enqueue(job_type, review_ids, run_after)
+    except Exception as e:
+        logger.error(f"[PipelineQueue] {job_type} 작업 등록 실패: {str(e)}")
+        return 0
+
+
+async def enqueue_pipeline_jobs_async(job_type: str, review_ids: Iterable[str], run_after: Optional[datetime] = None) -> int:
+    """enqueue_pipeline_jobs의 비동기 버전"""
+    if not PIPELINE_QUEUE_ENABLED:
+        return 0
+    return await asyncio.get_running_loop().run_in_executor(None, enqueue_pipeline_jobs, job_type, list(review_ids), run_after)
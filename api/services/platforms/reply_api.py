@@ -0,0 +1,203 @@
+"""
+플랫폼 답글 API 직접 호출
+브라우저 로그인 후 같은 컨텍스트의 context.request로 플랫폼 자체 답글 등록 API를 호출 (클릭 자동화 생략)
+
+- 답글 API 주소/본문 형식은 코드에 고정하지 않고, UI로 답글을 등록할 때 브라우저가 보낸 요청을 보고 학습
+  (URL/본문의 리뷰 원본 ID → {review_id}, 매장 코드 → {platform_code}, 답글 → {reply} 자리표시자로 저장)
+- 인증은 컨텍스트 쿠키 + 이번 세션 요청에서 본 인증 헤더(authorization, x-*) 사용
+- 학습한 형식은 계정 + 매장(platform_code)별로 프로세스 동안 유지 (다른 계정/매장 형식을 섞어 쓰지 않음)
+"""
+import os
+import re
+import json
+import logging
+import threading
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+REPLY_API_TIMEOUT_MS = int(os.getenv("REPLY_API_TIMEOUT_MS", "10000"))
+
+# 요청 재사용 시 함께 보낼 헤더 (쿠키는 컨텍스트가 처리)
+_FORWARD_HEADER_PATTERN = re.compile(r'^(authorization|content-type|accept|x-[\w-]+)$', re.IGNORECASE)
+_WRITE_METHODS = ('POST', 'PUT', 'PATCH')
+
+# 응답 코드별 처리: 형식/인증 문제는 UI로 다시 시도, 나머지(5xx 등)는 이미 등록됐을 수 있어 실패로 처리
+FALLBACK_STATUSES = {400, 401, 403, 404, 405, 415, 422}
+
+# 학습한 답글 API 형식 ((플랫폼, 계정, 매장 코드)별)
+_templates: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+_templates_lock = threading.Lock()
+
+
+def _substitute(value: Any, replacements: Dict[str, Any]) -> Any:
+    """
+    JSON 값을 자리표시자로 (또는 자리표시자를 값으로) 치환
+    숫자 값은 '{name:int}' 자리표시자로 저장해 되돌릴 때 숫자로 복원
+    """
+    if isinstance(value, dict):
+        return {key: _substitute(item, replacements) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_substitute(item, replacements) for item in value]
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        for old, new in replacements.items():
+            if old and isinstance(new, str) and str(value) == str(old) and new.startswith('{'):
+                return new[:-1] + ':int}'
+        return value
+    if isinstance(value, str):
+        for old, new in replacements.items():
+            if old and value == old:
+                return new
+            if value.endswith(':int}') and value[:-5] + '}' == old:
+                return int(new) if str(new).isdigit() else new
+    return value
+
+
+def _forward_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    return {key.lower(): value for key, value in headers.items() if _FORWARD_HEADER_PATTERN.match(key)}
+
+
+def _contains(value: Any, text: str) -> bool:
+    if isinstance(value, dict):
+        return any(_contains(item, text) for item in value.values())
+    if isinstance(value, list):
+        return any(_contains(item, text) for item in value)
+    return isinstance(value, str) and value.strip() == text.strip()
+
+
+def build_template(method: str, url: str, post_data: Optional[str], reply_text: str,
+                   original_id: str, platform_code: str) -> Optional[Dict[str, Any]]:
+    """UI 답글 등록 요청 → 재사용 가능한 형식 (리뷰를 특정할 수 없으면 None)"""
+    if method.upper() not in _WRITE_METHODS or not post_data:
+        return None
+    try:
+        body = json.loads(post_data)
+    except ValueError:
+        return None
+    if not _contains(body, reply_text):
+        return None
+
+    url_template = url
+    if original_id and original_id in url_template:
+        url_template = url_template.replace(original_id, '{review_id}')
+    if platform_code and platform_code in url_template:
+        url_template = url_template.replace(platform_code, '{platform_code}')
+
+    body_template = _substitute(body, {reply_text: '{reply}', original_id: '{review_id}', platform_code: '{platform_code}'})
+    if '{review_id}' not in url_template and '{review_id' not in json.dumps(body_template):
+        return None
+
+    return {'method': method.upper(), 'url': url_template, 'body': body_template, 'host': urlparse(url).netloc}
+
+
+def get_template(key: Tuple[str, str, str]) -> Optional[Dict[str, Any]]:
+    with _templates_lock:
+        return _templates.get(key)
+
+
+def set_template(key: Tuple[str, str, str], template: Optional[Dict[str, Any]]):
+    with _templates_lock:
+        if template is None:
+            _templates.pop(key, None)
+        else:
+            _templates[key] = template
+
+
+class ReplyApiChannel:
+    """
+    컨텍스트 하나의 답글 API 호출 채널
+
+    context.on('request')로 요청 헤더를 지켜보다가 UI 답글 등록 요청이 보이면 형식을 학습하고,
+    이후 리뷰는 post()로 바로 등록
+    """
+
+    def __init__(self, platform: str, account: str, context):
+        self.platform = platform
+        self.account = account or ''
+        self.context = context
+        self._headers_by_host: Dict[str, Dict[str, str]] = {}
+        self._learning: Optional[Dict[str, str]] = None
+
+        # 통계
+        self.api_posts = 0
+        self.api_failures = 0
+        self.learned = 0
+
+        context.on('request', self._on_request)
+
+    def _key(self, platform_code: Optional[str]) -> Tuple[str, str, str]:
+        return (self.platform, self.account, platform_code or '')
+
+    def ready(self, platform_code: Optional[str]) -> bool:
+        """이 계정/매장의 답글 API 형식을 학습했는지"""
+        return get_template(self._key(platform_code)) is not None
+
+    def _on_request(self, request):
+        try:
+            headers = request.headers
+            host = urlparse(request.url).netloc
+            if any(key.lower() == 'authorization' for key in headers):
+                self._headers_by_host[host] = _forward_headers(headers)
+            if self._learning and request.method in _WRITE_METHODS:
+                template = build_template(request.method, request.url, request.post_data, **self._learning)
+                if template:
+                    set_template(self._key(self._learning['platform_code']), template)
+                    self._headers_by_host[host] = _forward_headers(headers)
+                    self._learning = None
+                    self.learned += 1
+                    logger.info(f"[ReplyAPI] {self.platform} 답글 API 형식 학습: {template['method']} {template['url']}")
+        except Exception as e:
+            logger.debug(f"[ReplyAPI] 요청 확인 실패: {str(e)}")
+
+    def learn_from_next_submit(self, reply_text: str, original_id: str, platform_code: str):
+        """다음 UI 답글 제출 요청에서 형식 학습"""
+        self._learning = {'reply_text': reply_text, 'original_id': original_id, 'platform_code': platform_code}
+
+    def stop_learning(self):
+        self._learning = None
+
+    async def post(self, original_id: str, platform_code: str, reply_text: str) -> Optional[bool]:
+        """
+        답글 API 호출
+
+        Returns:
+            True - 등록 성공
+            False - 등록 실패 (이미 처리됐을 수 있어 UI로 다시 시도하지 않음)
+            None - API 형식/인증 문제 (UI로 다시 시도, 학습한 형식 폐기)
+        """
+        template = get_template(self._key(platform_code))
+        if not template:
+            return None
+
+        values = {'{review_id}': original_id, '{platform_code}': platform_code or ''}
+        url = template['url']
+        for placeholder, value in values.items():
+            url = url.replace(placeholder, value)
+        body = _substitute(template['body'], {'{reply}': reply_text, **values})
+
+        headers = dict(self._headers_by_host.get(template['host'], {}))
+        headers.setdefault('content-type', 'application/json')
+
+        try:
+            response = await self.context.request.fetch(
+                url, method=template['method'], data=json.dumps(body, ensure_ascii=False),
+                headers=headers, timeout=REPLY_API_TIMEOUT_MS
+            )
+        except Exception as e:
+            self.api_failures += 1
+            logger.warning(f"[ReplyAPI] {self.platform} 답글 API 호출 오류: {str(e)}")
+            return False
+
+        if response.ok:
+            self.api_posts += 1
+            return True
+
+        self.api_failures += 1
+        logger.warning(f"[ReplyAPI] {self.platform} 답글 API 응답 {response.status}: {url}")
+        if response.status in FALLBACK_STATUSES:
+            set_template(self._key(platform_code), None)
+            return None
+        return False
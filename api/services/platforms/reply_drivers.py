@@ -0,0 +1,395 @@
+"""
+플랫폼 답글 등록 드라이버
+한 계정(로그인 1회)으로 여러 리뷰에 답글을 등록할 때 플랫폼마다 다른 부분만 드라이버로 분리
+
+    open_session  - 브라우저/컨텍스트 생성 + 로그인 (저장된 세션이 있으면 재사용)
+    plan_batch    - 리뷰 목록을 한 번 훑어 대상 리뷰 위치를 확인하고 화면 순서로 정렬 (선택)
+    navigate      - 리뷰 목록 페이지 이동 (이미 해당 매장 페이지면 생략)
+    locate_review - 리뷰 찾기 + 답글 버튼 클릭 (True / False / "OLD_REVIEW")
+    post_reply    - 답글 작성 및 제출 (True / False / "OLD_REVIEW")
+    close         - 컨텍스트/브라우저 종료
+
+루프, 재시도, 리뷰 간 대기, DB 상태 업데이트, 단계별 소요 시간은
+ReplyPostingService._run_driver_batch 에서 공통 처리
+
+REPLY_DIRECT_API=true면 배민은 답글 API 직접 호출 드라이버 사용 (reply_api 참고)
+"""
+import os
+import sys
+import asyncio
+import hashlib
+import logging
+from typing import Dict, Any, List, Optional, Union
+
+from api.services.session_store import get_session_store, restore_session_async, save_session_async
+from api.services.platforms.reply_api import ReplyApiChannel
+from api.utils.page_waits import StepTimer
+
+logger = logging.getLogger(__name__)
+
+# 배민 답글을 플랫폼 답글 API로 직접 등록 (실패 시 UI 자동화)
+REPLY_DIRECT_API = os.getenv("REPLY_DIRECT_API", "false").lower() == "true"
+
+BROWSER_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--no-sandbox',
+    '--disable-web-security',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage'
+]
+if sys.platform == 'win32':
+    BROWSER_ARGS += ['--disable-gpu', '--disable-software-rasterizer']
+
+DESKTOP_CONTEXT_OPTIONS = {
+    'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'viewport': {'width': 1920, 'height': 1080},
+    'locale': 'ko-KR',
+}
+
+OLD_REVIEW = "OLD_REVIEW"
+
+ReplyResult = Union[bool, str]
+
+
+class PlatformDriver:
+    """플랫폼 드라이버 기본 클래스 (launch 방식: 일반 브라우저 + 새 컨텍스트)"""
+
+    platform = ''
+    display_name = ''
+    # 답글 간 대기 시간 (초) - 플랫폼 봇 탐지 회피용
+    pace_seconds = 2.0
+    # storage_state 세션 재사용 여부
+    reuse_session = True
+    context_options: Dict[str, Any] = {}
+
+    def __init__(self, store_info: Dict[str, Any]):
+        self.store_info = store_info
+        self.platform_id = store_info.get('platform_id')
+        self.platform_pw = store_info.get('platform_pw')
+        self.browser = None
+        self.context = None
+        self.page = None
+        self.manager = None
+        self.timer = StepTimer(f'{self.platform}_reply')
+
+    async def _launch(self, playwright):
+        """브라우저 실행 + 컨텍스트 생성 (저장된 세션 복원), 세션 복원 여부 반환"""
+        saved_state = get_session_store().load(self.platform, self.platform_id) if self.reuse_session else None
+        self.browser = await playwright.chromium.launch(
+            headless=False,
+            args=BROWSER_ARGS,
+            slow_mo=100 if sys.platform == 'win32' else 0
+        )
+        self.context = await self.browser.new_context(storage_state=saved_state, **self.context_options)
+        self.page = self.context.pages[0] if self.context.pages else await self.context.new_page()
+        return saved_state is not None
+
+    async def open_session(self, playwright) -> bool:
+        """브라우저 실행 + 로그인 (실패 시 False)"""
+        has_saved_state = await self._launch(playwright)
+        self.manager = await self._create_manager()
+        if self.manager is not None and hasattr(self.manager, 'timer'):
+            self.timer = self.manager.timer
+
+        if has_saved_state and await restore_session_async(self.session_page, self.platform, self.platform_id):
+            logger.info(f"🔓 {self.display_name} 저장된 세션 재사용")
+            self._mark_logged_in()
+            return True
+
+        logger.info(f"🔐 {self.display_name} 로그인 시작...")
+        with self.timer.step('login'):
+            logged_in = await self._login()
+        if not logged_in:
+            return False
+        if self.reuse_session:
+            await save_session_async(self.context, self.platform, self.platform_id)
+        return True
+
+    @property
+    def session_page(self):
+        """세션 검증/로그인에 사용하는 페이지"""
+        return self.page
+
+    def _mark_logged_in(self):
+        pass
+
+    async def plan_batch(self, reviews: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """일괄 처리 순서 결정 (기본: 입력 순서 그대로)"""
+        return reviews
+
+    async def _create_manager(self):
+        raise NotImplementedError
+
+    async def _login(self) -> bool:
+        raise NotImplementedError
+
+    async def navigate(self, review: Dict[str, Any], force: bool = False) -> bool:
+        raise NotImplementedError
+
+    async def locate_review(self, review: Dict[str, Any]) -> ReplyResult:
+        """리뷰 찾기 (찾기/등록을 한 번에 하는 플랫폼은 post_reply에서 처리)"""
+        return True
+
+    async def post_reply(self, review: Dict[str, Any], reply_content: str) -> ReplyResult:
+        raise NotImplementedError
+
+    async def close(self):
+        for target in (self.context, self.browser):
+            if target is None:
+                continue
+            try:
+                await target.close()
+            except Exception:
+                pass
+
+
+class _StorePageDriver(PlatformDriver):
+    """매장(platform_code)별 리뷰 페이지로 이동 후 리뷰 찾기/답글 작성을 나눠 하는 플랫폼 (배민, 요기요)"""
+
+    pace_seconds = 3.0
+    context_options = DESKTOP_CONTEXT_OPTIONS
+    manager_class = None
+
+    def __init__(self, store_info: Dict[str, Any]):
+        super().__init__(store_info)
+        self.current_platform_code = None
+
+    async def _create_manager(self):
+        manager = self.manager_class(self.context)
+        await manager.initialize()
+        return manager
+
+    @property
+    def session_page(self):
+        return self.manager.page
+
+    async def _login(self) -> bool:
+        return await self.manager.login(self.platform_id, self.platform_pw)
+
+    async def navigate(self, review: Dict[str, Any], force: bool = False) -> bool:
+        platform_code = review.get('platform_code') or self.store_info.get('platform_code')
+        if not force and self.current_platform_code == platform_code:
+            return True
+        logger.info(f"🔄 리뷰 페이지 이동 (platform_code: {platform_code})")
+        if not await self.manager.navigate_to_reviews(platform_code):
+            self.current_platform_code = None
+            return False
+        self.current_platform_code = platform_code
+        return True
+
+    async def locate_review(self, review: Dict[str, Any]) -> ReplyResult:
+        return await self.manager.find_review_and_click_reply(review.get('review_id'), review)
+
+    async def post_reply(self, review: Dict[str, Any], reply_content: str) -> ReplyResult:
+        return await self.manager.write_and_submit_reply(reply_content)
+
+
+class BaeminDriver(_StorePageDriver):
+    platform = 'baemin'
+    display_name = '배달의민족'
+
+    @property
+    def manager_class(self):
+        from api.crawlers.reply_managers.baemin_reply_manager import BaeminReplyManager
+        return BaeminReplyManager
+
+    def _mark_logged_in(self):
+        self.manager.is_logged_in = True
+
+
+class YogiyoDriver(_StorePageDriver):
+    platform = 'yogiyo'
+    display_name = '요기요'
+
+    @property
+    def manager_class(self):
+        from api.crawlers.reply_managers.yogiyo_reply_manager import YogiyoReplyManager
+        return YogiyoReplyManager
+
+    async def plan_batch(self, reviews: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """한 매장 리뷰 목록을 한 번 훑어 대상 리뷰를 모두 찾고 화면 순서로 등록"""
+        platform_codes = {review.get('platform_code') or self.store_info.get('platform_code') for review in reviews}
+        if len(reviews) < 2 or len(platform_codes) != 1 or not await self.navigate(reviews[0]):
+            return reviews
+        return order_by_position(reviews, await self.manager.index_reviews(reviews))
+
+
+class _DirectApiMixin:
+    """
+    답글 API 직접 호출 (_StorePageDriver 하위 드라이버용)
+
+    첫 답글은 UI로 등록하면서 API 형식을 학습하고, 이후 리뷰는 리뷰 찾기/클릭 없이 API로 등록
+    API가 형식/인증 문제로 거절하면 같은 리뷰를 UI로 다시 등록
+    """
+
+    api: Optional[ReplyApiChannel] = None
+    _api_pending: Optional[str] = None
+
+    async def _launch(self, playwright):
+        has_saved_state = await super()._launch(playwright)
+        # 로그인 요청부터 인증 헤더를 볼 수 있도록 컨텍스트 생성 직후 등록
+        self.api = ReplyApiChannel(self.platform, self.platform_id, self.context)
+        return has_saved_state
+
+    def _platform_code(self, review: Dict[str, Any]) -> Optional[str]:
+        return review.get('platform_code') or self.store_info.get('platform_code')
+
+    def _api_ready(self, review: Dict[str, Any]) -> bool:
+        return self.api is not None and self.api.ready(self._platform_code(review))
+
+    async def plan_batch(self, reviews: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # API로 등록하면 리뷰 위치가 필요 없음
+        if reviews and all(self._api_ready(review) for review in reviews):
+            return reviews
+        return await super().plan_batch(reviews)
+
+    def _original_id(self, review: Dict[str, Any]) -> str:
+        review_id = review.get('review_id') or ''
+        prefix = f"{self.platform}_"
+        return str(review.get('original_id') or (review_id[len(prefix):] if review_id.startswith(prefix) else review_id))
+
+    async def locate_review(self, review: Dict[str, Any]) -> ReplyResult:
+        if self._api_ready(review):
+            self._api_pending = review.get('review_id')
+            return True
+        self._api_pending = None
+        return await super().locate_review(review)
+
+    async def post_reply(self, review: Dict[str, Any], reply_content: str) -> ReplyResult:
+        original_id = self._original_id(review)
+        platform_code = self._platform_code(review)
+
+        if self._api_pending == review.get('review_id'):
+            self._api_pending = None
+            with self.timer.step('reply_api'):
+                result = await self.api.post(original_id, platform_code, reply_content)
+            if result is not None:
+                logger.info(f"⚡ {self.display_name} 답글 API {'등록 성공' if result else '등록 실패'}: {review.get('review_id')}")
+                return result
+            logger.warning(f"🔁 {self.display_name} 답글 API 거절 - UI로 다시 등록")
+            located = await super().locate_review(review)
+            if located is not True:
+                return located
+
+        # UI 등록 (제출 요청에서 API 형식 학습)
+        self.api.learn_from_next_submit(reply_content, original_id, platform_code)
+        try:
+            return await super().post_reply(review, reply_content)
+        finally:
+            self.api.stop_learning()
+
+    async def close(self):
+        if self.api and (self.api.api_posts or self.api.api_failures or self.api.learned):
+            logger.info(f"[ReplyAPI] {self.display_name} - API 등록 {self.api.api_posts}건, "
+                        f"실패 {self.api.api_failures}건, 형식 학습 {self.api.learned}회")
+        await super().close()
+
+
+class BaeminApiDriver(_DirectApiMixin, BaeminDriver):
+    pass
+
+
+class CoupangDriver(PlatformDriver):
+    """쿠팡이츠 - 리뷰 페이지는 한 번만 이동, 리뷰 찾기와 답글 등록을 매니저가 한 번에 처리"""
+
+    platform = 'coupang'
+    display_name = '쿠팡이츠'
+
+    def __init__(self, store_info: Dict[str, Any]):
+        super().__init__(store_info)
+        self.navigated = False
+
+    async def _create_manager(self):
+        from api.crawlers.reply_managers.coupang_reply_manager import CoupangReplyManager
+        return CoupangReplyManager(self.store_info)
+
+    async def _login(self) -> bool:
+        return await self.manager.login(self.page)
+
+    async def navigate(self, review: Dict[str, Any], force: bool = False) -> bool:
+        if self.navigated and not force:
+            return True
+        logger.info(f"📄 {self.display_name} 리뷰 페이지 이동...")
+        self.navigated = await self.manager.navigate_to_reviews(self.page)
+        return self.navigated
+
+    async def post_reply(self, review: Dict[str, Any], reply_content: str) -> ReplyResult:
+        review['reply_content'] = reply_content
+        review['final_response'] = reply_content
+        return await self.manager.find_and_reply_to_review(self.page, review)
+
+
+class NaverDriver(CoupangDriver):
+    """네이버 - 크롤러와 같은 계정별 고정 프로필(persistent context) 사용, 세션은 프로필에 유지"""
+
+    platform = 'naver'
+    display_name = '네이버'
+    reuse_session = False
+
+    def _profile_path(self) -> str:
+        account_hash = hashlib.md5(self.platform_id.encode()).hexdigest()[:10]
+        browser_data_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'logs', 'browser_profiles', 'naver')
+        profile_path = os.path.join(browser_data_dir, f"profile_{account_hash}")
+        os.makedirs(profile_path, exist_ok=True)
+        return profile_path
+
+    async def _launch(self, playwright):
+        profile_path = self._profile_path()
+        logger.info(f"📁 네이버 브라우저 프로필 경로: {profile_path} (크롤러와 동일)")
+        self.context = await playwright.chromium.launch_persistent_context(
+            user_data_dir=profile_path,
+            headless=False,
+            args=BROWSER_ARGS,
+            slow_mo=100 if sys.platform == 'win32' else 0
+        )
+        self.page = self.context.pages[0] if self.context.pages else await self.context.new_page()
+        return False
+
+    async def _create_manager(self):
+        from api.crawlers.reply_managers.naver_reply_manager import NaverReplyManager
+        return NaverReplyManager(self.store_info)
+
+    async def plan_batch(self, reviews: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """리뷰 목록을 한 번 끝까지 로드해 대상 리뷰를 모두 찾고 화면 순서로 등록"""
+        if len(reviews) < 2 or not await self.navigate(reviews[0]):
+            return reviews
+        return order_by_position(reviews, await self.manager.index_reviews(self.page, reviews))
+
+    async def navigate(self, review: Dict[str, Any], force: bool = False) -> bool:
+        if self.navigated and not force:
+            return True
+        logger.info(f"📄 {self.display_name} 리뷰 페이지 이동...")
+        self.navigated = await self.manager.navigate_to_review_page(self.page)
+        return self.navigated
+
+    async def post_reply(self, review: Dict[str, Any], reply_content: str) -> ReplyResult:
+        review['reply_content'] = reply_content
+        review['final_response'] = reply_content
+        return await self.manager.post_reply(self.page, review, reply_content)
+
+
+def order_by_position(reviews: List[Dict[str, Any]], positions: Dict[str, int]) -> List[Dict[str, Any]]:
+    """목록 위치 순으로 정렬 (위치를 못 찾은 리뷰는 입력 순서대로 뒤에)"""
+    return sorted(reviews, key=lambda review: positions.get(review.get('review_id'), float('inf')))
+
+
+REPLY_DRIVERS = {
+    'baemin': BaeminDriver,
+    'yogiyo': YogiyoDriver,
+    'coupang': CoupangDriver,
+    'naver': NaverDriver,
+}
+
+
+# 수집 시 플랫폼 리뷰 ID를 original_id로 저장하는 플랫폼만 지원
+# (요기요는 original_id가 내용 해시라 답글 API 요청에서 리뷰를 특정할 수 없음)
+REPLY_API_DRIVERS = {
+    'baemin': BaeminApiDriver,
+}
+
+
+def get_reply_driver(platform: str, store_info: Dict[str, Any]) -> Optional[PlatformDriver]:
+    """플랫폼 드라이버 생성 (지원하지 않는 플랫폼은 None)"""
+    platform = (platform or '').lower()
+    driver_class = (REPLY_DIRECT_API and REPLY_API_DRIVERS.get(platform)) or REPLY_DRIVERS.get(platform)
+    return driver_class(store_info) if driver_class else None
@@ -0,0 +1,232 @@
+"""
+AI 답글 캐시
+"맛있어요", 별점만 있는 리뷰처럼 거의 같은 리뷰에 매번 답글을 생성하지 않도록
+정규화한 리뷰 내용 + 별점 + 매장 답글 정책 해시를 키로 생성 결과를 재사용
+(키마다 최대 K개 변형을 모아두고 번갈아 사용해 같은 답글이 반복되지 않도록 함)
+
+고객명/주문메뉴는 키에 넣지 않음 (리뷰마다 달라 캐시가 적중하지 않음)
+- 답글의 고객명은 자리표시자로 바꿔 저장하고, 꺼낼 때 현재 리뷰의 고객명으로 채움
+- 주문메뉴를 언급한 답글과 배달리뷰가 있는 리뷰는 캐시하지 않음
+"""
+import os
+import re
+import json
+import time
+import random
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List
+
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# 답글 프롬프트/검증에 영향을 주는 매장 정책 필드 (이 값이 바뀌면 캐시 키도 바뀜)
+RULE_FIELDS = (
+    'store_name', 'role', 'tone', 'greeting_start', 'greeting_end',
+    'max_length', 'prohibited_words', 'manual_review_threshold'
+)
+
+# 캐시된 답글의 고객명 자리표시자
+NAME_PLACEHOLDER = '{고객명}'
+
+# 고객명이 없을 때 프롬프트에 쓰는 기본값 (이 값은 자리표시자로 바꾸지 않음)
+DEFAULT_REVIEW_NAME = '고객'
+
+# 캐시 결과로 돌려줄 필드
+CACHED_FIELDS = (
+    'reply', 'quality_score', 'is_valid', 'model_used',
+    'boss_review_needed', 'review_reason', 'urgency_score'
+)
+
+
+def normalize_review_text(text: Optional[str]) -> str:
+    """공백/문장부호/이모지 제거, 3회 이상 반복 문자 축약 ("맛있어요!!!" → "맛있어요")"""
+    if not text:
+        return ''
+    text = re.sub(r'[^0-9a-zA-Z가-힣ㄱ-ㅎㅏ-ㅣ]', '', text.lower())
+    return re.sub(r'(.)\1{2,}', r'\1\1', text)
+
+
+def hash_reply_rules(store_rules: Dict[str, Any]) -> str:
+    """답글 정책 중 생성 결과에 영향을 주는 필드만 해시"""
+    relevant = {field: store_rules.get(field) for field in RULE_FIELDS}
+    return hashlib.sha256(json.dumps(relevant, ensure_ascii=False, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+
+def review_name_of(review_data: Dict[str, Any]) -> str:
+    """프롬프트에 들어가는 고객명 (없으면 기본값)"""
+    return str(review_data.get('review_name') or '').strip() or DEFAULT_REVIEW_NAME
+
+
+def menu_items(ordered_menu: Optional[str]) -> List[str]:
+    """주문메뉴 문자열 → 메뉴 이름 목록 ("(겉바속촉) 3~4인 세트/반반" → ["겉바속촉", "3~4인 세트", "반반"])"""
+    if not ordered_menu:
+        return []
+    items = (item.strip() for item in re.split(r'[,/·\n()\[\]]+', str(ordered_menu)))
+    return [item for item in items if len(item) >= 2]
+
+
+def to_template(reply: str, review_data: Dict[str, Any]) -> Optional[str]:
+    """답글 → 캐시용 템플릿 (고객명을 자리표시자로 치환, 주문메뉴를 언급하면 None)"""
+    if any(item in reply for item in menu_items(review_data.get('ordered_menu'))):
+        return None
+    name = review_name_of(review_data)
+    if name != DEFAULT_REVIEW_NAME and len(name) >= 2:
+        reply = reply.replace(name, NAME_PLACEHOLDER)
+    return reply
+
+
+def fill_template(template: str, review_data: Dict[str, Any]) -> str:
+    """캐시용 템플릿 → 현재 리뷰의 고객명을 채운 답글"""
+    return template.replace(NAME_PLACEHOLDER, review_name_of(review_data))
+
+
+class _CacheEntry:
+    def __init__(self):
+        self.variants: List[Dict[str, Any]] = []
+        self.created_at = time.time()
+        self.last_index = -1
+
+
+class ReplyCache:
+    """
+    내용 주소 기반 답글 캐시 (TTL + LRU)
+
+    - 정규화한 내용이 REPLY_CACHE_MAX_CONTENT 자를 넘는 리뷰는 캐시하지 않음 (구체적인 리뷰는 반복되지 않음)
+    - 키당 REPLY_CACHE_VARIANTS 개의 변형이 모일 때까지는 미스로 처리해 새 답글을 생성
+    - 변형이 다 모이면 직전에 쓴 변형을 제외하고 무작위 선택
+    """
+
+    def __init__(self,
+                 max_entries: Optional[int] = None,
+                 ttl_hours: Optional[float] = None,
+                 variants: Optional[int] = None,
+                 max_content_length: Optional[int] = None):
+        self.max_entries = max_entries or int(os.getenv("REPLY_CACHE_MAX_ENTRIES", "5000"))
+        self.ttl_seconds = (ttl_hours or float(os.getenv("REPLY_CACHE_TTL_HOURS", "24"))) * 3600
+        self.variants = variants or int(os.getenv("REPLY_CACHE_VARIANTS", "3"))
+        self.max_content_length = max_content_length or int(os.getenv("REPLY_CACHE_MAX_CONTENT", "30"))
+        self.enabled = os.getenv("REPLY_CACHE_ENABLED", "true").lower() == "true"
+
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 통계
+        self._hits = 0
+        self._misses = 0
+        self._rating_only_hits = 0
+        self._rating_only_lookups = 0
+        self._evictions = 0
+
+    def make_key(self, review_data: Dict[str, Any], store_rules: Dict[str, Any]) -> Optional[str]:
+        """캐시 키 (캐시 대상이 아니면 None)"""
+        content = normalize_review_text(review_data.get('review_content'))
+        if len(content) > self.max_content_length:
+            return None
+        # 배달리뷰도 프롬프트에 들어가 답글 내용이 달라지므로 캐시하지 않음
+        if str(review_data.get('delivery_review') or '').strip():
+            return None
+        rating = review_data.get('rating')
+        return f"{rating}:{content}:{hash_reply_rules(store_rules)}"
+
+    def get(self, review_data: Dict[str, Any], store_rules: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """캐시된 답글 변형 반환 (변형이 K개 모이기 전이거나 없으면 None)"""
+        if not self.enabled:
+            return None
+
+        key = self.make_key(review_data, store_rules)
+        if key is None:
+            return None
+
+        rating_only = not normalize_review_text(review_data.get('review_content'))
+
+        with self._lock:
+            if rating_only:
+                self._rating_only_lookups += 1
+
+            entry = self._entries.get(key)
+            if entry and time.time() - entry.created_at > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+
+            if entry is None or len(entry.variants) < self.variants:
+                self._misses += 1
+                return None
+
+            # 변형이 1개뿐이면 직전 변형이라도 그대로 사용
+            choices = [i for i in range(len(entry.variants)) if i != entry.last_index] or [0]
+            index = random.choice(choices)
+            entry.last_index = index
+            self._entries.move_to_end(key)
+
+            self._hits += 1
+            if rating_only:
+                self._rating_only_hits += 1
+            variant = dict(entry.variants[index])
+
+        variant['reply'] = fill_template(variant['reply'], review_data)
+        return variant
+
+    def put(self, review_data: Dict[str, Any], store_rules: Dict[str, Any], result: Dict[str, Any]):
+        """품질 검증을 통과한 생성 결과를 변형으로 추가"""
+        if not self.enabled or not result.get('success') or not result.get('is_valid'):
+            return
+        # 사장님 확인이 필요한 리뷰는 개별 대응이 필요하므로 재사용하지 않음
+        if result.get('boss_review_needed'):
+            return
+
+        key = self.make_key(review_data, store_rules)
+        if key is None:
+            return
+
+        template = to_template(result.get('reply') or '', review_data)
+        if not template:
+            return
+
+        variant = {field: result.get(field) for field in CACHED_FIELDS}
+        variant['reply'] = template
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() - entry.created_at > self.ttl_seconds:
+                entry = _CacheEntry()
+                self._entries[key] = entry
+
+            if len(entry.variants) < self.variants and all(v['reply'] != variant['reply'] for v in entry.variants):
+                entry.variants.append(variant)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 3) if lookups else 0.0,
+                'rating_only_hit_rate': round(self._rating_only_hits / self._rating_only_lookups, 3) if self._rating_only_lookups else 0.0,
+                'evictions': self._evictions
+            }
+
+
+# 싱글톤 인스턴스
+_reply_cache: Optional[ReplyCache] = None
+_reply_cache_lock = threading.Lock()
+
+
+def get_reply_cache() -> ReplyCache:
+    """답글 캐시 싱글톤 인스턴스 반환"""
+    global _reply_cache
+    with _reply_cache_lock:
+        if _reply_cache is None:
+            _reply_cache = ReplyCache()
+        return _reply_cache
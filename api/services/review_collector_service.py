@@ -15,12 +15,17 @@ import re
 # 프로젝트 루트 경로를 Python 경로에 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from .review_collector_service_sync import SyncReviewCollector
-import threading
 from api.services.supabase_service import SupabaseService
 from api.services.encryption import get_encryption_service
+from api.services.automation_lease import get_lease_manager
+from api.services.collection_concurrency import get_collection_concurrency
+from api.services.crawl_scheduler import get_crawl_scheduler, store_key
 
 logger = logging.getLogger(__name__)
 
+# 증분 수집 워터마크에 유지할 최근 리뷰 ID 개수
+CRAWL_WATERMARK_SIZE = int(os.getenv("CRAWL_WATERMARK_SIZE", "50"))
+
 
 class ReviewCollectorService:
     def __init__(self, supabase_service: SupabaseService):
@@ -65,16 +70,25 @@ class ReviewCollectorService:
             end_date = datetime.now().strftime('%Y-%m-%d')
             start_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
             
-            # 플랫폼별 크롤러 선택
+            # 증분 수집 워터마크 (이전 수집 시 본 리뷰를 만나면 크롤러가 탐색 중단)
             platform = store_info['platform'].lower()
+            watermark = await self.supabase.get_crawl_watermark(platform, store_info['platform_code'])
+            known_review_ids = (watermark or {}).get('recent_review_ids') or []
+            if watermark and watermark.get('last_review_date'):
+                # 마지막 리뷰 하루 전부터 (답글 지연 리뷰 포함을 위해 여유 1일)
+                watermark_date = (datetime.strptime(str(watermark['last_review_date'])[:10], '%Y-%m-%d')
+                                  - timedelta(days=1)).strftime('%Y-%m-%d')
+                start_date = max(start_date, watermark_date)
+            
+            # 플랫폼별 크롤러 선택
             if platform == 'baemin':
-                collect_result = await self.collect_baemin_reviews(store_info, start_date, end_date)
+                collect_result = await self.collect_baemin_reviews(store_info, start_date, end_date, known_review_ids)
             elif platform == 'coupang':
-                collect_result = await self.collect_coupang_reviews(store_info, start_date, end_date)
+                collect_result = await self.collect_coupang_reviews(store_info, start_date, end_date, known_review_ids)
             elif platform == 'yogiyo':
-                collect_result = await self.collect_yogiyo_reviews(store_info, start_date, end_date)
+                collect_result = await self.collect_yogiyo_reviews(store_info, start_date, end_date, known_review_ids)
             elif platform == 'naver':
-                collect_result = await self.collect_naver_reviews(store_info, start_date, end_date)
+                collect_result = await self.collect_naver_reviews(store_info, start_date, end_date, known_review_ids)
             else:
                 result['errors'].append(f"지원하지 않는 플랫폼: {store_info['platform']}")
                 return result
@@ -89,8 +103,17 @@ class ReviewCollectorService:
                         store_info['owner_user_code'],
                         reviews_processed=result['collected']
                     )
+                
+                # 워터마크 갱신 (새로 본 리뷰 ID를 앞에 두고 기존 ID와 합쳐 최근 N개 유지)
+                await self._update_watermark(store_info, collect_result, known_review_ids, watermark)
             else:
                 result['errors'].append(collect_result.get('error', '알 수 없는 오류'))
+                
+                # 실패한 매장은 최소 간격 후 다시 시도 (매 주기 반복 실패 방지)
+                await self.supabase.update_crawl_schedule(
+                    platform, store_info['platform_code'], store_info['store_code'],
+                    get_crawl_scheduler().retry_schedule()
+                )
             
             logger.info(f"리뷰 수집 완료 - store: {store_code}, collected: {result['collected']}")
             
@@ -100,6 +123,29 @@ class ReviewCollectorService:
             
         return result
     
+    async def _update_watermark(self, store_info: dict, collect_result: dict,
+                                known_review_ids: List[str], watermark: Optional[Dict]):
+        """수집 결과로 증분 수집 워터마크 갱신"""
+        new_review_ids = collect_result.get('review_ids') or []
+        recent_review_ids = list(dict.fromkeys(new_review_ids + known_review_ids))[:CRAWL_WATERMARK_SIZE]
+        
+        latest_review_date = collect_result.get('latest_review_date')
+        if watermark and watermark.get('last_review_date'):
+            previous_date = str(watermark['last_review_date'])[:10]
+            latest_review_date = max(latest_review_date or previous_date, previous_date)
+        
+        # 새 리뷰 수로 유입 속도를 갱신하고 다음 수집 시간 결정
+        schedule = get_crawl_scheduler().next_schedule(watermark, collect_result.get('saved', 0))
+        
+        await self.supabase.update_crawl_watermark(
+            store_info['platform'].lower(),
+            store_info['platform_code'],
+            store_info['store_code'],
+            recent_review_ids,
+            latest_review_date,
+            schedule
+        )
+    
     async def _get_store_info(self, store_code: str) -> Optional[Dict]:
         """매장 정보 조회"""
         try:
@@ -113,8 +159,9 @@ class ReviewCollectorService:
             logger.error(f"매장 정보 조회 실패: {str(e)}")
             return None
     
-    async def collect_baemin_reviews(self, store_info: dict, start_date: str, end_date: str) -> dict:
-        """배민 리뷰 수집 - 스레드 방식으로 동기 실행"""
+    async def collect_baemin_reviews(self, store_info: dict, start_date: str, end_date: str,
+                                     known_review_ids: Optional[List[str]] = None) -> dict:
+        """배민 리뷰 수집 - 크롤러 워커 프로세스에서 실행"""
         try:
             logger.info(f"배민 리뷰 수집 시작 - 매장: {store_info['store_name']}")
             
@@ -143,30 +190,12 @@ class ReviewCollectorService:
             store_info_copy['platform_id'] = decrypted_id
             store_info_copy['platform_pw'] = decrypted_pw
             
-            # 동기 수집기 생성
+            # 크롤러 워커에서 실행 (제한 시간 초과 시 워커 풀이 작업을 취소하므로 스레드가 남지 않음)
             sync_collector = SyncReviewCollector()
-            
-            # 스레드에서 실행
-            thread = threading.Thread(
-                target=sync_collector.run_in_thread,
-                args=(store_info_copy, start_date, end_date)
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(
+                None, sync_collector.collect_baemin_reviews_sync, store_info_copy, start_date, end_date, known_review_ids
             )
-            thread.start()
-            
-            # 스레드 완료 대기 (최대 60초)
-            thread.join(timeout=60)
-            
-            if thread.is_alive():
-                logger.error("리뷰 수집 시간 초과")
-                return {"success": False, "error": "시간 초과"}
-            
-            # 결과 가져오기
-            try:
-                result = sync_collector.result_queue.get_nowait()
-                return result
-            except:
-                logger.error("결과를 가져올 수 없음")
-                return {"success": False, "error": "결과 없음"}
                 
         except Exception as e:
             logger.error(f"배민 리뷰 수집 실패: {str(e)}")
@@ -174,8 +203,9 @@ class ReviewCollectorService:
             logger.error(traceback.format_exc())
             return {"success": False, "error": str(e)}
 
-    async def collect_coupang_reviews(self, store_info: dict, start_date: str, end_date: str) -> dict:
-        """쿠팡이츠 리뷰 수집 - 스레드 방식으로 동기 실행"""
+    async def collect_coupang_reviews(self, store_info: dict, start_date: str, end_date: str,
+                                      known_review_ids: Optional[List[str]] = None) -> dict:
+        """쿠팡이츠 리뷰 수집 - 크롤러 워커 프로세스에서 실행"""
         try:
             logger.info(f"쿠팡이츠 리뷰 수집 시작 - 매장: {store_info['store_name']}")
             
@@ -204,31 +234,12 @@ class ReviewCollectorService:
             store_info_copy['platform_id'] = decrypted_id
             store_info_copy['platform_pw'] = decrypted_pw
             
-            # 동기 수집기에서 쿠팡 크롤러 사용
-            from .review_collector_service_sync import SyncReviewCollector
+            # 크롤러 워커에서 실행 (제한 시간 초과 시 워커 풀이 작업을 취소하므로 스레드가 남지 않음)
             sync_collector = SyncReviewCollector()
-            
-            # 스레드에서 실행
-            thread = threading.Thread(
-                target=sync_collector.run_coupang_in_thread,
-                args=(store_info_copy, start_date, end_date)
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(
+                None, sync_collector.collect_coupang_reviews_sync, store_info_copy, start_date, end_date, known_review_ids
             )
-            thread.start()
-            
-            # 스레드 완료 대기 (최대 60초)
-            thread.join(timeout=60)
-            
-            if thread.is_alive():
-                logger.error("쿠팡 리뷰 수집 시간 초과")
-                return {"success": False, "error": "시간 초과"}
-            
-            # 결과 가져오기
-            try:
-                result = sync_collector.result_queue.get_nowait()
-                return result
-            except:
-                logger.error("결과를 가져올 수 없음")
-                return {"success": False, "error": "결과 없음"}
                 
         except Exception as e:
             logger.error(f"쿠팡이츠 리뷰 수집 실패: {str(e)}")
@@ -236,8 +247,9 @@ class ReviewCollectorService:
             logger.error(traceback.format_exc())
             return {"success": False, "error": str(e)}
 
-    async def collect_yogiyo_reviews(self, store_info: dict, start_date: str, end_date: str) -> dict:
-        """요기요 리뷰 수집 - 스레드 방식으로 동기 실행"""
+    async def collect_yogiyo_reviews(self, store_info: dict, start_date: str, end_date: str,
+                                     known_review_ids: Optional[List[str]] = None) -> dict:
+        """요기요 리뷰 수집 - 크롤러 워커 프로세스에서 실행"""
         try:
             logger.info(f"요기요 리뷰 수집 시작 - 매장: {store_info['store_name']}")
             
@@ -266,31 +278,12 @@ class ReviewCollectorService:
             store_info_copy['platform_id'] = decrypted_id
             store_info_copy['platform_pw'] = decrypted_pw
             
-            # 동기 수집기에서 요기요 크롤러 사용
-            from .review_collector_service_sync import SyncReviewCollector
+            # 크롤러 워커에서 실행 (제한 시간 초과 시 워커 풀이 작업을 취소하므로 스레드가 남지 않음)
             sync_collector = SyncReviewCollector()
-            
-            # 스레드에서 실행
-            thread = threading.Thread(
-                target=sync_collector.run_yogiyo_in_thread,
-                args=(store_info_copy, start_date, end_date)
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(
+                None, sync_collector.collect_yogiyo_reviews_sync, store_info_copy, start_date, end_date, known_review_ids
             )
-            thread.start()
-            
-            # 스레드 완료 대기 (최대 60초)
-            thread.join(timeout=60)
-            
-            if thread.is_alive():
-                logger.error("요기요 리뷰 수집 시간 초과")
-                return {"success": False, "error": "시간 초과"}
-            
-            # 결과 가져오기
-            try:
-                result = sync_collector.result_queue.get_nowait()
-                return result
-            except:
-                logger.error("결과를 가져올 수 없음")
-                return {"success": False, "error": "결과 없음"}
                 
         except Exception as e:
             logger.error(f"요기요 리뷰 수집 실패: {str(e)}")
@@ -298,8 +291,9 @@ class ReviewCollectorService:
             logger.error(traceback.format_exc())
             return {"success": False, "error": str(e)}
         
-    async def collect_naver_reviews(self, store_info: dict, start_date: str, end_date: str) -> dict:
-        """네이버 리뷰 수집 - 스레드 방식으로 동기 실행"""
+    async def collect_naver_reviews(self, store_info: dict, start_date: str, end_date: str,
+                                    known_review_ids: Optional[List[str]] = None) -> dict:
+        """네이버 리뷰 수집 - 크롤러 워커 프로세스에서 실행"""
         try:
             logger.info(f"네이버 리뷰 수집 시작 - 매장: {store_info['store_name']}")
             
@@ -328,31 +322,12 @@ class ReviewCollectorService:
             store_info_copy['platform_id'] = decrypted_id
             store_info_copy['platform_pw'] = decrypted_pw
             
-            # 동기 수집기에서 네이버 크롤러 사용
-            from .review_collector_service_sync import SyncReviewCollector
+            # 크롤러 워커에서 실행 (제한 시간 초과 시 워커 풀이 작업을 취소하므로 스레드가 남지 않음)
             sync_collector = SyncReviewCollector()
-            
-            # 스레드에서 실행
-            thread = threading.Thread(
-                target=sync_collector.run_naver_in_thread,
-                args=(store_info_copy, start_date, end_date)
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(
+                None, sync_collector.collect_naver_reviews_sync, store_info_copy, start_date, end_date, known_review_ids
             )
-            thread.start()
-            
-            # 스레드 완료 대기 (최대 60초)
-            thread.join(timeout=60)
-            
-            if thread.is_alive():
-                logger.error("네이버 리뷰 수집 시간 초과")
-                return {"success": False, "error": "시간 초과"}
-            
-            # 결과 가져오기
-            try:
-                result = sync_collector.result_queue.get_nowait()
-                return result
-            except:
-                logger.error("결과를 가져올 수 없음")
-                return {"success": False, "error": "결과 없음"}
                 
         except Exception as e:
             logger.error(f"네이버 리뷰 수집 실패: {str(e)}")
@@ -360,27 +335,55 @@ class ReviewCollectorService:
             logger.error(traceback.format_exc())
             return {"success": False, "error": str(e)}
     
-    async def collect_all_stores_reviews(self) -> Dict[str, Any]:
-        """모든 활성 매장의 리뷰를 병렬로 수집"""
+    async def get_crawl_schedule_inputs(self):
+        """활성 매장 목록과 매장별 수집 스케줄 정보"""
+        active_stores = await self.supabase.get_active_stores()
+        watermarks = {
+            store_key(row['platform'], row['platform_code']): row
+            for row in await self.supabase.get_crawl_watermarks()
+        }
+        return active_stores, watermarks
+    
+    async def collect_all_stores_reviews(self, due_only: bool = False) -> Dict[str, Any]:
+        """
+        모든 활성 매장의 리뷰를 병렬로 수집
+        
+        Args:
+            due_only: True면 유입 속도 기준 수집 시점이 된 매장만 우선순위 순으로 수집 (주기 작업용)
+        """
         start_time = time.time()
         
         try:
             # 활성 매장 목록 조회
-            active_stores = await self.supabase.get_active_stores()
+            if due_only:
+                all_stores, watermarks = await self.get_crawl_schedule_inputs()
+                active_stores = get_crawl_scheduler().select_due_stores(all_stores, watermarks)
+            else:
+                active_stores = await self.supabase.get_active_stores()
             
             if not active_stores:
-                logger.info("활성 매장이 없습니다.")
+                logger.info("수집할 매장이 없습니다." if due_only else "활성 매장이 없습니다.")
                 return {"success": True, "message": "No active stores", "total": 0}
             
             logger.info(f"총 {len(active_stores)}개 매장 리뷰 수집 시작")
             
-            # 동시 실행 제한 (3개로 줄임 - 브라우저 리소스 고려)
-            semaphore = asyncio.Semaphore(3)
+            # 동시 실행 제한 (플랫폼별 적응형 한도 + 브라우저 리소스 기준 전체 한도)
+            concurrency = get_collection_concurrency()
+            lease_manager = get_lease_manager()
             
             async def collect_with_limit(store):
-                """세마포어로 동시 실행 제한"""
-                async with semaphore:
-                    return await self.collect_reviews_for_store(store['store_code'])
+                """플랫폼별 동시 실행 제한 (다른 워커가 이미 맡은 매장은 건너뜀)"""
+                async with concurrency.slot(store['platform']):
+                    if not await lease_manager.claim_store(store['store_code']):
+                        return {"success": True, "skipped": True}
+                    
+                    try:
+                        started = time.time()
+                        result = await self.collect_reviews_for_store(store['store_code'])
+                        concurrency.record(store['platform'], time.time() - started, result)
+                        return result
+                    finally:
+                        await lease_manager.release_store(store['store_code'])
             
             # 모든 매장 병렬 처리
             tasks = [
@@ -393,12 +396,15 @@ class ReviewCollectorService:
             # 결과 집계
             success_count = 0
             fail_count = 0
+            skipped_count = 0
             total_reviews = 0
             
             for idx, result in enumerate(results):
                 if isinstance(result, Exception):
                     fail_count += 1
                     logger.error(f"매장 {active_stores[idx]['store_code']} 수집 실패: {result}")
+                elif isinstance(result, dict) and result.get('skipped'):
+                    skipped_count += 1
                 elif isinstance(result, dict) and result.get('success'):
                     success_count += 1
                     total_reviews += result.get('collected', 0)
@@ -412,6 +418,7 @@ class ReviewCollectorService:
                 "total_stores": len(active_stores),
                 "success_count": success_count,
                 "fail_count": fail_count,
+                "skipped_count": skipped_count,
                 "total_new_reviews": total_reviews,
                 "elapsed_time": f"{elapsed_time:.2f}초"
             }
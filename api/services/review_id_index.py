@@ -0,0 +1,322 @@
+"""
+수집 리뷰 ID 인덱스
+매장(platform + platform_code)별 Bloom 필터로 이미 저장된 리뷰를 네트워크 없이 걸러내고,
+Bloom 필터가 "있을 수도 있음"이라고 답한 ID만 DB에서 정확히 확인
+(리뷰마다 select 하던 중복 확인 대체 - 신규 리뷰는 DB 조회 없이 통과)
+"""
+import os
+import math
+import time
+import struct
+import hashlib
+import asyncio
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Iterable, Callable, Set, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+project_root = Path(__file__).resolve().parent.parent.parent
+
+# 파일 헤더: 매직 + capacity, hash_count, bit_count, count, created_at(DB에서 생성한 시각)
+_MAGIC = b'RIDX1'
+_HEADER = struct.Struct('>IIIId')
+
+
+class BloomFilter:
+    """고정 크기 Bloom 필터 (md5 기반 이중 해싱)"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01,
+                 hash_count: Optional[int] = None, bit_count: Optional[int] = None):
+        self.capacity = max(capacity, 1)
+        self.bit_count = bit_count or max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = hash_count or max(1, round(self.bit_count / self.capacity * math.log(2)))
+        self.bits = bytearray((self.bit_count + 7) // 8)
+        self.count = 0
+        self.created_at = time.time()
+
+    def _positions(self, item: str):
+        digest = hashlib.md5(item.encode('utf-8')).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.bit_count
+
+    def add(self, item: str):
+        is_new = False
+        for pos in self._positions(item):
+            mask = 1 << (pos & 7)
+            if not self.bits[pos >> 3] & mask:
+                self.bits[pos >> 3] |= mask
+                is_new = True
+        if is_new:
+            self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def is_saturated(self) -> bool:
+        return self.count > self.capacity
+
+    def to_bytes(self) -> bytes:
+        return _MAGIC + _HEADER.pack(self.capacity, self.hash_count, self.bit_count, self.count, self.created_at) + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'BloomFilter':
+        if not data.startswith(_MAGIC):
+            raise ValueError("리뷰 인덱스 파일 형식 오류")
+        offset = len(_MAGIC)
+        capacity, hash_count, bit_count, count, created_at = _HEADER.unpack_from(data, offset)
+        bits = data[offset + _HEADER.size:]
+        if len(bits) != (bit_count + 7) // 8:
+            raise ValueError("리뷰 인덱스 파일 크기 불일치")
+
+        bloom = cls(capacity, hash_count=hash_count, bit_count=bit_count)
+        bloom.bits = bytearray(bits)
+        bloom.count = count
+        bloom.created_at = created_at
+        return bloom
+
+
+class _StoreIndex:
+    """매장 하나의 Bloom 필터와 파일 동기화 상태"""
+
+    def __init__(self, bloom: BloomFilter, file_mtime: float):
+        self.bloom = bloom
+        self.file_mtime = file_mtime
+
+
+class ReviewIdIndex:
+    """
+    매장별 수집 리뷰 ID 인덱스
+
+    처음 조회하는 매장은 저장된 파일에서, 파일이 없거나 DB에서 만든 지 REVIEW_ID_INDEX_MAX_AGE_HOURS 가
+    지났으면 DB의 review_id 전체로 필터를 만들고 파일로 저장합니다. 크롤러 워커 프로세스가 여러 개여도
+    파일 수정 시간이 바뀌면 다시 읽으므로 다른 워커가 저장한 리뷰도 반영됩니다.
+    """
+
+    def __init__(self,
+                 base_dir: Optional[str] = None,
+                 capacity: Optional[int] = None,
+                 error_rate: Optional[float] = None,
+                 max_age_hours: Optional[float] = None):
+        base_dir = base_dir or os.getenv("REVIEW_ID_INDEX_DIR", str(project_root / "data" / "review_index"))
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.capacity = capacity or int(os.getenv("REVIEW_ID_INDEX_CAPACITY", "20000"))
+        self.error_rate = error_rate or float(os.getenv("REVIEW_ID_INDEX_ERROR_RATE", "0.01"))
+        self.max_age_seconds = (max_age_hours or float(os.getenv("REVIEW_ID_INDEX_MAX_AGE_HOURS", "24"))) * 3600
+
+        self._stores: Dict[Tuple[str, str], _StoreIndex] = {}
+        self._lock = threading.RLock()
+
+        # 통계
+        self._warms = 0
+        self._checked = 0
+        self._bloom_hits = 0
+        self._confirmed = 0
+
+    def _path(self, platform: str, platform_code: str) -> Path:
+        key = hashlib.sha256(f"{platform}:{platform_code}".encode('utf-8')).hexdigest()[:32]
+        return self.base_dir / f"{platform}_{key}.bloom"
+
+    def _load_ids_from_db(self, platform: str, platform_code: str) -> List[str]:
+        """매장의 저장된 review_id 전체 조회 (1000개 단위 페이지)"""
+        from config.supabase_client import get_supabase_client
+
+        supabase = get_supabase_client()
+        review_ids = []
+        page_size = 1000
+        start = 0
+        while True:
+            response = supabase.table('reviews')\
+                .select('review_id')\
+                .eq('platform', platform)\
+                .eq('platform_code', platform_code)\
+                .range(start, start + page_size - 1)\
+                .execute()
+            rows = response.data or []
+            review_ids.extend(row['review_id'] for row in rows)
+            if len(rows) < page_size:
+                return review_ids
+            start += page_size
+
+    def _warm(self, platform: str, platform_code: str) -> _StoreIndex:
+        """DB에서 필터 생성 후 파일로 저장"""
+        review_ids = self._load_ids_from_db(platform, platform_code)
+        bloom = BloomFilter(max(self.capacity, len(review_ids) * 2), self.error_rate)
+        for review_id in review_ids:
+            bloom.add(review_id)
+
+        store = _StoreIndex(bloom, 0)
+        store.file_mtime = self._save(platform, platform_code, bloom)
+        self._warms += 1
+        logger.info(f"[ReviewIdIndex] {platform}/{platform_code} 인덱스 생성 ({len(review_ids)}개)")
+        return store
+
+    def _save(self, platform: str, platform_code: str, bloom: BloomFilter) -> float:
+        path = self._path(platform, platform_code)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp_path.write_bytes(bloom.to_bytes())
+        os.replace(tmp_path, path)
+        return path.stat().st_mtime
+
+    def _is_fresh(self, bloom: BloomFilter) -> bool:
+        """DB에서 다시 만들 필요가 없는 필터인지 (생성 후 경과 시간, 용량 초과 여부)"""
+        return time.time() - bloom.created_at < self.max_age_seconds and not bloom.is_saturated()
+
+    def _merge_from_file(self, platform: str, platform_code: str, store: _StoreIndex):
+        """다른 워커가 그사이 저장한 필터가 있으면 비트 OR로 합침 (덮어써서 잃지 않도록)"""
+        path = self._path(platform, platform_code)
+        try:
+            if not path.exists() or path.stat().st_mtime == store.file_mtime:
+                return
+            other = BloomFilter.from_bytes(path.read_bytes())
+        except Exception:
+            return
+
+        if other.bit_count != store.bloom.bit_count or other.hash_count != store.bloom.hash_count:
+            return
+        for i, byte in enumerate(other.bits):
+            store.bloom.bits[i] |= byte
+        store.bloom.count = max(store.bloom.count, other.count)
+
+    def _get_store(self, platform: str, platform_code: str) -> Optional[_StoreIndex]:
+        """메모리 → 파일 → DB 순서로 매장 필터 확보 (실패 시 None)"""
+        key = (platform, platform_code)
+        path = self._path(platform, platform_code)
+
+        with self._lock:
+            try:
+                file_mtime = path.stat().st_mtime if path.exists() else 0
+                store = self._stores.get(key)
+
+                if store and store.file_mtime == file_mtime and self._is_fresh(store.bloom):
+                    return store
+
+                if file_mtime:
+                    bloom = BloomFilter.from_bytes(path.read_bytes())
+                    if self._is_fresh(bloom):
+                        store = _StoreIndex(bloom, file_mtime)
+                        self._stores[key] = store
+                        return store
+
+                store = self._warm(platform, platform_code)
+                self._stores[key] = store
+                return store
+
+            except Exception as e:
+                logger.error(f"[ReviewIdIndex] {platform}/{platform_code} 인덱스 준비 실패: {str(e)}")
+                self._stores.pop(key, None)
+                return None
+
+    def find_existing(self,
+                      platform: str,
+                      platform_code: str,
+                      review_ids: Iterable[str],
+                      confirm: Optional[Callable[[List[str]], Set[str]]] = None) -> Set[str]:
+        """
+        이미 저장된 review_id 반환
+
+        Bloom 필터에 없는 ID는 신규로 확정하고, 필터에 있는 ID만 confirm(DB in_() 조회)으로 확인합니다.
+        필터를 준비하지 못하면 전체를 confirm으로 확인합니다.
+
+        Args:
+            confirm: ID 목록 → 실제 저장된 ID 집합 (기본: reviews 테이블 in_() 조회)
+        """
+        review_ids = [review_id for review_id in dict.fromkeys(review_ids) if review_id]
+        if not review_ids:
+            return set()
+
+        if confirm is None:
+            from api.services.review_ingest import fetch_existing_review_ids
+            from config.supabase_client import get_supabase_client
+
+            def confirm(ids: List[str]) -> Set[str]:
+                return fetch_existing_review_ids(get_supabase_client(), ids)
+
+        store = self._get_store(platform, platform_code)
+        if store is None:
+            return set(confirm(review_ids))
+
+        with self._lock:
+            candidates = [review_id for review_id in review_ids if review_id in store.bloom]
+            self._checked += len(review_ids)
+            self._bloom_hits += len(candidates)
+
+        existing = set(confirm(candidates)) if candidates else set()
+
+        with self._lock:
+            self._confirmed += len(existing)
+
+        if candidates:
+            logger.debug(f"[ReviewIdIndex] {platform}/{platform_code} {len(review_ids)}개 중 "
+                         f"후보 {len(candidates)}개, 확인 {len(existing)}개")
+        return existing
+
+    async def find_existing_async(self,
+                                  platform: str,
+                                  platform_code: str,
+                                  review_ids: Iterable[str]) -> Set[str]:
+        """find_existing의 async 버전 (DB 조회를 executor에서 실행)"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.find_existing, platform, platform_code, list(review_ids))
+
+    def add(self, platform: str, platform_code: str, review_ids: Iterable[str]):
+        """저장된 review_id 반영 후 파일 갱신"""
+        review_ids = [review_id for review_id in review_ids if review_id]
+        if not review_ids:
+            return
+
+        store = self._get_store(platform, platform_code)
+        if store is None:
+            return
+
+        with self._lock:
+            self._merge_from_file(platform, platform_code, store)
+            for review_id in review_ids:
+                store.bloom.add(review_id)
+            try:
+                store.file_mtime = self._save(platform, platform_code, store.bloom)
+            except Exception as e:
+                logger.error(f"[ReviewIdIndex] {platform}/{platform_code} 인덱스 저장 실패: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'stores': len(self._stores),
+                'warms': self._warms,
+                'checked': self._checked,
+                'bloom_hits': self._bloom_hits,
+                'confirmed': self._confirmed,
+                'false_positives': self._bloom_hits - self._confirmed
+            }
+
+
+# 싱글톤 인스턴스
+_review_id_index: Optional[ReviewIdIndex] = None
+_review_id_index_lock = threading.Lock()
+
+
+def get_review_id_index() -> ReviewIdIndex:
+    """리뷰 ID 인덱스 싱글톤 인스턴스 반환"""
+    global _review_id_index
+    with _review_id_index_lock:
+        if _review_id_index is None:
+            _review_id_index = ReviewIdIndex()
+        return _review_id_index
+
+
+def find_known_review_ids(platform: str, platform_code: str, review_ids: Iterable[str]) -> Set[str]:
+    """
+    크롤러용: 이미 저장된 review_id 집합 (오류 시 빈 집합 - 저장 단계에서 다시 중복 확인됨)
+    """
+    try:
+        return get_review_id_index().find_existing(platform, platform_code, review_ids)
+    except Exception as e:
+        logger.warning(f"[ReviewIdIndex] 기존 리뷰 확인 실패, 전체 수집으로 진행: {str(e)}")
+        return set()
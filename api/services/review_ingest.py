@@ -0,0 +1,198 @@
+"""
+리뷰 일괄 저장 서비스
+크롤러가 수집한 리뷰를 한 번의 in_() 조회로 중복 제거한 뒤 청크 단위로 insert
+(리뷰마다 select + insert 하던 방식 대체: 50개 기준 ~100회 → 2~3회 요청)
+중복 확인은 리뷰 ID 인덱스(Bloom 필터)가 "있을 수도 있음"이라고 답한 ID만 DB에서 조회
+새로 저장한 리뷰는 작업 큐(PIPELINE_QUEUE_ENABLED)에 AI 답글 생성 작업으로 등록
+"""
+import os
+import logging
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from config.supabase_client import get_supabase_client
+from api.services.review_id_index import get_review_id_index
+from api.services.pipeline_queue import enqueue_pipeline_jobs, JOB_AI_REPLY
+
+logger = logging.getLogger(__name__)
+
+INGEST_CHUNK_SIZE = int(os.getenv("REVIEW_INGEST_CHUNK_SIZE", "100"))
+
+
+def build_review_row(review: Dict[str, Any], crawled_at: str) -> Dict[str, Any]:
+    """크롤러 리뷰 dict → reviews 테이블 행"""
+    row = {
+        'review_id': review['review_id'],
+        'platform': review['platform'],
+        'platform_code': review['platform_code'],
+        'store_code': review['store_code'],
+        'review_name': review['review_name'],
+        'rating': review['rating'],
+        'review_content': review['review_content'],
+        'review_date': review['review_date'],
+        'ordered_menu': review['ordered_menu'],
+        'delivery_review': review.get('delivery_review', ''),
+        'response_status': 'pending',  # 기본값: 미답변 상태
+        'crawled_at': crawled_at
+    }
+
+    # review_images는 TEXT[] 컬럼 (리스트는 Supabase가 자동 변환)
+    if isinstance(review.get('review_images'), list):
+        row['review_images'] = review['review_images']
+    else:
+        row['review_images'] = []
+
+    return row
+
+
+def watermark_from_reviews(reviews: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """수집 결과 → 증분 수집 워터마크 필드 (review_ids는 수집 순서 = 최신순)"""
+    review_ids = [review['review_id'] for review in reviews if review.get('review_id')]
+    review_dates = [review['review_date'] for review in reviews if review.get('review_date')]
+    return {
+        'review_ids': review_ids,
+        'latest_review_date': max(review_dates) if review_dates else None
+    }
+
+
+def _chunks(items: List[Any], size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def fetch_existing_review_ids(supabase, review_ids: List[str], chunk_size: int = INGEST_CHUNK_SIZE) -> set:
+    """이미 저장된 review_id 조회 (청크당 in_() 1회)"""
+    existing = set()
+    for chunk in _chunks(review_ids, chunk_size):
+        response = supabase.table('reviews').select('review_id').in_('review_id', chunk).execute()
+        existing.update(row['review_id'] for row in (response.data or []))
+    return existing
+
+
+def ingest_reviews(store_info: Dict[str, Any],
+                   reviews: List[Dict[str, Any]],
+                   normalize: bool = True,
+                   update_usage: bool = True,
+                   chunk_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    수집한 리뷰 일괄 저장
+
+    Args:
+        store_info: 매장 정보 (사용량 집계용 owner_user_code)
+        reviews: 크롤러가 반환한 리뷰 목록
+        normalize: True면 build_review_row로 정제, False면 크롤러 dict를 그대로 저장
+        update_usage: 저장 건수만큼 update_usage RPC 호출 여부
+        chunk_size: 조회/insert 청크 크기 (기본 REVIEW_INGEST_CHUNK_SIZE)
+
+    Returns:
+        dict: {saved, duplicate, failed, saved_ids, duplicate_ids}
+    """
+    stats = {'saved': 0, 'duplicate': 0, 'failed': 0, 'saved_ids': [], 'duplicate_ids': []}
+    if not reviews:
+        return stats
+
+    chunk_size = chunk_size or INGEST_CHUNK_SIZE
+    supabase = get_supabase_client()
+    crawled_at = datetime.now().isoformat()
+
+    # 배치 내부 중복 제거 (같은 페이지에서 같은 리뷰가 두 번 잡히는 경우)
+    unique_reviews: Dict[str, Dict[str, Any]] = {}
+    for review in reviews:
+        review_id = review.get('review_id')
+        if not review_id:
+            stats['failed'] += 1
+            continue
+        if review_id in unique_reviews:
+            stats['duplicate'] += 1
+            stats['duplicate_ids'].append(review_id)
+            continue
+        unique_reviews[review_id] = review
+
+    def confirm(ids: List[str]) -> set:
+        return fetch_existing_review_ids(supabase, ids, chunk_size)
+
+    # 매장별로 인덱스 조회 (Bloom 필터에 없는 ID는 DB 조회 없이 신규로 확정)
+    review_index = get_review_id_index()
+    ids_by_store: Dict[tuple, List[str]] = {}
+    for review_id, review in unique_reviews.items():
+        store_key = (review.get('platform'), review.get('platform_code'))
+        ids_by_store.setdefault(store_key, []).append(review_id)
+
+    try:
+        existing_ids = set()
+        for (platform, platform_code), store_ids in ids_by_store.items():
+            if platform and platform_code:
+                existing_ids |= review_index.find_existing(platform, platform_code, store_ids, confirm)
+            else:
+                existing_ids |= confirm(store_ids)
+    except Exception as e:
+        logger.error(f"[DB] 기존 리뷰 조회 실패: {str(e)}")
+        stats['failed'] += len(unique_reviews)
+        return stats
+
+    rows = []
+    for review_id, review in unique_reviews.items():
+        if review_id in existing_ids:
+            stats['duplicate'] += 1
+            stats['duplicate_ids'].append(review_id)
+            continue
+        try:
+            if normalize:
+                rows.append(build_review_row(review, crawled_at))
+            else:
+                rows.append(dict(review, crawled_at=review.get('crawled_at') or crawled_at))
+        except KeyError as e:
+            logger.error(f"[DB] 리뷰 필드 누락: {review_id} - {str(e)}")
+            stats['failed'] += 1
+
+    for chunk in _chunks(rows, chunk_size):
+        try:
+            result = supabase.table('reviews').insert(chunk).execute()
+            inserted_ids = [row['review_id'] for row in (result.data or [])]
+            stats['saved'] += len(inserted_ids)
+            stats['saved_ids'].extend(inserted_ids)
+            stats['failed'] += len(chunk) - len(inserted_ids)
+        except Exception as e:
+            # 한 행 때문에 청크 전체가 실패하지 않도록 행 단위로 재시도
+            logger.warning(f"[DB] 청크 저장 실패, 개별 저장으로 재시도: {str(e)}")
+            for row in chunk:
+                try:
+                    result = supabase.table('reviews').insert(row).execute()
+                    if result.data:
+                        stats['saved'] += 1
+                        stats['saved_ids'].append(row['review_id'])
+                    else:
+                        stats['failed'] += 1
+                except Exception as row_error:
+                    # 인덱스가 놓친 기존 리뷰 (다른 워커가 먼저 저장한 경우 등)
+                    if 'duplicate' in str(row_error) or '23505' in str(row_error):
+                        stats['duplicate'] += 1
+                        stats['duplicate_ids'].append(row['review_id'])
+                        continue
+                    logger.error(f"[DB] 저장 중 오류: {row['review_id']} - {str(row_error)}")
+                    stats['failed'] += 1
+
+    # 저장/중복 확인된 ID를 인덱스에 반영
+    known_ids = set(stats['saved_ids']) | set(stats['duplicate_ids'])
+    for (platform, platform_code), store_ids in ids_by_store.items():
+        if platform and platform_code:
+            review_index.add(platform, platform_code, [review_id for review_id in store_ids if review_id in known_ids])
+
+    # 작업 큐 사용 시 새 리뷰의 AI 답글 생성 작업 등록
+    enqueue_pipeline_jobs(JOB_AI_REPLY, stats['saved_ids'])
+
+    if update_usage and stats['saved'] > 0:
+        try:
+            supabase.rpc('update_usage', {
+                'p_user_code': store_info.get('owner_user_code', 'SYSTEM'),
+                'p_reviews_increment': stats['saved'],
+                'p_ai_api_calls_increment': 0,
+                'p_web_api_calls_increment': 0,
+                'p_manual_replies_increment': 0,
+                'p_error_increment': 0
+            }).execute()
+        except Exception as e:
+            logger.error(f"[DB] 사용량 업데이트 실패: {str(e)}")
+
+    logger.info(f"[DB] 리뷰 일괄 저장 완료: 성공 {stats['saved']}개, 중복 {stats['duplicate']}개, 실패 {stats['failed']}개")
+    return stats
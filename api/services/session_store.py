@@ -0,0 +1,249 @@
+"""
+플랫폼 로그인 세션 저장소
+플랫폼 계정(platform + platform_id)별로 Playwright storage_state(쿠키 + localStorage)를
+암호화하여 보관하고, 재사용 전에 가볍게 검증한 뒤 만료된 경우에만 로그인하도록 지원
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from dotenv import load_dotenv
+
+from api.services.encryption import get_encryption_service
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+project_root = Path(__file__).resolve().parent.parent.parent
+
+# 세션 검증용 페이지 (로그인 필요 페이지로 이동 후 로그인 페이지로 튕기는지 확인)
+SESSION_PROBE_URLS = {
+    'baemin': 'https://self.baemin.com/',
+    'coupang': 'https://store.coupangeats.com/merchant/management/reviews',
+    'yogiyo': 'https://ceo.yogiyo.co.kr/reviews',
+    'naver': 'https://new.smartplace.naver.com/',
+}
+
+# 세션이 죽었을 때 리다이렉트되는 URL에 포함되는 문자열
+SESSION_LOGIN_MARKERS = {
+    'baemin': ['login'],
+    'coupang': ['login'],
+    'yogiyo': ['login'],
+    'naver': ['nid.naver.com', 'login'],
+}
+
+
+class SessionStore:
+    """
+    플랫폼 계정별 storage_state 저장소
+
+    파일명은 platform_id 해시를 사용하고, 내용은 ENCRYPTION_KEY로 암호화합니다.
+    저장된 지 SESSION_TTL_HOURS 가 지난 세션은 검증 없이 폐기합니다.
+    """
+
+    def __init__(self, base_dir: Optional[str] = None, ttl_hours: Optional[float] = None):
+        base_dir = base_dir or os.getenv("SESSION_STORE_DIR", str(project_root / "browser_data" / "sessions"))
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = (ttl_hours or float(os.getenv("SESSION_TTL_HOURS", "12"))) * 3600
+        self.encryption = get_encryption_service()
+        self._lock = threading.Lock()
+
+        # 통계
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def _path(self, platform: str, platform_id: str) -> Path:
+        account_hash = hashlib.sha256(f"{platform}:{platform_id}".encode()).hexdigest()[:16]
+        return self.base_dir / f"{platform}_{account_hash}.session"
+
+    def load(self, platform: str, platform_id: str) -> Optional[Dict[str, Any]]:
+        """
+        저장된 storage_state 로드
+
+        Returns:
+            new_context(storage_state=...)에 바로 넘길 수 있는 dict, 없거나 만료되면 None
+        """
+        if not platform_id:
+            return None
+
+        path = self._path(platform, platform_id)
+        if not path.exists():
+            self._count('_misses')
+            return None
+
+        try:
+            payload = json.loads(path.read_text(encoding='utf-8'))
+            if time.time() - payload.get('saved_at', 0) > self.ttl_seconds:
+                logger.info(f"[SessionStore] {platform} 세션 만료 (TTL 초과): {platform_id}")
+                self.invalidate(platform, platform_id)
+                self._count('_misses')
+                return None
+
+            state = json.loads(self.encryption.decrypt(payload['state']))
+            self._count('_hits')
+            logger.info(f"[SessionStore] {platform} 저장된 세션 로드: {platform_id}")
+            return state
+
+        except Exception as e:
+            logger.warning(f"[SessionStore] {platform} 세션 로드 실패, 폐기: {str(e)}")
+            self.invalidate(platform, platform_id)
+            self._count('_misses')
+            return None
+
+    def save(self, platform: str, platform_id: str, state: Dict[str, Any]):
+        """context.storage_state() 결과 저장"""
+        if not platform_id or not state:
+            return
+
+        encrypted = self.encryption.encrypt(json.dumps(state, ensure_ascii=False))
+        if not encrypted:
+            logger.warning(f"[SessionStore] {platform} 세션 암호화 실패, 저장하지 않음")
+            return
+
+        path = self._path(platform, platform_id)
+        # 프로세스마다 다른 임시 파일 (여러 워커 프로세스가 같은 계정 세션을 동시에 저장할 수 있음)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        payload = {'platform': platform, 'saved_at': time.time(), 'state': encrypted}
+
+        with self._lock:
+            tmp_path.write_text(json.dumps(payload), encoding='utf-8')
+            os.replace(tmp_path, path)
+
+        logger.info(f"[SessionStore] {platform} 세션 저장: {platform_id}")
+
+    def invalidate(self, platform: str, platform_id: str):
+        """세션 폐기 (검증 실패 또는 로그아웃 감지 시)"""
+        if not platform_id:
+            return
+
+        path = self._path(platform, platform_id)
+        try:
+            path.unlink()
+            self._count('_invalidations')
+            logger.info(f"[SessionStore] {platform} 세션 폐기: {platform_id}")
+        except FileNotFoundError:
+            pass
+
+    def is_logged_in_url(self, platform: str, url: str) -> bool:
+        """검증 페이지 이동 후 URL로 로그인 상태 판단"""
+        if not url or url == 'about:blank':
+            return False
+        markers = SESSION_LOGIN_MARKERS.get(platform, ['login'])
+        return not any(marker in url for marker in markers)
+
+    def get_probe_url(self, platform: str) -> Optional[str]:
+        return SESSION_PROBE_URLS.get(platform)
+
+    def _count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'invalidations': self._invalidations
+            }
+
+
+# 싱글톤 인스턴스
+_session_store: Optional[SessionStore] = None
+_session_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """세션 저장소 싱글톤 인스턴스 반환"""
+    global _session_store
+    with _session_store_lock:
+        if _session_store is None:
+            _session_store = SessionStore()
+        return _session_store
+
+
+async def restore_session_async(page, platform: str, platform_id: str) -> bool:
+    """
+    저장된 세션이 유효한지 검증 (async Playwright)
+
+    context는 미리 storage_state로 생성되어 있어야 합니다.
+    검증 페이지가 로그인 페이지로 리다이렉트되면 세션을 폐기하고 쿠키를 비운 뒤 False 반환.
+    """
+    store = get_session_store()
+    probe_url = store.get_probe_url(platform)
+    if not probe_url:
+        return False
+
+    try:
+        await page.goto(probe_url, wait_until='domcontentloaded', timeout=20000)
+        try:
+            # SPA의 클라이언트 리다이렉트 반영 대기
+            await page.wait_for_load_state('networkidle', timeout=5000)
+        except Exception:
+            pass
+
+        if store.is_logged_in_url(platform, page.url):
+            logger.info(f"[SessionStore] {platform} 저장된 세션 유효 - 로그인 생략")
+            # 갱신된 쿠키와 저장 시각 반영
+            store.save(platform, platform_id, await page.context.storage_state())
+            return True
+    except Exception as e:
+        logger.warning(f"[SessionStore] {platform} 세션 검증 중 오류: {str(e)}")
+
+    store.invalidate(platform, platform_id)
+    try:
+        await page.context.clear_cookies()
+    except Exception:
+        pass
+    return False
+
+
+async def save_session_async(context, platform: str, platform_id: str):
+    """로그인 성공 후 세션 저장 (async Playwright)"""
+    try:
+        get_session_store().save(platform, platform_id, await context.storage_state())
+    except Exception as e:
+        logger.warning(f"[SessionStore] {platform} 세션 저장 실패: {str(e)}")
+
+
+def restore_session_sync(page, platform: str, platform_id: str) -> bool:
+    """restore_session_async 의 sync Playwright 버전"""
+    store = get_session_store()
+    probe_url = store.get_probe_url(platform)
+    if not probe_url:
+        return False
+
+    try:
+        page.goto(probe_url, wait_until='domcontentloaded', timeout=20000)
+        try:
+            page.wait_for_load_state('networkidle', timeout=5000)
+        except Exception:
+            pass
+
+        if store.is_logged_in_url(platform, page.url):
+            logger.info(f"[SessionStore] {platform} 저장된 세션 유효 - 로그인 생략")
+            store.save(platform, platform_id, page.context.storage_state())
+            return True
+    except Exception as e:
+        logger.warning(f"[SessionStore] {platform} 세션 검증 중 오류: {str(e)}")
+
+    store.invalidate(platform, platform_id)
+    try:
+        page.context.clear_cookies()
+    except Exception:
+        pass
+    return False
+
+
+def save_session_sync(context, platform: str, platform_id: str):
+    """save_session_async 의 sync Playwright 버전"""
+    try:
+        get_session_store().save(platform, platform_id, context.storage_state())
+    except Exception as e:
+        logger.warning(f"[SessionStore] {platform} 세션 저장 실패: {str(e)}")
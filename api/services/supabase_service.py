@@ -7,12 +7,38 @@ import logging
 from supabase import create_client, Client
 from dotenv import load_dotenv
 import asyncio
+import time
+import threading
 from functools import wraps
 from datetime import datetime, timedelta
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# AI 답글 생성/검증에 필요한 리뷰 컬럼 (프롬프트에 들어가는 고객명/주문메뉴/배달리뷰 포함)
+AI_REPLY_REVIEW_COLUMNS = (
+    'review_id, store_code, review_content, rating, review_name, platform, response_status, '
+    'boss_reply_needed, ai_response, created_at, ordered_menu, delivery_review, review_date'
+)
+
+# 매장 답글 정책 캐시 (프로세스 공용, store_code → (조회 시각, 버전 확인 시각, updated_at, 정책))
+# 매장 설정 변경 시 invalidate_store_rules_cache로 즉시 무효화 (설정을 바꾼 API 프로세스만 해당)
+# 다른 프로세스(SCHEDULER_MODE=worker 워커 등)는 STORE_RULES_VERSION_CHECK_SECONDS마다
+# updated_at만 가볍게 조회해 바뀐 매장의 정책을 다시 읽음
+STORE_RULES_CACHE_TTL = float(os.getenv("STORE_RULES_CACHE_TTL", "300"))
+STORE_RULES_VERSION_CHECK_SECONDS = float(os.getenv("STORE_RULES_VERSION_CHECK_SECONDS", "15"))
+_store_rules_cache: Dict[str, tuple] = {}
+_store_rules_cache_lock = threading.Lock()
+
+
+def invalidate_store_rules_cache(store_code: Optional[str] = None):
+    """매장 답글 정책 캐시 무효화 (store_code가 없으면 전체)"""
+    with _store_rules_cache_lock:
+        if store_code is None:
+            _store_rules_cache.clear()
+        else:
+            _store_rules_cache.pop(store_code, None)
+
 
 def async_wrapper(func):
     """동기 함수를 비동기로 래핑"""
@@ -420,69 +446,151 @@ class SupabaseService:
     # =============================================
 
     async def get_store_reply_rules(self, store_code: str) -> Dict[str, Any]:
-        """매장별 답글 정책 조회"""
+        """매장별 답글 정책 조회 (캐시 우선)"""
+        rules_by_store = await self.get_store_reply_rules_bulk([store_code])
+        return rules_by_store[store_code]
+    
+    async def get_store_reply_rules_bulk(self, store_codes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        여러 매장의 답글 정책 일괄 조회
+        
+        캐시에 없는 매장만 in_() 한 번으로 조회하며, 정책이 없거나 조회에 실패한 매장은 기본 정책 반환
+        버전 확인 주기가 지난 캐시는 updated_at만 조회해 바뀌었으면 다시 조회
+        
+        Returns:
+            dict: store_code → 답글 정책 (호출 측에서 수정해도 캐시에 영향 없도록 복사본)
+        """
+        now = time.time()
+        rules_by_store: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        to_check = {}
+        
+        with _store_rules_cache_lock:
+            for store_code in dict.fromkeys(store_codes):
+                cached = _store_rules_cache.get(store_code)
+                if not cached or now - cached[0] >= STORE_RULES_CACHE_TTL:
+                    missing.append(store_code)
+                elif now - cached[1] < STORE_RULES_VERSION_CHECK_SECONDS:
+                    rules_by_store[store_code] = dict(cached[3])
+                else:
+                    to_check[store_code] = cached
+        
+        if to_check:
+            missing.extend(await self._revalidate_store_rules(to_check, rules_by_store, now))
+        
+        if not missing:
+            return rules_by_store
+        
         try:
             response = await self._execute_query(
                 self.client.table('platform_reply_rules')
                 .select('*')
-                .eq('store_code', store_code)
+                .in_('store_code', missing)
                 .eq('is_active', True)
             )
             
-            if response.data:
-                rules = response.data[0]
-                
-                # SQL 스키마의 실제 필드명에 맞춰 반환
-                return {
-                    'store_code': rules.get('store_code', store_code),
-                    'store_name': rules.get('store_name', ''),
-                    'platform': rules.get('platform', ''),
-                    'platform_code': rules.get('platform_code', ''),
+            rows = {}
+            for row in response.data or []:
+                rows.setdefault(row['store_code'], row)
+            
+            with _store_rules_cache_lock:
+                for store_code in missing:
+                    if store_code in rows:
+                        rules = self._build_reply_rules(rows[store_code], store_code)
+                        _store_rules_cache[store_code] = (now, now, str(rows[store_code].get('updated_at')), rules)
+                    else:
+                        # 매장 정보가 없는 경우 기본값 반환 (캐시하지 않음)
+                        logger.warning(f"매장 정책을 찾을 수 없습니다: {store_code}")
+                        rules = self._get_default_reply_rules(store_code)
+                    rules_by_store[store_code] = dict(rules)
                     
-                    # 답글 정책 설정
-                    'greeting_start': rules.get('greeting_start', '안녕하세요'),
-                    'greeting_end': rules.get('greeting_end', '감사합니다'),
-                    'role': rules.get('role', ''),
-                    'tone': rules.get('tone', ''),
-                    'prohibited_words': rules.get('prohibited_words', []),
-                    'max_length': rules.get('max_length', 300),
-                    
-                    # 별점별 자동 답글 활성화 설정
-                    'rating_5_reply': rules.get('rating_5_reply', True),
-                    'rating_4_reply': rules.get('rating_4_reply', True),
-                    'rating_3_reply': rules.get('rating_3_reply', True),
-                    'rating_2_reply': rules.get('rating_2_reply', True),
-                    'rating_1_reply': rules.get('rating_1_reply', True),
-                    
-                    # 운영 설정
-                    'auto_reply_enabled': rules.get('auto_reply_enabled', True),
-                    'auto_reply_hours': rules.get('auto_reply_hours', '10:00-20:00'),
-                    'reply_delay_minutes': rules.get('reply_delay_minutes', 30),
-                    'weekend_enabled': rules.get('weekend_enabled', True),
-                    'holiday_enabled': rules.get('holiday_enabled', False),
-                    
-                    # 품질 관리
-                    'quality_check_enabled': rules.get('quality_check_enabled', True),
-                    'manual_review_threshold': rules.get('manual_review_threshold', 0.3),
-                    'learning_mode': rules.get('learning_mode', False),
-                    
-                    # 기타 정보
-                    'owner_user_code': rules.get('owner_user_code', ''),
-                    'store_type': rules.get('store_type', 'delivery_only'),
-                    'store_address': rules.get('store_address', ''),
-                    'store_phone': rules.get('store_phone', ''),
-                    'business_hours': rules.get('business_hours', {}),
-                    'avg_rating': rules.get('avg_rating', 0.0),
-                    'total_reviews_processed': rules.get('total_reviews_processed', 0)
-                }
-            else:
-                # 매장 정보가 없는 경우 기본값 반환
-                logger.warning(f"매장 정책을 찾을 수 없습니다: {store_code}")
-                return self._get_default_reply_rules(store_code)
-                
         except Exception as e:
             logger.error(f"매장 정책 조회 오류: {e}")
-            return self._get_default_reply_rules(store_code)
+            for store_code in missing:
+                rules_by_store[store_code] = self._get_default_reply_rules(store_code)
+        
+        return rules_by_store
+    
+    async def _revalidate_store_rules(
+        self,
+        to_check: Dict[str, tuple],
+        rules_by_store: Dict[str, Dict[str, Any]],
+        now: float
+    ) -> List[str]:
+        """캐시된 정책의 updated_at 비교 - 그대로면 rules_by_store에 채우고, 바뀐 매장 코드 목록 반환"""
+        try:
+            response = await self._execute_query(
+                self.client.table('platform_reply_rules')
+                .select('store_code, updated_at')
+                .in_('store_code', list(to_check.keys()))
+                .eq('is_active', True)
+            )
+        except Exception as e:
+            # 확인에 실패하면 TTL 안의 캐시를 그대로 사용
+            logger.warning(f"매장 정책 버전 확인 실패, 캐시 사용: {e}")
+            for store_code, cached in to_check.items():
+                rules_by_store[store_code] = dict(cached[3])
+            return []
+        
+        versions = {}
+        for row in response.data or []:
+            versions.setdefault(row['store_code'], str(row.get('updated_at')))
+        
+        changed = []
+        with _store_rules_cache_lock:
+            for store_code, cached in to_check.items():
+                if versions.get(store_code) == cached[2]:
+                    _store_rules_cache[store_code] = (cached[0], now, cached[2], cached[3])
+                    rules_by_store[store_code] = dict(cached[3])
+                else:
+                    changed.append(store_code)
+        return changed
+    
+    def _build_reply_rules(self, rules: Dict[str, Any], store_code: str) -> Dict[str, Any]:
+        """platform_reply_rules 행 → 답글 정책 dict"""
+        # SQL 스키마의 실제 필드명에 맞춰 반환
+        return {
+            'store_code': rules.get('store_code', store_code),
+            'store_name': rules.get('store_name', ''),
+            'platform': rules.get('platform', ''),
+            'platform_code': rules.get('platform_code', ''),
+            
+            # 답글 정책 설정
+            'greeting_start': rules.get('greeting_start', '안녕하세요'),
+            'greeting_end': rules.get('greeting_end', '감사합니다'),
+            'role': rules.get('role', ''),
+            'tone': rules.get('tone', ''),
+            'prohibited_words': rules.get('prohibited_words', []),
+            'max_length': rules.get('max_length', 300),
+            
+            # 별점별 자동 답글 활성화 설정
+            'rating_5_reply': rules.get('rating_5_reply', True),
+            'rating_4_reply': rules.get('rating_4_reply', True),
+            'rating_3_reply': rules.get('rating_3_reply', True),
+            'rating_2_reply': rules.get('rating_2_reply', True),
+            'rating_1_reply': rules.get('rating_1_reply', True),
+            
+            # 운영 설정
+            'auto_reply_enabled': rules.get('auto_reply_enabled', True),
+            'auto_reply_hours': rules.get('auto_reply_hours', '10:00-20:00'),
+            'reply_delay_minutes': rules.get('reply_delay_minutes', 30),
+            'weekend_enabled': rules.get('weekend_enabled', True),
+            'holiday_enabled': rules.get('holiday_enabled', False),
+            
+            # 품질 관리
+            'quality_check_enabled': rules.get('quality_check_enabled', True),
+            'manual_review_threshold': rules.get('manual_review_threshold', 0.3),
+            'learning_mode': rules.get('learning_mode', False),
+            
+            # 기타 정보
+            'owner_user_code': rules.get('owner_user_code', ''),
+            'store_type': rules.get('store_type', 'delivery_only'),
+            'store_address': rules.get('store_address', ''),
+            'store_phone': rules.get('store_phone', ''),
+            'business_hours': rules.get('business_hours', {}),
+            'avg_rating': rules.get('avg_rating', 0.0),
+            'total_reviews_processed': rules.get('total_reviews_processed', 0)
+        }
     
     def _get_default_reply_rules(self, store_code: str) -> Dict[str, Any]:
         """기본 답글 정책 반환"""
@@ -629,8 +737,35 @@ class SupabaseService:
             logger.error(f"리뷰 답글 업데이트 오류: {e}")
             return False
 
-    async def get_reviews_without_reply(self) -> List[Dict]:
-        """AI 답글이 생성되지 않은 리뷰 목록 조회"""
+    async def get_reviews_without_reply(self, limit: int = 50, after: Optional[Dict[str, Any]] = None) -> List[Dict]:
+        """
+        AI 답글 생성 대상 리뷰 조회 (get_ai_reply_candidates RPC)
+        
+        답글 미생성 + 매장 자동 답글 정책 필터링을 DB에서 처리하며, created_at/id 기준 키셋 페이징 지원
+        
+        Args:
+            limit: 페이지 크기
+            after: 이전 페이지의 마지막 리뷰 (None이면 첫 페이지)
+        """
+        params = {'p_limit': limit}
+        if after:
+            params['p_after_created_at'] = after['created_at']
+            params['p_after_id'] = after['id']
+        
+        try:
+            response = await self._execute_query(self.client.rpc('get_ai_reply_candidates', params))
+            reviews = response.data or []
+            logger.info(f"AI 답글 생성 대상 리뷰: {len(reviews)}개")
+            return reviews
+        except Exception as e:
+            # RPC가 아직 배포되지 않은 DB에서는 기존 방식(첫 페이지만)으로 조회
+            logger.warning(f"get_ai_reply_candidates 호출 실패, 기존 조회 방식 사용: {str(e)}")
+            if after:
+                return []
+            return await self._get_reviews_without_reply_legacy(limit)
+    
+    async def _get_reviews_without_reply_legacy(self, limit: int = 50) -> List[Dict]:
+        """AI 답글이 생성되지 않은 리뷰 목록 조회 (Python 필터링, RPC 미배포 시 사용)"""
         try:
             # 먼저 현재 데이터베이스 상태를 확인
             logger.info("AI 답글이 필요한 리뷰 조회 시작...")
@@ -638,7 +773,7 @@ class SupabaseService:
             # 단순한 조건으로 시작: ai_response가 없는 모든 리뷰
             response = await self._execute_query(
                 self.client.table('reviews').select(
-                    'review_id, store_code, review_content, rating, review_name, platform, response_status, boss_reply_needed, ai_response, created_at, ordered_menu, review_date'
+                    'id, review_id, store_code, review_content, rating, review_name, platform, response_status, boss_reply_needed, ai_response, created_at, ordered_menu, review_date'
                 ).or_(
                     'ai_response.is.null,ai_response.eq.'  # ai_response가 null이거나 빈 문자열
                 ).or_(
@@ -647,18 +782,21 @@ class SupabaseService:
                     'is_deleted.is.null,is_deleted.eq.false'  # is_deleted가 null이거나 false (있다면)
                 ).order(
                     'created_at', desc=False  # 오래된 것부터
-                ).limit(50)  # 한 번에 최대 50개로 줄임
+                ).limit(limit)
             )
             
             logger.info(f"조회된 원본 리뷰 수: {len(response.data or [])}개")
             
-            # 매장별 자동 답글 정책 확인하여 필터링
+            # 매장별 자동 답글 정책 확인하여 필터링 (조회된 리뷰의 매장 정책을 한 번에 조회)
             filtered_reviews = []
             if response.data:
+                rules_by_store = await self.get_store_reply_rules_bulk(
+                    [review['store_code'] for review in response.data]
+                )
                 for review in response.data:
                     try:
                         # 매장 자동 답글 정책 확인
-                        store_rules = await self.get_store_reply_rules(review['store_code'])
+                        store_rules = rules_by_store[review['store_code']]
                         
                         # 자동 답글이 활성화되어 있는지 확인
                         if not store_rules.get('auto_reply_enabled', True):
@@ -815,6 +953,152 @@ class SupabaseService:
             logger.error(f"사용량 업데이트 오류: {str(e)}")
             return False
 
+    async def get_crawl_watermark(self, platform: str, platform_code: str) -> Optional[Dict[str, Any]]:
+        """매장별 증분 수집 워터마크 조회"""
+        try:
+            response = await self._execute_query(
+                self.client.table('store_crawl_watermarks')
+                .select('*')
+                .eq('platform', platform)
+                .eq('platform_code', platform_code)
+            )
+            return response.data[0] if response.data else None
+        except Exception as e:
+            logger.error(f"워터마크 조회 오류: {e}")
+            return None
+
+    async def get_crawl_watermarks(self) -> List[Dict[str, Any]]:
+        """전체 매장 수집 스케줄 정보 조회 (우선순위 스케줄링용, 리뷰 ID 목록 제외)"""
+        try:
+            response = await self._execute_query(
+                self.client.table('store_crawl_watermarks')
+                .select('platform, platform_code, store_code, last_crawled_at, review_rate_per_hour, crawl_interval_minutes, next_crawl_at')
+            )
+            return response.data or []
+        except Exception as e:
+            logger.error(f"워터마크 목록 조회 오류: {e}")
+            return []
+
+    async def update_crawl_watermark(
+        self,
+        platform: str,
+        platform_code: str,
+        store_code: str,
+        recent_review_ids: List[str],
+        latest_review_date: Optional[str] = None,
+        schedule: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        매장별 증분 수집 워터마크 갱신
+
+        Args:
+            recent_review_ids: 최근 수집한 리뷰 ID (최신순)
+            latest_review_date: 가장 최근 리뷰 날짜 (YYYY-MM-DD)
+            schedule: 유입 속도/수집 간격/다음 수집 시간 (CrawlScheduler.next_schedule)
+        """
+        try:
+            watermark = {
+                'platform': platform,
+                'platform_code': platform_code,
+                'store_code': store_code,
+                'recent_review_ids': recent_review_ids,
+                'last_crawled_at': datetime.now().isoformat(),
+                'updated_at': datetime.now().isoformat()
+            }
+            if recent_review_ids:
+                watermark['last_review_id'] = recent_review_ids[0]
+            if latest_review_date:
+                watermark['last_review_date'] = latest_review_date
+            if schedule:
+                watermark.update(schedule)
+
+            await self._execute_query(
+                self.client.table('store_crawl_watermarks')
+                .upsert(watermark, on_conflict='platform,platform_code')
+            )
+            return True
+        except Exception as e:
+            logger.error(f"워터마크 갱신 오류: {e}")
+            return False
+
+    async def update_crawl_schedule(self, platform: str, platform_code: str, store_code: str,
+                                    schedule: Dict[str, Any]) -> bool:
+        """다음 수집 시간만 갱신 (수집 실패 시 - 워터마크는 유지)"""
+        try:
+            await self._execute_query(
+                self.client.table('store_crawl_watermarks')
+                .upsert(dict(schedule, platform=platform, platform_code=platform_code, store_code=store_code,
+                             updated_at=datetime.now().isoformat()),
+                        on_conflict='platform,platform_code')
+            )
+            return True
+        except Exception as e:
+            logger.error(f"수집 스케줄 갱신 오류: {e}")
+            return False
+
+    async def get_reviews_by_ids(
+        self,
+        review_ids: List[str],
+        columns: str = AI_REPLY_REVIEW_COLUMNS
+    ) -> List[Dict]:
+        """review_id 목록으로 리뷰 조회 (in_() 1회)"""
+        if not review_ids:
+            return []
+        try:
+            response = await self._execute_query(
+                self.client.table('reviews')
+                .select(columns)
+                .in_('review_id', review_ids)
+            )
+            return response.data or []
+        except Exception as e:
+            logger.error(f"리뷰 목록 조회 오류: {e}")
+            return []
+
+    async def create_ai_reply_batch(self, batch_id: str, review_ids: List[str], input_file_id: str, status: str) -> bool:
+        """OpenAI 배치 작업 등록"""
+        try:
+            await self._execute_query(
+                self.client.table('ai_reply_batches').insert({
+                    'batch_id': batch_id,
+                    'status': status,
+                    'review_ids': review_ids,
+                    'request_count': len(review_ids),
+                    'input_file_id': input_file_id,
+                    'submitted_at': datetime.now().isoformat()
+                })
+            )
+            return True
+        except Exception as e:
+            logger.error(f"배치 작업 등록 오류: {e}")
+            return False
+
+    async def get_open_ai_reply_batches(self) -> List[Dict]:
+        """결과가 아직 반영되지 않은 배치 작업 목록"""
+        try:
+            response = await self._execute_query(
+                self.client.table('ai_reply_batches')
+                .select('*')
+                .in_('status', ['validating', 'in_progress', 'finalizing', 'cancelling'])
+                .order('submitted_at', desc=False)
+            )
+            return response.data or []
+        except Exception as e:
+            logger.error(f"배치 작업 조회 오류: {e}")
+            return []
+
+    async def update_ai_reply_batch(self, batch_id: str, **fields) -> bool:
+        """배치 작업 상태 갱신"""
+        try:
+            fields['updated_at'] = datetime.now().isoformat()
+            await self._execute_query(
+                self.client.table('ai_reply_batches').update(fields).eq('batch_id', batch_id)
+            )
+            return True
+        except Exception as e:
+            logger.error(f"배치 작업 갱신 오류: {e}")
+            return False
+
 
 # 파일 끝에 추가
 def get_supabase_client() -> Client:
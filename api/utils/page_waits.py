@@ -0,0 +1,268 @@
+"""
+Playwright 페이지 대기 헬퍼
+고정 대기(wait_for_timeout / asyncio.sleep) 대신 조건(셀렉터, URL 변경, 네트워크 응답, DOM 변경)이
+충족되는 즉시 진행하고, 상한 시간(ceiling)을 넘기면 예외 없이 False를 반환
+
+동기 크롤러(playwright.sync_api)와 비동기 답글 관리자(playwright.async_api) 모두 사용하도록
+같은 이름의 함수를 동기/비동기(_async 접미사) 두 벌로 제공
+
+StepTimer로 단계별 소요 시간을 기록해 매장 단위 수집/답글 등록이 어디서 시간을 쓰는지 확인
+"""
+import os
+import re
+import time
+import logging
+from contextlib import contextmanager, asynccontextmanager
+from typing import Dict, Any, Optional, Union, Callable, Pattern
+
+logger = logging.getLogger(__name__)
+
+# 대기 상한 기본값 (ms) - 기존 고정 대기 중 가장 긴 값 수준
+PAGE_WAIT_CEILING_MS = int(os.getenv("PAGE_WAIT_CEILING_MS", "8000"))
+# DOM 변경 후 추가 변경이 없을 때까지 기다리는 시간 (ms) - 목록이 여러 번에 나눠 렌더링되는 경우
+DOM_QUIET_MS = int(os.getenv("PAGE_WAIT_DOM_QUIET_MS", "300"))
+
+UrlMatcher = Union[str, Pattern, Callable[[str], bool]]
+
+# MutationObserver 설치 스크립트 - 마지막 변경 시각을 window 전역에 기록
+_OBSERVE_SCRIPT = """
+(rootSelector) => {
+    const root = document.querySelector(rootSelector) || document.body;
+    if (window.__pageWaitObserver) window.__pageWaitObserver.disconnect();
+    window.__pageWaitChangedAt = 0;
+    window.__pageWaitObserver = new MutationObserver(() => { window.__pageWaitChangedAt = Date.now(); });
+    window.__pageWaitObserver.observe(root, {childList: true, subtree: true, characterData: true});
+}
+"""
+
+# 변경이 있었고 quietMs 동안 추가 변경이 없으면 true
+_DOM_SETTLED_SCRIPT = """
+(quietMs) => window.__pageWaitChangedAt > 0 && Date.now() - window.__pageWaitChangedAt >= quietMs
+"""
+
+_DISCONNECT_SCRIPT = """
+() => { if (window.__pageWaitObserver) { window.__pageWaitObserver.disconnect(); window.__pageWaitObserver = null; } }
+"""
+
+
+def _url_predicate(matcher: UrlMatcher) -> Callable[[str], bool]:
+    if callable(matcher):
+        return matcher
+    if isinstance(matcher, str):
+        return lambda url: matcher in url
+    return lambda url: bool(matcher.search(url))
+
+
+class StepTimer:
+    """
+    단계별 소요 시간 기록
+
+        timer = StepTimer('coupang')
+        with timer.step('login'):
+            ...
+        timer.log()  # [StepTimer] coupang - login 3.21s, reviews 5.02s (합계 8.23s)
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._steps: Dict[str, Dict[str, float]] = {}
+
+    @contextmanager
+    def step(self, label: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(label, time.perf_counter() - started)
+
+    def record(self, label: str, seconds: float):
+        step = self._steps.setdefault(label, {'count': 0, 'seconds': 0.0})
+        step['count'] += 1
+        step['seconds'] += seconds
+
+    def summary(self) -> Dict[str, Any]:
+        """단계별 {count, seconds} (결과 dict에 함께 담아 전달)"""
+        return {label: {'count': step['count'], 'seconds': round(step['seconds'], 3)}
+                for label, step in self._steps.items()}
+
+    def log(self, level: int = logging.INFO):
+        if not self._steps:
+            return
+        total = sum(step['seconds'] for step in self._steps.values())
+        parts = ', '.join(
+            f"{label} {step['seconds']:.2f}s" + (f"x{step['count']}" if step['count'] > 1 else '')
+            for label, step in self._steps.items()
+        )
+        logger.log(level, f"[StepTimer] {self.name} - {parts} (합계 {total:.2f}s)")
+
+
+# ============ 동기 (playwright.sync_api) ============
+
+def wait_for_load(page, state: str = 'networkidle', ceiling_ms: Optional[int] = None) -> bool:
+    """페이지 로드 상태 대기 (goto/클릭 이동 후 고정 대기 대체)"""
+    try:
+        page.wait_for_load_state(state, timeout=ceiling_ms or PAGE_WAIT_CEILING_MS)
+        return True
+    except Exception:
+        return False
+
+
+def wait_for_selector(page, selector: str, ceiling_ms: Optional[int] = None, state: str = 'visible') -> bool:
+    """셀렉터가 지정 상태가 될 때까지 대기 (여러 후보는 CSS ', '로 묶어서 전달)"""
+    try:
+        page.wait_for_selector(selector, state=state, timeout=ceiling_ms or PAGE_WAIT_CEILING_MS)
+        return True
+    except Exception:
+        return False
+
+
+def wait_for_url(page, matcher: UrlMatcher, ceiling_ms: Optional[int] = None) -> bool:
+    """URL 조건 대기 (문자열은 포함 여부, 정규식, 또는 url -> bool 함수)"""
+    predicate = _url_predicate(matcher)
+    if predicate(page.url):
+        return True
+    try:
+        page.wait_for_url(predicate, timeout=ceiling_ms or PAGE_WAIT_CEILING_MS, wait_until='commit')
+        return True
+    except Exception:
+        return False
+
+
+def wait_for_url_change(page, previous_url: str, ceiling_ms: Optional[int] = None) -> bool:
+    """URL이 바뀔 때까지 대기 (로그인 제출 후 등)"""
+    return wait_for_url(page, lambda url: url != previous_url, ceiling_ms)
+
+
+@contextmanager
+def expect_response(page, matcher: UrlMatcher, ceiling_ms: Optional[int] = None):
+    """
+    블록 안의 동작이 일으킨 네트워크 응답 대기 (상한 초과 시 조용히 진행)
+
+        with expect_response(page, '/reviews'):
+            next_button.click()
+    """
+    predicate = _url_predicate(matcher)
+    body_done = False
+    try:
+        with page.expect_response(lambda response: predicate(response.url),
+                                  timeout=ceiling_ms or PAGE_WAIT_CEILING_MS):
+            yield
+            body_done = True
+    except Exception as e:
+        # 블록 내부 예외는 그대로 올리고, 응답 대기 시간 초과만 무시
+        if not body_done or not _is_timeout(e):
+            raise
+
+
+@contextmanager
+def expect_dom_change(page, root_selector: str = 'body', ceiling_ms: Optional[int] = None,
+                      quiet_ms: Optional[int] = None):
+    """
+    블록 안의 동작 후 root_selector 하위 DOM이 바뀌고 잠잠해질 때까지 대기
+    (페이지네이션/탭 전환처럼 URL이 그대로인 목록 갱신)
+
+        with expect_dom_change(page, 'table tbody'):
+            next_button.click()
+    """
+    observing = True
+    try:
+        page.evaluate(_OBSERVE_SCRIPT, root_selector)
+    except Exception:
+        observing = False
+
+    try:
+        yield
+
+        if not observing:
+            wait_for_load(page, ceiling_ms=ceiling_ms)
+            return
+        try:
+            page.wait_for_function(_DOM_SETTLED_SCRIPT, arg=quiet_ms if quiet_ms is not None else DOM_QUIET_MS,
+                                   timeout=ceiling_ms or PAGE_WAIT_CEILING_MS, polling=100)
+        except Exception:
+            pass
+    finally:
+        if observing:
+            try:
+                page.evaluate(_DISCONNECT_SCRIPT)
+            except Exception:
+                pass
+
+
+# ============ 비동기 (playwright.async_api) ============
+
+async def wait_for_load_async(page, state: str = 'networkidle', ceiling_ms: Optional[int] = None) -> bool:
+    try:
+        await page.wait_for_load_state(state, timeout=ceiling_ms or PAGE_WAIT_CEILING_MS)
+        return True
+    except Exception:
+        return False
+
+
+async def wait_for_selector_async(page, selector: str, ceiling_ms: Optional[int] = None, state: str = 'visible') -> bool:
+    try:
+        await page.wait_for_selector(selector, state=state, timeout=ceiling_ms or PAGE_WAIT_CEILING_MS)
+        return True
+    except Exception:
+        return False
+
+
+async def wait_for_url_async(page, matcher: UrlMatcher, ceiling_ms: Optional[int] = None) -> bool:
+    predicate = _url_predicate(matcher)
+    if predicate(page.url):
+        return True
+    try:
+        await page.wait_for_url(predicate, timeout=ceiling_ms or PAGE_WAIT_CEILING_MS, wait_until='commit')
+        return True
+    except Exception:
+        return False
+
+
+async def wait_for_url_change_async(page, previous_url: str, ceiling_ms: Optional[int] = None) -> bool:
+    return await wait_for_url_async(page, lambda url: url != previous_url, ceiling_ms)
+
+
+@asynccontextmanager
+async def expect_response_async(page, matcher: UrlMatcher, ceiling_ms: Optional[int] = None):
+    predicate = _url_predicate(matcher)
+    body_done = False
+    try:
+        async with page.expect_response(lambda response: predicate(response.url),
+                                        timeout=ceiling_ms or PAGE_WAIT_CEILING_MS):
+            yield
+            body_done = True
+    except Exception as e:
+        if not body_done or not _is_timeout(e):
+            raise
+
+
+@asynccontextmanager
+async def expect_dom_change_async(page, root_selector: str = 'body', ceiling_ms: Optional[int] = None,
+                                  quiet_ms: Optional[int] = None):
+    observing = True
+    try:
+        await page.evaluate(_OBSERVE_SCRIPT, root_selector)
+    except Exception:
+        observing = False
+
+    try:
+        yield
+
+        if not observing:
+            await wait_for_load_async(page, ceiling_ms=ceiling_ms)
+            return
+        try:
+            await page.wait_for_function(_DOM_SETTLED_SCRIPT, arg=quiet_ms if quiet_ms is not None else DOM_QUIET_MS,
+                                         timeout=ceiling_ms or PAGE_WAIT_CEILING_MS, polling=100)
+        except Exception:
+            pass
+    finally:
+        if observing:
+            try:
+                await page.evaluate(_DISCONNECT_SCRIPT)
+            except Exception:
+                pass
+
+
+def _is_timeout(error: Exception) -> bool:
+    return type(error).__name__ == 'TimeoutError' or bool(re.search(r'[Tt]imeout', str(error)))
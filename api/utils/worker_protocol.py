@@ -0,0 +1,58 @@
+"""
+크롤러 워커 프로세스 통신 프로토콜
+4바이트 빅엔디안 길이 + UTF-8 JSON 본문으로 된 프레임을 파이프로 주고받음
+(크롤러가 stdout에 남기는 로그와 결과가 섞이지 않도록 하기 위함)
+"""
+import json
+import struct
+from typing import Any, BinaryIO, Dict, Optional
+
+HEADER = struct.Struct('>I')
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+
+class ProtocolError(Exception):
+    """프레임 형식 오류"""
+    pass
+
+
+def write_message(stream: BinaryIO, message: Dict[str, Any]):
+    """메시지 한 개를 프레임으로 기록"""
+    body = json.dumps(message, ensure_ascii=False, default=str).encode('utf-8')
+    stream.write(HEADER.pack(len(body)))
+    stream.write(body)
+    stream.flush()
+
+
+def _read_exact(stream: BinaryIO, size: int) -> Optional[bytes]:
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = stream.read(remaining)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(chunks)
+
+
+def read_message(stream: BinaryIO) -> Optional[Dict[str, Any]]:
+    """
+    프레임 한 개 읽기
+
+    Returns:
+        메시지 dict, 스트림이 닫혔으면 None
+    """
+    header = _read_exact(stream, HEADER.size)
+    if header is None:
+        return None
+
+    (length,) = HEADER.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise ProtocolError(f"프레임 크기 초과: {length} bytes")
+
+    body = _read_exact(stream, length)
+    if body is None:
+        raise ProtocolError("프레임 본문 수신 중 스트림 종료")
+
+    return json.loads(body.decode('utf-8'))
@@ -0,0 +1,54 @@
+"""
+자동화 워커 실행 진입점
+FastAPI 웹서버와 별도 프로세스에서 리뷰 수집 / AI 답글 생성 / 답글 등록 스케줄 작업 실행
+
+    python -m api.worker
+
+- 웹서버는 SCHEDULER_MODE=worker 로 실행하면 스케줄러를 띄우지 않고 API만 제공
+- 워커는 여러 호스트에서 동시에 실행 가능
+  - 리뷰 수집: 매장별 임대(collect:<매장코드>)를 먼저 잡은 워커가 수집 → 매장 목록 분산
+  - AI 답글 생성 / 답글 등록: 리더 임대(job:<작업ID>)를 가진 워커만 실행
+  - 작업 큐(PIPELINE_QUEUE_ENABLED): 모든 워커가 SKIP LOCKED 임대로 나눠서 처리
+"""
+import asyncio
+import signal
+import logging
+
+from api.main import start_automation, shutdown_automation, scheduler
+from api.services.automation_lease import WORKER_ID
+
+logger = logging.getLogger(__name__)
+
+
+async def run_worker():
+    """종료 신호(SIGINT/SIGTERM)를 받을 때까지 스케줄러 실행"""
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except (NotImplementedError, RuntimeError):
+            # Windows 이벤트 루프는 신호 처리기 미지원 - Ctrl+C는 KeyboardInterrupt로 처리
+            pass
+
+    logger.info(f"=== 자동화 워커 시작 ({WORKER_ID}) ===")
+    await start_automation()
+
+    if not scheduler.running:
+        logger.error("스케줄러가 시작되지 않아 워커를 종료합니다")
+        await shutdown_automation()
+        return
+
+    try:
+        await stop_event.wait()
+    finally:
+        logger.info("=== 자동화 워커 종료 중... ===")
+        await shutdown_automation()
+        logger.info("=== 자동화 워커 종료 ===")
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(run_worker())
+    except KeyboardInterrupt:
+        pass
@@ -2,28 +2,51 @@
 OpenAI 클라이언트 설정
 """
 import os
+import time
+import asyncio
 import logging
-from openai import OpenAI
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from openai import OpenAI, AsyncOpenAI
 from dotenv import load_dotenv
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# 비동기 호출 설정 (동시 호출 수, 타임아웃, 분당 요청/토큰 한도)
+OPENAI_CONCURRENCY = int(os.getenv("OPENAI_CONCURRENCY", "5"))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "30"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+OPENAI_RPM_LIMIT = int(os.getenv("OPENAI_RPM_LIMIT", "500"))
+OPENAI_TPM_LIMIT = int(os.getenv("OPENAI_TPM_LIMIT", "200000"))
+
 # 전역 클라이언트 인스턴스
 _openai_client = None
+# 이벤트 루프별 (AsyncOpenAI 클라이언트, 호출 제한기) - asyncio 객체는 생성한 루프에서만 사용 가능
+_async_clients = weakref.WeakKeyDictionary()
+_async_clients_lock = threading.Lock()
+_last_rate_limiter: Optional['OpenAIRateLimiter'] = None
+
+def _get_api_key() -> str:
+    api_key = os.getenv("OPENAI_API_KEY")
+    
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY 환경변수를 설정해주세요.")
+    
+    if api_key.startswith('sk-') and len(api_key) < 20:
+        raise ValueError("유효하지 않은 OpenAI API 키입니다.")
+    
+    return api_key
 
 def get_openai_client() -> OpenAI:
     """OpenAI 클라이언트 반환 (싱글톤 패턴)"""
     global _openai_client
     
     if _openai_client is None:
-        api_key = os.getenv("OPENAI_API_KEY")
-        
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY 환경변수를 설정해주세요.")
-        
-        if api_key.startswith('sk-') and len(api_key) < 20:
-            raise ValueError("유효하지 않은 OpenAI API 키입니다.")
+        api_key = _get_api_key()
         
         try:
             _openai_client = OpenAI(api_key=api_key)
@@ -34,6 +57,166 @@ def get_openai_client() -> OpenAI:
     
     return _openai_client
 
+class TokenBucket:
+    """분당 한도를 초당 보충량으로 나눠 채우는 토큰 버킷"""
+    
+    def __init__(self, per_minute: int):
+        self.capacity = float(max(per_minute, 1))
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+    
+    async def acquire(self, amount: float):
+        """amount만큼 토큰이 쌓일 때까지 대기 후 차감 (대기자는 순서대로 처리)"""
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+    
+    def adjust(self, delta: float):
+        """실제 사용량 반영 (양수: 추가 차감, 음수: 반환)"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+class OpenAIRateLimiter:
+    """
+    OpenAI 호출 제한기
+    
+    동시 호출 수(OPENAI_CONCURRENCY)와 분당 요청/토큰 한도(OPENAI_RPM_LIMIT / OPENAI_TPM_LIMIT)를
+    호출 전에 확보하고, 응답의 실제 토큰 사용량으로 예상치를 보정합니다.
+    """
+    
+    def __init__(self, concurrency: int, rpm_limit: int, tpm_limit: int):
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._requests = TokenBucket(rpm_limit)
+        self._tokens = TokenBucket(tpm_limit)
+        
+        # 통계
+        self.calls = 0
+        self.waited_ms = 0
+        self.total_tokens = 0
+    
+    async def run(self, estimated_tokens: int, call):
+        """제한을 확보한 뒤 call() 실행"""
+        async with self._semaphore:
+            wait_start = time.monotonic()
+            await self._requests.acquire(1)
+            await self._tokens.acquire(estimated_tokens)
+            self.waited_ms += int((time.monotonic() - wait_start) * 1000)
+            
+            response = await call()
+            
+            usage = getattr(response, 'usage', None)
+            actual_tokens = getattr(usage, 'total_tokens', None) if usage else None
+            if actual_tokens is not None:
+                self._tokens.adjust(actual_tokens - estimated_tokens)
+                self.total_tokens += actual_tokens
+            self.calls += 1
+            return response
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'concurrency': self.concurrency,
+            'calls': self.calls,
+            'waited_ms': self.waited_ms,
+            'total_tokens': self.total_tokens,
+            'rpm_available': int(self._requests.tokens),
+            'tpm_available': int(self._tokens.tokens)
+        }
+
+def _get_loop_client() -> Tuple[AsyncOpenAI, 'OpenAIRateLimiter']:
+    """
+    현재 이벤트 루프의 (클라이언트, 호출 제한기) 반환
+    
+    루프마다 하나씩 만들어 재사용하고, 닫힌 루프의 항목은 정리합니다.
+    """
+    global _last_rate_limiter
+    
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        for closed_loop in [item for item in _async_clients.keys() if item.is_closed()]:
+            # 닫힌 루프에서는 aclose를 실행할 수 없어 참조만 해제 (소켓은 GC 시 정리)
+            _async_clients.pop(closed_loop, None)
+        
+        entry = _async_clients.get(loop)
+        if entry is not None:
+            return entry
+        
+        try:
+            client = AsyncOpenAI(
+                api_key=_get_api_key(),
+                timeout=OPENAI_TIMEOUT,
+                max_retries=OPENAI_MAX_RETRIES,
+                http_client=httpx.AsyncClient(
+                    timeout=httpx.Timeout(OPENAI_TIMEOUT, connect=10.0),
+                    limits=httpx.Limits(
+                        max_connections=OPENAI_CONCURRENCY * 2,
+                        max_keepalive_connections=OPENAI_CONCURRENCY
+                    )
+                )
+            )
+        except Exception as e:
+            logger.error(f"AsyncOpenAI 클라이언트 초기화 실패: {e}")
+            raise
+        
+        entry = (client, OpenAIRateLimiter(OPENAI_CONCURRENCY, OPENAI_RPM_LIMIT, OPENAI_TPM_LIMIT))
+        _async_clients[loop] = entry
+        _last_rate_limiter = entry[1]
+        logger.info(f"AsyncOpenAI 클라이언트 초기화 완료 (동시 {OPENAI_CONCURRENCY}개, RPM {OPENAI_RPM_LIMIT}, TPM {OPENAI_TPM_LIMIT})")
+        return entry
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """
+    공유 AsyncOpenAI 클라이언트 반환
+    
+    httpx 연결 풀을 재사용하며, 이벤트 루프마다(스크립트의 asyncio.run 등) 하나씩 생성합니다.
+    """
+    return _get_loop_client()[0]
+
+def get_openai_rate_limiter() -> OpenAIRateLimiter:
+    """현재 이벤트 루프의 OpenAI 호출 제한기 반환"""
+    return _get_loop_client()[1]
+
+def estimate_tokens(messages, max_tokens: int = 0) -> int:
+    """요청 토큰 추정 (한글 위주라 2자당 1토큰 정도로 계산 + 응답 최대 토큰)"""
+    text_length = sum(len(message.get('content') or '') for message in messages)
+    return text_length // 2 + len(messages) * 4 + (max_tokens or 0)
+
+async def create_chat_completion(**kwargs):
+    """
+    공유 AsyncOpenAI 클라이언트로 chat.completions.create 호출
+    
+    동시 호출 수와 분당 요청/토큰 한도 안에서 실행되므로 이벤트 루프를 막지 않고 병렬 호출됩니다.
+    """
+    client, rate_limiter = _get_loop_client()
+    estimated_tokens = estimate_tokens(kwargs.get('messages', []), kwargs.get('max_tokens', 0))
+    return await rate_limiter.run(
+        estimated_tokens,
+        lambda: client.chat.completions.create(**kwargs)
+    )
+
+async def close_async_openai_client():
+    """현재 이벤트 루프의 AsyncOpenAI 클라이언트 연결 풀 종료"""
+    with _async_clients_lock:
+        entry = _async_clients.pop(asyncio.get_running_loop(), None)
+    
+    if entry is not None:
+        try:
+            await entry[0].close()
+        except Exception as e:
+            logger.debug(f"AsyncOpenAI 클라이언트 종료 오류: {e}")
+
 def test_openai_connection() -> bool:
     """OpenAI 연결 테스트"""
     try:
@@ -48,4 +231,14 @@ def test_openai_connection() -> bool:
         return True
     except Exception as e:
         logger.error(f"OpenAI 연결 테스트 실패: {e}")
-        return False
\ No newline at end of file
+        return False
+
+
+def get_openai_limiter_stats() -> Dict[str, Any]:
+    """OpenAI 호출 제한기 통계 (현재 루프, 없으면 마지막으로 만든 제한기 / 클라이언트 생성 전이면 빈 dict)"""
+    try:
+        entry = _async_clients.get(asyncio.get_running_loop())
+    except RuntimeError:
+        entry = None
+    rate_limiter = entry[1] if entry else _last_rate_limiter
+    return rate_limiter.get_stats() if rate_limiter else {}
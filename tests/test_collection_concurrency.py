@@ -0,0 +1,163 @@
+"""
+수집 동시 실행 제어(AIMD) 테스트
+한도 가산 증가/배율 감소, 감소 쿨다운, 지연/로그인 실패 판정, 한도에 따른 대기
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import api.services.collection_concurrency as concurrency_module
+from api.services.collection_concurrency import (
+    AdaptiveLimiter, CollectionConcurrencyController, is_login_failure
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """감소 쿨다운 판정에 쓰는 시각 고정"""
+    now = [10000.0]
+    monkeypatch.setattr(concurrency_module.time, 'time', lambda: now[0])
+    monkeypatch.setattr(concurrency_module, 'COLLECT_AIMD_DECREASE_COOLDOWN', 30.0)
+    monkeypatch.setattr(concurrency_module, 'COLLECT_AIMD_DECREASE_FACTOR', 0.5)
+    return now
+
+
+def test_initial_limit_is_clamped():
+    assert AdaptiveLimiter('baemin', 10, 4, 60.0).limit == 4
+    assert AdaptiveLimiter('baemin', 0, 4, 60.0).limit == 1
+    assert AdaptiveLimiter('baemin', 3, 0, 60.0).max_limit == 1
+
+
+def test_additive_increase_per_window(clock):
+    limiter = AdaptiveLimiter('baemin', 2, 4, 60.0)
+
+    # 성공마다 1/한도씩 증가 → 한도 2에서 약 한 주기(2~3번 성공) 후 3
+    limiter.record(10.0, True)
+    limiter.record(10.0, True)
+    assert int(limiter.limit) == 2
+    limiter.record(10.0, True)
+    assert int(limiter.limit) == 3
+
+    for _ in range(20):
+        limiter.record(10.0, True)
+    assert int(limiter.limit) == 4
+
+
+def test_failure_halves_limit_once_per_cooldown(clock):
+    limiter = AdaptiveLimiter('baemin', 4, 8, 60.0)
+
+    limiter.record(5.0, False)
+    assert int(limiter.limit) == 2
+    # 같은 혼잡으로 인한 연속 실패는 쿨다운 동안 다시 줄이지 않음
+    limiter.record(5.0, False)
+    assert int(limiter.limit) == 2
+
+    clock[0] += 30
+    limiter.record(5.0, False)
+    assert int(limiter.limit) == 1
+
+    clock[0] += 30
+    limiter.record(5.0, False)
+    assert limiter.limit == 1
+
+
+def test_slow_success_counts_as_congestion(clock):
+    limiter = AdaptiveLimiter('naver', 2, 2, 90.0)
+
+    limiter.record(120.0, True)
+
+    assert int(limiter.limit) == 1
+    stats = limiter.get_stats()
+    assert (stats['successes'], stats['slow'], stats['failures']) == (1, 1, 0)
+    assert stats['avg_latency'] == 120.0
+
+
+def test_acquire_waits_for_release():
+    limiter = AdaptiveLimiter('coupang', 1, 3, 60.0)
+    order = []
+
+    async def job(name):
+        await limiter.acquire()
+        order.append(f'{name} 시작')
+        await asyncio.sleep(0.01)
+        order.append(f'{name} 종료')
+        await limiter.release()
+
+    async def main():
+        await asyncio.gather(job('a'), job('b'))
+
+    asyncio.run(main())
+    assert order == ['a 시작', 'a 종료', 'b 시작', 'b 종료']
+    assert limiter.in_flight == 0
+
+
+def test_increase_wakes_waiting_jobs(clock):
+    limiter = AdaptiveLimiter('baemin', 1, 2, 60.0)
+
+    async def main():
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        # 한도 1 → 2 (해제 없이도 대기 중인 작업이 시작)
+        limiter.record(1.0, True)
+        await asyncio.wait_for(waiter, 1)
+        assert limiter.in_flight == 2
+
+    asyncio.run(main())
+
+
+def test_login_failure_detection():
+    assert is_login_failure('로그인 실패: 비밀번호 오류')
+    assert is_login_failure('Login timeout')
+    assert not is_login_failure('페이지 로드 시간 초과')
+    assert not is_login_failure(None)
+
+
+def test_controller_records_login_failures(clock):
+    controller = CollectionConcurrencyController(global_limit=4, platform_defaults={'baemin': (2, 4, 60.0)})
+
+    controller.record('Baemin', 5.0, {'success': False, 'errors': ['로그인 실패']})
+    controller.record('baemin', 5.0, {'success': False, 'error': 'timeout'})
+
+    stats = controller.get_stats()['platforms']['baemin']
+    assert stats['failures'] == 2 and stats['login_failures'] == 1
+    assert stats['limit'] == 1
+
+
+def test_controller_uses_env_overrides(monkeypatch):
+    monkeypatch.setenv('REPLY_CONCURRENCY_COUPANG_INITIAL', '2')
+    monkeypatch.setenv('REPLY_CONCURRENCY_COUPANG_MAX', '5')
+    controller = CollectionConcurrencyController(global_limit=4, env_prefix='REPLY', platform_defaults={})
+
+    limiter = controller.get_limiter('coupang')
+
+    assert (int(limiter.limit), limiter.max_limit) == (2, 5)
+    assert controller.get_limiter('COUPANG') is limiter
+
+
+def test_slot_respects_global_limit():
+    controller = CollectionConcurrencyController(
+        global_limit=1, platform_defaults={'baemin': (2, 2, 60.0), 'yogiyo': (2, 2, 60.0)})
+    running = []
+    peak = []
+
+    async def job(platform):
+        async with controller.slot(platform):
+            running.append(platform)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(platform)
+
+    async def main():
+        await asyncio.gather(job('baemin'), job('yogiyo'), job('baemin'))
+
+    asyncio.run(main())
+    assert max(peak) == 1
+    assert controller.get_stats()['global_in_flight'] == 0
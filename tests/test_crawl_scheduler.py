@@ -0,0 +1,161 @@
+"""
+매장별 수집 우선순위 스케줄링 테스트
+유입 속도 EWMA, 수집 간격, 예산 배율, 수집 대상 선택, 신선도 보고
+"""
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import api.services.crawl_scheduler as scheduler_module
+from api.services.crawl_scheduler import (
+    CrawlScheduler, compute_crawl_interval, compute_review_rate, store_key
+)
+
+NOW = datetime(2026, 10, 17, 12, 0)
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    """환경 변수와 무관하게 기본 설정으로 고정"""
+    monkeypatch.setattr(scheduler_module, 'COLLECT_RATE_ALPHA', 0.3)
+    monkeypatch.setattr(scheduler_module, 'COLLECT_TARGET_REVIEWS_PER_CRAWL', 3.0)
+    monkeypatch.setattr(scheduler_module, 'COLLECT_MIN_INTERVAL_MINUTES', 30)
+    monkeypatch.setattr(scheduler_module, 'COLLECT_MAX_INTERVAL_MINUTES', 720)
+    monkeypatch.setattr(scheduler_module, 'COLLECT_DEFAULT_INTERVAL_MINUTES', 240)
+
+
+def store(code, platform='baemin'):
+    return {'store_code': code, 'store_name': f'매장{code}', 'platform': platform, 'platform_code': code}
+
+
+def watermark(code, platform='baemin', hours_ago=None, rate=None, interval=None, next_in_minutes=None):
+    return store_key(platform, code), {
+        'last_crawled_at': (NOW - timedelta(hours=hours_ago)).isoformat() if hours_ago is not None else None,
+        'review_rate_per_hour': rate,
+        'crawl_interval_minutes': interval,
+        'next_crawl_at': (NOW + timedelta(minutes=next_in_minutes)).isoformat() if next_in_minutes is not None else None
+    }
+
+
+def test_review_rate_ewma():
+    # 첫 관측은 그대로
+    assert compute_review_rate(None, 6, 2.0) == 3.0
+    # 0.3 * 관측(1.0) + 0.7 * 이전(3.0)
+    assert compute_review_rate(3.0, 2, 2.0) == pytest.approx(2.4)
+    # 경과 시간이 없으면 이전 값 유지
+    assert compute_review_rate(1.5, 10, None) == 1.5
+    assert compute_review_rate(None, 10, 0) == 0.0
+
+
+def test_crawl_interval_targets_reviews_per_crawl():
+    assert compute_crawl_interval(None) == 240
+    assert compute_crawl_interval(0) == 720
+    # 시간당 1개 → 3개 쌓이는 180분
+    assert compute_crawl_interval(1.0) == 180
+    assert compute_crawl_interval(100.0) == 30
+    assert compute_crawl_interval(0.001) == 720
+
+
+def test_store_key_normalizes():
+    assert store_key('Baemin', 14) == ('baemin', '14')
+    assert store_key(None, None) == ('', '')
+
+
+def test_next_schedule_updates_rate_from_elapsed_time():
+    scheduler = CrawlScheduler(budget_per_hour=100)
+    _, previous = watermark('1', hours_ago=2, rate=3.0)
+
+    schedule = scheduler.next_schedule(previous, new_reviews=2, now=NOW)
+
+    assert schedule['review_rate_per_hour'] == pytest.approx(2.4)
+    assert schedule['crawl_interval_minutes'] == 75
+    assert schedule['next_crawl_at'] == (NOW + timedelta(minutes=75)).isoformat()
+
+
+def test_next_schedule_without_history_uses_default_interval():
+    schedule = CrawlScheduler().next_schedule(None, new_reviews=5, now=NOW)
+
+    assert schedule['review_rate_per_hour'] is None
+    assert schedule['crawl_interval_minutes'] == 240
+
+
+def test_budget_scale_stretches_only_next_crawl_at():
+    scheduler = CrawlScheduler(budget_per_hour=2)
+    stores = [store(str(i)) for i in range(4)]
+    watermarks = dict(watermark(str(i), interval=60) for i in range(4))
+
+    # 시간당 4회 수요 / 예산 2회 → 배율 2
+    scheduler.select_due_stores(stores, watermarks, now=NOW)
+    assert scheduler.budget_scale == 2.0
+
+    _, previous = watermark('0', hours_ago=1, rate=1.0)
+    schedule = scheduler.next_schedule(previous, new_reviews=1, now=NOW)
+    assert schedule['crawl_interval_minutes'] == 180
+    assert schedule['next_crawl_at'] == (NOW + timedelta(minutes=360)).isoformat()
+
+
+def test_budget_scale_never_below_one_and_capped_interval():
+    scheduler = CrawlScheduler(budget_per_hour=100)
+    scheduler.select_due_stores([store('1')], {}, now=NOW)
+    assert scheduler.budget_scale == 1.0
+
+    scheduler.budget_scale = 10.0
+    _, previous = watermark('1', hours_ago=1, rate=0.1)
+    schedule = scheduler.next_schedule(previous, new_reviews=0, now=NOW)
+    # 늘린 간격도 최대 간격을 넘지 않음
+    assert schedule['next_crawl_at'] == (NOW + timedelta(minutes=720)).isoformat()
+
+
+def test_select_due_stores_orders_by_expected_backlog():
+    scheduler = CrawlScheduler(budget_per_hour=600, tick_minutes=10)
+    stores = [store('never'), store('busy'), store('quiet'), store('old_quiet'), store('not_due')]
+    watermarks = dict([
+        watermark('busy', hours_ago=1, rate=5.0),
+        watermark('quiet', hours_ago=1, rate=0.0),
+        watermark('old_quiet', hours_ago=10, rate=0.0),
+        watermark('not_due', hours_ago=5, rate=10.0, next_in_minutes=30),
+    ])
+
+    selected = scheduler.select_due_stores(stores, watermarks, now=NOW)
+
+    # 이력 없는 매장 → 밀린 리뷰 많은 매장 → 유입 없는 매장은 오래 안 본 순, 수집 시점 전 매장 제외
+    assert [s['store_code'] for s in selected] == ['never', 'busy', 'old_quiet', 'quiet']
+
+
+def test_select_due_stores_limits_to_tick_budget():
+    scheduler = CrawlScheduler(budget_per_hour=12, tick_minutes=10)
+    stores = [store(str(i)) for i in range(5)]
+    watermarks = dict(watermark(str(i), hours_ago=1, rate=float(i)) for i in range(5))
+
+    selected = scheduler.select_due_stores(stores, watermarks, now=NOW)
+
+    # 시간당 12회 * 10분 = 주기당 2개
+    assert [s['store_code'] for s in selected] == ['4', '3']
+
+
+def test_retry_schedule_waits_min_interval():
+    assert CrawlScheduler().retry_schedule(now=NOW) == {'next_crawl_at': (NOW + timedelta(minutes=30)).isoformat()}
+
+
+def test_freshness_report():
+    scheduler = CrawlScheduler(budget_per_hour=100, tick_minutes=10)
+    stores = [store('slow'), store('fast'), store('new')]
+    watermarks = dict([
+        watermark('slow', hours_ago=4, rate=0.5, interval=360),
+        watermark('fast', hours_ago=1, rate=6.0, interval=30),
+    ])
+
+    report = scheduler.freshness_report(stores, watermarks, now=NOW)
+
+    assert [row['store_code'] for row in report] == ['fast', 'slow', 'new']
+    fast, slow, new = report
+    assert fast['expected_delay_minutes'] == 20.0
+    assert fast['expected_backlog'] == 6.0
+    assert slow['expected_backlog'] == 2.0
+    assert new['crawl_interval_minutes'] == 240
+    assert new['expected_backlog'] is None
@@ -0,0 +1,175 @@
+"""
+증분 수집 워터마크 테스트
+수집 결과 → 워터마크 필드 변환, 크롤러에 전달되는 known_review_ids/시작일, 수집 후 워터마크 병합
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import api.services.review_collector_service as collector_module
+from api.services.review_collector_service import ReviewCollectorService
+from api.services.review_ingest import watermark_from_reviews
+
+
+STORE = {
+    'store_code': 'STR_001',
+    'store_name': '테스트매장',
+    'platform': 'Coupang',
+    'platform_code': '708561',
+    'owner_user_code': 'USR_001'
+}
+
+
+class FakeSupabaseService:
+    """워터마크 조회/저장만 기록하는 SupabaseService 대역"""
+
+    def __init__(self, watermark=None):
+        self.watermark = watermark
+        self.saved_watermarks = []
+        self.usage_updates = []
+
+    async def get_active_stores(self):
+        return [STORE]
+
+    async def get_crawl_watermark(self, platform, platform_code):
+        return self.watermark
+
+    async def update_usage(self, user_code, reviews_processed=0):
+        self.usage_updates.append((user_code, reviews_processed))
+        return True
+
+    async def update_crawl_watermark(self, platform, platform_code, store_code,
+                                     recent_review_ids, latest_review_date=None, schedule=None):
+        self.saved_watermarks.append({
+            'platform': platform,
+            'platform_code': platform_code,
+            'store_code': store_code,
+            'recent_review_ids': recent_review_ids,
+            'latest_review_date': latest_review_date,
+            'schedule': schedule
+        })
+        return True
+
+
+def make_service(watermark, collect_result):
+    """암호화 서비스 초기화 없이 수집 서비스 생성, 쿠팡 크롤러 호출은 인자만 기록"""
+    service = ReviewCollectorService.__new__(ReviewCollectorService)
+    service.supabase = FakeSupabaseService(watermark)
+    service.crawler_calls = []
+
+    async def collect_coupang_reviews(store_info, start_date, end_date, known_review_ids):
+        service.crawler_calls.append({
+            'start_date': start_date,
+            'end_date': end_date,
+            'known_review_ids': list(known_review_ids)
+        })
+        return collect_result
+
+    service.collect_coupang_reviews = collect_coupang_reviews
+    return service
+
+
+def test_watermark_from_reviews_keeps_crawl_order_and_latest_date():
+    reviews = [
+        {'review_id': 'coupang_3', 'review_date': '2026-10-15'},
+        {'review_id': 'coupang_2', 'review_date': '2026-10-16'},
+        {'review_id': '', 'review_date': '2026-10-17'},
+        {'review_id': 'coupang_1'}
+    ]
+
+    watermark = watermark_from_reviews(reviews)
+
+    assert watermark['review_ids'] == ['coupang_3', 'coupang_2', 'coupang_1']
+    assert watermark['latest_review_date'] == '2026-10-17'
+
+
+def test_watermark_from_reviews_empty():
+    assert watermark_from_reviews([]) == {'review_ids': [], 'latest_review_date': None}
+
+
+def test_first_crawl_passes_no_known_ids_and_stores_new_ids():
+    service = make_service(None, {
+        'success': True, 'saved': 2,
+        'review_ids': ['coupang_2', 'coupang_1'], 'latest_review_date': '2026-10-16'
+    })
+
+    result = asyncio.run(service.collect_reviews_for_store('STR_001'))
+
+    assert result['success'] and result['collected'] == 2
+    assert service.crawler_calls[0]['known_review_ids'] == []
+    saved = service.supabase.saved_watermarks[0]
+    assert saved['platform'] == 'coupang'
+    assert saved['recent_review_ids'] == ['coupang_2', 'coupang_1']
+    assert saved['latest_review_date'] == '2026-10-16'
+    assert saved['schedule']['next_crawl_at']
+
+
+def test_known_ids_and_start_date_come_from_watermark():
+    watermark = {
+        'recent_review_ids': ['coupang_5', 'coupang_4'],
+        'last_review_date': '2099-01-10T00:00:00',
+        'last_crawled_at': None
+    }
+    service = make_service(watermark, {'success': True, 'saved': 0, 'review_ids': [], 'latest_review_date': None})
+
+    asyncio.run(service.collect_reviews_for_store('STR_001'))
+
+    call = service.crawler_calls[0]
+    assert call['known_review_ids'] == ['coupang_5', 'coupang_4']
+    # 마지막 리뷰 하루 전부터 수집 (30일 전보다 늦으면 워터마크 기준)
+    assert call['start_date'] == '2099-01-09'
+
+
+def test_merge_puts_new_ids_first_dedupes_and_truncates(monkeypatch):
+    monkeypatch.setattr(collector_module, 'CRAWL_WATERMARK_SIZE', 4)
+    watermark = {
+        'recent_review_ids': ['coupang_5', 'coupang_4', 'coupang_3', 'coupang_2'],
+        'last_review_date': '2026-10-15'
+    }
+    # 크롤러가 coupang_5에서 멈췄지만 경계 리뷰가 결과에 함께 들어온 경우
+    service = make_service(watermark, {
+        'success': True, 'saved': 2,
+        'review_ids': ['coupang_7', 'coupang_6', 'coupang_5'], 'latest_review_date': '2026-10-16'
+    })
+
+    asyncio.run(service.collect_reviews_for_store('STR_001'))
+
+    saved = service.supabase.saved_watermarks[0]
+    assert saved['recent_review_ids'] == ['coupang_7', 'coupang_6', 'coupang_5', 'coupang_4']
+    assert saved['latest_review_date'] == '2026-10-16'
+
+
+def test_latest_review_date_never_moves_backwards():
+    watermark = {'recent_review_ids': ['coupang_5'], 'last_review_date': '2026-10-16T09:00:00'}
+
+    # 새 리뷰가 없어 수집 결과에 날짜가 없는 경우
+    service = make_service(watermark, {'success': True, 'saved': 0, 'review_ids': [], 'latest_review_date': None})
+    asyncio.run(service.collect_reviews_for_store('STR_001'))
+    assert service.supabase.saved_watermarks[0]['latest_review_date'] == '2026-10-16'
+    assert service.supabase.saved_watermarks[0]['recent_review_ids'] == ['coupang_5']
+
+    # 수집 결과 날짜가 기존보다 이른 경우
+    service = make_service(watermark, {'success': True, 'saved': 1, 'review_ids': ['coupang_6'],
+                                       'latest_review_date': '2026-10-14'})
+    asyncio.run(service.collect_reviews_for_store('STR_001'))
+    assert service.supabase.saved_watermarks[0]['latest_review_date'] == '2026-10-16'
+
+
+def test_failed_crawl_keeps_watermark(monkeypatch):
+    service = make_service({'recent_review_ids': ['coupang_5']}, {'success': False, 'error': '로그인 실패'})
+    retries = []
+
+    async def update_crawl_schedule(platform, platform_code, store_code, schedule):
+        retries.append(schedule)
+        return True
+
+    service.supabase.update_crawl_schedule = update_crawl_schedule
+
+    result = asyncio.run(service.collect_reviews_for_store('STR_001'))
+
+    assert not result['success']
+    assert service.supabase.saved_watermarks == []
+    assert retries and retries[0]['next_crawl_at']
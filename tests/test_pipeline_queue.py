@@ -0,0 +1,286 @@
+"""
+파이프라인 작업 큐 테스트
+등록 → 임대 → 완료/재시도/격리 → 재등록 상태 전이 (SQL 함수는 메모리 대역으로 재현)
+"""
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import api.services.pipeline_queue as pipeline_queue_module
+from api.services.pipeline_queue import PipelineQueue, JOB_AI_REPLY, JOB_POST_REPLY, enqueue_pipeline_jobs
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeRpc:
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self):
+        return FakeResponse(self.result)
+
+
+class FakeQueueDB:
+    """SQL_playwright.txt의 pipeline_jobs 함수들을 메모리에서 재현하는 Supabase 클라이언트 대역"""
+
+    def __init__(self):
+        self.now = datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc)
+        self.jobs = []
+        self.calls = []
+
+    def advance(self, seconds):
+        self.now += timedelta(seconds=seconds)
+
+    def rpc(self, name, params):
+        self.calls.append((name, params))
+        return FakeRpc(getattr(self, name)(**params))
+
+    def _open(self, job_type, review_id):
+        return any(job['job_type'] == job_type and job['review_id'] == review_id
+                   and job['status'] in ('queued', 'leased') for job in self.jobs)
+
+    def enqueue_pipeline_jobs(self, p_job_type, p_review_ids, p_max_attempts=5, p_run_after=None):
+        run_after = datetime.fromisoformat(p_run_after) if p_run_after else self.now
+        inserted = 0
+        for review_id in dict.fromkeys(p_review_ids):
+            if self._open(p_job_type, review_id):
+                continue
+            self.jobs.append({'id': len(self.jobs) + 1, 'job_type': p_job_type, 'review_id': review_id,
+                              'status': 'queued', 'attempts': 0, 'max_attempts': p_max_attempts,
+                              'run_after': run_after, 'leased_by': None, 'lease_expires_at': None,
+                              'last_error': None})
+            inserted += 1
+        return inserted
+
+    def claim_pipeline_jobs(self, p_job_type, p_worker_id, p_limit, p_lease_seconds):
+        for job in self.jobs:
+            if (job['job_type'] == p_job_type and job['status'] == 'leased'
+                    and job['lease_expires_at'] < self.now and job['attempts'] >= job['max_attempts']):
+                job.update(status='dead', leased_by=None, lease_expires_at=None,
+                           last_error=job['last_error'] or '임대 만료')
+
+        ready = [job for job in self.jobs if job['job_type'] == p_job_type and (
+            (job['status'] == 'queued' and job['run_after'] <= self.now)
+            or (job['status'] == 'leased' and job['lease_expires_at'] < self.now))]
+        ready.sort(key=lambda job: (job['run_after'], job['id']))
+
+        claimed = []
+        for job in ready[:p_limit]:
+            job.update(status='leased', leased_by=p_worker_id, attempts=job['attempts'] + 1,
+                       lease_expires_at=self.now + timedelta(seconds=p_lease_seconds))
+            claimed.append(dict(job))
+        return claimed
+
+    def _held(self, job_ids, worker_id):
+        return [job for job in self.jobs
+                if job['id'] in job_ids and job['status'] == 'leased' and job['leased_by'] == worker_id]
+
+    def renew_pipeline_jobs(self, p_job_ids, p_worker_id, p_lease_seconds):
+        held = self._held(p_job_ids, p_worker_id)
+        for job in held:
+            job['lease_expires_at'] = self.now + timedelta(seconds=p_lease_seconds)
+        return [job['id'] for job in held]
+
+    def complete_pipeline_jobs(self, p_job_ids, p_worker_id):
+        held = self._held(p_job_ids, p_worker_id)
+        for job in held:
+            job.update(status='done', lease_expires_at=None)
+        return len(held)
+
+    def fail_pipeline_job(self, p_job_id, p_worker_id, p_error, p_retry_delay_seconds):
+        held = self._held([p_job_id], p_worker_id)
+        if not held:
+            return None
+        job = held[0]
+        job.update(status='dead' if job['attempts'] >= job['max_attempts'] else 'queued',
+                   run_after=self.now + timedelta(seconds=p_retry_delay_seconds),
+                   last_error=p_error, leased_by=None, lease_expires_at=None)
+        return job['status']
+
+    def requeue_dead_pipeline_jobs(self, p_job_type):
+        latest_dead = {}
+        for job in self.jobs:
+            if job['job_type'] == p_job_type and job['status'] == 'dead' and not self._open(p_job_type, job['review_id']):
+                latest_dead[job['review_id']] = job
+        for job in latest_dead.values():
+            job.update(status='queued', attempts=0, run_after=self.now)
+        return len(latest_dead)
+
+    def status_of(self, review_id, job_type=JOB_POST_REPLY):
+        return [job['status'] for job in self.jobs if job['review_id'] == review_id and job['job_type'] == job_type]
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = FakeQueueDB()
+    monkeypatch.setattr(pipeline_queue_module, 'get_supabase_client', lambda: fake)
+    return fake
+
+
+def make_queue(worker_id='worker-a', **kwargs):
+    options = {'lease_seconds': 300, 'max_attempts': 3, 'retry_base_seconds': 60, 'retry_max_seconds': 100}
+    options.update(kwargs)
+    queue = PipelineQueue(**options)
+    queue.worker_id = worker_id
+    return queue
+
+
+def test_enqueue_skips_open_jobs_and_empty_ids(db):
+    queue = make_queue()
+
+    assert queue.enqueue(JOB_POST_REPLY, ['r1', 'r2', '', None]) == 2
+    assert queue.enqueue(JOB_POST_REPLY, ['r1', 'r3']) == 1
+    # 유형이 다르면 같은 리뷰라도 별도 작업
+    assert queue.enqueue(JOB_AI_REPLY, ['r1']) == 1
+    assert queue.enqueue(JOB_POST_REPLY, []) == 0
+    assert queue.get_stats()['enqueued'] == 4
+    assert db.calls[0] == ('enqueue_pipeline_jobs', {
+        'p_job_type': JOB_POST_REPLY, 'p_review_ids': ['r1', 'r2'], 'p_max_attempts': 3})
+
+
+def test_run_after_delays_claim(db):
+    queue = make_queue()
+    queue.enqueue(JOB_POST_REPLY, ['r1'], run_after=db.now + timedelta(minutes=10))
+
+    # 시간대 정보가 있는 ISO 문자열로 전달
+    assert db.calls[0][1]['p_run_after'].endswith('+00:00')
+    assert queue.claim(JOB_POST_REPLY) == []
+    db.advance(601)
+    assert [job['review_id'] for job in queue.claim(JOB_POST_REPLY)] == ['r1']
+
+
+def test_claim_complete(db):
+    queue = make_queue()
+    queue.enqueue(JOB_POST_REPLY, ['r1', 'r2'])
+
+    jobs = queue.claim(JOB_POST_REPLY, limit=1)
+    assert [(job['review_id'], job['attempts']) for job in jobs] == [('r1', 1)]
+    assert queue.claim(JOB_POST_REPLY, limit=5)[0]['review_id'] == 'r2'
+    assert queue.claim(JOB_POST_REPLY) == []
+
+    assert queue.complete(jobs) == 1
+    assert db.status_of('r1') == ['done']
+    # 완료된 리뷰는 다시 등록 가능 (진행 중 작업만 중복 방지)
+    assert queue.enqueue(JOB_POST_REPLY, ['r1']) == 1
+    stats = queue.get_stats()
+    assert (stats['claimed'], stats['completed']) == (2, 1)
+
+
+def test_fail_backs_off_exponentially_then_dead(db):
+    queue = make_queue(max_attempts=3, retry_base_seconds=60, retry_max_seconds=100)
+    queue.enqueue(JOB_POST_REPLY, ['r1'])
+
+    job = queue.claim(JOB_POST_REPLY)[0]
+    assert queue.fail(job, '네트워크 오류') == 'queued'
+    assert db.calls[-1][1]['p_retry_delay_seconds'] == 60
+    assert queue.claim(JOB_POST_REPLY) == []
+
+    db.advance(60)
+    job = queue.claim(JOB_POST_REPLY)[0]
+    assert job['attempts'] == 2
+    assert queue.fail(job, '네트워크 오류') == 'queued'
+    # 60 * 2 = 120 → 최대 100초로 제한
+    assert db.calls[-1][1]['p_retry_delay_seconds'] == 100
+
+    db.advance(100)
+    job = queue.claim(JOB_POST_REPLY)[0]
+    assert queue.fail(job, '네트워크 오류') == 'dead'
+    db.advance(3600)
+    assert queue.claim(JOB_POST_REPLY) == []
+
+    stats = queue.get_stats()
+    assert (stats['retried'], stats['dead']) == (2, 1)
+
+
+def test_fail_truncates_error(db):
+    queue = make_queue()
+    queue.enqueue(JOB_POST_REPLY, ['r1'])
+    job = queue.claim(JOB_POST_REPLY)[0]
+
+    queue.fail(job, 'x' * 5000)
+
+    assert len(db.calls[-1][1]['p_error']) == 1000
+
+
+def test_expired_lease_moves_to_other_worker(db):
+    worker_a = make_queue('worker-a', lease_seconds=300)
+    worker_b = make_queue('worker-b', lease_seconds=300)
+    worker_a.enqueue(JOB_POST_REPLY, ['r1', 'r2'])
+    jobs_a = worker_a.claim(JOB_POST_REPLY)
+
+    db.advance(200)
+    assert worker_a.renew(jobs_a) == {1, 2}
+    db.advance(200)
+    # 연장했으므로 아직 만료 전
+    assert worker_b.claim(JOB_POST_REPLY) == []
+
+    db.advance(301)
+    jobs_b = worker_b.claim(JOB_POST_REPLY, limit=1)
+    assert [job['id'] for job in jobs_b] == [1]
+
+    # 만료됐어도 아무도 가져가지 않은 작업(2)은 계속 보유, 다른 워커가 가져간 작업(1)은
+    # renew/complete/fail 모두 무시됨
+    assert worker_a.renew(jobs_a) == {2}
+    assert worker_a.get_stats()['lost'] == 1
+    assert worker_a.complete(jobs_a[:1]) == 0
+    assert worker_a.fail(jobs_a[0], '오류') is None
+    assert worker_b.complete(jobs_b) == 1
+
+
+def test_expired_lease_on_last_attempt_becomes_dead(db):
+    queue = make_queue(max_attempts=1, lease_seconds=300)
+    queue.enqueue(JOB_POST_REPLY, ['r1'])
+    queue.claim(JOB_POST_REPLY)
+
+    db.advance(301)
+    assert queue.claim(JOB_POST_REPLY) == []
+    assert db.status_of('r1') == ['dead']
+
+
+def test_requeue_dead_resets_attempts(db):
+    queue = make_queue(max_attempts=1)
+    queue.enqueue(JOB_POST_REPLY, ['r1'])
+    queue.fail(queue.claim(JOB_POST_REPLY)[0], '오류')
+    assert db.status_of('r1') == ['dead']
+
+    assert queue.requeue_dead(JOB_POST_REPLY) == 1
+    job = queue.claim(JOB_POST_REPLY)[0]
+    assert job['attempts'] == 1
+    assert queue.get_stats()['requeued'] == 1
+    # 진행 중 작업이 있으면 다시 되살리지 않음
+    assert queue.requeue_dead(JOB_POST_REPLY) == 0
+
+
+def test_enqueue_pipeline_jobs_respects_flags(db, monkeypatch):
+    queue = make_queue()
+    monkeypatch.setattr(pipeline_queue_module, 'get_pipeline_queue', lambda: queue)
+
+    monkeypatch.setattr(pipeline_queue_module, 'PIPELINE_QUEUE_ENABLED', False)
+    assert enqueue_pipeline_jobs(JOB_POST_REPLY, ['r1']) == 0
+
+    monkeypatch.setattr(pipeline_queue_module, 'PIPELINE_QUEUE_ENABLED', True)
+    monkeypatch.setattr(pipeline_queue_module, 'AI_REPLY_JOBS_ENABLED', False)
+    assert enqueue_pipeline_jobs(JOB_AI_REPLY, ['r1']) == 0
+    assert enqueue_pipeline_jobs(JOB_POST_REPLY, ['r1']) == 1
+
+    monkeypatch.setattr(pipeline_queue_module, 'AI_REPLY_JOBS_ENABLED', True)
+    assert enqueue_pipeline_jobs(JOB_AI_REPLY, ['r1']) == 1
+
+
+def test_enqueue_pipeline_jobs_swallows_errors(monkeypatch):
+    def broken_client():
+        raise RuntimeError("DB 연결 실패")
+
+    monkeypatch.setattr(pipeline_queue_module, 'PIPELINE_QUEUE_ENABLED', True)
+    monkeypatch.setattr(pipeline_queue_module, 'get_supabase_client', broken_client)
+    monkeypatch.setattr(pipeline_queue_module, 'get_pipeline_queue', lambda: make_queue())
+
+    assert enqueue_pipeline_jobs(JOB_POST_REPLY, ['r1']) == 0
@@ -0,0 +1,191 @@
+"""
+플랫폼 답글 API 형식 학습 테스트
+UI 답글 등록 요청 → 자리표시자 형식(build_template) → 다른 리뷰/답글로 복원(_substitute, post) 왕복
+"""
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import api.services.platforms.reply_api as reply_api_module
+from api.services.platforms.reply_api import ReplyApiChannel, _substitute, build_template
+
+REPLY = '소중한 리뷰 감사합니다!'
+
+
+def restore(template, original_id, platform_code, reply_text):
+    """ReplyApiChannel.post와 같은 방식으로 형식 → 실제 요청"""
+    values = {'{review_id}': original_id, '{platform_code}': platform_code}
+    url = template['url']
+    for placeholder, value in values.items():
+        url = url.replace(placeholder, value)
+    return url, _substitute(template['body'], {'{reply}': reply_text, **values})
+
+
+@pytest.fixture(autouse=True)
+def clear_templates(monkeypatch):
+    monkeypatch.setattr(reply_api_module, '_templates', {})
+
+
+def test_url_and_string_body_round_trip():
+    body = {'reviewId': '2025060801238589', 'shopNo': '14512', 'comment': {'contents': REPLY}, 'visible': True}
+
+    template = build_template('post', 'https://self-api.baemin.com/v1/shops/14512/reviews/2025060801238589/comments',
+                              json.dumps(body), REPLY, '2025060801238589', '14512')
+
+    assert template['method'] == 'POST'
+    assert template['url'] == 'https://self-api.baemin.com/v1/shops/{platform_code}/reviews/{review_id}/comments'
+    assert template['host'] == 'self-api.baemin.com'
+    assert template['body'] == {'reviewId': '{review_id}', 'shopNo': '{platform_code}',
+                                'comment': {'contents': '{reply}'}, 'visible': True}
+
+    url, restored = restore(template, '2025061002345678', '14512', '또 찾아주세요')
+    assert url == 'https://self-api.baemin.com/v1/shops/14512/reviews/2025061002345678/comments'
+    assert restored == {'reviewId': '2025061002345678', 'shopNo': '14512',
+                        'comment': {'contents': '또 찾아주세요'}, 'visible': True}
+
+
+def test_numeric_ids_round_trip_as_int():
+    body = {'orderReviewId': 987654, 'storeId': 708561, 'content': REPLY, 'rating': 5}
+
+    template = build_template('POST', 'https://store.coupangeats.com/api/v1/merchant/reviews/reply',
+                              json.dumps(body), REPLY, '987654', '708561')
+
+    assert template['body'] == {'orderReviewId': '{review_id:int}', 'storeId': '{platform_code:int}',
+                                'content': '{reply}', 'rating': 5}
+
+    _, restored = restore(template, '123456', '708561', '감사합니다')
+    assert restored == {'orderReviewId': 123456, 'storeId': 708561, 'content': '감사합니다', 'rating': 5}
+    assert json.loads(json.dumps(restored)) == restored
+
+
+def test_int_placeholder_with_non_numeric_value_stays_string():
+    assert _substitute('{review_id:int}', {'{review_id}': 'abc-1'}) == 'abc-1'
+
+
+def test_lists_and_unrelated_values_are_kept():
+    body = {'items': [{'id': '555', 'text': REPLY}], 'flags': [True, False, 0], 'count': 1}
+
+    template = build_template('PUT', 'https://api.example.com/replies', json.dumps(body), REPLY, '555', '')
+
+    assert template['body'] == {'items': [{'id': '{review_id}', 'text': '{reply}'}],
+                                'flags': [True, False, 0], 'count': 1}
+    _, restored = restore(template, '777', '', '네 감사합니다')
+    assert restored == {'items': [{'id': '777', 'text': '네 감사합니다'}], 'flags': [True, False, 0], 'count': 1}
+
+
+def test_bool_is_not_treated_as_number():
+    assert _substitute(True, {'1': '{review_id}'}) is True
+    assert _substitute(1, {'1': '{review_id}'}) == '{review_id:int}'
+
+
+@pytest.mark.parametrize('method, url, post_data', [
+    ('GET', 'https://api.example.com/reviews/555', json.dumps({'text': REPLY})),
+    ('POST', 'https://api.example.com/reviews/555', None),
+    ('POST', 'https://api.example.com/reviews/555', 'text=hello'),
+    # 본문에 답글이 없는 요청 (다른 API 호출)
+    ('POST', 'https://api.example.com/reviews/555/read', json.dumps({'read': True})),
+    # 리뷰를 특정할 수 없는 요청
+    ('POST', 'https://api.example.com/replies', json.dumps({'text': REPLY})),
+])
+def test_unusable_requests_are_rejected(method, url, post_data):
+    assert build_template(method, url, post_data, REPLY, '555', '14') is None
+
+
+class FakeRequest:
+    def __init__(self, method, url, post_data=None, headers=None):
+        self.method = method
+        self.url = url
+        self.post_data = post_data
+        self.headers = headers or {}
+
+
+class FakeResponse:
+    def __init__(self, status):
+        self.status = status
+        self.ok = 200 <= status < 300
+
+
+class FakeAPIRequest:
+    def __init__(self, status=200):
+        self.status = status
+        self.calls = []
+
+    async def fetch(self, url, **kwargs):
+        self.calls.append(dict(kwargs, url=url))
+        return FakeResponse(self.status)
+
+
+class FakeContext:
+    """playwright BrowserContext 대역 (request 이벤트 구독 + context.request.fetch)"""
+
+    def __init__(self, status=200):
+        self.handlers = {}
+        self.request = FakeAPIRequest(status)
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def emit_request(self, request):
+        self.handlers['request'](request)
+
+
+def learn(channel, context):
+    channel.learn_from_next_submit(REPLY, '987654', '708561')
+    context.emit_request(FakeRequest('GET', 'https://store.coupangeats.com/api/v1/merchant/reviews',
+                                     headers={'Authorization': 'Bearer old'}))
+    context.emit_request(FakeRequest(
+        'POST', 'https://store.coupangeats.com/api/v1/merchant/reviews/reply',
+        json.dumps({'orderReviewId': 987654, 'storeId': 708561, 'content': REPLY}),
+        headers={'Authorization': 'Bearer token', 'X-Request-Id': 'abc', 'Cookie': 'skip', 'User-Agent': 'skip'}
+    ))
+
+
+def test_channel_learns_from_ui_submit_and_posts():
+    context = FakeContext()
+    channel = ReplyApiChannel('coupang', 'owner@example.com', context)
+    assert not channel.ready('708561')
+
+    learn(channel, context)
+    assert channel.ready('708561') and channel.learned == 1
+    # 다른 매장/계정 형식은 공유하지 않음
+    assert not channel.ready('111111')
+    assert not ReplyApiChannel('coupang', 'other@example.com', FakeContext()).ready('708561')
+
+    assert asyncio.run(channel.post('123456', '708561', '또 오세요')) is True
+    call = context.request.calls[0]
+    assert call['url'] == 'https://store.coupangeats.com/api/v1/merchant/reviews/reply'
+    assert call['method'] == 'POST'
+    assert json.loads(call['data']) == {'orderReviewId': 123456, 'storeId': 708561, 'content': '또 오세요'}
+    assert call['headers'] == {'authorization': 'Bearer token', 'x-request-id': 'abc',
+                               'content-type': 'application/json'}
+    assert channel.api_posts == 1
+
+
+def test_channel_drops_template_on_fallback_status():
+    context = FakeContext(status=401)
+    channel = ReplyApiChannel('coupang', 'owner@example.com', context)
+    learn(channel, context)
+
+    assert asyncio.run(channel.post('123456', '708561', '또 오세요')) is None
+    assert not channel.ready('708561')
+
+
+def test_channel_keeps_template_on_server_error():
+    context = FakeContext(status=500)
+    channel = ReplyApiChannel('coupang', 'owner@example.com', context)
+    learn(channel, context)
+
+    # 5xx는 이미 등록됐을 수 있으므로 UI로 재시도하지 않고 실패 처리
+    assert asyncio.run(channel.post('123456', '708561', '또 오세요')) is False
+    assert channel.ready('708561') and channel.api_failures == 1
+
+
+def test_post_without_template_returns_none():
+    channel = ReplyApiChannel('naver', 'owner', FakeContext())
+    assert asyncio.run(channel.post('1', '2', '감사합니다')) is None
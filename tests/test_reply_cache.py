@@ -0,0 +1,169 @@
+"""
+AI 답글 캐시 테스트
+캐시 키(고객명/주문메뉴 제외), 캐시 제외 대상, 고객명 자리표시자, 변형 순환, TTL, LRU 제거
+"""
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import api.services.reply_cache as reply_cache_module
+from api.services.reply_cache import ReplyCache, normalize_review_text
+
+
+RULES = {'store_name': '테스트치킨', 'tone': '친근하게', 'max_length': 300}
+
+
+def make_cache(**kwargs):
+    options = {'max_entries': 100, 'ttl_hours': 1, 'variants': 2, 'max_content_length': 30}
+    options.update(kwargs)
+    cache = ReplyCache(**options)
+    cache.enabled = True
+    return cache
+
+
+def review(content='맛있어요!!', rating=5, name='김철수', menu='후라이드치킨', delivery=''):
+    return {'review_content': content, 'rating': rating, 'review_name': name,
+            'ordered_menu': menu, 'delivery_review': delivery}
+
+
+def result(reply, **fields):
+    data = {'success': True, 'is_valid': True, 'reply': reply, 'quality_score': 0.9,
+            'model_used': 'gpt-4o-mini', 'boss_review_needed': False}
+    data.update(fields)
+    return data
+
+
+def fill(cache, review_data, replies, rules=RULES):
+    for reply in replies:
+        cache.put(review_data, rules, result(reply))
+
+
+def test_normalize_review_text():
+    assert normalize_review_text('맛있어요!!! 😀') == '맛있어요'
+    assert normalize_review_text('최고ㅋㅋㅋㅋㅋ') == '최고ㅋㅋ'
+    assert normalize_review_text(None) == ''
+
+
+def test_key_ignores_name_and_menu_but_not_rating_or_rules():
+    cache = make_cache()
+    key = cache.make_key(review(), RULES)
+
+    assert cache.make_key(review(name='이영희', menu='양념치킨'), RULES) == key
+    assert cache.make_key(review(content='맛있어요'), RULES) == key
+    assert cache.make_key(review(rating=4), RULES) != key
+    assert cache.make_key(review(), dict(RULES, tone='정중하게')) != key
+    # 답글 생성에 쓰이지 않는 정책 필드는 키에 영향 없음
+    assert cache.make_key(review(), dict(RULES, auto_reply_hours='10:00-20:00')) == key
+
+
+def test_long_content_and_delivery_review_are_not_cached():
+    cache = make_cache(max_content_length=5)
+    assert cache.make_key(review(content='양이 많고 배달도 빨라서 좋았어요'), RULES) is None
+    assert cache.make_key(review(delivery='배달이 늦었어요'), RULES) is None
+
+    fill(cache, review(delivery='배달이 늦었어요'), ['감사합니다', '또 오세요'])
+    assert cache.get(review(delivery='배달이 늦었어요'), RULES) is None
+    assert cache.get_stats()['entries'] == 0
+
+
+def test_miss_until_variants_collected():
+    cache = make_cache(variants=2)
+    fill(cache, review(), ['김철수님 감사합니다!'])
+    assert cache.get(review(), RULES) is None
+
+    fill(cache, review(), ['김철수님 또 찾아주세요!'])
+    assert cache.get(review(), RULES) is not None
+
+
+def test_name_is_replaced_with_current_reviewer():
+    cache = make_cache(variants=1)
+    fill(cache, review(name='김철수'), ['김철수님 감사합니다!'])
+
+    cached = cache.get(review(name='이영희'), RULES)
+
+    assert cached['reply'] == '이영희님 감사합니다!'
+    assert cached['quality_score'] == 0.9
+
+
+def test_reply_mentioning_menu_is_not_cached():
+    cache = make_cache(variants=1)
+    fill(cache, review(menu='후라이드치킨'), ['후라이드치킨 맛있게 드셨다니 기뻐요'])
+    assert cache.get(review(menu='양념치킨'), RULES) is None
+
+
+def test_invalid_or_boss_review_results_are_not_cached():
+    cache = make_cache(variants=1)
+    cache.put(review(), RULES, result('감사합니다', is_valid=False))
+    cache.put(review(), RULES, result('감사합니다', success=False))
+    cache.put(review(), RULES, result('감사합니다', boss_review_needed=True))
+    assert cache.get(review(), RULES) is None
+
+
+def test_duplicate_variants_are_not_added():
+    cache = make_cache(variants=2)
+    fill(cache, review(name='김철수'), ['김철수님 감사합니다!'])
+    fill(cache, review(name='이영희'), ['이영희님 감사합니다!'])
+    # 같은 템플릿이므로 변형은 여전히 1개
+    assert cache.get(review(), RULES) is None
+
+
+def test_variants_do_not_repeat_back_to_back():
+    cache = make_cache(variants=3)
+    fill(cache, review(), ['감사합니다!', '또 오세요!', '좋은 하루 되세요!'])
+
+    replies = [cache.get(review(), RULES)['reply'] for _ in range(30)]
+
+    assert set(replies) == {'감사합니다!', '또 오세요!', '좋은 하루 되세요!'}
+    assert all(a != b for a, b in zip(replies, replies[1:]))
+
+
+def test_single_variant_can_be_reused():
+    cache = make_cache(variants=1)
+    fill(cache, review(), ['감사합니다!'])
+
+    assert [cache.get(review(), RULES)['reply'] for _ in range(3)] == ['감사합니다!'] * 3
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(reply_cache_module.time, 'time', lambda: now[0])
+    cache = make_cache(variants=1, ttl_hours=1)
+    fill(cache, review(), ['감사합니다!'])
+    assert cache.get(review(), RULES) is not None
+
+    now[0] += 3601
+    assert cache.get(review(), RULES) is None
+    assert cache.get_stats()['entries'] == 0
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = make_cache(variants=1, max_entries=2)
+    fill(cache, review(content='맛있어요'), ['감사합니다!'])
+    fill(cache, review(content='최고예요'), ['감사합니다!'])
+    # 맛있어요를 최근 사용으로 만든 뒤 새 키 추가 → 최고예요가 제거됨
+    assert cache.get(review(content='맛있어요'), RULES) is not None
+    fill(cache, review(content='좋아요'), ['감사합니다!'])
+
+    assert cache.get(review(content='최고예요'), RULES) is None
+    assert cache.get(review(content='맛있어요'), RULES) is not None
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_stats_track_rating_only_hits():
+    cache = make_cache(variants=1)
+    fill(cache, review(content=''), ['감사합니다!'])
+    cache.get(review(content=''), RULES)
+    cache.get(review(content='', rating=1), RULES)
+
+    stats = cache.get_stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1
+    assert stats['rating_only_hit_rate'] == 0.5
+
+
+def test_disabled_cache_never_hits():
+    cache = make_cache(variants=1)
+    fill(cache, review(), ['감사합니다!'])
+    cache.enabled = False
+    assert cache.get(review(), RULES) is None
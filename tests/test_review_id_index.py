@@ -0,0 +1,177 @@
+"""
+수집 리뷰 ID 인덱스(Bloom 필터) 테스트
+필터 동작/직렬화, DB 확인 대상 축소, 여러 워커가 같은 파일을 저장할 때 병합
+"""
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.services.review_id_index import BloomFilter, ReviewIdIndex
+
+
+def make_index(tmp_path, db_ids=(), **kwargs):
+    """DB 조회 대신 db_ids를 돌려주는 인덱스 (조회 횟수는 db_loads에 기록)"""
+    index = ReviewIdIndex(base_dir=str(tmp_path), capacity=kwargs.pop('capacity', 1000), **kwargs)
+    index.db_loads = 0
+
+    def load_ids_from_db(platform, platform_code):
+        index.db_loads += 1
+        return list(db_ids)
+
+    index._load_ids_from_db = load_ids_from_db
+    return index
+
+
+class RecordingConfirm:
+    """confirm 콜백 대역: 요청받은 ID를 기록하고 stored에 있는 것만 반환"""
+
+    def __init__(self, stored):
+        self.stored = set(stored)
+        self.requested = []
+
+    def __call__(self, ids):
+        self.requested.append(list(ids))
+        return {review_id for review_id in ids if review_id in self.stored}
+
+
+def test_bloom_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    ids = [f"baemin_{i}" for i in range(1000)]
+    for review_id in ids:
+        bloom.add(review_id)
+
+    assert all(review_id in bloom for review_id in ids)
+    assert bloom.count <= 1000
+
+
+def test_bloom_false_positive_rate_near_target():
+    bloom = BloomFilter(1000, 0.01)
+    for i in range(1000):
+        bloom.add(f"baemin_{i}")
+
+    false_positives = sum(f"coupang_{i}" in bloom for i in range(10000))
+    assert false_positives / 10000 < 0.03
+
+
+def test_bloom_add_is_idempotent_and_saturation():
+    bloom = BloomFilter(2, 0.01)
+    bloom.add('a')
+    bloom.add('a')
+    assert bloom.count == 1
+    assert not bloom.is_saturated()
+
+    bloom.add('b')
+    bloom.add('c')
+    assert bloom.is_saturated()
+
+
+def test_bloom_bytes_round_trip():
+    bloom = BloomFilter(100, 0.01)
+    bloom.add('naver_abc')
+    bloom.created_at = 1234.5
+
+    restored = BloomFilter.from_bytes(bloom.to_bytes())
+
+    assert 'naver_abc' in restored
+    assert (restored.capacity, restored.hash_count, restored.bit_count, restored.count, restored.created_at) == \
+        (bloom.capacity, bloom.hash_count, bloom.bit_count, bloom.count, 1234.5)
+
+
+def test_bloom_from_bytes_rejects_bad_data():
+    data = BloomFilter(100).to_bytes()
+    with pytest.raises(ValueError):
+        BloomFilter.from_bytes(b'XXXXX' + data[5:])
+    with pytest.raises(ValueError):
+        BloomFilter.from_bytes(data[:-1])
+
+
+def test_find_existing_confirms_only_bloom_candidates(tmp_path):
+    index = make_index(tmp_path, db_ids=['baemin_1', 'baemin_2'])
+    confirm = RecordingConfirm({'baemin_1', 'baemin_2'})
+
+    existing = index.find_existing('baemin', '14', ['baemin_1', 'baemin_2', 'baemin_new', ''], confirm)
+
+    assert existing == {'baemin_1', 'baemin_2'}
+    # 신규 ID는 (오탐이 아니라면) DB 확인 없이 통과
+    assert set(confirm.requested[0]) >= {'baemin_1', 'baemin_2'}
+    assert '' not in confirm.requested[0]
+    assert index.db_loads == 1
+    assert index._path('baemin', '14').exists()
+
+
+def test_find_existing_skips_confirm_when_nothing_known(tmp_path):
+    index = make_index(tmp_path)
+    confirm = RecordingConfirm(set())
+
+    assert index.find_existing('coupang', '7', [f"coupang_{i}" for i in range(20)], confirm) == set()
+    # 빈 필터에는 후보가 없으므로 DB 확인 자체를 하지 않음
+    assert confirm.requested == []
+
+
+def test_find_existing_falls_back_to_confirm_when_index_unavailable(tmp_path):
+    index = make_index(tmp_path)
+
+    def broken_load(platform, platform_code):
+        raise RuntimeError("DB 연결 실패")
+
+    index._load_ids_from_db = broken_load
+    confirm = RecordingConfirm({'yogiyo_1'})
+
+    assert index.find_existing('yogiyo', '3', ['yogiyo_1', 'yogiyo_2'], confirm) == {'yogiyo_1'}
+    assert confirm.requested == [['yogiyo_1', 'yogiyo_2']]
+
+
+def test_added_ids_persist_for_new_instance(tmp_path):
+    writer = make_index(tmp_path)
+    writer.add('baemin', '14', ['baemin_9'])
+
+    reader = make_index(tmp_path)
+    confirm = RecordingConfirm({'baemin_9'})
+    assert reader.find_existing('baemin', '14', ['baemin_9'], confirm) == {'baemin_9'}
+    # 파일에서 읽었으므로 DB로 다시 만들지 않음
+    assert reader.db_loads == 0
+
+
+def test_save_merges_ids_written_by_other_worker(tmp_path):
+    worker_a = make_index(tmp_path)
+    worker_b = make_index(tmp_path)
+    worker_a.find_existing('baemin', '14', ['x'], RecordingConfirm(set()))
+    worker_b.find_existing('baemin', '14', ['x'], RecordingConfirm(set()))
+
+    worker_a.add('baemin', '14', ['baemin_from_a'])
+    # 파일 수정 시간이 확실히 달라지도록
+    time.sleep(0.01)
+    worker_b.add('baemin', '14', ['baemin_from_b'])
+
+    reader = make_index(tmp_path)
+    store = reader._get_store('baemin', '14')
+    assert 'baemin_from_a' in store.bloom
+    assert 'baemin_from_b' in store.bloom
+
+
+def test_stale_index_is_rebuilt_from_db(tmp_path):
+    index = make_index(tmp_path, db_ids=['naver_1'], max_age_hours=1)
+    index.find_existing('naver', '5', ['naver_1'], RecordingConfirm(set()))
+    assert index.db_loads == 1
+
+    # 메모리와 파일 모두 DB에서 만든 지 2시간 지난 필터
+    bloom = index._stores[('naver', '5')].bloom
+    bloom.created_at = time.time() - 7200
+    index._save('naver', '5', bloom)
+    index.find_existing('naver', '5', ['naver_1'], RecordingConfirm(set()))
+    assert index.db_loads == 2
+
+
+def test_stats_count_false_positives(tmp_path):
+    index = make_index(tmp_path, db_ids=['baemin_1'])
+    index.find_existing('baemin', '14', ['baemin_1', 'baemin_2'], RecordingConfirm(set()))
+
+    stats = index.get_stats()
+    assert stats['checked'] == 2
+    assert stats['bloom_hits'] >= 1
+    assert stats['false_positives'] == stats['bloom_hits'] - stats['confirmed']
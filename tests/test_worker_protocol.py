@@ -0,0 +1,80 @@
+"""
+크롤러 워커 프로세스 통신 프로토콜(길이 프레임) 테스트
+"""
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.utils.worker_protocol import HEADER, MAX_FRAME_SIZE, ProtocolError, read_message, write_message
+
+
+class ChunkedStream(io.BytesIO):
+    """read()가 한 번에 최대 chunk 바이트만 돌려주는 스트림 (파이프의 부분 읽기 재현)"""
+
+    def __init__(self, data: bytes, chunk: int):
+        super().__init__(data)
+        self.chunk = chunk
+
+    def read(self, size=-1):
+        return super().read(min(size, self.chunk) if size and size > 0 else self.chunk)
+
+
+def test_round_trip_multiple_messages():
+    stream = io.BytesIO()
+    messages = [{'type': 'result', 'reviews': [{'review_id': 'baemin_1', 'content': '맛있어요'}]}, {'type': 'done'}]
+    for message in messages:
+        write_message(stream, message)
+
+    stream.seek(0)
+    assert [read_message(stream) for _ in messages] == messages
+    # 스트림 끝에서는 None
+    assert read_message(stream) is None
+
+
+def test_frame_header_is_big_endian_body_length():
+    stream = io.BytesIO()
+    write_message(stream, {'text': '한글'})
+    data = stream.getvalue()
+
+    (length,) = HEADER.unpack(data[:HEADER.size])
+    assert length == len(data) - HEADER.size
+    assert data[:HEADER.size] == length.to_bytes(4, 'big')
+
+
+def test_partial_reads_are_reassembled():
+    buffer = io.BytesIO()
+    message = {'type': 'log', 'line': 'x' * 1000}
+    write_message(buffer, message)
+
+    assert read_message(ChunkedStream(buffer.getvalue(), chunk=3)) == message
+
+
+def test_non_json_values_are_stringified():
+    stream = io.BytesIO()
+    write_message(stream, {'path': Path('a/b')})
+    stream.seek(0)
+    assert read_message(stream) == {'path': str(Path('a/b'))}
+
+
+def test_truncated_body_raises():
+    buffer = io.BytesIO()
+    write_message(buffer, {'type': 'result'})
+    truncated = io.BytesIO(buffer.getvalue()[:-2])
+
+    with pytest.raises(ProtocolError):
+        read_message(truncated)
+
+
+def test_truncated_header_is_end_of_stream():
+    assert read_message(io.BytesIO(b'\x00\x00')) is None
+
+
+def test_oversized_frame_is_rejected():
+    stream = io.BytesIO(HEADER.pack(MAX_FRAME_SIZE + 1))
+    with pytest.raises(ProtocolError):
+        read_message(stream)